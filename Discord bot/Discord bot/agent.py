@@ -0,0 +1,227 @@
+# agent.py
+"""
+Headless per-host agent for multi-host mode.
+
+Runs the bots assigned to this host in BOT_AGENTS using the same launcher,
+tailers and process matching as the controller (botlogs), without a
+Discord client. State goes to the controller's fleetcontroller extension
+over TCP: a full snapshot on every (re)connect, then only what changed.
+Bots keep running while the controller is away; the next hello resyncs.
+
+    python agent.py --id host2
+    python agent.py --id host2 --controller 10.0.0.5:9470 --log-dir D:\\v4logs
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+from collections import deque
+
+import src.config as config
+from src.fleetfile import load_into
+from src.fleetproto import PROTOCOL_VERSION, MAX_LINE_BYTES, encode, read_message, diff_snapshot
+
+DELTA_INTERVAL_SECONDS = 0.25  # how often changed state / new lines are flushed
+LINE_QUEUE_MAX = 5000          # lines kept while disconnected (oldest dropped)
+EVENT_QUEUE_MAX = 500
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 30.0
+
+
+class Agent:
+    def __init__(self, agent_id: str, host: str, port: int, token: str):
+        from src.extensions.Background_Processes import botlogs
+
+        self.botlogs = botlogs
+        self.agent_id = agent_id
+        self.host = host
+        self.port = port
+        self.token = token
+        self.lines: deque[tuple[str, str, str]] = deque(maxlen=LINE_QUEUE_MAX)
+        self.events: deque[tuple[str, str, str]] = deque(maxlen=EVENT_QUEUE_MAX)
+        self._sent: dict[str, dict] = {}
+        self._writer: asyncio.StreamWriter | None = None
+        self._wake = asyncio.Event()
+
+        botlogs.LINE_LISTENERS.append(lambda name, stream, text: self.lines.append((name, stream, text)))
+        botlogs.EVENT_LISTENERS.append(self._on_event)
+
+    def _on_event(self, name: str, kind: str, detail: str) -> None:
+        self.events.append((name, kind, detail))
+        self._wake.set()
+
+    def snapshot(self, name: str) -> dict:
+        b = self.botlogs
+        return {
+            "started": bool(b.startup_detected.get(name)),
+            "state": b._display_state(name),
+            "depo": int(b.trade_counts.get(name) or 0),
+            "instant": b.instant_coins.get(name),
+            "max": b.max_coins.get(name),
+        }
+
+    # ---- outbound ----
+    def _send(self, msg_type: str, **fields) -> None:
+        self._writer.write(encode(msg_type, **fields))
+
+    def _flush(self) -> None:
+        """Queue deltas, lines and events on the socket (caller drains)."""
+        for name in self.botlogs.BOT_EXECUTABLES:
+            snap = self.snapshot(name)
+            changed = diff_snapshot(self._sent.get(name), snap)
+            if changed:
+                self._send("delta", bot=name, f=changed)
+                self._sent[name] = snap
+
+        if self.lines:
+            batches: dict[tuple[str, str], list[str]] = {}
+            while self.lines:
+                name, stream, text = self.lines.popleft()
+                batches.setdefault((name, stream), []).append(text)
+            for (name, stream), texts in batches.items():
+                self._send("lines", bot=name, s=stream, l=texts)
+
+        while self.events:
+            name, kind, detail = self.events.popleft()
+            self._send("event", bot=name, kind=kind, detail=detail)
+
+    async def _sender(self) -> None:
+        ping_every = config.FLEET_IDLE_TIMEOUT_SECONDS / 3
+        loop = asyncio.get_running_loop()
+        last_ping = loop.time()
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), DELTA_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            self._flush()
+            if loop.time() - last_ping >= ping_every:
+                self._send("ping")
+                last_ping = loop.time()
+            await self._writer.drain()
+
+    # ---- inbound ----
+    async def _run_command(self, msg: dict) -> None:
+        b = self.botlogs
+        name, op, cmd_id = msg.get("bot"), msg.get("op"), msg.get("id")
+        path = b.BOT_EXECUTABLES.get(name)
+        try:
+            if path is None:
+                ok, text = False, f"`{name}` is not run by agent `{self.agent_id}`"
+            elif op == "start":
+                asyncio.create_task(b.run_and_monitor_bot(None, name, path))
+                ok, text = True, f"🚀 Starting `{name}` on `{self.agent_id}`…"
+            elif op == "stop":
+                results = await b.stop_bot(name, wipe=bool(msg.get("wipe")))
+                ok, text = True, f"🛑 Stopped `{name}` on `{self.agent_id}` → " + "; ".join(results)
+            elif op == "restart":
+                results = await b.stop_bot(name, wipe=bool(msg.get("wipe")), restart=True)
+                asyncio.create_task(b.run_and_monitor_bot(None, name, path))
+                ok, text = True, f"🔁 Restarting `{name}` on `{self.agent_id}` → " + "; ".join(results)
+            else:
+                ok, text = False, f"unknown op {op!r}"
+        except Exception as e:
+            ok, text = False, f"{op} `{name}` failed on `{self.agent_id}`: {e}"
+        b.log(f"[AGENT] {op} {name}: {text}")
+        if self._writer is not None and not self._writer.is_closing():
+            self._send("result", id=cmd_id, ok=ok, msg=text)
+            self._wake.set()
+
+    async def _session(self) -> None:
+        reader, writer = await asyncio.open_connection(self.host, self.port, limit=MAX_LINE_BYTES)
+        self._writer = writer
+        try:
+            # Full snapshot every time: the controller may have restarted or
+            # marked our bots stopped while we were away
+            snaps = {name: self.snapshot(name) for name in self.botlogs.BOT_EXECUTABLES}
+            self._send("hello", agent=self.agent_id, token=self.token, v=PROTOCOL_VERSION, bots=snaps)
+            await writer.drain()
+            reply = await read_message(reader, timeout=10)
+            if not reply or reply["t"] != "welcome":
+                raise ConnectionError(f"controller refused: {(reply or {}).get('msg', 'connection closed')}")
+            self._sent = snaps
+            self.botlogs.log(f"[AGENT] connected to {self.host}:{self.port} as {self.agent_id}")
+
+            sender = asyncio.create_task(self._sender())
+            try:
+                while True:
+                    msg = await read_message(reader, timeout=config.FLEET_IDLE_TIMEOUT_SECONDS)
+                    if msg is None:
+                        raise ConnectionError("controller closed the connection")
+                    if msg["t"] == "cmd":
+                        asyncio.create_task(self._run_command(msg))
+                    elif msg["t"] == "resync":
+                        # The controller just started accepting these (fleet.json reload)
+                        for name in msg.get("bots") or []:
+                            self._sent.pop(name, None)
+                        self._wake.set()
+                    elif msg["t"] == "error":
+                        raise ConnectionError(msg.get("msg", "error"))
+                    if sender.done():
+                        sender.result()  # surface write errors
+            finally:
+                sender.cancel()
+        finally:
+            self._writer = None
+            writer.close()
+
+    async def run(self) -> None:
+        await self.botlogs.start_all_bots(None)
+        delay = RECONNECT_MIN_SECONDS
+        while True:
+            try:
+                await self._session()
+                delay = RECONNECT_MIN_SECONDS
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.botlogs.log(f"[AGENT] controller link down: {e}; retrying in {delay:.0f}s")
+            await asyncio.sleep(delay * (0.8 + 0.4 * random.random()))
+            delay = min(RECONNECT_MAX_SECONDS, delay * 2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--id", required=True, help="agent id, as used in BOT_AGENTS")
+    parser.add_argument("--controller", default=config.FLEET_CONTROLLER, help="host:port of the controller")
+    parser.add_argument("--token", default=config.FLEET_TOKEN)
+    parser.add_argument("--log-dir", default=None, help="override LOG_DIR on this host")
+    args = parser.parse_args()
+
+    # Only this agent's bots; must happen before botlogs builds its state from the config
+    load_into(config.FLEET_FILE, config.BOT_EXECUTABLES, config.BOT_AGENTS)
+    mine = {n: p for n, p in config.BOT_EXECUTABLES.items() if config.BOT_AGENTS.get(n) == args.id}
+    if not mine:
+        sys.exit(f"No bots are assigned to agent {args.id!r} in BOT_AGENTS")
+    config.BOT_EXECUTABLES.clear()
+    config.BOT_EXECUTABLES.update(mine)
+    if args.log_dir:
+        config.LOG_DIR = args.log_dir
+
+    from src.extensions.Background_Processes import botlogs
+
+    botlogs.HEADLESS = True
+    botlogs.AGENT_ID = args.id
+    # Several agents may share a host (and a checkout) when testing, so the
+    # state files go to this agent's LOG_DIR before anything is loaded
+    if botlogs.STATE_DB_FILE:
+        botlogs.STATE_DB_FILE = os.path.join(config.LOG_DIR, f"agent-{args.id}-state.db")
+    botlogs.COIN_STATE_FILE = os.path.join(config.LOG_DIR, f"agent-{args.id}-coin_state.json")
+    botlogs.SUPERVISOR_STATE_FILE = os.path.join(config.LOG_DIR, f"agent-{args.id}-supervisor_state.json")
+    botlogs.init_state()
+
+    host, _, port = args.controller.rpartition(":")
+    agent = Agent(args.id, host or "127.0.0.1", int(port), args.token)
+    try:
+        asyncio.run(agent.run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if botlogs.STORE is not None:
+            botlogs.STORE.close()
+
+
+if __name__ == "__main__":
+    main()
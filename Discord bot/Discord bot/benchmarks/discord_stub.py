@@ -0,0 +1,576 @@
+# benchmarks/discord_stub.py
+"""
+Local stand-in for the parts of Discord this controller talks to, so the
+REST-heavy paths (status embed edits, offline alerts, control panel edits,
+interaction responses) can be measured without network access.
+
+REST (under /api/v10):
+    GET    /gateway, /gateway/bot, /users/@me, /oauth2/applications/@me
+    GET/PUT /applications/{app}/commands (+ guild variant)
+    POST   /channels/{channel}/messages
+    GET/PATCH/DELETE /channels/{channel}/messages/{message}
+    POST   /interactions/{interaction}/{token}/callback
+    POST   /webhooks/{app}/{token}                       (followups)
+    GET/PATCH/DELETE /webhooks/{app}/{token}/messages/{message|@original}
+
+Gateway: a websocket at /gateway doing HELLO / IDENTIFY -> READY /
+heartbeat ACK / RESUME, with zlib-stream compression if asked for.
+
+Rate limits: each route has a bucket (per channel / webhook token where
+Discord uses a major parameter) plus a global bucket, with the usual
+X-RateLimit-* headers and 429 JSON bodies.
+
+Control endpoints (not Discord):
+    GET  /_stub/stats          request, 429 and ack-latency counters
+    POST /_stub/reset          clear counters
+    POST /_stub/interactions   {"custom_id": "btn_start", "values": [], "user_id": 1}
+                               dispatches INTERACTION_CREATE to every gateway
+                               session; ack latency is measured when the
+                               callback arrives
+
+Run from the "Discord bot/Discord bot" folder:
+    python -m benchmarks.discord_stub --port 8765
+and set DISCORD_REST_URL = "http://127.0.0.1:8765/api/v10" in src/config.py.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import random
+import time
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from aiohttp import web, WSMsgType
+
+API = "/api/v10"
+BOT_USER_ID = 900000000000000001
+APPLICATION_ID = 900000000000000002
+GUILD_ID = 900000000000000003
+
+_snowflakes = itertools.count(int(time.time() * 1000 - 1420070400000) << 22)
+
+
+def _snowflake() -> str:
+    return str(next(_snowflakes))
+
+
+def _now_iso() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def _user(user_id: int = BOT_USER_ID, name: str = "v4-controller", bot: bool = True) -> dict:
+    return {
+        "id": str(user_id),
+        "username": name,
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": None,
+        "bot": bot,
+        "system": False,
+        "public_flags": 0,
+        "flags": 0,
+        "mfa_enabled": False,
+        "verified": True,
+        "locale": "en-US",
+        "email": None,
+        "premium_type": 0,
+    }
+
+
+# -----------------------------
+# Rate limiting
+# -----------------------------
+@dataclass
+class Bucket:
+    limit: int
+    period: float
+    remaining: int = 0
+    reset_at: float = 0.0
+
+    def take(self, now: float) -> tuple[bool, int, float]:
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.period
+        if self.remaining <= 0:
+            return False, 0, self.reset_at - now
+        self.remaining -= 1
+        return True, self.remaining, self.reset_at - now
+
+
+@dataclass
+class RouteLimit:
+    bucket_hash: str
+    limit: int
+    period: float
+    uses_global: bool = True
+
+
+# Roughly Discord's published/observed limits for the routes we use
+DEFAULT_LIMITS: dict[str, RouteLimit] = {
+    "create_message": RouteLimit("msg-create", 5, 5.0),
+    "edit_message": RouteLimit("msg-edit", 5, 5.0),
+    "get_message": RouteLimit("msg-get", 50, 1.0),
+    "delete_message": RouteLimit("msg-delete", 5, 1.0),
+    # Discord sends no bucket headers for interaction callbacks (and hikari
+    # complains if it sees any), so that route is unlimited here too
+    "interaction_callback": RouteLimit("interaction", 0, 0.0, uses_global=False),
+    "webhook": RouteLimit("webhook", 5, 2.0, uses_global=False),
+    "commands": RouteLimit("commands", 5, 20.0),
+    "misc": RouteLimit("misc", 50, 1.0),
+}
+
+
+@dataclass
+class Stats:
+    started: float = field(default_factory=time.time)
+    requests: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    rate_limited: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    global_limited: int = 0
+    ack_latency_ms: list[float] = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        acks = sorted(self.ack_latency_ms)
+
+        def pct(q: float) -> float | None:
+            return round(acks[min(len(acks) - 1, int(q * len(acks)))], 2) if acks else None
+
+        return {
+            "uptime_s": round(time.time() - self.started, 1),
+            "requests": dict(self.requests),
+            "rate_limited": dict(self.rate_limited),
+            "global_rate_limited": self.global_limited,
+            "interactions_acked": len(acks),
+            "ack_latency_ms": {"p50": pct(0.5), "p95": pct(0.95), "p99": pct(0.99), "max": acks[-1] if acks else None},
+        }
+
+
+class DiscordStub:
+    def __init__(
+        self,
+        *,
+        limits: dict[str, RouteLimit] | None = None,
+        global_limit: int = 50,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+    ):
+        self.limits = limits or DEFAULT_LIMITS
+        self.global_bucket = Bucket(global_limit, 1.0)
+        self.buckets: dict[tuple[str, str], Bucket] = {}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.stats = Stats()
+        self.messages: dict[str, dict] = {}
+        self.sessions: list[_GatewaySession] = []
+        self.pending_interactions: dict[str, float] = {}
+        self.base_url = ""
+
+    # ---- helpers ----
+    async def _delay(self) -> None:
+        if self.latency_ms or self.jitter_ms:
+            await asyncio.sleep(max(0.0, self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000.0)
+
+    def _limit(self, route: str, major: str) -> web.Response | dict[str, str]:
+        """Apply route + global buckets; return headers, or a 429 response."""
+        now = time.monotonic()
+        rl = self.limits.get(route, self.limits["misc"])
+        self.stats.requests[route] += 1
+
+        if rl.uses_global:
+            ok, _, reset_after = self.global_bucket.take(now)
+            if not ok:
+                self.stats.global_limited += 1
+                return web.json_response(
+                    {"message": "You are being rate limited.", "retry_after": round(reset_after, 3), "global": True},
+                    status=429,
+                    headers={"Retry-After": f"{reset_after:.3f}", "X-RateLimit-Global": "true", "X-RateLimit-Scope": "global"},
+                )
+
+        if not rl.limit:
+            return {}
+
+        bucket = self.buckets.get((rl.bucket_hash, major))
+        if bucket is None:
+            bucket = self.buckets[(rl.bucket_hash, major)] = Bucket(rl.limit, rl.period)
+        ok, remaining, reset_after = bucket.take(now)
+        headers = {
+            "X-RateLimit-Limit": str(rl.limit),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": f"{time.time() + reset_after:.3f}",
+            "X-RateLimit-Reset-After": f"{reset_after:.3f}",
+            "X-RateLimit-Bucket": rl.bucket_hash,
+        }
+        if not ok:
+            self.stats.rate_limited[route] += 1
+            return web.json_response(
+                {"message": "You are being rate limited.", "retry_after": round(reset_after, 3), "global": False},
+                status=429,
+                headers={**headers, "Retry-After": f"{reset_after:.3f}", "X-RateLimit-Scope": "user"},
+            )
+        return headers
+
+    async def _respond(self, route: str, major: str, body: dict | list | None, status: int = 200) -> web.Response:
+        await self._delay()
+        limited = self._limit(route, major)
+        if isinstance(limited, web.Response):
+            return limited
+        if body is None:
+            return web.Response(status=204, headers=limited)
+        return web.json_response(body, status=status, headers=limited)
+
+    def _message(self, channel_id: str, payload: dict, webhook_id: str | None = None) -> dict:
+        msg = {
+            "id": _snowflake(),
+            "channel_id": channel_id,
+            "author": _user(),
+            "content": payload.get("content") or "",
+            "timestamp": _now_iso(),
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "mention_channels": [],
+            "attachments": [],
+            "embeds": payload.get("embeds") or [],
+            "reactions": [],
+            "pinned": False,
+            "type": 0,
+            "flags": int(payload.get("flags") or 0),
+            "components": payload.get("components") or [],
+            "sticker_items": [],
+        }
+        if webhook_id:
+            msg["webhook_id"] = webhook_id
+            msg["application_id"] = str(APPLICATION_ID)
+        self.messages[msg["id"]] = msg
+        return msg
+
+    def _edit(self, message_id: str, payload: dict) -> dict | None:
+        msg = self.messages.get(message_id)
+        if msg is None:
+            return None
+        for key in ("content", "embeds", "components", "flags"):
+            if key in payload:
+                msg[key] = payload[key]
+        msg["edited_timestamp"] = _now_iso()
+        return msg
+
+    @staticmethod
+    async def _json(request: web.Request) -> dict:
+        if request.content_type == "application/json":
+            return await request.json()
+        if request.content_type.startswith("multipart/"):
+            # Attachments: only the payload_json part matters here
+            reader = await request.multipart()
+            async for part in reader:
+                if part.name == "payload_json":
+                    return json.loads(await part.text())
+        return {}
+
+    # ---- REST handlers ----
+    async def gateway(self, _: web.Request) -> web.Response:
+        return await self._respond("misc", "", {"url": self.base_url.replace("http", "ws", 1) + "/gateway"})
+
+    async def gateway_bot(self, _: web.Request) -> web.Response:
+        return await self._respond(
+            "misc",
+            "",
+            {
+                "url": self.base_url.replace("http", "ws", 1) + "/gateway",
+                "shards": 1,
+                "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1},
+            },
+        )
+
+    async def me(self, _: web.Request) -> web.Response:
+        return await self._respond("misc", "", _user())
+
+    async def application(self, _: web.Request) -> web.Response:
+        return await self._respond(
+            "misc",
+            "",
+            {
+                "id": str(APPLICATION_ID),
+                "name": "v4-controller",
+                "icon": None,
+                "description": "",
+                "bot_public": False,
+                "bot_require_code_grant": False,
+                "verify_key": "0" * 64,
+                "flags": 0,
+                "owner": _user(1, "owner", bot=False),
+                "team": None,
+                "summary": "",
+            },
+        )
+
+    async def get_commands(self, request: web.Request) -> web.Response:
+        return await self._respond("commands", request.match_info.get("guild", ""), [])
+
+    async def put_commands(self, request: web.Request) -> web.Response:
+        commands = await self._json(request)
+        out = []
+        for cmd in commands if isinstance(commands, list) else []:
+            out.append(
+                {
+                    "id": _snowflake(),
+                    "application_id": str(APPLICATION_ID),
+                    "version": _snowflake(),
+                    "default_member_permissions": None,
+                    "dm_permission": True,
+                    "nsfw": False,
+                    "type": cmd.get("type", 1),
+                    "options": cmd.get("options", []),
+                    "description": cmd.get("description", ""),
+                    "name": cmd.get("name", ""),
+                    **({"guild_id": request.match_info["guild"]} if "guild" in request.match_info else {}),
+                }
+            )
+        return await self._respond("commands", request.match_info.get("guild", ""), out)
+
+    async def create_message(self, request: web.Request) -> web.Response:
+        channel = request.match_info["channel"]
+        payload = await self._json(request)
+        await self._delay()
+        limited = self._limit("create_message", channel)
+        if isinstance(limited, web.Response):
+            return limited
+        return web.json_response(self._message(channel, payload), headers=limited)
+
+    async def get_message(self, request: web.Request) -> web.Response:
+        msg = self.messages.get(request.match_info["message"])
+        if msg is None:
+            return web.json_response({"message": "Unknown Message", "code": 10008}, status=404)
+        return await self._respond("get_message", request.match_info["channel"], msg)
+
+    async def edit_message(self, request: web.Request) -> web.Response:
+        channel = request.match_info["channel"]
+        payload = await self._json(request)
+        await self._delay()
+        limited = self._limit("edit_message", channel)
+        if isinstance(limited, web.Response):
+            return limited
+        msg = self._edit(request.match_info["message"], payload)
+        if msg is None:
+            return web.json_response({"message": "Unknown Message", "code": 10008}, status=404, headers=limited)
+        return web.json_response(msg, headers=limited)
+
+    async def delete_message(self, request: web.Request) -> web.Response:
+        self.messages.pop(request.match_info["message"], None)
+        return await self._respond("delete_message", request.match_info["channel"], None)
+
+    async def interaction_callback(self, request: web.Request) -> web.Response:
+        iid = request.match_info["interaction"]
+        sent = self.pending_interactions.pop(iid, None)
+        if sent is not None:
+            self.stats.ack_latency_ms.append((time.perf_counter() - sent) * 1000.0)
+        payload = await self._json(request)
+        data = payload.get("data") or {}
+        if payload.get("type") in (4, 5):  # message / deferred message: becomes @original
+            msg = self._message("0", data, webhook_id=str(APPLICATION_ID))
+            self.messages[f"original:{request.match_info['token']}"] = msg
+        return await self._respond("interaction_callback", iid, None)
+
+    async def followup(self, request: web.Request) -> web.Response:
+        payload = await self._json(request)
+        return await self._respond(
+            "webhook", request.match_info["token"], self._message("0", payload, webhook_id=request.match_info["app"])
+        )
+
+    def _webhook_message_id(self, request: web.Request) -> str:
+        mid = request.match_info["message"]
+        if mid == "@original":
+            original = self.messages.get(f"original:{request.match_info['token']}")
+            return original["id"] if original else ""
+        return mid
+
+    async def get_webhook_message(self, request: web.Request) -> web.Response:
+        msg = self.messages.get(self._webhook_message_id(request))
+        if msg is None:
+            return web.json_response({"message": "Unknown Message", "code": 10008}, status=404)
+        return await self._respond("webhook", request.match_info["token"], msg)
+
+    async def edit_webhook_message(self, request: web.Request) -> web.Response:
+        payload = await self._json(request)
+        await self._delay()
+        limited = self._limit("webhook", request.match_info["token"])
+        if isinstance(limited, web.Response):
+            return limited
+        msg = self._edit(self._webhook_message_id(request), payload)
+        if msg is None:
+            return web.json_response({"message": "Unknown Message", "code": 10008}, status=404, headers=limited)
+        return web.json_response(msg, headers=limited)
+
+    async def delete_webhook_message(self, request: web.Request) -> web.Response:
+        self.messages.pop(self._webhook_message_id(request), None)
+        return await self._respond("webhook", request.match_info["token"], None)
+
+    # ---- control endpoints ----
+    async def stub_stats(self, _: web.Request) -> web.Response:
+        return web.json_response(self.stats.as_dict())
+
+    async def stub_reset(self, _: web.Request) -> web.Response:
+        self.stats = Stats()
+        return web.json_response({"ok": True})
+
+    async def stub_interaction(self, request: web.Request) -> web.Response:
+        body = await self._json(request)
+        iid = self.dispatch_component_interaction(
+            body.get("custom_id", "btn_start"), body.get("values") or [], int(body.get("user_id", 1))
+        )
+        return web.json_response({"interaction_id": iid, "sessions": len(self.sessions)})
+
+    def dispatch_component_interaction(self, custom_id: str, values: list[str], user_id: int) -> str:
+        iid = _snowflake()
+        is_select = bool(values) or custom_id.startswith("select")
+        payload = {
+            "id": iid,
+            "application_id": str(APPLICATION_ID),
+            "type": 3,
+            "token": f"tok{iid}",
+            "version": 1,
+            "channel_id": "1",
+            "locale": "en-US",
+            "app_permissions": "0",
+            "user": _user(user_id, "owner", bot=False),
+            "data": {"custom_id": custom_id, "component_type": 3 if is_select else 2, "values": values},
+            "message": self._message("1", {"content": "panel"}),
+            "entitlements": [],
+        }
+        self.pending_interactions[iid] = time.perf_counter()
+        for session in list(self.sessions):
+            session.dispatch("INTERACTION_CREATE", payload)
+        return iid
+
+    # ---- gateway ----
+    async def gateway_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(autoping=True, max_msg_size=0)
+        await ws.prepare(request)
+        session = _GatewaySession(ws, compress=request.query.get("compress") == "zlib-stream", stub=self)
+        self.sessions.append(session)
+        try:
+            await session.run()
+        finally:
+            self.sessions.remove(session)
+        return ws
+
+    def build_app(self) -> web.Application:
+        app = web.Application(client_max_size=32 * 1024 * 1024)
+        r = app.router
+        r.add_get(f"{API}/gateway", self.gateway)
+        r.add_get(f"{API}/gateway/bot", self.gateway_bot)
+        r.add_get(f"{API}/users/@me", self.me)
+        r.add_get(f"{API}/oauth2/applications/@me", self.application)
+        r.add_get(f"{API}/applications/{{app}}/commands", self.get_commands)
+        r.add_put(f"{API}/applications/{{app}}/commands", self.put_commands)
+        r.add_get(f"{API}/applications/{{app}}/guilds/{{guild}}/commands", self.get_commands)
+        r.add_put(f"{API}/applications/{{app}}/guilds/{{guild}}/commands", self.put_commands)
+        r.add_post(f"{API}/channels/{{channel}}/messages", self.create_message)
+        r.add_get(f"{API}/channels/{{channel}}/messages/{{message}}", self.get_message)
+        r.add_patch(f"{API}/channels/{{channel}}/messages/{{message}}", self.edit_message)
+        r.add_delete(f"{API}/channels/{{channel}}/messages/{{message}}", self.delete_message)
+        r.add_post(f"{API}/interactions/{{interaction}}/{{token}}/callback", self.interaction_callback)
+        r.add_post(f"{API}/webhooks/{{app}}/{{token}}", self.followup)
+        r.add_get(f"{API}/webhooks/{{app}}/{{token}}/messages/{{message}}", self.get_webhook_message)
+        r.add_patch(f"{API}/webhooks/{{app}}/{{token}}/messages/{{message}}", self.edit_webhook_message)
+        r.add_delete(f"{API}/webhooks/{{app}}/{{token}}/messages/{{message}}", self.delete_webhook_message)
+        r.add_get("/gateway", self.gateway_ws)
+        r.add_get("/_stub/stats", self.stub_stats)
+        r.add_post("/_stub/reset", self.stub_reset)
+        r.add_post("/_stub/interactions", self.stub_interaction)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> web.AppRunner:
+        runner = web.AppRunner(self.build_app(), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        bound = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{bound}"
+        return runner
+
+    @property
+    def rest_url(self) -> str:
+        return self.base_url + API
+
+
+class _GatewaySession:
+    HEARTBEAT_INTERVAL_MS = 41250
+
+    def __init__(self, ws: web.WebSocketResponse, *, compress: bool, stub: DiscordStub):
+        self.ws = ws
+        self.stub = stub
+        self.seq = 0
+        self.session_id = _snowflake()
+        self._zlib = zlib.compressobj() if compress else None
+
+    def _send(self, payload: dict) -> None:
+        data = json.dumps(payload)
+        if self._zlib is not None:
+            blob = self._zlib.compress(data.encode()) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+            asyncio.ensure_future(self.ws.send_bytes(blob))
+        else:
+            asyncio.ensure_future(self.ws.send_str(data))
+
+    def dispatch(self, event: str, data: dict) -> None:
+        self.seq += 1
+        self._send({"op": 0, "t": event, "s": self.seq, "d": data})
+
+    async def run(self) -> None:
+        self._send({"op": 10, "d": {"heartbeat_interval": self.HEARTBEAT_INTERVAL_MS}, "s": None, "t": None})
+        async for msg in self.ws:
+            if msg.type not in (WSMsgType.TEXT, WSMsgType.BINARY):
+                break
+            try:
+                payload = json.loads(msg.data)
+            except ValueError:
+                continue
+            op = payload.get("op")
+            if op == 1:  # heartbeat
+                self._send({"op": 11, "d": None, "s": None, "t": None})
+            elif op == 2:  # identify
+                self.dispatch(
+                    "READY",
+                    {
+                        "v": 10,
+                        "user": _user(),
+                        "guilds": [],
+                        "session_id": self.session_id,
+                        "resume_gateway_url": self.stub.base_url.replace("http", "ws", 1) + "/gateway",
+                        "shard": [0, 1],
+                        "application": {"id": str(APPLICATION_ID), "flags": 0},
+                    },
+                )
+            elif op == 6:  # resume
+                self.dispatch("RESUMED", {})
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    stub = DiscordStub(global_limit=args.global_limit, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+    await stub.start(args.host, args.port)
+    print(f"Discord stand-in listening; set DISCORD_REST_URL = \"{stub.rest_url}\"", flush=True)
+    while True:
+        await asyncio.sleep(3600)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--global-limit", type=int, default=50, help="global requests/sec")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="added per-request latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
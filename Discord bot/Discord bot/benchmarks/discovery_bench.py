@@ -0,0 +1,110 @@
+# benchmarks/discovery_bench.py
+"""
+Bot discovery over a synthetic tree of --folders folders (--groups parent
+folders, --bot-share of them bot folders with v4-bot.exe + run.cmd, the
+rest with a few ordinary files), scanned at depth 2:
+
+  - legacy       os.listdir + isdir + two isfile per entry (old pathgenerator.py)
+  - cold         src.discovery without a cache
+  - warm         again, nothing changed (one stat per folder)
+  - incremental  after adding --changed new bot folders
+
+Run from the "Discord bot/Discord bot" folder:
+    python -m benchmarks.discovery_bench --folders 5000
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from src.discovery import Discovery
+
+EXE = "v4-bot.exe"
+MARKER = "run.cmd"
+
+
+def _make_bot(folder: str) -> None:
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, EXE), "wb") as f:
+        f.write(b"MZ\x90\x00" + b"\x00" * 60)
+    with open(os.path.join(folder, MARKER), "w") as f:
+        f.write("v4-bot.exe\n")
+
+
+def _make_tree(root: str, folders: int, groups: int, bot_share: float, seed: int) -> int:
+    rnd = random.Random(seed)
+    bots = 0
+    for i in range(folders):
+        folder = os.path.join(root, f"group{i % groups:03d}", f"folder{i:05d}")
+        if rnd.random() < bot_share:
+            _make_bot(folder)
+            bots += 1
+        else:
+            os.makedirs(folder)
+            for j in range(3):
+                with open(os.path.join(folder, f"notes{j}.txt"), "w") as f:
+                    f.write("x")
+    return bots
+
+
+def _legacy(root: str, depth: int) -> int:
+    found = 0
+    level = [root]
+    for _ in range(depth + 1):
+        nxt = []
+        for d in level:
+            for entry in os.listdir(d):
+                folder = os.path.join(d, entry)
+                if not os.path.isdir(folder):
+                    continue
+                if os.path.isfile(os.path.join(folder, EXE)) and os.path.isfile(os.path.join(folder, MARKER)):
+                    found += 1
+                else:
+                    nxt.append(folder)
+        level = nxt
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folders", type=int, default=5000)
+    parser.add_argument("--groups", type=int, default=50)
+    parser.add_argument("--bot-share", type=float, default=0.1)
+    parser.add_argument("--changed", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="v4discover-")
+    cache = os.path.join(root, "cache.json")
+    tree = os.path.join(root, "tree")
+    try:
+        expected = _make_tree(tree, args.folders, args.groups, args.bot_share, seed=1)
+
+        def scan():
+            return Discovery([tree], depth=2, exe_names=[EXE], marker=MARKER, cache_path=cache, workers=args.workers).run()
+
+        rows = []
+        t0 = time.perf_counter()
+        legacy = _legacy(tree, 2)
+        rows.append(("legacy", time.perf_counter() - t0, legacy, None, None))
+        for label in ("cold", "warm"):
+            r = scan()
+            rows.append((label, r.seconds, len(r.bots), r.dirs, r.scanned))
+        for i in range(args.changed):
+            _make_bot(os.path.join(tree, f"group{i % args.groups:03d}", f"new{i:05d}"))
+        r = scan()
+        rows.append(("incremental", r.seconds, len(r.bots), r.dirs, r.scanned))
+
+        print(f"{args.folders} folders, {expected} bots (+{args.changed} before incremental)")
+        print(f"{'run':>12}  {'ms':>8}  {'bots':>6}  {'dirs':>6}  {'listed':>6}")
+        for label, secs, bots, dirs, listed in rows:
+            print(f"{label:>12}  {secs * 1000:8.1f}  {bots:>6}  {dirs if dirs is not None else '—':>6}  "
+                  f"{listed if listed is not None else '—':>6}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+# benchmarks/edit_throughput.py
+"""
+Edit throughput and rate-limit handling against the local Discord stand-in
+(benchmarks/discord_stub.py). No network access needed.
+
+Scenarios (each against a fresh stub):
+  - burst         N concurrent message edits spread over C channels, through
+                  hikari's REST client with our HTTP settings
+  - status        the real botlogs._update_embed(force=True) in a loop
+                  (status embed edits are limited to one channel's bucket)
+  - alerts        N offline-alert style create_message calls at once to the
+                  alert channel (how long until the last one lands)
+  - interactions  component interactions dispatched over the gateway and
+                  answered with a deferred update (stub-side ack latency)
+  - router        the same through src.components.ROUTER, with a handler that
+                  does a blocking scan (--job-ms in a thread), edits progress
+                  and finishes later; the ack must not wait for any of it
+
+Reported per scenario: achieved ops/sec vs. what the stub's buckets allow,
+REST latency p50/p99 seen by the client, 429s served by the stub and 429s
+hikari logged (should both stay ~0 if the client respects the headers).
+
+Run from the "Discord bot/Discord bot" folder:
+    python -m benchmarks.edit_throughput
+    python -m benchmarks.edit_throughput --scenarios burst,alerts --edits 200 --channels 8
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+import hikari
+
+from benchmarks.discord_stub import DiscordStub, DEFAULT_LIMITS
+
+
+class _HikariRateLimitLog(logging.Handler):
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if "rate limited" in str(record.msg):
+            self.count += 1
+
+
+def _pct(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(q * len(values)))] * 1000.0, 1)
+
+
+async def _timed(latencies: list[float], coro) -> None:
+    t0 = time.perf_counter()
+    await coro
+    latencies.append(time.perf_counter() - t0)
+
+
+def _row(name: str, ops: int, wall: float, allowed: float, latencies: list[float], stub: DiscordStub, rl_log) -> dict:
+    stats = stub.stats.as_dict()
+    return {
+        "scenario": name,
+        "ops": ops,
+        "wall_s": round(wall, 2),
+        "ops_per_s": round(ops / wall, 2) if wall else None,
+        "allowed_per_s": round(allowed, 2),
+        "latency_p50_ms": _pct(latencies, 0.5),
+        "latency_p99_ms": _pct(latencies, 0.99),
+        "stub_429": sum(stats["rate_limited"].values()) + stats["global_rate_limited"],
+        "hikari_429_logged": rl_log.count,
+        "ack_p50_ms": stats["ack_latency_ms"]["p50"],
+        "ack_p99_ms": stats["ack_latency_ms"]["p99"],
+    }
+
+
+async def _with_rest(stub: DiscordStub):
+    from src.httpsettings import build_http_settings
+
+    settings = build_http_settings()
+    settings.ssl = False  # plain http to the stub
+    app = hikari.RESTApp(http_settings=settings, url=stub.rest_url)
+    await app.start()
+    return app, app.acquire("x.y.z", hikari.TokenType.BOT)
+
+
+# -----------------------------
+# Scenarios
+# -----------------------------
+async def _burst(stub: DiscordStub, args, rl_log) -> dict:
+    app, rest = await _with_rest(stub)
+    latencies: list[float] = []
+    try:
+        async with rest:
+            channels = list(range(1, args.channels + 1))
+            msgs = {c: await rest.create_message(c, "status") for c in channels}
+            stub.stats.requests.clear()
+            t0 = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    _timed(latencies, rest.edit_message(c, msgs[c], f"edit {i}"))
+                    for i in range(args.edits)
+                    for c in [channels[i % len(channels)]]
+                )
+            )
+            wall = time.perf_counter() - t0
+    finally:
+        await app.close()
+    rl = DEFAULT_LIMITS["edit_message"]
+    return _row("burst", args.edits, wall, args.channels * rl.limit / rl.period, latencies, stub, rl_log)
+
+
+async def _status(stub: DiscordStub, args, rl_log) -> dict:
+    import src.config as config
+
+    root = tempfile.mkdtemp(prefix="v4edit-")
+    config.ALERT_CHANNEL_ID = 42
+    config.STATE_DB = os.path.join(root, "state.db")  # not src/state.db
+    from src.extensions.Background_Processes import botlogs
+
+    botlogs.ALERT_CHANNEL_ID = 42
+    botlogs.STATUS_STATE_FILE = os.path.join(root, "monitor_status.json")
+
+    app, rest = await _with_rest(stub)
+    latencies: list[float] = []
+    try:
+        async with rest:
+            botlogs.status_message_id = (await rest.create_message(42, "status")).id
+            fake_bot = SimpleNamespace(rest=rest)
+            t0 = time.perf_counter()
+            for _ in range(args.status_edits):
+                botlogs._mark_dirty()
+                await _timed(latencies, botlogs._update_embed(fake_bot, force=True))
+            wall = time.perf_counter() - t0
+    finally:
+        await app.close()
+    rl = DEFAULT_LIMITS["edit_message"]
+    return _row("status", args.status_edits, wall, rl.limit / rl.period, latencies, stub, rl_log)
+
+
+async def _alerts(stub: DiscordStub, args, rl_log) -> dict:
+    app, rest = await _with_rest(stub)
+    latencies: list[float] = []
+    embed = hikari.Embed(title="Bot went offline", description="fake000 process exited", color=0xE74C3C)
+    try:
+        async with rest:
+            t0 = time.perf_counter()
+            await asyncio.gather(
+                *(_timed(latencies, rest.create_message(42, "<@1>", embed=embed)) for _ in range(args.alerts))
+            )
+            wall = time.perf_counter() - t0
+    finally:
+        await app.close()
+    rl = DEFAULT_LIMITS["create_message"]
+    return _row("alerts", args.alerts, wall, rl.limit / rl.period, latencies, stub, rl_log)
+
+
+async def _interactions(stub: DiscordStub, args, rl_log) -> dict:
+    from src.httpsettings import build_http_settings
+
+    settings = build_http_settings()
+    settings.ssl = False
+    bot = hikari.GatewayBot(
+        "x.y.z", rest_url=stub.rest_url, http_settings=settings, banner=None, intents=hikari.Intents.NONE
+    )
+    latencies: list[float] = []
+    done = asyncio.Event()
+    answered = 0
+
+    @bot.listen(hikari.InteractionCreateEvent)
+    async def _on_interaction(event: hikari.InteractionCreateEvent) -> None:
+        nonlocal answered
+        if isinstance(event.interaction, hikari.ComponentInteraction):
+            await _timed(latencies, event.interaction.create_initial_response(hikari.ResponseType.DEFERRED_MESSAGE_UPDATE))
+            answered += 1
+            if answered >= args.interactions:
+                done.set()
+
+    await bot.start()
+    try:
+        t0 = time.perf_counter()
+        for i in range(args.interactions):
+            stub.dispatch_component_interaction("btn_start" if i % 2 else "select_bot", [] if i % 2 else ["fake000"], 1)
+            await asyncio.sleep(args.interaction_gap)
+        await asyncio.wait_for(done.wait(), timeout=30)
+        wall = time.perf_counter() - t0
+    finally:
+        await bot.close()
+    return _row("interactions", args.interactions, wall, 1.0 / args.interaction_gap, latencies, stub, rl_log)
+
+
+async def _router(stub: DiscordStub, args, rl_log) -> dict:
+    from src.components import ComponentRouter, Job
+    from src.httpsettings import build_http_settings
+
+    settings = build_http_settings()
+    settings.ssl = False
+    bot = hikari.GatewayBot(
+        "x.y.z", rest_url=stub.rest_url, http_settings=settings, banner=None, intents=hikari.Intents.NONE
+    )
+    router = ComponentRouter()
+    finished = 0
+    done = asyncio.Event()
+
+    @router.route("btn_start")
+    async def _heavy(job: Job) -> str:
+        nonlocal finished
+        await job.say("working…")
+        await asyncio.to_thread(time.sleep, args.job_ms / 1000)  # the psutil scan
+        await asyncio.sleep(args.job_ms / 1000)                   # terminate waits
+        finished += 1
+        if finished >= args.interactions:
+            done.set()
+        return "done"
+
+    bot.subscribe(hikari.InteractionCreateEvent, router.dispatch)
+    await bot.start()
+    try:
+        t0 = time.perf_counter()
+        for _ in range(args.interactions):
+            stub.dispatch_component_interaction("btn_start", [], 1)
+            await asyncio.sleep(args.interaction_gap)
+        await asyncio.wait_for(done.wait(), timeout=60)
+        wall = time.perf_counter() - t0
+    finally:
+        await bot.close()
+    from src.metrics import INTERACTION_ACK
+
+    acks = [INTERACTION_ACK.quantile(q, route="btn_start", result="ok") for q in (0.5, 0.99)]
+    print(f"[bench] router acks (client side) p50={acks[0] * 1000:.1f}ms p99={acks[1] * 1000:.1f}ms", file=sys.stderr)
+    return _row("router", args.interactions, wall, 1.0 / args.interaction_gap, [], stub, rl_log)
+
+
+SCENARIOS = {
+    "burst": _burst, "status": _status, "alerts": _alerts, "interactions": _interactions, "router": _router,
+}
+COLUMNS = (
+    "scenario", "ops", "wall_s", "ops_per_s", "allowed_per_s",
+    "latency_p50_ms", "latency_p99_ms", "stub_429", "hikari_429_logged", "ack_p50_ms", "ack_p99_ms",
+)
+
+
+async def _run(args) -> list[dict]:
+    rows = []
+    for name in (s.strip() for s in args.scenarios.split(",") if s.strip()):
+        stub = DiscordStub(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+        runner = await stub.start()
+        rl_log = _HikariRateLimitLog()
+        logging.getLogger("hikari.rest").addHandler(rl_log)
+        try:
+            print(f"[bench] {name} ...", file=sys.stderr, flush=True)
+            rows.append(await SCENARIOS[name](stub, args, rl_log))
+        finally:
+            logging.getLogger("hikari.rest").removeHandler(rl_log)
+            await runner.cleanup()
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default="burst,status,alerts,interactions,router")
+    parser.add_argument("--edits", type=int, default=100, help="burst: total edits")
+    parser.add_argument("--channels", type=int, default=4, help="burst: channels to spread edits over")
+    parser.add_argument("--status-edits", type=int, default=15)
+    parser.add_argument("--alerts", type=int, default=15)
+    parser.add_argument("--interactions", type=int, default=50)
+    parser.add_argument("--interaction-gap", type=float, default=0.02, help="seconds between dispatched interactions")
+    parser.add_argument("--job-ms", type=float, default=500.0, help="router: blocking scan + wait per job (ms each)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="stub: added per-request latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    real_stdout = sys.stdout
+    # botlogs echoes every embed edit to the console; keep the table readable
+    sys.stdout = open(os.devnull, "w")
+    try:
+        rows = asyncio.run(_run(args))
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+
+    print("  ".join(f"{c:>17}" for c in COLUMNS))
+    for row in rows:
+        print("  ".join(f"{'—' if row.get(c) is None else row[c]!s:>17}" for c in COLUMNS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# benchmarks/export_bench.py
+"""
+/exportlogs bundles from a large capture: --mb of fake stdout (and a little
+stderr) for one bot, segments gzipped as in production, then a bundle of the
+whole range two ways:
+
+  - lines   read the range into memory line by line (iter_range), then zip it
+            (what building the export from log_range-style reads costs)
+  - stream  logexport.write_bundle: planned newest-first, copied in blocks
+
+Both are capped at --cap MB. Peak RSS above the starting point is sampled
+from a thread while each runs.
+
+Run from the "Discord bot/Discord bot" folder:
+    python -m benchmarks.export_bench --mb 500 --cap 8
+"""
+import argparse
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+
+import psutil
+
+from src import logstore
+from src.logexport import write_bundle
+from src.logstore import LogCapture
+
+
+class PeakRss:
+    def __init__(self):
+        self.proc = psutil.Process()
+        self.base = self.proc.memory_info().rss
+        self.peak = self.base
+        self._stop = threading.Event()
+        self._t = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.proc.memory_info().rss)
+            time.sleep(0.005)
+
+    def __enter__(self):
+        self._t.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._t.join()
+
+
+def _in_memory(capture: LogCapture, path: str, start: float, end: float, cap: int) -> int:
+    lines = {s: [line for _, line in capture.iter_range("bot", s, start, end)] for s in ("err", "out")}
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED, compresslevel=6) as zf:
+        for stream, rows in lines.items():
+            zf.writestr(f"bot/{stream}.log", b"\n".join(rows))
+    data = buf.getvalue()[:cap]
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=500.0, help="stdout to capture (uncompressed MB)")
+    parser.add_argument("--cap", type=float, default=8.0, help="bundle cap (MB)")
+    parser.add_argument("--segment-mb", type=float, default=8.0)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="v4export-")
+    real_time = logstore.time.time
+    try:
+        capture = LogCapture(root, segment_bytes=int(args.segment_mb * 1024 * 1024))
+        rate = 2000  # lines/s of fake time, so the range spans hours
+        total = int(args.mb * 1024 * 1024)
+        start = real_time() - total / 90 / rate - 60
+        clock = [start]
+        logstore.time.time = lambda: clock[0]
+        t0 = time.perf_counter()
+        written, n = 0, 0
+        while written < total:
+            clock[0] = start + n / rate
+            data = "".join(
+                f"[{j}] Instant payout amount : {j % 997}.00 (3/10) trade {j * 7919 % 100003} ok, waiting\n"
+                for j in range(n, n + 400)
+            ).encode()
+            capture.append("bot", "out", data)
+            if n % 40000 == 0:
+                capture.append("bot", "err", f"Error: timeout after {n % 89} ms talking to 10.0.0.{n % 7}\n".encode())
+            written += len(data)
+            n += 400
+        logstore.time.time = real_time
+        capture.shutdown(timeout=600)
+        for s in ("out", "err"):
+            for seg in capture.segments("bot", s):
+                idx = logstore.read_index(seg)
+                if idx:
+                    os.utime(seg.path, (idx[-1][0], idx[-1][0]))
+        print(f"captured {written / 1e6:.0f} MB ({n} lines) in {time.perf_counter() - t0:.1f} s")
+
+        end = real_time()
+        cap = int(args.cap * 1024 * 1024)
+        print(f"{'run':>6}  {'seconds':>8}  {'zip MB':>7}  {'peak RSS +MB':>12}  note")
+        out = os.path.join(root, "lines.zip")
+        with PeakRss() as m:
+            t0 = time.perf_counter()
+            size = _in_memory(capture, out, start, end, cap)
+            took = time.perf_counter() - t0
+        print(f"{'lines':>6}  {took:8.1f}  {size / 1e6:7.1f}  {(m.peak - m.base) / 1e6:12.0f}  whole range in memory, cut at the cap")
+
+        out = os.path.join(root, "stream.zip")
+        with PeakRss() as m:
+            b = write_bundle(out, "bot", start, end, capture=capture, live_files={}, state={}, events=[], max_bytes=cap)
+        note = ", ".join(
+            f"{p.stream} {p.raw_bytes / 1e6:.0f} MB"
+            + (" (oldest left out)" if p.trimmed else "")
+            + (" (newest cut at the cap)" if p.cut else "")
+            for p in b.parts
+        )
+        print(f"{'stream':>6}  {b.seconds:8.1f}  {b.size / 1e6:7.1f}  {(m.peak - m.base) / 1e6:12.0f}  {note}")
+        with zipfile.ZipFile(out) as zf:
+            assert zf.testzip() is None
+    finally:
+        logstore.time.time = real_time
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
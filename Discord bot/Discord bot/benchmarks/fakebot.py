@@ -0,0 +1,88 @@
+# benchmarks/fakebot.py
+"""
+Stand-in for v4-bot.exe. fleet_bench copies this file into each fake bot
+folder as an executable named "v4-bot" and writes a fakebot.json next to it:
+
+    {"name": "fake001", "rate": 5.0, "depo_every": 20, "payout_every": 50,
+     "max_coins": 2000, "ready_delay": 0.5, "error_every": 0, "leak_kb_per_line": 0}
+
+It prints log lines to stdout (redirected to LOG_DIR/<name>.log by the
+controller) at `rate` lines/sec: mostly noise, with a depositable-items line
+every `depo_every` lines and an instant-payout line every `payout_every`.
+`leak_kb_per_line` keeps that much memory per line written, for RSS growth.
+Only the standard library is used so each fake bot stays small.
+"""
+import json
+import os
+import random
+import sys
+import time
+
+NOISE = (
+    "Checking trade offers...",
+    "Inventory refreshed ({n} items)",
+    "Heartbeat ok (latency {n}ms)",
+    "Polling market prices for {n} listings",
+    "No pending offers",
+    "Session keepalive sent",
+)
+
+
+def main() -> None:
+    cfg_path = os.path.join(os.getcwd(), "fakebot.json")
+    with open(cfg_path, "r", encoding="utf-8") as f:
+        cfg = json.load(f)
+
+    name = cfg.get("name", "fake")
+    rate = max(0.01, float(cfg.get("rate", 5.0)))
+    depo_every = int(cfg.get("depo_every", 20))
+    payout_every = int(cfg.get("payout_every", 50))
+    error_every = int(cfg.get("error_every", 0))
+    max_coins = float(cfg.get("max_coins", 2000))
+    ready_delay = float(cfg.get("ready_delay", 0.5))
+    leak = int(float(cfg.get("leak_kb_per_line", 0)) * 1024)
+    leaked: list[bytes] = []
+
+    out = sys.stdout
+    out.write(f"Starting v4-bot ({name})\n")
+    out.write("Loading session...\n")
+    out.flush()
+    time.sleep(ready_delay)
+    out.write(f"Logged in as {name}\n")
+    out.flush()
+
+    interval = 1.0 / rate
+    depo = random.randint(0, 20)
+    coins = round(random.uniform(0, max_coins / 4), 2)
+    i = 0
+    next_ts = time.monotonic()
+    while True:
+        i += 1
+        stamp = time.strftime("%H:%M:%S")
+        if depo_every and i % depo_every == 0:
+            depo = max(0, depo + random.choice((-2, -1, 1, 1, 2, 3)))
+            line = f"[{stamp}] Found {depo} depositable items"
+        elif payout_every and i % payout_every == 0:
+            coins = min(max_coins, round(coins + random.uniform(0.5, 15.0), 2))
+            line = f"[{stamp}] Instant payout amount : {coins:.2f} ({coins:.2f}/{max_coins:.0f})"
+        else:
+            line = f"[{stamp}] " + random.choice(NOISE).format(n=random.randint(1, 999))
+        out.write(line + "\n")
+        out.flush()
+        if leak:
+            leaked.append(os.urandom(leak))  # random bytes so the pages are really touched
+
+        if error_every and i % error_every == 0:
+            sys.stderr.write(f"Error: request {random.randint(1000, 9999)} timed out after 30s\n")
+            sys.stderr.flush()
+
+        next_ts += interval
+        delay = next_ts - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        else:
+            next_ts = time.monotonic()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+# benchmarks/fleet_bench.py
+"""
+End-to-end benchmark against a synthetic fleet (Linux/macOS only).
+
+For each fleet size this spawns N fake bots (benchmarks/fakebot.py), points
+BOT_EXECUTABLES / LOG_DIR at them and drives the real controller code:
+start_all_bots, the tailers, and /restartall. Discord is replaced by a
+recording stub. Each size runs in its own subprocess so module state starts
+clean.
+
+Reported per size:
+  - time_to_fleet_ready_s    start_all_bots -> every bot ready (its log
+                             matched the readiness pattern)
+  - bot_ready_p50_s / p95    per-launch time to ready
+  - lines_per_sec            log lines ingested by the tailers (vs. written)
+  - embed_latency_*          parsed state change -> embed edit (excludes the
+                             tailer's 0.2s file poll)
+  - controller_cpu_pct / controller_rss_mb
+  - restartall_s / restartall_ready_s
+  - crash_recovery_s / mttr_s  SIGKILL --crash-fraction of the bots with the
+                             supervisor on ("always", --restart-backoff base):
+                             kill -> all ready again, and the mean recovery
+  - hang_detect_s            SIGSTOP a couple of bots (alive but frozen) ->
+                             the watchdog flags all of them as hung
+
+Run from the "Discord bot/Discord bot" folder:
+    python -m benchmarks.fleet_bench --sizes 10,100,500 --duration 30
+    python -m benchmarks.fleet_bench --sizes 10 --baseline benchmarks/results/<old>.json
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(HERE, "results")
+
+
+# -----------------------------
+# Fleet setup
+# -----------------------------
+def _make_fleet(root: str, size: int, args: argparse.Namespace) -> dict[str, str]:
+    with open(os.path.join(HERE, "fakebot.py"), "r", encoding="utf-8") as f:
+        body = f.read()
+    script = f"#!{sys.executable}\n{body}"
+
+    bots: dict[str, str] = {}
+    for i in range(size):
+        name = f"fake{i:03d}"
+        folder = os.path.join(root, "bots", name)
+        os.makedirs(folder, exist_ok=True)
+        exe = os.path.join(folder, "v4-bot")
+        with open(exe, "w", encoding="utf-8") as f:
+            f.write(script)
+        os.chmod(exe, 0o755)
+        with open(os.path.join(folder, "fakebot.json"), "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "name": name,
+                    "rate": args.rate,
+                    "depo_every": args.depo_every,
+                    "payout_every": args.payout_every,
+                    "ready_delay": args.ready_delay,
+                },
+                f,
+            )
+        bots[name] = exe
+    return bots
+
+
+class _FakeRest:
+    """Records Discord calls instead of making them."""
+
+    def __init__(self):
+        self.created = 0
+        self.edits: list[float] = []
+        self._next_id = 1000
+
+    async def create_message(self, *_, **__):
+        self.created += 1
+        self._next_id += 1
+        return SimpleNamespace(id=self._next_id)
+
+    async def edit_message(self, *_, **__):
+        self.edits.append(time.time())
+
+
+async def _wait_all_ready(botlogs, names, timeout: float) -> float | None:
+    t0 = time.monotonic()
+    while time.monotonic() - t0 < timeout:
+        if all(botlogs._display_state(n) == "ready" for n in names):
+            return time.monotonic() - t0
+        await asyncio.sleep(0.05)
+    return None
+
+
+def _kill_fleet(root: str) -> None:
+    import psutil
+
+    for p in psutil.process_iter(["pid", "cwd"]):
+        try:
+            if (p.info.get("cwd") or "").startswith(root):
+                p.kill()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+
+
+# -----------------------------
+# One fleet size (child process)
+# -----------------------------
+async def _run_size(size: int, args: argparse.Namespace) -> dict:
+    import psutil
+
+    root = tempfile.mkdtemp(prefix=f"v4fleet{size}-")
+    bots = _make_fleet(root, size, args)
+
+    import src.config as config
+
+    config.LOG_DIR = os.path.join(root, "logs")
+    config.STATE_DB = os.path.join(root, "state.db")  # not src/state.db
+    config.BOT_EXECUTABLES.clear()
+    config.BOT_EXECUTABLES.update(bots)
+
+    from src import offload
+    from src.extensions.Background_Processes import botlogs
+    from src.extensions.Commands_Owner import restartbots
+    from src.metrics import TAIL_LINES, EMBED_EVENT_LATENCY, TIME_TO_READY, RECOVERY_TIME
+
+    botlogs.STATUS_STATE_FILE = os.path.join(root, "monitor_status.json")
+    botlogs.COIN_STATE_FILE = os.path.join(root, "coin_state.json")
+    botlogs.LAUNCH_STAGGER_SECONDS = args.stagger
+    botlogs.LAUNCH_CONCURRENCY = args.launch_concurrency
+    botlogs.LAUNCH_JITTER_SECONDS = 0.0
+    botlogs.FLEET_FILE = None  # the generated fleet, not src/fleet.json
+    botlogs.SUPERVISOR_STATE_FILE = os.path.join(root, "supervisor_state.json")
+    botlogs.init_state()
+    botlogs.SUPERVISOR.default_policy = "always"
+    botlogs.SUPERVISOR.backoff_base = args.restart_backoff
+    botlogs.WATCHDOG.warmup = args.watchdog_warmup
+
+    rest = _FakeRest()
+    fake_bot = SimpleNamespace(rest=rest)
+    me = psutil.Process()
+    names = list(bots)
+    result: dict = {"bots": size, "rate_per_bot": args.rate}
+
+    try:
+        # --- fleet bring-up ---
+        t0 = time.monotonic()
+        await botlogs.start_all_bots(fake_bot)
+        ready = await _wait_all_ready(botlogs, names, args.ready_timeout)
+        result["time_to_fleet_ready_s"] = None if ready is None else round(time.monotonic() - t0, 3)
+        for q in (0.5, 0.95):
+            v = TIME_TO_READY.quantile(q)
+            result[f"bot_ready_p{int(q * 100)}_s"] = None if v is None else round(v, 3)
+
+        # let the tailers attach and settle before measuring
+        await asyncio.sleep(2.0)
+
+        # --- steady state ---
+        lines0 = TAIL_LINES.total()
+        cpu0 = sum(me.cpu_times()[:2])
+        w0 = time.monotonic()
+        peak_rss = 0
+        while time.monotonic() - w0 < args.duration:
+            await asyncio.sleep(1.0)
+            peak_rss = max(peak_rss, me.memory_info().rss)
+        wall = time.monotonic() - w0
+        lines = TAIL_LINES.total() - lines0
+        cpu = sum(me.cpu_times()[:2]) - cpu0
+
+        result["lines_per_sec"] = round(lines / wall, 1)
+        result["lines_per_sec_written"] = round(size * args.rate, 1)
+        result["controller_cpu_pct"] = round(100.0 * cpu / wall, 1)
+        result["controller_rss_mb"] = round(peak_rss / (1024 * 1024), 1)
+        result["embed_edits"] = len(rest.edits)
+        for q in (0.5, 0.95, 0.99):
+            v = EMBED_EVENT_LATENCY.quantile(q)
+            result[f"embed_latency_p{int(q * 100)}_s"] = None if v is None else round(v, 3)
+
+        # --- /restartall ---
+        responses: list[str] = []
+
+        async def _respond(content, **__):
+            responses.append(content)
+
+        ctx = SimpleNamespace(
+            app=fake_bot,
+            options=SimpleNamespace(wipe=False, stagger=args.stagger),
+            respond=_respond,
+        )
+        t0 = time.monotonic()
+        await restartbots.restartall.callback(ctx)
+        result["restartall_s"] = round(time.monotonic() - t0, 3)
+        ready = await _wait_all_ready(botlogs, names, args.ready_timeout)
+        result["restartall_ready_s"] = None if ready is None else round(time.monotonic() - t0, 3)
+
+        # --- crashes: the supervisor brings the killed bots back ---
+        victims = names[: max(1, int(size * args.crash_fraction))] if args.crash_fraction > 0 else []
+        if victims:
+            await asyncio.sleep(1.0)
+            t0 = time.monotonic()
+            for name in victims:
+                pid = await offload.find_pid(bots[name], caller="bench")
+                if pid:
+                    psutil.Process(pid).kill()
+            # give the PID watchers (2s poll) a chance to notice before waiting on ready
+            while any(botlogs._display_state(n) == "ready" for n in victims):
+                if time.monotonic() - t0 > args.ready_timeout:
+                    break
+                await asyncio.sleep(0.05)
+            ready = await _wait_all_ready(botlogs, names, args.ready_timeout)
+            result["crash_recovery_s"] = None if ready is None else round(time.monotonic() - t0, 3)
+            mttr = RECOVERY_TIME.mean()
+            result["mttr_s"] = None if mttr is None else round(mttr, 3)
+
+        # --- hangs: freeze processes without killing them ---
+        if args.hang_count > 0:
+            await asyncio.sleep(args.watchdog_warmup + 5.0)  # baselines learned again after the relaunches
+            frozen = []
+            for name in names[-args.hang_count:]:
+                pid = await offload.find_pid(bots[name], caller="bench")
+                if pid:
+                    os.kill(pid, signal.SIGSTOP)
+                    frozen.append(pid)
+            t0 = time.monotonic()
+            hung = None
+            while time.monotonic() - t0 < args.ready_timeout:
+                if all(botlogs._display_state(n) == "hung" for n in names[-args.hang_count:]):
+                    hung = time.monotonic() - t0
+                    break
+                await asyncio.sleep(0.1)
+            result["hang_detect_s"] = None if hung is None else round(hung, 3)
+            for pid in frozen:
+                os.kill(pid, signal.SIGCONT)
+    finally:
+        for name in names:
+            botlogs._stop_tailer(name)
+        _kill_fleet(root)
+        await asyncio.sleep(0.2)
+        shutil.rmtree(root, ignore_errors=True)
+
+    return result
+
+
+def _child(size: int, args: argparse.Namespace) -> None:
+    real_stdout = sys.stdout
+    # The controller echoes every bot line to the console; keep that cost, drop the output
+    sys.stdout = open(os.devnull, "w")
+    try:
+        result = asyncio.run(_run_size(size, args))
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+    print(json.dumps(result))
+
+
+# -----------------------------
+# Orchestrator
+# -----------------------------
+COLUMNS = (
+    "bots",
+    "time_to_fleet_ready_s",
+    "bot_ready_p50_s",
+    "lines_per_sec",
+    "lines_per_sec_written",
+    "embed_latency_p50_s",
+    "embed_latency_p95_s",
+    "controller_cpu_pct",
+    "controller_rss_mb",
+    "restartall_s",
+    "restartall_ready_s",
+    "crash_recovery_s",
+    "mttr_s",
+    "hang_detect_s",
+)
+
+
+def _print_table(rows: list[dict], baseline: dict[int, dict]) -> None:
+    print("  ".join(f"{c:>22}" for c in COLUMNS))
+    for row in rows:
+        cells = []
+        base = baseline.get(row.get("bots"), {})
+        for c in COLUMNS:
+            v = row.get(c)
+            cell = "—" if v is None else str(v)
+            b = base.get(c)
+            if c != "bots" and isinstance(v, (int, float)) and isinstance(b, (int, float)) and b:
+                cell += f" ({(v - b) / b * 100:+.0f}%)"
+            cells.append(f"{cell:>22}")
+        print("  ".join(cells))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,100,500", help="comma-separated fleet sizes")
+    parser.add_argument("--rate", type=float, default=5.0, help="lines/sec written per fake bot")
+    parser.add_argument("--depo-every", type=int, default=20)
+    parser.add_argument("--payout-every", type=int, default=50)
+    parser.add_argument("--ready-delay", type=float, default=0.5, help="fake bot login delay (s)")
+    parser.add_argument("--stagger", type=float, default=0.05, help="launch stagger (s)")
+    parser.add_argument("--launch-concurrency", type=int, default=0, help="LAUNCH_CONCURRENCY (0 = no limit)")
+    parser.add_argument("--duration", type=float, default=30.0, help="steady-state window (s)")
+    parser.add_argument("--ready-timeout", type=float, default=120.0)
+    parser.add_argument("--crash-fraction", type=float, default=0.2, help="share of bots killed in the crash phase (0 = skip)")
+    parser.add_argument("--restart-backoff", type=float, default=1.0, help="RESTART_BACKOFF_BASE_SECONDS for the crash phase")
+    parser.add_argument("--hang-count", type=int, default=2, help="bots frozen in the hang phase (0 = skip)")
+    parser.add_argument("--watchdog-warmup", type=float, default=10.0, help="WATCHDOG_WARMUP_SECONDS for the run")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--out", help="results file (default: benchmarks/results/fleet-<ts>.json)")
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)  # child mode
+    args = parser.parse_args()
+
+    if os.name == "nt":
+        sys.exit("fleet_bench needs a POSIX host (fake bots are shebang scripts)")
+
+    if args.size is not None:
+        _child(args.size, args)
+        return
+
+    child_args = [
+        "--rate", str(args.rate),
+        "--depo-every", str(args.depo_every),
+        "--payout-every", str(args.payout_every),
+        "--ready-delay", str(args.ready_delay),
+        "--stagger", str(args.stagger),
+        "--launch-concurrency", str(args.launch_concurrency),
+        "--duration", str(args.duration),
+        "--ready-timeout", str(args.ready_timeout),
+        "--crash-fraction", str(args.crash_fraction),
+        "--restart-backoff", str(args.restart_backoff),
+        "--hang-count", str(args.hang_count),
+        "--watchdog-warmup", str(args.watchdog_warmup),
+    ]
+    rows: list[dict] = []
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        print(f"[bench] fleet of {size} ...", flush=True)
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.fleet_bench", *child_args, "--size", str(size)],
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            print(proc.stderr[-2000:], file=sys.stderr)
+            rows.append({"bots": size, "error": proc.returncode})
+            continue
+        rows.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    baseline: dict[int, dict] = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = {r["bots"]: r for r in json.load(f).get("results", [])}
+
+    _print_table(rows, baseline)
+
+    out = args.out or os.path.join(
+        RESULTS_DIR, f"fleet-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "when": datetime.datetime.now().isoformat(timespec="seconds"),
+                "host": platform.node(),
+                "python": platform.python_version(),
+                "cpus": os.cpu_count(),
+                "params": {k: v for k, v in vars(args).items() if k not in ("size", "baseline", "out")},
+                "results": rows,
+            },
+            f,
+            indent=2,
+        )
+    print(f"[bench] results -> {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/logrange_bench.py
+"""
+Time-range reads from captured bot output: --hours of fake output at --rate
+lines/sec for one bot (segments gzipped as in production), then a
+--window-minute range in the middle, --queries times:
+
+  - scan    iter_lines from the oldest segment, keeping lines by position
+            (what a range read costs without an index)
+  - index   LogCapture.iter_range (skip segments by mtime, seek by index entry)
+
+Capture itself runs with the clock faked, so writing the hours takes seconds.
+
+Run from the "Discord bot/Discord bot" folder:
+    python -m benchmarks.logrange_bench --hours 24 --rate 20
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from src import logstore
+from src.logstore import LogCapture
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--rate", type=float, default=20.0, help="lines/sec")
+    parser.add_argument("--window", type=float, default=10.0, help="range length (minutes)")
+    parser.add_argument("--segment-mb", type=float, default=8.0)
+    parser.add_argument("--queries", type=int, default=5)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="v4logs-")
+    real_time = logstore.time.time
+    try:
+        capture = LogCapture(root, segment_bytes=int(args.segment_mb * 1024 * 1024))
+        start = real_time() - args.hours * 3600
+        lines = int(args.hours * 3600 * args.rate)
+        batch = max(1, int(args.rate * 0.2))  # one tailer read every 0.2 s
+        clock = [start]
+        logstore.time.time = lambda: clock[0]
+        t0 = time.perf_counter()
+        for i in range(0, lines, batch):
+            clock[0] = start + i / args.rate
+            data = "".join(
+                f"[{j}] Instant payout amount : {j % 997}.00 (3/10) trade ok, waiting for next offer\n"
+                for j in range(i, min(lines, i + batch))
+            )
+            capture.append("bot", "out", data.encode())
+        logstore.time.time = real_time
+        capture.shutdown(timeout=600)
+        written = time.perf_counter() - t0
+
+        # Give the segments the last write time they would have had
+        segs = capture.segments("bot", "out")
+        for seg in segs:
+            last = logstore.read_index(seg)[-1][0]
+            os.utime(seg.path, (last, last))
+        segs = capture.segments("bot", "out")
+        size = sum(s.size for s in segs)
+        mid = start + args.hours * 1800
+        lo, hi = mid, mid + args.window * 60
+        first, last = int((lo - start) * args.rate), int((hi - start) * args.rate)
+
+        t0 = time.perf_counter()
+        for _ in range(args.queries):
+            got = sum(1 for n, _ in enumerate(capture.iter_lines("bot", "out")) if first <= n < last)
+        scan = (time.perf_counter() - t0) / args.queries
+
+        t0 = time.perf_counter()
+        for _ in range(args.queries):
+            hits = sum(1 for _ in capture.iter_range("bot", "out", lo, hi))
+        indexed = (time.perf_counter() - t0) / args.queries
+
+        print(
+            f"{lines} lines in {len(segs)} segments ({size / 1e6:.1f} MB gzipped), written in {written:.1f} s; "
+            f"{args.window:g} min window = {got} lines"
+        )
+        print(f"{'run':>6}  {'ms/query':>9}  {'lines read':>10}")
+        print(f"{'scan':>6}  {scan * 1000:9.1f}  {lines:>10}")
+        print(f"{'index':>6}  {indexed * 1000:9.1f}  {hits:>10}")
+        print(f"speedup {scan / max(indexed, 1e-9):.0f}x")
+    finally:
+        logstore.time.time = real_time
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# benchmarks/parse_bench.py
+"""
+Inline vs. process-pool log parsing under a log storm.
+
+For each fleet size and parse mode this starts the real tailers
+(botlogs._tail_log_and_parse) on N empty log files, then appends
+--lines-per-bot lines to every file at once and measures:
+
+  - lines_per_sec    lines ingested by the tailers until all caught up
+  - loop_lag_p99_ms  / loop_lag_max_ms: how late a 10ms ticker on the event
+                     loop ran meanwhile; this is what interaction handling
+                     would have waited
+  - cpu_pct          controller process CPU (workers are not included)
+
+Modes: "inline" (PARSE_WORKERS = 0) and one pooled run per --workers value.
+Each (size, mode) runs in its own subprocess so module state starts clean.
+
+Run from the "Discord bot/Discord bot" folder:
+    python -m benchmarks.parse_bench --sizes 10,100,500 --workers 2,4
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+NOISE = (
+    "Checking inventory...",
+    "Heartbeat ok",
+    "Refreshing market listings (page 3/12)",
+    "Trade offer #4512234 accepted by partner",
+    "Waiting for confirmations",
+)
+
+
+def _make_log_blob(n_lines: int, seed: int) -> bytes:
+    rnd = random.Random(seed)
+    out = []
+    for i in range(n_lines):
+        stamp = f"[{i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}]"
+        if i % 40 == 0:
+            out.append(f"{stamp} Found {rnd.randint(0, 300)} depositable items")
+        elif i % 97 == 0:
+            coins = rnd.uniform(0, 2000)
+            out.append(f"{stamp} Instant payout amount : {coins:.2f} ({coins:.2f}/2000)")
+        else:
+            out.append(f"{stamp} {rnd.choice(NOISE)} ({rnd.random():.6f})")
+    return ("\n".join(out) + "\n").encode("utf-8")
+
+
+async def _run_one(size: int, workers: int, args: argparse.Namespace) -> dict:
+    import psutil
+
+    root = tempfile.mkdtemp(prefix=f"v4parse{size}-")
+    names = [f"bot{i:03d}" for i in range(size)]
+
+    import src.config as config
+
+    config.LOG_DIR = root
+    config.STATE_DB = os.path.join(root, "state.db")  # not src/state.db
+    config.BOT_EXECUTABLES.clear()
+    config.BOT_EXECUTABLES.update({n: os.path.join(root, n, "v4-bot") for n in names})
+
+    from src.extensions.Background_Processes import botlogs
+    from src.metrics import TAIL_LINES
+
+    botlogs.PARSE_WORKERS = workers
+    botlogs.ECHO_BOT_LINES = args.echo
+    botlogs.COIN_STATE_FILE = os.path.join(root, "coin_state.json")
+    botlogs.HEADLESS = True  # no embed edits; parsing only
+
+    paths = {n: os.path.join(root, f"{n}.log") for n in names}
+    for p in paths.values():
+        open(p, "wb").close()
+    fake_bot = SimpleNamespace(rest=None)
+    for n in names:
+        botlogs._start_tailer(fake_bot, n, paths[n], "out")
+
+    if workers:
+        # Start the worker processes before the clock does
+        await asyncio.gather(*(botlogs._parse(n, b"warmup\n") for n in names[:workers * 4]))
+    await asyncio.sleep(1.0)
+
+    blob = _make_log_blob(args.lines_per_bot, seed=1)
+    base = TAIL_LINES.total()
+    expected = base + size * args.lines_per_bot
+
+    lags: list[float] = []
+    stop = False
+
+    async def _ticker():
+        loop = asyncio.get_running_loop()
+        while not stop:
+            t = loop.time()
+            await asyncio.sleep(0.01)
+            lags.append(max(0.0, loop.time() - t - 0.01))
+
+    me = psutil.Process()
+    ticker = asyncio.create_task(_ticker())
+    cpu0 = sum(me.cpu_times()[:2])
+    t0 = time.perf_counter()
+    for p in paths.values():
+        with open(p, "ab") as f:
+            f.write(blob)
+    timed_out = False
+    while TAIL_LINES.total() < expected:
+        if time.perf_counter() - t0 > args.timeout:
+            timed_out = True
+            break
+        await asyncio.sleep(0.02)
+    wall = time.perf_counter() - t0
+    cpu = sum(me.cpu_times()[:2]) - cpu0
+    stop = True
+    await ticker
+
+    for n in names:
+        botlogs._stop_tailer(n)
+    await asyncio.sleep(0.1)
+    botlogs.shutdown_pools()
+    shutil.rmtree(root, ignore_errors=True)
+
+    lags.sort()
+    return {
+        "bots": size,
+        "mode": f"pool x{workers}" if workers else "inline",
+        "lines": size * args.lines_per_bot,
+        "lines_per_sec": round((TAIL_LINES.total() - base) / wall),
+        "catch_up_s": None if timed_out else round(wall, 2),
+        "loop_lag_p99_ms": round(lags[int(0.99 * (len(lags) - 1))] * 1000, 1) if lags else None,
+        "loop_lag_max_ms": round(lags[-1] * 1000, 1) if lags else None,
+        "cpu_pct": round(100.0 * cpu / wall, 1),
+    }
+
+
+def _child(size: int, workers: int, args: argparse.Namespace) -> None:
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        result = asyncio.run(_run_one(size, workers, args))
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+    print(json.dumps(result))
+
+
+COLUMNS = ("bots", "mode", "lines", "lines_per_sec", "catch_up_s", "loop_lag_p99_ms", "loop_lag_max_ms", "cpu_pct")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,100,500")
+    parser.add_argument("--workers", default=str(max(2, min(8, (os.cpu_count() or 2) // 2))),
+                        help="comma-separated PARSE_WORKERS values to compare with inline")
+    parser.add_argument("--lines-per-bot", type=int, default=5000)
+    parser.add_argument("--echo", action="store_true", help="keep ECHO_BOT_LINES on (to /dev/null)")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)  # child mode
+    parser.add_argument("--pool", type=int, help=argparse.SUPPRESS)  # child mode
+    args = parser.parse_args()
+
+    if args.size is not None:
+        _child(args.size, args.pool or 0, args)
+        return
+
+    child_args = ["--lines-per-bot", str(args.lines_per_bot), "--timeout", str(args.timeout)]
+    if args.echo:
+        child_args.append("--echo")
+
+    modes = [0] + [int(w) for w in args.workers.split(",") if w.strip()]
+    print("  ".join(f"{c:>16}" for c in COLUMNS), flush=True)
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        for workers in modes:
+            proc = subprocess.run(
+                [sys.executable, "-m", "benchmarks.parse_bench", *child_args,
+                 "--size", str(size), "--pool", str(workers)],
+                capture_output=True,
+                text=True,
+            )
+            if proc.returncode != 0:
+                print(proc.stderr[-2000:], file=sys.stderr)
+                continue
+            row = json.loads(proc.stdout.strip().splitlines()[-1])
+            print("  ".join(f"{'—' if row.get(c) is None else row[c]!s:>16}" for c in COLUMNS), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/payout_bench.py
+"""
+Payout-rate recompute for --bots bots with --samples Instant amounts each
+(a few cash-outs mixed in), all inside the window:
+
+  - python  a per-bot loop over deques, the way it would be written without
+            src.payouts (same rules: increases only, span >= min_span)
+  - numpy   PayoutSeries.compute over the fleet-wide ring buffer
+
+Run from the "Discord bot/Discord bot" folder:
+    python -m benchmarks.payout_bench --bots 500 --samples 512
+"""
+import argparse
+import random
+import time
+from collections import deque
+
+from src.payouts import PayoutSeries
+
+
+def _python_rates(series: dict[str, deque], since: float, min_span: float) -> dict[str, float | None]:
+    out = {}
+    for name, samples in series.items():
+        gained, first, last, prev = 0.0, None, None, None
+        for ts, value in samples:
+            if ts < since:
+                continue
+            if prev is not None and value > prev:
+                gained += value - prev
+            prev = value
+            first = ts if first is None else first
+            last = ts
+        span = (last - first) if first is not None else 0.0
+        out[name] = gained / span * 3600 if span >= min_span else None
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bots", type=int, default=500)
+    parser.add_argument("--samples", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rnd = random.Random(1)
+    now = time.time()
+    names = [f"bot{i:04d}" for i in range(args.bots)]
+    series = PayoutSeries(samples=args.samples)
+    plain: dict[str, deque] = {n: deque(maxlen=args.samples) for n in names}
+    for name in names:
+        value = 0.0
+        for k in range(args.samples):
+            ts = now - 5 * 3600 + k * (5 * 3600 / args.samples)
+            value = 0.0 if rnd.random() < 0.01 else value + rnd.random()
+            series.add(name, value, ts)
+            plain[name].append((ts, value))
+    maxes = {n: 1000.0 for n in names}
+    since = now - 6 * 3600
+
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        expected = _python_rates(plain, since, series.min_span)
+    py = (time.perf_counter() - t0) / args.repeat
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        stats = series.compute(names, maxes, window_hours=6, now=now)
+    vec = (time.perf_counter() - t0) / args.repeat
+
+    worst = max(abs(stats.rate[i] - expected[n]) for i, n in enumerate(names))
+    print(f"{args.bots} bots x {args.samples} samples; max difference {worst:.2e} coins/h")
+    print(f"{'run':>7}  {'ms':>8}")
+    print(f"{'python':>7}  {py * 1000:8.2f}")
+    print(f"{'numpy':>7}  {vec * 1000:8.2f}  ({py / vec:.1f}x)")
+
+    # A bot removed from the fleet and added back starts a fresh row
+    name = names[0]
+    for k in range(5):  # so the old head isn't at position 0
+        series.add(name, 1.0, now - 3600 + k)
+    series.forget(name)
+    for k in range(3):
+        series.add(name, 10.0 * k, now - 600 + k * 300)
+    rate = series.compute([name], maxes, window_hours=6, now=now).rate[0]
+    assert abs(rate - 120.0) < 1e-9, f"forget then re-add: {rate} coins/h, expected 120"
+    print(f"forget + 3 new samples: {rate:.0f} coins/h")
+
+
+if __name__ == "__main__":
+    main()
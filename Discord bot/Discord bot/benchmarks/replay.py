@@ -0,0 +1,335 @@
+# benchmarks/replay.py
+"""
+Offline log replay: recorded bot output fed through the tailer's own parsing
+and state updates (botlogs._ingest), without bots or Discord.
+
+Inputs (files or folders, mixed):
+  <bot>.log / <bot>.log.err        live logs as the bots write them into LOG_DIR
+  segments/<bot>/out-000001.log.gz  captured segments (see src/logstore.py);
+                                    their .idx files give the original reads
+                                    and timing
+  --synthetic N                     N generated lines for each of --bots bots
+
+Plain files are read in --chunk byte reads cut at a line, like the tailer
+(the default 4 KiB is closer to a live bot's reads than the tailer's 256 KiB
+maximum; a bigger chunk means fewer, coarser events); segments are replayed
+one captured read at a time. Every bot starts out "launching", so readiness
+detection is exercised as well.
+
+  --speed 0   as fast as possible (default): lines/sec of the pipeline
+  --speed X   X times the original pace (segment index times; plain files
+              are paced at --rate lines/sec)
+
+The controller runs in agent mode (botlogs.HEADLESS: no embed updates or
+alerts, so nothing calls Discord), with its state store and files in a temp
+folder. PARSE_WORKERS comes from --workers.
+
+Reported per bot: lines, extracted events (readiness, depositable, instant,
+max, new stderr fingerprints) and the final trade_counts / instant_coins /
+max_coins. With --golden the result is compared with a golden file (exit
+status 1 on any difference, with the first differing event); --update-golden
+writes it instead. Events depend on how the input is split into reads, so a
+golden file records --chunk and is only compared at that size.
+
+Run from the "Discord bot/Discord bot" folder:
+    python -m benchmarks.replay benchmarks/replay_data --golden benchmarks/replay_data/golden.json
+    python -m benchmarks.replay --synthetic 500000 --bots 4 --workers 2
+    python -m benchmarks.replay C:\\v4logs\\segments\\mybot --speed 60
+"""
+import argparse
+import asyncio
+import gzip
+import heapq
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+
+_SEGMENT_RX = re.compile(r"^(out|err)-(\d{6,})\.log(\.gz)?$")
+_LIVE_RX = re.compile(r"^(.+)\.log(\.err)?(\.gz)?$")
+GOLDEN_FIELDS = ("lines", "ready", "trade_counts", "instant_coins", "max_coins", "events")
+
+
+# -----------------------------
+# Inputs -> (time, order, bot, stream, bytes) reads
+# -----------------------------
+def _open(path: str):
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb")
+
+
+def _plain_reads(path: str, chunk: int, rate: float):
+    """Reads of up to `chunk` bytes ending at a newline; time = lines so far / rate."""
+    pending, lines = b"", 0
+    with _open(path) as f:
+        while True:
+            block = f.read(chunk)
+            if not block:
+                break
+            data = pending + block
+            cut = data.rfind(b"\n") + 1
+            data, pending = data[:cut], data[cut:]
+            if data:
+                yield (lines / rate if rate > 0 else 0.0), data
+                lines += data.count(b"\n")
+    if pending:
+        yield (lines / rate if rate > 0 else 0.0), pending
+
+
+def _segment_reads(paths: list[str], chunk: int, rate: float):
+    """A bot's captured segments in order, one read per index entry (absolute times)."""
+    from src.logstore import Segment, read_index
+
+    for path in paths:
+        m = _SEGMENT_RX.match(os.path.basename(path))
+        seg = Segment(path, "", m.group(1), int(m.group(2)), bool(m.group(3)), os.path.getsize(path), os.path.getmtime(path))
+        entries = read_index(seg)
+        if not entries:
+            yield from _plain_reads(path, chunk, rate)
+            continue
+        with _open(path) as f:
+            for (ts, off), nxt in zip(entries, entries[1:] + [(None, None)]):
+                f.seek(off)
+                data = f.read(nxt[1] - off) if nxt[1] is not None else f.read()
+                if data:
+                    yield ts, data
+
+
+def _collect(paths: list[str]) -> tuple[list[tuple[str, str, str]], dict[tuple[str, str], list[str]]]:
+    """(bot, stream, live file) and {(bot, stream): segment paths} under the given paths."""
+    live: list[tuple[str, str, str]] = []
+    segs: dict[tuple[str, str], list[str]] = {}
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            for dirpath, _, names in os.walk(p):
+                files.extend(os.path.join(dirpath, n) for n in sorted(names))
+        else:
+            files.append(p)
+    for path in files:
+        base = os.path.basename(path)
+        m = _SEGMENT_RX.match(base)
+        if m:
+            bot = os.path.basename(os.path.dirname(os.path.abspath(path)))
+            segs.setdefault((bot, m.group(1)), []).append(path)
+            continue
+        m = _LIVE_RX.match(base)
+        if m:
+            live.append((m.group(1), "err" if m.group(2) else "out", path))
+    for key in segs:
+        segs[key].sort(key=lambda p: int(_SEGMENT_RX.match(os.path.basename(p)).group(2)))
+    return live, segs
+
+
+def _reads(live, segs, chunk: int, rate: float):
+    """Every read of every input, merged by time (plain files count from 0, segments from their first entry)."""
+    sources = []
+    for bot, stream, path in live:
+        sources.append((bot, stream, _plain_reads(path, chunk, rate)))
+    seg_sources = [(bot, stream, _segment_reads(paths, chunk, rate)) for (bot, stream), paths in segs.items()]
+    # Segment times are wall clock; start them at 0 too
+    firsts = []
+    for bot, stream, gen in seg_sources:
+        first = next(gen, None)
+        if first is not None:
+            firsts.append((bot, stream, first, gen))
+    t0 = min((f[0] for _, _, f, _ in firsts), default=0.0)
+    for bot, stream, first, gen in firsts:
+        def shifted(first=first, gen=gen):
+            yield first[0] - t0, first[1]
+            for ts, data in gen:
+                yield ts - t0, data
+        sources.append((bot, stream, shifted()))
+
+    def tagged(i, bot, stream, gen):
+        for t, data in gen:
+            yield t, i, bot, stream, data
+
+    return heapq.merge(*(tagged(i, b, s, g) for i, (b, s, g) in enumerate(sources)))
+
+
+def _synthetic(root: str, lines: int, bots: int) -> list[str]:
+    from benchmarks.parse_bench import _make_log_blob
+
+    paths = []
+    for i in range(bots):
+        path = os.path.join(root, f"synth{i}.log")
+        with open(path, "wb") as f:
+            f.write(b"Logged in as synth\n" + _make_log_blob(lines, seed=i))
+        paths.append(path)
+    return paths
+
+
+# -----------------------------
+# Replay
+# -----------------------------
+async def _replay(args: argparse.Namespace, root: str, live, segs) -> dict:
+    bots = sorted({b for b, _, _ in live} | {b for b, _ in segs})
+
+    import src.config as config
+
+    config.LOG_DIR = os.path.join(root, "logs")
+    config.STATE_DB = os.path.join(root, "state.db")
+    config.ECHO_BOT_LINES = False
+    config.PARSE_WORKERS = args.workers
+    config.BOT_EXECUTABLES.clear()
+    config.BOT_EXECUTABLES.update({b: os.path.join(root, "bots", b, f"{b}.exe") for b in bots})
+
+    from src.errortrack import error_id, fingerprint
+    from src.extensions.Background_Processes import botlogs
+    from src.logparse import shutdown_pools
+
+    botlogs.HEADLESS = True  # agent mode: no embed or alert traffic
+    botlogs.COIN_STATE_FILE = os.path.join(root, "coin_state.json")
+    botlogs.SUPERVISOR_STATE_FILE = os.path.join(root, "supervisor_state.json")
+    botlogs.init_state()
+
+    events: dict[str, list] = {b: [] for b in bots}
+    journal = botlogs._journal
+
+    def record(name, kind, value=None, detail=""):
+        events[name].append([kind, error_id(fingerprint(detail)) if kind == "error" else value])
+        journal(name, kind, value, detail)
+
+    botlogs._journal = record
+    for b in bots:
+        botlogs.bot_state[b] = "launching"
+
+    lines: dict[str, int] = {b: 0 for b in bots}
+    n_bytes = reads = 0
+    t0 = time.perf_counter()
+    try:
+        for t, _, bot, stream, data in _reads(live, segs, args.chunk, args.rate):
+            if args.speed > 0:
+                delay = t0 + t / args.speed - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            was = botlogs.bot_state.get(bot)
+            res = await botlogs._ingest(None, bot, stream, data)
+            if was != "ready" and botlogs.bot_state.get(bot) == "ready":
+                events[bot].append(["ready", None])
+            lines[bot] += res.line_count
+            n_bytes += res.byte_count
+            reads += 1
+        seconds = time.perf_counter() - t0
+    finally:
+        botlogs._journal = journal
+        shutdown_pools()
+        if botlogs.STORE is not None:
+            botlogs.STORE.close()
+        if botlogs.LOGCAPTURE is not None:
+            botlogs.LOGCAPTURE.shutdown()
+
+    total = sum(lines.values())
+    return {
+        "chunk": args.chunk,
+        "workers": args.workers,
+        "reads": reads,
+        "lines": total,
+        "bytes": n_bytes,
+        "seconds": round(seconds, 3),
+        "lines_per_sec": round(total / seconds) if seconds > 0 else None,
+        "bots": {
+            b: {
+                "lines": lines[b],
+                "ready": botlogs.bot_state.get(b) == "ready",
+                "trade_counts": botlogs.trade_counts.get(b),
+                "instant_coins": botlogs.instant_coins.get(b),
+                "max_coins": botlogs.max_coins.get(b),
+                "events": events[b],
+            }
+            for b in bots
+        },
+    }
+
+
+def _compare(result: dict, golden: dict) -> list[str]:
+    problems = []
+    if golden.get("chunk") != result["chunk"]:
+        return [f"golden file was recorded with --chunk {golden.get('chunk')}, this run used {result['chunk']}"]
+    for bot in sorted(set(golden["bots"]) | set(result["bots"])):
+        want, got = golden["bots"].get(bot), result["bots"].get(bot)
+        if want is None or got is None:
+            problems.append(f"{bot}: {'not in the golden file' if want is None else 'not replayed'}")
+            continue
+        for field in GOLDEN_FIELDS:
+            if field == "events":
+                a, b = want["events"], got["events"]
+                if a != b:
+                    i = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), min(len(a), len(b)))
+                    problems.append(
+                        f"{bot}: events differ at #{i}: golden {a[i] if i < len(a) else 'end'}, "
+                        f"got {b[i] if i < len(b) else 'end'} ({len(a)} vs {len(b)} events)"
+                    )
+            elif want.get(field) != got.get(field):
+                problems.append(f"{bot}: {field} golden {want.get(field)!r}, got {got.get(field)!r}")
+    return problems
+
+
+def _print(result: dict) -> None:
+    print(
+        f"{result['lines']} lines ({result['bytes'] / 1e6:.1f} MB, {result['reads']} reads) in {result['seconds']:.2f} s"
+        f" = {result['lines_per_sec'] or 0:,} lines/s (PARSE_WORKERS={result['workers']}, chunk {result['chunk']})"
+    )
+    print(f"{'bot':<16}{'lines':>9}{'ready':>6}{'depo':>6}{'inst':>6}{'max':>5}{'err':>5}  final depo / instant / max")
+    for bot, r in result["bots"].items():
+        kinds = [k for k, _ in r["events"]]
+        print(
+            f"{bot[:15]:<16}{r['lines']:>9}{'yes' if r['ready'] else 'no':>6}{kinds.count('depositable'):>6}"
+            f"{kinds.count('instant'):>6}{kinds.count('max'):>5}{kinds.count('error'):>5}"
+            f"  {r['trade_counts']} / {r['instant_coins']} / {r['max_coins']}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", help="log files and/or folders")
+    parser.add_argument("--synthetic", type=int, default=0, help="generate this many lines per bot instead")
+    parser.add_argument("--bots", type=int, default=1, help="bots for --synthetic")
+    parser.add_argument("--speed", type=float, default=0.0, help="0 = as fast as possible, else x original pace")
+    parser.add_argument("--rate", type=float, default=50.0, help="lines/sec pacing plain files get with --speed")
+    parser.add_argument("--chunk", type=int, default=4096, help="read size for plain files (the tailer's reads are up to 256 KiB)")
+    parser.add_argument("--workers", type=int, default=0, help="PARSE_WORKERS")
+    parser.add_argument("--golden", help="compare with this golden file")
+    parser.add_argument("--update-golden", action="store_true", help="write --golden from this run instead")
+    parser.add_argument("--json", help="also write the full result here")
+    args = parser.parse_args()
+    if not args.paths and not args.synthetic:
+        parser.error("give log files/folders or --synthetic N")
+
+    root = tempfile.mkdtemp(prefix="v4replay-")
+    try:
+        paths = args.paths + (_synthetic(root, args.synthetic, args.bots) if args.synthetic else [])
+        live, segs = _collect(paths)
+        if not live and not segs:
+            parser.error("no <bot>.log, <bot>.log.err or segment files found")
+        result = asyncio.run(_replay(args, root, live, segs))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    _print(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=1)
+    if not args.golden:
+        return
+    if args.update_golden:
+        golden = {"chunk": result["chunk"], "bots": {b: {k: r[k] for k in GOLDEN_FIELDS} for b, r in result["bots"].items()}}
+        with open(args.golden, "w", encoding="utf-8") as f:
+            json.dump(golden, f, indent=1)
+        print(f"golden file written: {args.golden}")
+        return
+    with open(args.golden, encoding="utf-8") as f:
+        problems = _compare(result, json.load(f))
+    if problems:
+        print("MISMATCH against " + args.golden)
+        for p in problems:
+            print("  " + p)
+        sys.exit(1)
+    print(f"matches {args.golden}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/rest_latency.py
+"""
+REST round-trip latency against a local stub server.
+
+Compares hikari's default HTTP settings (connection closed after every
+request) with our tuned settings from src/httpsettings.py (keep-alive).
+The stub speaks plain HTTP, so the numbers show the cost of connection setup
+only; against Discord the TLS handshake makes the gap larger.
+
+Run from the "Discord bot/Discord bot" folder:
+    python -m benchmarks.rest_latency --requests 500 --concurrency 8
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import hikari
+from aiohttp import web
+
+from src.httpsettings import build_http_settings
+
+
+async def _start_stub() -> tuple[web.AppRunner, str]:
+    async def gateway(_: web.Request) -> web.Response:
+        return web.json_response({"url": "wss://gateway.discord.gg"})
+
+    app = web.Application()
+    app.router.add_get("/api/v10/gateway", gateway)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/api/v10"
+
+
+def _pct(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def _run(label: str, settings: hikari.impl.HTTPSettings, url: str, total: int, concurrency: int) -> dict:
+    rest_app = hikari.RESTApp(http_settings=settings, url=url)
+    await rest_app.start()
+    samples: list[float] = []
+    try:
+        async with rest_app.acquire("stub-token", hikari.TokenType.BOT) as client:
+            sem = asyncio.Semaphore(concurrency)
+
+            async def one() -> None:
+                async with sem:
+                    t0 = time.perf_counter()
+                    await client.fetch_gateway_url()
+                    samples.append((time.perf_counter() - t0) * 1000)
+
+            t_start = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(total)))
+            elapsed = time.perf_counter() - t_start
+    finally:
+        await rest_app.close()
+
+    result = {
+        "label": label,
+        "requests": total,
+        "concurrency": concurrency,
+        "req_per_sec": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(_pct(samples, 0.95), 3),
+        "p99_ms": round(_pct(samples, 0.99), 3),
+    }
+    print(
+        f"{label:<10} {result['req_per_sec']:>9} req/s   "
+        f"p50={result['p50_ms']}ms p95={result['p95_ms']}ms p99={result['p99_ms']}ms"
+    )
+    return result
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    runner, url = await _start_stub()
+    try:
+        await _run("default", hikari.impl.HTTPSettings(), url, args.requests, args.concurrency)
+        await _run("tuned", build_http_settings(), url, args.requests, args.concurrency)
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+# benchmarks/store_bench.py
+"""
+State store throughput, as seen by the caller (the event loop) and on disk:
+
+  - json      the old _persist_coin_state: rewrite the whole coin JSON file
+              on every change (--bots entries), on the calling thread
+  - state     store.set_state for the same updates (queued)
+  - events    --events journal events across --bots bots: time spent in
+              store.event() by the caller, and until the writer committed all
+  - queries   last 20 events for a bot / one hour for a bot, --queries times
+  - compact   folding everything older than an hour into totals
+
+Run from the "Discord bot/Discord bot" folder:
+    python -m benchmarks.store_bench --events 200000
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from src.store import Store
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bots", type=int, default=200)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="v4store-")
+    try:
+        bots = [f"bot{i:04d}" for i in range(args.bots)]
+        instant = {b: 1.0 for b in bots}
+        maxes = {b: 100.0 for b in bots}
+        rnd = random.Random(1)
+        rows = []
+
+        path = os.path.join(root, "coin_state.json")
+        t0 = time.perf_counter()
+        for _ in range(args.updates):
+            instant[rnd.choice(bots)] = rnd.random() * 100
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"instant": dict(instant), "max": dict(maxes)}, f)
+        rows.append(("json", args.updates, time.perf_counter() - t0, None))
+
+        store = Store(os.path.join(root, "state.db"), max_pending=args.events + args.updates + 10)
+        t0 = time.perf_counter()
+        for _ in range(args.updates):
+            instant[rnd.choice(bots)] = rnd.random() * 100
+            store.set_state("coins", {"instant": dict(instant), "max": dict(maxes)})  # fresh object, like botlogs
+        caller = time.perf_counter() - t0
+        store.flush()
+        rows.append(("state", args.updates, caller, time.perf_counter() - t0))
+
+        # Spread over the last two hours so the range query and compaction have work
+        now = time.time()
+        events = [(bots[i % args.bots], now - 7200 + 7200 * i / args.events) for i in range(args.events)]
+        t0 = time.perf_counter()
+        for bot, ts in events:
+            store.event(bot, "instant", 1.5, ts=ts)
+        caller = time.perf_counter() - t0
+        store.flush()
+        rows.append(("events", args.events, caller, time.perf_counter() - t0))
+
+        t0 = time.perf_counter()
+        for i in range(args.queries):
+            store.last_events(bots[i % args.bots], 20)
+        rows.append(("last 20", args.queries, time.perf_counter() - t0, None))
+        t0 = time.perf_counter()
+        for i in range(args.queries):
+            store.events_between(now - 3600, now, bot=bots[i % args.bots])
+        rows.append(("1h range", args.queries, time.perf_counter() - t0, None))
+
+        store.retention_days = 1 / 24
+        t0 = time.perf_counter()
+        summary = store.compact()
+        rows.append(("compact", summary["removed"] if summary else 0, time.perf_counter() - t0, None))
+        store.close()
+
+        print(f"{args.bots} bots; dropped {store.dropped}; file {os.path.getsize(store.path) / 1e6:.1f} MB after compaction")
+        print(f"{'run':>9}  {'ops':>8}  {'caller ms':>10}  {'us/op':>8}  {'committed ms':>12}  {'ops/s':>9}")
+        for label, ops, secs, committed in rows:
+            total = committed if committed is not None else secs
+            done = f"{committed * 1000:.1f}" if committed is not None else "—"
+            print(
+                f"{label:>9}  {ops:>8}  {secs * 1000:10.1f}  {secs / max(ops, 1) * 1e6:8.2f}  "
+                f"{done:>12}  {ops / total:9.0f}"
+            )
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
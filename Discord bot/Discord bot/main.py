@@ -1,37 +1,36 @@
-import ssl, certifi, aiohttp
-from src.config import DISCORD_TOKEN
-
-# Force aiohttp to use certifi bundle
-old_init = aiohttp.TCPConnector.__init__
-
-def new_init(self, *args, **kwargs):
-    ssl_context = ssl.create_default_context(cafile=certifi.where())
-    kwargs["ssl"] = ssl_context
-    old_init(self, *args, **kwargs)
-
-aiohttp.TCPConnector.__init__ = new_init
+from src.config import DISCORD_TOKEN, DISCORD_REST_URL, FLEET_FILE, BOT_EXECUTABLES, BOT_AGENTS
+from src.fleetfile import load_into
+from src.httpsettings import build_http_settings, build_proxy_settings
 
 import os
 import hikari
 import lightbulb
 
-bot = lightbulb.BotApp(
-    token=DISCORD_TOKEN,
-    intents=hikari.Intents.ALL_UNPRIVILEGED | hikari.Intents.MESSAGE_CONTENT,
-    ignore_bots=True,
-    banner=None,
-    help_slash_command=False,
-    help_class=None,
-)
-
-bot.load_extensions_from("./src/extensions/", recursive=True)
-
-bot.run(
-    status = hikari.Status.DO_NOT_DISTURB,
-    activity = hikari.Activity(
-        name = "cashmoney",
-        type = hikari.ActivityType.PLAYING,
+# Guarded: with PARSE_WORKERS > 0, log-parser worker processes re-import this
+# file on Windows and must not start a second bot
+if __name__ == "__main__":
+    # fleet.json (if any) replaces the config dicts before the extensions read them
+    load_into(FLEET_FILE, BOT_EXECUTABLES, BOT_AGENTS)
+
+    bot = lightbulb.BotApp(
+        token=DISCORD_TOKEN,
+        intents=hikari.Intents.ALL_UNPRIVILEGED | hikari.Intents.MESSAGE_CONTENT,
+        ignore_bots=True,
+        banner=None,
+        help_slash_command=False,
+        help_class=None,
+        http_settings=build_http_settings(),
+        proxy_settings=build_proxy_settings(),
+        rest_url=DISCORD_REST_URL,
+    )
+
+    bot.load_extensions_from("./src/extensions/", recursive=True)
+
+    bot.run(
+        status = hikari.Status.DO_NOT_DISTURB,
+        activity = hikari.Activity(
+            name = "cashmoney",
+            type = hikari.ActivityType.PLAYING,
         
-    ),
-)
-
+        ),
+    )
@@ -0,0 +1,168 @@
+# src/components.py
+"""
+Component interaction router: one InteractionCreateEvent listener looks the
+custom_id up in a table, instead of every plugin filtering every interaction.
+
+Each route says how it is acknowledged, and the router sends that ack before
+anything else runs:
+
+  ack="update"  DEFERRED_MESSAGE_UPDATE (silent; select menus)
+  ack="reply"   DEFERRED_MESSAGE_CREATE, ephemeral ("is thinking..."), which
+                the handler's progress and result then replace
+
+A route's `check` runs before the ack and must be cheap (no I/O); when it
+returns a message (or raises) the ack is that message instead and the handler
+doesn't run.
+
+Discord drops interactions that aren't acknowledged within 3 s, so handlers
+always run after the ack, as tracked jobs (ROUTER.jobs): a handler gets a Job
+whose say() edits the ephemeral reply (or sends an ephemeral followup for
+"update" routes) and returns the final text, or None. A handler that raises
+reports the error instead of leaving "is thinking..." up.
+
+Ack latency per route goes to v4_interaction_ack_seconds (see /metrics).
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import hikari
+
+from src.metrics import INTERACTION_ACK, INTERACTION_JOB_SECONDS, INTERACTION_JOBS
+
+Handler = Callable[["Job"], Awaitable[str | None]]
+Check = Callable[[hikari.ComponentInteraction], str | None]
+
+
+@dataclass
+class Route:
+    name: str
+    handler: Handler
+    ack: str = "reply"
+    check: Check | None = None
+
+
+@dataclass
+class Job:
+    id: int
+    route: str
+    interaction: hikari.ComponentInteraction
+    ack: str
+    started: float = field(default_factory=time.time)
+    status: str = "running"
+    task: asyncio.Task | None = None
+
+    @property
+    def user_id(self) -> int:
+        return self.interaction.user.id
+
+    async def say(self, text: str) -> None:
+        """Progress or result for the user who clicked."""
+        self.status = text
+        if self.ack == "reply":
+            await self.interaction.edit_initial_response(content=text)
+        else:
+            await self.interaction.execute(text, flags=hikari.MessageFlag.EPHEMERAL)
+
+
+class ComponentRouter:
+    def __init__(self):
+        self.routes: dict[str, Route] = {}
+        self.prefixes: dict[str, Route] = {}
+        self.jobs: dict[int, Job] = {}
+        self._ids = itertools.count(1)
+
+    def route(self, custom_id: str, *, ack: str = "reply", check: Check | None = None, prefix: bool = False):
+        """Decorator: handle `custom_id` (or every custom_id starting with it when prefix=True)."""
+        if ack not in ("reply", "update"):
+            raise ValueError(f"ack must be 'reply' or 'update', not {ack!r}")
+
+        def deco(fn: Handler) -> Handler:
+            r = Route(custom_id, fn, ack, check)
+            (self.prefixes if prefix else self.routes)[custom_id] = r
+            return fn
+
+        return deco
+
+    def find(self, custom_id: str) -> Route | None:
+        r = self.routes.get(custom_id)
+        if r is not None:
+            return r
+        for start, r in self.prefixes.items():
+            if custom_id.startswith(start):
+                return r
+        return None
+
+    async def dispatch(self, event: hikari.InteractionCreateEvent) -> None:
+        inter = event.interaction
+        if not isinstance(inter, hikari.ComponentInteraction):
+            return
+        r = self.find(inter.custom_id)
+        if r is None:
+            return
+
+        t0 = time.perf_counter()
+        try:
+            refusal = r.check(inter) if r.check else None
+        except Exception as e:
+            # A broken check refuses rather than leaving the click unanswered
+            refusal = f"❌ `{r.name}` check failed: {type(e).__name__}: {e}"[:1900]
+        try:
+            if refusal is not None:
+                await inter.create_initial_response(
+                    hikari.ResponseType.MESSAGE_CREATE, content=refusal, flags=hikari.MessageFlag.EPHEMERAL
+                )
+            elif r.ack == "update":
+                await inter.create_initial_response(hikari.ResponseType.DEFERRED_MESSAGE_UPDATE)
+            else:
+                await inter.create_initial_response(
+                    hikari.ResponseType.DEFERRED_MESSAGE_CREATE, flags=hikari.MessageFlag.EPHEMERAL
+                )
+        except hikari.NotFoundError:
+            # Expired (acked too late) or already answered; nothing to follow up on
+            INTERACTION_ACK.observe(time.perf_counter() - t0, route=r.name, result="expired")
+            return
+        except hikari.HTTPError:
+            # Already acknowledged (400), Discord 5xx, ...: there is no reply to follow up on
+            INTERACTION_ACK.observe(time.perf_counter() - t0, route=r.name, result="failed")
+            return
+        INTERACTION_ACK.observe(time.perf_counter() - t0, route=r.name, result="refused" if refusal else "ok")
+        if refusal is not None:
+            return
+
+        job = Job(next(self._ids), r.name, inter, r.ack)
+        self.jobs[job.id] = job
+        job.task = asyncio.create_task(self._run(r, job))
+
+    async def _run(self, r: Route, job: Job) -> None:
+        INTERACTION_JOBS.inc()
+        t0 = time.perf_counter()
+        result = "ok"
+        try:
+            text = await r.handler(job)
+            if text:
+                await job.say(text)
+        except asyncio.CancelledError:
+            result = "cancelled"
+            raise
+        except Exception as e:
+            result = "failed"
+            try:
+                await job.say(f"❌ `{r.name}` failed: {type(e).__name__}: {e}"[:1900])
+            except Exception:
+                pass
+        finally:
+            INTERACTION_JOBS.dec()
+            INTERACTION_JOB_SECONDS.observe(time.perf_counter() - t0, route=r.name, result=result)
+            self.jobs.pop(job.id, None)
+
+    def running(self) -> list[Job]:
+        return sorted(self.jobs.values(), key=lambda j: j.started)
+
+
+# The one router; plugins add routes to it, controlpanal's listener feeds it
+ROUTER = ComponentRouter()
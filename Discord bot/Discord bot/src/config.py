@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict, Set
+from typing import Dict, List, Set, Tuple
 
 # =========================
 #  Discord / bot identity
@@ -20,6 +20,72 @@ LOG_DIR: str = r"C:\v4logs"
 BOT_EXECUTABLES: Dict[str, str] = {
     # "examplebot": r"C:\Users\You\Desktop\examplebot\v4-bot.exe",
 }
+# If this file exists it replaces BOT_EXECUTABLES / BOT_AGENTS and is re-read
+# while running: added bots launch, removed ones stop, changed paths reattach
+# (format in src/fleetfile.py; relative to the bot folder; None = config only)
+FLEET_FILE: str | None = "src/fleet.json"
+FLEET_RELOAD_SECONDS: float = 5.0
+# Groups for the bulk commands, e.g. /restartbot names: tag:eu (members may use * wildcards)
+BOT_TAGS: Dict[str, List[str]] = {
+    # "eu": ["eu-*", "examplebot"],
+}
+
+# /discover (and pathgenerator.py): folders up to DISCOVERY_DEPTH levels below
+# each root that contain one of DISCOVERY_EXE_NAMES plus DISCOVERY_MARKER
+# (None = exe only) are written to FLEET_FILE. Unchanged folders are served
+# from DISCOVERY_CACHE_FILE.
+DISCOVERY_ROOTS: List[str] = ["~/Desktop"]
+DISCOVERY_DEPTH: int = 1
+DISCOVERY_EXE_NAMES: List[str] = ["v4-bot.exe"]
+DISCOVERY_MARKER: str | None = "run.cmd"
+DISCOVERY_CACHE_FILE: str | None = "src/discovery_cache.json"
+DISCOVERY_WORKERS: int = 8
+
+# Parse bot logs in this many worker processes (0 = on the event loop).
+# Worth it for large fleets / chatty bots; each bot always uses the same worker.
+PARSE_WORKERS: int = 0
+# psutil scans and file operations run on a pool of this many threads (src/offload.py)
+OFFLOAD_WORKERS: int = 4
+# A bot counts as ready (not just "process exists") once its log matches this
+# (case-insensitive regex); override per bot in READY_PATTERNS
+DEFAULT_READY_PATTERN: str = r"logged in as|\d+\s+depositable\s+items"
+READY_PATTERNS: Dict[str, str] = {
+    # "examplebot": r"Connected to trade server",
+}
+# Launched bots that haven't matched their pattern by then are flagged
+READY_TIMEOUT_SECONDS: int = 180
+# Bring-up: at most this many bots launching (started, not yet ready) at once; 0 = no limit
+LAUNCH_CONCURRENCY: int = 0
+
+# Echo every bot log line to the controller console (the printing itself runs on
+# the event loop, so turn this off for log storms even with PARSE_WORKERS)
+ECHO_BOT_LINES: bool = True
+# Bot output is also kept as history in LOG_DIR/segments/<bot>/: LOG_SEGMENT_MB
+# segments, gzipped once full; the oldest are deleted past LOG_RETENTION_DAYS
+# or once all segments together pass LOG_RETENTION_MB (0 MB segments = off)
+LOG_SEGMENT_MB: float = 8.0
+LOG_RETENTION_MB: float = 2048.0
+LOG_RETENTION_DAYS: float = 14.0
+# Each segment gets a sparse time -> offset index (an entry at most every
+# LOG_INDEX_KB of output or LOG_INDEX_SECONDS), so /tail since/until reads
+# only the requested window; the interval is also the precision of its edges
+LOG_INDEX_KB: int = 64
+LOG_INDEX_SECONDS: float = 5.0
+# Live follow (/tail follow, the panel's "Follow Log"): one message edited with
+# the newest lines, at most every FOLLOW_EDIT_SECONDS and only when there are
+# new ones, for FOLLOW_MINUTES unless asked otherwise. Ephemeral follows end
+# before their 15-minute interaction token does. At most FOLLOW_MAX_VIEWERS
+# follows run at once
+FOLLOW_EDIT_SECONDS: float = 3.0
+FOLLOW_MINUTES: float = 10.0
+FOLLOW_MAX_MINUTES: float = 60.0
+FOLLOW_MAX_VIEWERS: int = 10
+# /exportlogs: a bot's captured output since a time (the last
+# EXPORT_DEFAULT_HOURS by default) plus its controller state, as one zip of at
+# most EXPORT_MAX_MB (keep it under the server's upload limit); when the range
+# doesn't fit, its oldest lines are left out
+EXPORT_DEFAULT_HOURS: float = 24.0
+EXPORT_MAX_MB: float = 8.0
 
 
 # =========================
@@ -28,4 +94,175 @@ BOT_EXECUTABLES: Dict[str, str] = {
 
 ALERT_CHANNEL_ID: int = 0
 ALERT_USER_ID: int = 0
-STATUS_REFRESH_SECONDS: int = 60
\ No newline at end of file
+STATUS_REFRESH_SECONDS: int = 60
+
+# Payout analytics (/payouts): coins/hour from the Instant payout amounts over
+# the last PAYOUT_WINDOW_HOURS (at most PAYOUT_MAX_SAMPLES amounts per bot; a
+# rate needs samples at least PAYOUT_MIN_SPAN_SECONDS apart)
+PAYOUT_WINDOW_HOURS: float = 6.0
+PAYOUT_MAX_SAMPLES: int = 512
+PAYOUT_MIN_SPAN_SECONDS: float = 300.0
+# Add a coins/hour column to the status embed
+PAYOUT_EMBED_COLUMN: bool = False
+# Stderr lines are grouped into fingerprints (numbers, ids and paths masked;
+# see /errors), at most ERROR_MAX_FINGERPRINTS across the fleet. A fingerprint
+# seen for the first time alerts, at most ERROR_ALERTS_PER_HOUR times per bot
+ERROR_MAX_FINGERPRINTS: int = 2000
+ERROR_ALERTS: bool = True
+ERROR_ALERTS_PER_HOUR: int = 5
+# The panel shows "errors present" while a bot's last stderr error is this recent
+ERROR_RECENT_SECONDS: int = 900
+
+
+# =========================
+#  Crash recovery
+# =========================
+
+# What to do when a bot exits without being stopped from Discord/an agent command:
+#   "always" restart, "on-failure" restart unless it exited with code 0, "never" alert only
+DEFAULT_RESTART_POLICY: str = "never"
+RESTART_POLICIES: Dict[str, str] = {
+    # "examplebot": "always",
+}
+# Restart delay: base * 2^(n-1) for the n-th exit inside the crash-loop window, capped, +/-20% jitter
+RESTART_BACKOFF_BASE_SECONDS: float = 5.0
+RESTART_BACKOFF_MAX_SECONDS: float = 300.0
+# This many unexpected exits within the window -> stop restarting that bot and alert
+CRASH_LOOP_MAX_EXITS: int = 5
+CRASH_LOOP_WINDOW_SECONDS: int = 900
+
+
+# =========================
+#  Hang watchdog
+# =========================
+
+# Flag ready bots whose log output stalls (process alive but frozen). Each bot
+# is judged against its own baseline rate, learned after WATCHDOG_WARMUP_SECONDS.
+WATCHDOG_ENABLED: bool = True
+WATCHDOG_INTERVAL_SECONDS: float = 5.0
+WATCHDOG_WARMUP_SECONDS: float = 60.0
+# Hung when silent for max(MIN_SILENCE, GAP_FACTOR x its usual gap between lines) ...
+WATCHDOG_MIN_SILENCE_SECONDS: float = 20.0
+WATCHDOG_GAP_FACTOR: float = 10.0
+# ... or when its recent rate drops below this fraction of the baseline
+WATCHDOG_DROP_RATIO: float = 0.05
+# Bots quieter than this (lines/s) are never judged
+WATCHDOG_MIN_BASELINE_LPS: float = 0.02
+# "alert", or "restart": also kill the hung process so its restart policy brings it back
+# (bots with restart policy "never" are only alerted on)
+WATCHDOG_ACTION: str = "alert"
+
+
+# =========================
+#  Memory watch
+# =========================
+
+# Sample each bot's RSS and fit a line over the window; warn when it is projected
+# to reach its limit within MEMWATCH_WARN_HOURS (or is already past it)
+MEMWATCH_ENABLED: bool = True
+MEMWATCH_INTERVAL_SECONDS: float = 60.0
+MEMWATCH_WINDOW_SECONDS: float = 3 * 3600
+MEMWATCH_MIN_SAMPLES: int = 20
+MEMWATCH_RSS_LIMIT_MB: float = 1500.0
+MEMWATCH_LIMITS_MB: Dict[str, float] = {
+    # "examplebot": 2500.0,
+}
+MEMWATCH_WARN_HOURS: float = 6.0
+# Recycle (stop -> relaunch) bots that are at risk, soonest-to-limit first,
+# only inside MEMWATCH_QUIET_HOURS (local (start, end) hour, may wrap midnight;
+# None = any time) and never more than MEMWATCH_MAX_RECYCLING at once
+MEMWATCH_RECYCLE: bool = False
+MEMWATCH_QUIET_HOURS: Tuple[int, int] | None = (3, 6)
+MEMWATCH_MAX_RECYCLING: int = 2
+
+# =========================
+#  CPU placement
+# =========================
+
+# Pin this process to CONTROLLER_CORES and give each bot CORES_PER_BOT of the
+# remaining cores (psutil cpu_affinity + nice, applied right after launch/attach).
+# Strategy "round-robin" follows BOT_EXECUTABLES order; "load" picks the cores
+# with the least measured bot CPU. Needs cpu_affinity (Linux/Windows, not macOS).
+PLACEMENT_ENABLED: bool = False
+PLACEMENT_STRATEGY: str = "round-robin"
+CONTROLLER_CORES: List[int] = [0]
+CORES_PER_BOT: int = 1
+BOT_PRIORITY: str = "below_normal"  # "normal", "below_normal" or "idle"
+# A bot at >= PLACEMENT_HOT_PCT of its cores for PLACEMENT_HOT_CHECKS checks in a
+# row is moved to the least-loaded cores
+PLACEMENT_CHECK_SECONDS: float = 30.0
+PLACEMENT_HOT_PCT: float = 90.0
+PLACEMENT_HOT_CHECKS: int = 4
+
+# =========================
+#  State store
+# =========================
+
+# Coin, status-message and supervisor state plus the event journal (restarts,
+# exits, payouts, depositable history) live in this SQLite file, relative to
+# the bot folder. None = the old JSON files next to botlogs.py and no journal.
+STATE_DB: str | None = "src/state.db"
+# Journal events older than this, or beyond the newest STATE_MAX_EVENTS, are
+# folded into per-bot totals and deleted (checked every STATE_COMPACT_SECONDS)
+STATE_RETENTION_DAYS: float = 30.0
+STATE_MAX_EVENTS: int = 1_000_000
+STATE_COMPACT_SECONDS: float = 3600.0
+
+# =========================
+#  HTTP / REST client
+# =========================
+
+# Reuse connections across bursts of embed edits / interaction replies.
+HTTP_KEEPALIVE: bool = True
+HTTP_CONNECT_TIMEOUT_SECONDS: float = 10.0
+HTTP_TOTAL_TIMEOUT_SECONDS: float = 30.0
+# Optional outbound proxy, e.g. "http://proxy.local:3128"
+HTTP_PROXY_URL: str | None = None
+# Also honour HTTP(S)_PROXY / NO_PROXY environment variables
+HTTP_TRUST_ENV: bool = False
+# Point the REST client somewhere other than discord.com, e.g. the local
+# stand-in from benchmarks/discord_stub.py: "http://127.0.0.1:8765/api/v10"
+# (the gateway URL is then taken from that server's /gateway/bot).
+DISCORD_REST_URL: str | None = None
+
+
+# =========================
+#  Metrics
+# =========================
+
+# Prometheus-format endpoint at http://METRICS_HOST:METRICS_PORT/metrics (0 disables)
+METRICS_HOST: str = "127.0.0.1"
+METRICS_PORT: int = 9464
+
+
+# =========================
+#  Event-loop monitor
+# =========================
+
+LOOP_LAG_SAMPLE_SECONDS: float = 0.5
+# A loop silent for longer than this is recorded as a stall (with a stack sample)
+LOOP_STALL_MS: int = 250
+# Stalls at least this long ping ALERT_CHANNEL_ID (interactions must be acked within 3s)
+LOOP_ALERT_MS: int = 2000
+LOOP_ALERT_COOLDOWN_SECONDS: int = 300
+LOOP_STALL_HISTORY: int = 200
+
+
+# =========================
+#  Multi-host agents
+# =========================
+
+# Bots that run on another machine, by agent id; everything else runs here.
+# That host runs `python agent.py --id <agent id>` with this same config.
+BOT_AGENTS: Dict[str, str] = {
+    # "examplebot": "host2",
+}
+# Controller side: where agents connect (port 0 disables the listener)
+FLEET_LISTEN_HOST: str = "0.0.0.0"
+FLEET_LISTEN_PORT: int = 0
+# Agent side: where the controller listens
+FLEET_CONTROLLER: str = "127.0.0.1:9470"
+# Shared secret agents must present (the listener stays off while it is "CHANGE_ME")
+FLEET_TOKEN: str = "CHANGE_ME"
+# Agents are dropped if silent this long (they ping every third of it)
+FLEET_IDLE_TIMEOUT_SECONDS: float = 45.0
@@ -0,0 +1,219 @@
+# src/discovery.py
+"""
+Bot discovery: find v4-bot folders under a few root directories and turn
+them into a fleet (src/fleetfile.py format).
+
+Each level of the tree is scanned in parallel with os.scandir (one listing
+per directory, no extra stat per entry). A JSON cache remembers, per
+directory, its mtime, its subdirectories and whether it holds a bot; a
+directory whose mtime is unchanged is not listed again, so a rescan of an
+unchanged tree costs one stat per directory. Folders that hold a bot are
+not descended into.
+
+A folder holds a bot when it contains one of the executable names and the
+marker file (run.cmd by default), and the executable looks like a program:
+a PE header for .exe files, otherwise an ELF header, a #! line or the
+execute bit.
+
+Pure filesystem work like src/fleetfile.py; /discover and pathgenerator.py
+call it and write the result.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from src.fleetfile import Fleet
+
+CACHE_VERSION = 1
+BATCH = 256  # directories per thread-pool task; one task per directory costs more than the stat
+
+
+@dataclass
+class DiscoveryResult:
+    bots: dict[str, str]       # name -> exe path, sorted by path
+    dirs: int = 0              # directories visited
+    scanned: int = 0           # of those, listed again (new or changed mtime)
+    seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def cached(self) -> int:
+        return self.dirs - self.scanned
+
+
+def is_bot_executable(path: str) -> bool:
+    try:
+        with open(path, "rb") as f:
+            head = f.read(4)
+    except OSError:
+        return False
+    if path.lower().endswith(".exe"):
+        return head[:2] == b"MZ"
+    return head[:2] == b"#!" or head == b"\x7fELF" or os.access(path, os.X_OK)
+
+
+def _skip(name: str) -> bool:
+    # Hidden folders, $RECYCLE.BIN and friends
+    return name.startswith((".", "$"))
+
+
+class Discovery:
+    def __init__(
+        self,
+        roots: list[str],
+        *,
+        depth: int,
+        exe_names: list[str],
+        marker: str | None,
+        cache_path: str | None,
+        workers: int = 8,
+    ):
+        self.roots = [os.path.abspath(os.path.expanduser(r)) for r in roots]
+        self.depth = depth
+        self.exe_names = {n.lower(): n for n in exe_names}
+        self.marker = marker.lower() if marker else None
+        self.cache_path = cache_path
+        self.workers = max(1, workers)
+        # Cached verdicts are only valid for the same exe names / marker
+        self._cache_key = "|".join(sorted(self.exe_names)) + "|" + (self.marker or "")
+
+    # ---- cache ----
+    def _load_cache(self) -> dict[str, dict]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f) or {}
+        except (OSError, ValueError):
+            return {}
+        if data.get("v") != CACHE_VERSION or data.get("key") != self._cache_key:
+            return {}
+        return data.get("dirs") or {}
+
+    def _save_cache(self, dirs: dict[str, dict]) -> None:
+        if not self.cache_path:
+            return
+        # dumps (C encoder) + one write; json.dump streams through the pure-Python encoder
+        text = json.dumps({"v": CACHE_VERSION, "key": self._cache_key, "dirs": dirs}, separators=(",", ":"))
+        tmp = self.cache_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, self.cache_path)
+
+    # ---- scanning ----
+    def _visit(self, path: str, cached: dict | None) -> tuple[dict, bool]:
+        """Cache entry for one directory and whether it had to be listed."""
+        mtime = os.stat(path).st_mtime_ns
+        if cached is not None and cached.get("m") == mtime:
+            return cached, False
+        subdirs: list[str] = []
+        files: dict[str, str] = {}
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not _skip(entry.name):
+                            subdirs.append(entry.name)
+                    elif entry.is_file():
+                        files[entry.name.lower()] = entry.name
+                except OSError:
+                    continue
+        exe = None
+        if self.marker is None or self.marker in files:
+            for lower in self.exe_names:
+                if lower in files and is_bot_executable(os.path.join(path, files[lower])):
+                    exe = files[lower]
+                    break
+        return {"m": mtime, "sub": sorted(subdirs), "exe": exe}, True
+
+    def _visit_batch(self, paths: list[str], old: dict[str, dict]) -> list:
+        out = []
+        for path in paths:
+            try:
+                out.append((path, *self._visit(path, old.get(path))))
+            except OSError as e:
+                out.append((path, e, False))
+        return out
+
+    def run(self) -> DiscoveryResult:
+        t0 = time.perf_counter()
+        old = self._load_cache()
+        new: dict[str, dict] = {}
+        found: list[str] = []
+        result = DiscoveryResult({})
+
+        level = [r for r in self.roots if os.path.isdir(r)]
+        for r in self.roots:
+            if r not in level:
+                result.errors.append(f"not a directory: {r}")
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for depth in range(self.depth + 1):
+                if not level:
+                    break
+                batches = [level[i:i + BATCH] for i in range(0, len(level), BATCH)]
+                futures = [pool.submit(self._visit_batch, b, old) for b in batches]
+                nxt: list[str] = []
+                for fut in futures:
+                    for path, entry, listed in fut.result():
+                        if isinstance(entry, OSError):
+                            result.errors.append(f"{path}: {entry.strerror or entry}")
+                            continue
+                        new[path] = entry
+                        result.dirs += 1
+                        result.scanned += listed
+                        if entry["exe"]:
+                            found.append(os.path.join(path, entry["exe"]))
+                        elif depth < self.depth:
+                            nxt.extend(os.path.join(path, s) for s in entry["sub"])
+                level = nxt
+
+        # Nothing listed and nothing gone: the cache on disk is still exact
+        if result.scanned or len(new) != len(old):
+            try:
+                self._save_cache(new)
+            except OSError as e:
+                result.errors.append(f"cache not saved: {e}")
+        result.bots = name_bots(sorted(found))
+        result.seconds = time.perf_counter() - t0
+        return result
+
+
+def name_bots(paths: list[str], taken: set[str] | None = None) -> dict[str, str]:
+    """Folder name per exe; clashes get the parent folder as a prefix, then a number."""
+    taken = set(taken or ())
+    out: dict[str, str] = {}
+    for exe in paths:
+        folder = os.path.dirname(exe)
+        name = os.path.basename(folder)
+        if name in taken:
+            name = f"{os.path.basename(os.path.dirname(folder))}-{name}"
+        base, n = name, 2
+        while name in taken:
+            name = f"{base}-{n}"
+            n += 1
+        taken.add(name)
+        out[name] = exe
+    return out
+
+
+def merge_fleet(current: Fleet | None, found: dict[str, str]) -> Fleet:
+    """
+    The fleet to write: bots already listed keep their names (and agents);
+    local ones whose exe is gone are dropped; newly found ones are added.
+    Bots run by agents are kept as they are (their paths are on other hosts).
+    """
+    current = current or Fleet({})
+    key = os.path.normcase
+    bots: dict[str, str] = {}
+    for name, path in current.bots.items():
+        if name in current.agents or os.path.exists(path):
+            bots[name] = path
+    known = {key(p) for n, p in bots.items() if n not in current.agents}
+    new = [p for p in found.values() if key(p) not in known]
+    bots.update(name_bots(new, set(bots)))
+    agents = {n: a for n, a in current.agents.items() if n in bots}
+    return Fleet(bots, agents)
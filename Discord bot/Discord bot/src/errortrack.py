@@ -0,0 +1,157 @@
+# src/errortrack.py
+"""
+Stderr fingerprints: the same error with different numbers, ids or paths is
+one entry with a count, instead of one line per occurrence.
+
+  fingerprint()  masks what varies between occurrences: quoted strings,
+                 paths (C:\\..., /...), hex ids, GUIDs and numbers, then
+                 collapses whitespace
+  ErrorTracker   per (bot, fingerprint): count, first/last seen and the
+                 first raw line as a sample, in one LRU bounded at
+                 max_entries across the fleet (the least recently seen entry
+                 goes first)
+
+Indented lines (stack frames: "   at Foo.Bar()", '  File "x.py", line 3')
+and "Traceback (most recent call last):" headers belong to the error line
+around them; they are counted as stderr lines but are not fingerprints of
+their own, so one exception is one entry however deep its stack.
+
+observe() says whether a fingerprint is new; botlogs alerts on those (rate
+limited per bot) rather than on every line. snapshot()/restore() carry the
+table across a controller restart through the state store, so known errors
+don't alert again.
+
+No hikari imports, like src/memtrend.py and src/supervisor.py.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+
+_MASKS = (
+    (re.compile(r"\"[^\"]*\"|'[^']*'"), "<str>"),
+    (re.compile(r"(?:[A-Za-z]:)?(?:[\\/][\w.\-~$]+){2,}[\\/]?"), "<path>"),
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<guid>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b|\b(?=[0-9a-fA-F]*\d)[0-9a-fA-F]{8,}\b"), "<hex>"),
+    (re.compile(r"\d+(?:[.,:]\d+)*"), "<n>"),
+)
+_SPACE_RX = re.compile(r"\s+")
+_CONTINUATION_RX = re.compile(r"^(?:\s|Traceback \(most recent call last\):|--- End of)")
+MAX_SAMPLE = 300
+
+
+def fingerprint(line: str) -> str:
+    """The line with its variable parts masked (what identifies the error)."""
+    text = line.strip()
+    for rx, mask in _MASKS:
+        text = rx.sub(mask, text)
+    return _SPACE_RX.sub(" ", text)[:MAX_SAMPLE]
+
+
+def error_id(key: str) -> str:
+    """Short stable id for a fingerprint, for display and lookups."""
+    return hashlib.sha1(key.encode("utf-8", errors="replace")).hexdigest()[:8]
+
+
+@dataclass
+class ErrorEntry:
+    bot: str
+    key: str          # the fingerprint
+    sample: str       # first raw line seen for it
+    count: int
+    first_seen: float
+    last_seen: float
+
+    @property
+    def id(self) -> str:
+        return error_id(self.key)
+
+
+class ErrorTracker:
+    def __init__(self, *, max_entries: int = 2000):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[tuple[str, str], ErrorEntry] = OrderedDict()
+        self.lines: dict[str, int] = {}  # stderr lines per bot, continuation lines included
+        self.evicted = 0
+
+    def observe(self, bot: str, line: str, now: float) -> ErrorEntry | None:
+        """Count one stderr line; the entry if it is a fingerprint seen for the first time."""
+        self.lines[bot] = self.lines.get(bot, 0) + 1
+        if not line.strip() or _CONTINUATION_RX.match(line):
+            return None
+        key = fingerprint(line)
+        entry = self.entries.get((bot, key))
+        if entry is not None:
+            entry.count += 1
+            entry.last_seen = now
+            self.entries.move_to_end((bot, key))
+            return None
+        entry = ErrorEntry(bot, key, line.strip()[:MAX_SAMPLE], 1, now, now)
+        self.entries[(bot, key)] = entry
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evicted += 1
+        return entry
+
+    def top(self, bot: str | None = None, n: int = 10, since: float | None = None) -> list[ErrorEntry]:
+        """Most frequent fingerprints (of one bot, or fleet-wide), optionally last seen after `since`."""
+        found = [
+            e for e in self.entries.values()
+            if (bot is None or e.bot == bot) and (since is None or e.last_seen >= since)
+        ]
+        found.sort(key=lambda e: (e.count, e.last_seen), reverse=True)
+        return found[:n]
+
+    def find(self, entry_id: str) -> list[ErrorEntry]:
+        return [e for e in self.entries.values() if e.id == entry_id]
+
+    def last_seen(self, bot: str) -> float | None:
+        # Newest first: the LRU order is last-seen order
+        for (b, _), e in reversed(self.entries.items()):
+            if b == bot:
+                return e.last_seen
+        return None
+
+    def count(self, bot: str) -> int:
+        return sum(1 for b, _ in self.entries if b == bot)
+
+    def forget(self, bot: str) -> None:
+        for key in [k for k in self.entries if k[0] == bot]:
+            del self.entries[key]
+        self.lines.pop(bot, None)
+
+    def snapshot(self) -> dict:
+        return {"entries": [asdict(e) for e in self.entries.values()], "lines": dict(self.lines)}
+
+    def restore(self, data: dict, bots) -> None:
+        """Load a snapshot (oldest first, as saved); entries of bots not in `bots` are skipped."""
+        for raw in data.get("entries", []):
+            try:
+                entry = ErrorEntry(**raw)
+            except TypeError:
+                continue
+            if entry.bot in bots:
+                self.entries[(entry.bot, entry.key)] = entry
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self.lines.update({k: int(v) for k, v in data.get("lines", {}).items() if k in bots})
+
+
+class AlertLimiter:
+    """At most `limit` alerts per bot per `window` seconds."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.sent: dict[str, deque] = {}
+
+    def allow(self, bot: str, now: float) -> bool:
+        q = self.sent.setdefault(bot, deque())
+        while q and q[0] <= now - self.window:
+            q.popleft()
+        if len(q) >= self.limit:
+            return False
+        q.append(now)
+        return True
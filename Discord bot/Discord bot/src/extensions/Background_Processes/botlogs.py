@@ -4,18 +4,123 @@ import lightbulb
 import asyncio
 import os
 import time
-import re
 import json
 from collections import defaultdict, deque
 import psutil
 import sys, datetime
 import random
+from dataclasses import asdict
+from typing import Callable
 from src.config import (
     LOG_DIR,
     BOT_EXECUTABLES,
+    BOT_AGENTS,
     ALERT_CHANNEL_ID,
     ALERT_USER_ID,
     STATUS_REFRESH_SECONDS,
+    PAYOUT_WINDOW_HOURS,
+    PAYOUT_MAX_SAMPLES,
+    PAYOUT_MIN_SPAN_SECONDS,
+    PAYOUT_EMBED_COLUMN,
+    ERROR_MAX_FINGERPRINTS,
+    ERROR_ALERTS,
+    ERROR_ALERTS_PER_HOUR,
+    PARSE_WORKERS,
+    ECHO_BOT_LINES,
+    LOG_SEGMENT_MB,
+    LOG_RETENTION_MB,
+    EXPORT_MAX_MB,
+    LOG_RETENTION_DAYS,
+    LOG_INDEX_KB,
+    LOG_INDEX_SECONDS,
+    DEFAULT_READY_PATTERN,
+    READY_PATTERNS,
+    READY_TIMEOUT_SECONDS,
+    LAUNCH_CONCURRENCY,
+    DEFAULT_RESTART_POLICY,
+    RESTART_POLICIES,
+    RESTART_BACKOFF_BASE_SECONDS,
+    RESTART_BACKOFF_MAX_SECONDS,
+    CRASH_LOOP_MAX_EXITS,
+    CRASH_LOOP_WINDOW_SECONDS,
+    WATCHDOG_ENABLED,
+    WATCHDOG_INTERVAL_SECONDS,
+    WATCHDOG_WARMUP_SECONDS,
+    WATCHDOG_MIN_SILENCE_SECONDS,
+    WATCHDOG_GAP_FACTOR,
+    WATCHDOG_DROP_RATIO,
+    WATCHDOG_MIN_BASELINE_LPS,
+    WATCHDOG_ACTION,
+    MEMWATCH_ENABLED,
+    MEMWATCH_INTERVAL_SECONDS,
+    MEMWATCH_WINDOW_SECONDS,
+    MEMWATCH_MIN_SAMPLES,
+    MEMWATCH_RSS_LIMIT_MB,
+    MEMWATCH_LIMITS_MB,
+    MEMWATCH_WARN_HOURS,
+    MEMWATCH_RECYCLE,
+    MEMWATCH_QUIET_HOURS,
+    MEMWATCH_MAX_RECYCLING,
+    PLACEMENT_ENABLED,
+    PLACEMENT_STRATEGY,
+    CONTROLLER_CORES,
+    CORES_PER_BOT,
+    BOT_PRIORITY,
+    PLACEMENT_CHECK_SECONDS,
+    PLACEMENT_HOT_PCT,
+    PLACEMENT_HOT_CHECKS,
+    FLEET_FILE,
+    FLEET_RELOAD_SECONDS,
+    BOT_TAGS,
+    STATE_DB,
+    STATE_RETENTION_DAYS,
+    STATE_MAX_EVENTS,
+    STATE_COMPACT_SECONDS,
+)
+from src.logparse import parse_chunk, pool_for, shutdown_pools
+from src.supervisor import Supervisor
+from src.watchdog import Watchdog
+from src.memtrend import MemTrend
+from src.placement import Placer, core_percents, nice_value
+from src.fleetfile import Fleet, FleetDiff, read_fleet, diff_fleet
+from src.nameindex import NameIndex, TAG_PREFIX
+from src.store import Store
+from src.payouts import PayoutSeries, PayoutStats
+from src.logstore import LogCapture
+from src.logexport import Bundle, write_bundle
+from src import offload
+from src.errortrack import AlertLimiter, ErrorEntry, ErrorTracker
+from src.metrics import (
+    REGISTRY,
+    TAIL_LINES,
+    TAIL_BYTES,
+    EMBED_EDITS,
+    EMBED_EVENT_LATENCY,
+    REST_LATENCY,
+    OFFLINE_ALERTS,
+    BOT_LAUNCHES,
+    BOTS_STARTED,
+    BOTS_READY,
+    TIME_TO_READY,
+    READY_TIMEOUTS,
+    BOT_EXITS,
+    BOT_RESTARTS,
+    CRASH_LOOPS,
+    RECOVERY_TIME,
+    BOT_DOWNTIME,
+    BOT_HANGS,
+    BOT_LOG_RATE,
+    BOT_RSS_GROWTH,
+    BOT_RSS_ETA,
+    MEMORY_WARNINGS,
+    BOT_RECYCLES,
+    PLACEMENT_MOVES,
+    CORE_LOAD,
+    FLEET_RELOADS,
+    STATE_STORE,
+    LOG_CAPTURE,
+    BOT_STDERR_LINES,
+    ERROR_FINGERPRINTS,
 )
 
 
@@ -43,10 +148,87 @@ CREATION_FLAGS = (
     | CREATE_BREAKAWAY_FROM_JOB
 )
 # -------------------------------------------------------------
-os.makedirs(LOG_DIR, exist_ok=True)
 
 # Keep rolling logs per bot, accessible to other modules
 LOG_BUFFERS: dict[str, deque[str]] = defaultdict(lambda: deque(maxlen=15))
+# stderr has its own, so an exception loop can't push stdout out of LOG_BUFFERS
+ERR_BUFFERS: dict[str, deque[str]] = defaultdict(lambda: deque(maxlen=15))
+
+# Log history: the tailers copy every byte they read into segments (src/logstore.py).
+# Created by init_state(); read it as botlogs.LOGCAPTURE, not imported by name.
+LOGCAPTURE: LogCapture | None = None
+
+def _open_capture() -> None:
+    global LOGCAPTURE
+    if LOG_SEGMENT_MB > 0 and LOGCAPTURE is None:
+        LOGCAPTURE = LogCapture(
+            LOG_DIR,
+            segment_bytes=int(LOG_SEGMENT_MB * 1024 * 1024),
+            max_bytes=int(LOG_RETENTION_MB * 1024 * 1024),
+            max_age_days=LOG_RETENTION_DAYS,
+            index_bytes=LOG_INDEX_KB * 1024,
+            index_seconds=LOG_INDEX_SECONDS,
+        )
+
+def log_range(name: str, stream: str, start: float, end: float | None = None, limit: int = 200) -> tuple[list[tuple[float, str]], bool]:
+    """
+    Captured lines of one stream between two unix times (via the segment
+    index), at most `limit`, plus whether more were in range. Blocking: call
+    it through offload.run.
+    """
+    out: list[tuple[float, str]] = []
+    if LOGCAPTURE is None:
+        return out, False
+    for ts, line in LOGCAPTURE.iter_range(name, stream, start, end):
+        if len(out) >= limit:
+            return out, True
+        out.append((ts, line.decode("utf-8", errors="replace")))
+    return out, False
+
+def export_state(name: str) -> dict:
+    """What the controller knows about one bot, for /exportlogs (plain copies; build it on the loop)."""
+    now = time.time()
+    rec = SUPERVISOR.records.get(name)
+    act = WATCHDOG.bots.get(name)
+    fit = MEMTREND.fit(name)
+    return {
+        "bot": name,
+        "exported_at": now,
+        "exe": BOT_EXECUTABLES.get(name),
+        "agent": BOT_AGENTS.get(name),
+        "state": _display_state(name),
+        "pid": bot_pids.get(name),
+        "launch_started_at": launch_started_at.get(name),
+        "last_line_at": last_seen.get(name) or None,
+        "instant_coins": instant_coins.get(name),
+        "max_coins": max_coins.get(name),
+        "depositable": trade_counts.get(name),
+        "cpu_percent": bot_cpu.get(name),
+        "rss_bytes": MEMTREND.latest(name),
+        "rss_trend": asdict(fit) if fit else None,
+        "restart_policy": SUPERVISOR.policy(name),
+        "supervisor": asdict(rec) if rec else None,
+        "watchdog": asdict(act) if act else None,
+        "stderr_lines": ERRORS.lines.get(name, 0),
+        "errors": [asdict(e) | {"id": e.id} for e in ERRORS.top(name, 50)],
+        "recent_out": list(LOG_BUFFERS.get(name, ())),
+        "recent_err": list(ERR_BUFFERS.get(name, ())),
+    }
+
+def write_export(path: str, name: str, start: float, end: float, state: dict) -> Bundle:
+    """
+    Write the /exportlogs zip for one bot to `path` (see src/logexport.py).
+    Blocking: call it through offload.run.
+    """
+    events = STORE.events_between(start, end, bot=name) if STORE is not None else []
+    return write_bundle(
+        path, name, start, end,
+        capture=LOGCAPTURE,
+        live_files={"out": os.path.join(LOG_DIR, f"{name}.log"), "err": os.path.join(LOG_DIR, f"{name}.log.err")},
+        state=state,
+        events=events,
+        max_bytes=int(EXPORT_MAX_MB * 1024 * 1024),
+    )
 
 plugin = lightbulb.Plugin("Bot Log Monitor")
 
@@ -55,12 +237,71 @@ STATUS_STATE_FILE = os.path.join(os.path.dirname(__file__), "monitor_status.json
 # Persist latest instant/max so embed has values on startup
 COIN_STATE_FILE = os.path.join(os.path.dirname(__file__), "coin_state.json")
 
+# State store + event journal (src/store.py); without it the JSON files above
+# are used. A relative STATE_DB is relative to the bot folder (where main.py
+# is), not the working directory. Agents point STATE_DB_FILE at their LOG_DIR
+# before init_state() opens it.
+_BOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+STATE_DB_FILE = os.path.join(_BOT_DIR, STATE_DB) if STATE_DB else None
+STORE: Store | None = None
+
+def _open_store() -> None:
+    global STORE
+    if STORE is not None:
+        STORE.close()
+        STORE = None
+    if not STATE_DB_FILE:
+        return
+    try:
+        STORE = Store(
+            STATE_DB_FILE,
+            retention_days=STATE_RETENTION_DAYS,
+            max_events=STATE_MAX_EVENTS,
+            compact_seconds=STATE_COMPACT_SECONDS,
+        )
+        log(f"[STATE] store opened: {STATE_DB_FILE}")
+    except Exception as e:
+        log(f"[STATE] store open failed, using JSON files: {e}")
+
+def _journal(name: str, kind: str, value: float | None = None, detail: str = "") -> None:
+    """Append to the event journal (queued; the store's writer thread commits it)."""
+    if STORE is not None:
+        STORE.event(name, kind, value, detail)
+
+def _collect_store() -> None:
+    if STORE is None:
+        return
+    STATE_STORE.set(STORE.pending(), stat="pending")
+    STATE_STORE.set(STORE.written, stat="written")
+    STATE_STORE.set(STORE.dropped, stat="dropped")
+    STATE_STORE.set(STORE.last_flush_seconds, stat="flush_seconds")
+    if STORE.last_compaction:
+        STATE_STORE.set(STORE.last_compaction["bytes"], stat="bytes")
+
+REGISTRY.add_collector(_collect_store)
+
+def _collect_logcapture() -> None:
+    if LOGCAPTURE is None:
+        return
+    LOG_CAPTURE.set(LOGCAPTURE.compressed, stat="compressed")
+    LOG_CAPTURE.set(LOGCAPTURE.deleted, stat="deleted")
+    if LOGCAPTURE.raw_bytes:
+        LOG_CAPTURE.set(round(LOGCAPTURE.raw_bytes / max(1, LOGCAPTURE.gz_bytes), 2), stat="ratio")
+    if LOGCAPTURE.last_retention:
+        LOG_CAPTURE.set(LOGCAPTURE.last_retention["segments"], stat="segments")
+        LOG_CAPTURE.set(LOGCAPTURE.last_retention["bytes"], stat="bytes")
+
+REGISTRY.add_collector(_collect_logcapture)
+
 def _persist_coin_state() -> None:
     try:
         data = {
             "instant": {k: (None if v is None else float(v)) for k, v in instant_coins.items()},
             "max": {k: (None if v is None else float(v)) for k, v in max_coins.items()},
         }
+        if STORE is not None:
+            STORE.set_state("coins", data)
+            return
         with open(COIN_STATE_FILE, "w", encoding="utf-8") as f:
             json.dump(data, f)
         log("[STATE] coin state persisted")
@@ -69,11 +310,14 @@ def _persist_coin_state() -> None:
 
 def _load_coin_state() -> None:
     try:
-        if not os.path.exists(COIN_STATE_FILE):
-            log("[STATE] no persisted coin state found")
-            return
-        with open(COIN_STATE_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f) or {}
+        data = STORE.get_state("coins") if STORE is not None else None
+        if data is None:
+            # No store, or its first start: fall back to (migrate) the JSON file
+            if not os.path.exists(COIN_STATE_FILE):
+                log("[STATE] no persisted coin state found")
+                return
+            with open(COIN_STATE_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f) or {}
         inst = data.get("instant", {})
         mx = data.get("max", {})
         # populate known bots; ignore unknown keys
@@ -93,30 +337,218 @@ def _load_coin_state() -> None:
         log(f"[STATE] coin load failed: {e}")
 
 
-# Parse: "Instant payout amount : 201.59 (201.59/2000)"
-INSTANT_RX = re.compile(
-    r"Instant\s+payout\s+amount\s*:\s*([0-9]+(?:\.[0-9]+)?)\s*\(\s*[0-9]+(?:\.[0-9]+)?\s*/\s*([0-9]+(?:\.[0-9]+)?)\s*\)",
-    re.IGNORECASE,
-)
-
 # Latest parsed Instant coins and Max, per bot
 instant_coins: dict[str, float | None] = {name: None for name in BOT_EXECUTABLES}
 max_coins: dict[str, float | None] = {name: None for name in BOT_EXECUTABLES}
 
-# Load persisted values so the embed isn't empty on startup
-_load_coin_state()
+# Payout analytics: Instant amounts per bot over time (src/payouts.py)
+PAYOUTS = PayoutSeries(samples=PAYOUT_MAX_SAMPLES, min_span=PAYOUT_MIN_SPAN_SECONDS)
+
+def _seed_payouts() -> None:
+    """Refill the series from the journal so rates survive a controller restart."""
+    if STORE is None:
+        return
+    try:
+        now = time.time()
+        events = STORE.events_between(
+            now - PAYOUT_WINDOW_HOURS * 3600, now + 1, type="instant", limit=len(BOT_EXECUTABLES) * PAYOUT_MAX_SAMPLES
+        )
+        for ev in events:
+            if ev.bot in BOT_EXECUTABLES and ev.value is not None:
+                PAYOUTS.add(ev.bot, ev.value, ev.ts)
+        log(f"[STATE] payout series seeded with {len(events)} sample(s)")
+    except Exception as e:
+        log(f"[STATE] payout seed failed: {e}")
+
+def _record_instant(name: str, value: float) -> None:
+    _journal(name, "instant", value)
+    PAYOUTS.add(name, value)
+
+def payout_stats(window_hours: float = PAYOUT_WINDOW_HOURS) -> PayoutStats:
+    return PAYOUTS.compute(list(BOT_EXECUTABLES), max_coins, window_hours=window_hours)
 
-# Strict pattern: match number immediately before "Depositable items"
-DEPOSITABLE_RE = re.compile(r"\b(\d+)\s+depositable\s+items\b", re.IGNORECASE)
+# Stderr fingerprints (src/errortrack.py), kept in the state store so known
+# errors don't alert again after a controller restart
+ERRORS = ErrorTracker(max_entries=ERROR_MAX_FINGERPRINTS)
+_error_alerts = AlertLimiter(ERROR_ALERTS_PER_HOUR, 3600)
+_errors_saved_at = 0.0
+_errors_dirty = False
+
+def _load_errors() -> None:
+    if STORE is None:
+        return
+    try:
+        data = STORE.get_state("errors")
+        if data:
+            ERRORS.restore(data, BOT_EXECUTABLES)
+            log(f"[STATE] {len(ERRORS.entries)} error fingerprint(s) loaded")
+    except Exception as e:
+        log(f"[STATE] error fingerprints not loaded: {e}")
+
+def _persist_errors(force: bool = False) -> None:
+    """Save the fingerprint table; at most once a minute unless forced (shutdown)."""
+    global _errors_saved_at, _errors_dirty
+    if STORE is None or not _errors_dirty or (not force and time.time() - _errors_saved_at < 60):
+        return
+    STORE.set_state("errors", ERRORS.snapshot())
+    _errors_saved_at = time.time()
+    _errors_dirty = False
+
+def observe_stderr(bot: lightbulb.BotApp, name: str, lines: list[str]) -> None:
+    """Fingerprint a bot's stderr lines; alert on fingerprints not seen before."""
+    global _errors_dirty
+    now = time.time()
+    ERR_BUFFERS[name].extend(lines)
+    BOT_STDERR_LINES.inc(len(lines), bot=name)
+    for text in lines:
+        entry = ERRORS.observe(name, text, now)
+        _errors_dirty = True
+        if entry is None:
+            continue
+        ERROR_FINGERPRINTS.inc(bot=name)
+        _journal(name, "error", None, entry.sample)
+        log(f"[{name}] new stderr error {entry.id}: {entry.sample[:200]}")
+        if ERROR_ALERTS and not HEADLESS and _error_alerts.allow(name, now):
+            asyncio.create_task(_send_error_alert(bot, name, entry))
+    _persist_errors()
+
+async def _send_error_alert(bot: lightbulb.BotApp, name: str, entry: ErrorEntry):
+    try:
+        await bot.rest.create_message(
+            ALERT_CHANNEL_ID,
+            f"🧯 New error from `{name}` (`{entry.id}`, see /errors):\n```\n{entry.sample[:1500]}\n```",
+        )
+    except Exception as e:
+        log(f"[{name}] ERROR sending error alert: {e}")
+
+# Crash recovery: restart policy decisions plus restart/downtime/MTTR stats,
+# persisted next to the coin state (agents point this at their LOG_DIR)
+SUPERVISOR_STATE_FILE = os.path.join(os.path.dirname(__file__), "supervisor_state.json")
+SUPERVISOR = Supervisor(
+    SUPERVISOR_STATE_FILE,
+    policies=RESTART_POLICIES,
+    default_policy=DEFAULT_RESTART_POLICY,
+    backoff_base=RESTART_BACKOFF_BASE_SECONDS,
+    backoff_max=RESTART_BACKOFF_MAX_SECONDS,
+    loop_max_exits=CRASH_LOOP_MAX_EXITS,
+    loop_window=CRASH_LOOP_WINDOW_SECONDS,
+)
+
+def _load_supervisor_state() -> None:
+    SUPERVISOR.path = SUPERVISOR_STATE_FILE
+    SUPERVISOR.store = STORE
+    try:
+        SUPERVISOR.load(BOT_EXECUTABLES)
+        held = [n for n in BOT_EXECUTABLES if SUPERVISOR.is_held(n)]
+        log("[SUPERVISOR] state loaded" + (f"; held after a crash loop: {', '.join(held)}" if held else ""))
+    except Exception as e:
+        log(f"[SUPERVISOR] state load failed: {e}")
+
+_state_ready = False
+
+def init_state() -> None:
+    """
+    Open the log capture and the state store and load what was persisted
+    (coins, payout series, error fingerprints, supervisor records).
+    Importing this module touches nothing on disk: load() calls this on the
+    controller, agent.py after pointing the state files at its LOG_DIR.
+    Runs once.
+    """
+    global _state_ready
+    if _state_ready:
+        return
+    _state_ready = True
+    os.makedirs(LOG_DIR, exist_ok=True)
+    _open_capture()
+    _open_store()
+    # Load persisted values so the embed isn't empty on startup
+    _load_coin_state()
+    _seed_payouts()
+    _load_errors()
+    _load_supervisor_state()
+
+def _collect_downtime() -> None:
+    now = time.time()
+    for name, rec in SUPERVISOR.records.items():
+        BOT_DOWNTIME.set(round(rec.downtime(now), 1), bot=name)
+
+REGISTRY.add_collector(_collect_downtime)
+
+# Hang watchdog: per-bot log-rate EWMAs fed by the tailers, checked by _watchdog_loop
+WATCHDOG = Watchdog(
+    fast_half_life=10.0,
+    slow_half_life=600.0,
+    warmup=WATCHDOG_WARMUP_SECONDS,
+    min_silence=WATCHDOG_MIN_SILENCE_SECONDS,
+    gap_factor=WATCHDOG_GAP_FACTOR,
+    drop_ratio=WATCHDOG_DROP_RATIO,
+    min_baseline=WATCHDOG_MIN_BASELINE_LPS,
+)
+_watchdog_task: asyncio.Task | None = None
+_hung_killed: set[str] = set()  # terminated by the watchdog; the exit is reported as a hang
+
+def _collect_log_rates() -> None:
+    for name, act in WATCHDOG.bots.items():
+        if act.fast is not None:
+            BOT_LOG_RATE.set(round(act.fast, 3), bot=name, window="recent")
+        if act.slow is not None:
+            BOT_LOG_RATE.set(round(act.slow, 3), bot=name, window="baseline")
+
+REGISTRY.add_collector(_collect_log_rates)
+
+# Memory watch: RSS trend per bot (sampled by PID) and the proactive recycler
+MEMTREND = MemTrend(window=MEMWATCH_WINDOW_SECONDS, min_samples=MEMWATCH_MIN_SAMPLES, min_r2=0.6)
+_memwatch_task: asyncio.Task | None = None
+_recycling: set[str] = set()
+# PID each bot's current watcher is following
+bot_pids: dict[str, int] = {}
+
+# CPU placement: cores + priority per bot, applied by PID when its watcher starts;
+# _placement_loop measures per-core/per-bot CPU and moves bots that stay hot
+PLACER = Placer(
+    cpu_count=psutil.cpu_count() or 1,
+    reserved=CONTROLLER_CORES,
+    per_bot=CORES_PER_BOT,
+    strategy=PLACEMENT_STRATEGY,
+    hot_pct=PLACEMENT_HOT_PCT,
+    hot_checks=PLACEMENT_HOT_CHECKS,
+)
+_placement_task: asyncio.Task | None = None
+_placement_lock = asyncio.Lock()
+_bot_procs: dict[str, psutil.Process] = {}  # kept so cpu_percent() measures since the previous check
+_core_times = None                          # psutil.cpu_times(percpu=True) at the previous check
+core_load: list[float] = []                 # per-core % over the last check
+bot_cpu: dict[str, float] = {}              # per-bot % over the last check (100 = one core)
+# Placement changes with per-core load before and after: {"at", "reason", "moves", "before", "after"}
+placement_log: deque = deque(maxlen=20)
 
 # State
 startup_detected = {name: False for name in BOT_EXECUTABLES}
 trade_counts = {name: 0 for name in BOT_EXECUTABLES}
 status_message_id: int | None = None
-last_seen: dict[str, float] = {name: 0.0 for name in BOT_EXECUTABLES}  # heartbeat timestamps
+BOTS_STARTED.set_function(lambda: sum(1 for v in startup_detected.values() if v))
+last_seen: dict[str, float] = {name: 0.0 for name in BOT_EXECUTABLES}  # last tailed line, per bot
+
+# Lifecycle: "stopped" -> "launching" -> "ready" (or "unready" once READY_TIMEOUT_SECONDS
+# pass without a readiness match); "ready" <-> "hung" is the watchdog's call.
+# startup_detected still just means "a process exists".
+bot_state: dict[str, str] = {name: "stopped" for name in BOT_EXECUTABLES}
+launch_started_at: dict[str, float] = {}
+_launch_seq: dict[str, int] = {}      # per launch, so an old deadline timer can tell it's stale
+_launch_pending: set[str] = set()     # handed to run_and_monitor_bot, not spawned yet
+_watch_gen: dict[str, int] = {}       # newest PID watcher per bot; older ones stand down
+BOTS_READY.set_function(lambda: sum(1 for n in BOT_EXECUTABLES if _display_state(n) == "ready"))
+STATE_ICONS = {"ready": "✅", "launching": "⏳", "unready": "⚠️", "stopped": "❌", "restarting": "🔁", "held": "🛑", "hung": "🥶"}
+
+# Crash recovery: a stop/restart path marks the bot before terminating it so
+# the watcher knows the exit was intentional; pending supervisor restarts
+_stop_requested: set[str] = set()
+_restart_tasks: dict[str, asyncio.Task] = {}
+# Processes spawned directly by us (non-Windows), kept for their exit code
+_children: dict[int, asyncio.subprocess.Process] = {}
 
 # Heartbeat / refresh tuning
-STALE_AFTER_SECONDS = 300  # (9) mark as stale if no log within 5 minutes
+STALE_AFTER_SECONDS = 300  # panel health: warn if no log line within 5 minutes
 _periodic_task: asyncio.Task | None = None
 
 # Serialize embed edits to avoid race conditions + debounce/throttle (4)
@@ -126,55 +558,202 @@ _update_scheduled = False
 MIN_EDIT_INTERVAL = 5.0  # seconds; tune 3–8s
 _last_edit_ts: float = 0.0
 _pending_force = False
+# Oldest state change not yet shown in the embed (event-to-embed latency)
+_dirty_since: float | None = None
 # (_embed_lock and _update_scheduled are already defined above)
 
+# Launch stagger for start_all_bots
+LAUNCH_STAGGER_SECONDS = 0.75  # tune 0.3–1.5s
+LAUNCH_JITTER_SECONDS = 0.25   # +/- random jitter
+
 # One tail task per bot *and* stream ("out" for stdout, "err" for stderr)
 TAIL_TASKS: dict[tuple[str, str], asyncio.Task] = {}
+# Bytes read per tailer poll (a chunk is parsed in one go)
+TAIL_CHUNK_BYTES = 256 * 1024
+
+# Agent mode (agent.py): there is no Discord client; tailed lines and exits
+# go to the listeners below and the agent forwards them to the controller
+HEADLESS = False
+AGENT_ID: str | None = None
+# fn(name, stream, text) for every tailed line
+LINE_LISTENERS: list[Callable[[str, str, str], None]] = []
+# fn(name, kind, detail); kinds are listed in src/fleetproto.py
+EVENT_LISTENERS: list[Callable[[str, str, str], None]] = []
+# fn(diff) after a fleet.json change has been applied
+FLEET_LISTENERS: list[Callable[[FleetDiff], None]] = []
+_fleet_task: asyncio.Task | None = None  # polls FLEET_FILE
+_fleet_version = 0                        # bumped by apply_fleet; name_index() rebuilds on change
+_name_index: tuple[tuple[int, int], NameIndex] | None = None
+
+
+def name_index() -> NameIndex:
+    """Autocomplete/selector index over BOT_EXECUTABLES and BOT_TAGS, rebuilt when the fleet changes."""
+    global _name_index
+    key = (_fleet_version, len(BOT_EXECUTABLES))
+    if _name_index is None or _name_index[0] != key:
+        _name_index = (key, NameIndex(BOT_EXECUTABLES, BOT_TAGS))
+    return _name_index[1]
+
+
+def name_choices(value: str | None, *, multi: bool = False) -> list[hikari.CommandChoice]:
+    """
+    Autocomplete for a bot option. With multi=True the option is a selector
+    ("bot1, bot2, tag:eu"): only the part after the last comma is completed,
+    and matching tags are offered too.
+    """
+    ix = name_index()
+    value = value or ""
+    head, sep, query = value.rpartition(",") if multi else ("", "", value)
+    query = query.strip()
+    keep = f"{head}{sep} " if sep else ""
+    out: list[tuple[str, str]] = []
+    if multi:
+        tag_query = query[len(TAG_PREFIX):] if query.lower().startswith(TAG_PREFIX) else query
+        for tag in ix.search_tags(tag_query, limit=25 if tag_query != query else 5):
+            out.append((f"{TAG_PREFIX}{tag} ({len(ix.tags[tag])} bots)", f"{TAG_PREFIX}{tag}"))
+        if tag_query != query:
+            return _choices(out, keep)
+    out.extend((n, n) for n in ix.search(query, limit=25 - len(out)))
+    return _choices(out, keep)
+
+
+def _choices(pairs: list[tuple[str, str]], keep: str) -> list[hikari.CommandChoice]:
+    choices = []
+    for label, value in pairs[:25]:
+        full = keep + value
+        if len(full) > 100:  # Discord's limit for a choice value
+            full = value
+        choices.append(hikari.CommandChoice(name=(keep + label)[-100:], value=full))
+    return choices
+
+
+def _runs_here(name: str) -> bool:
+    """True if this process launches/monitors `name` (bots in BOT_AGENTS run on that agent)."""
+    return BOT_AGENTS.get(name) == AGENT_ID
+
+
+def _emit_event(name: str, kind: str, detail: str = "") -> None:
+    _journal(name, kind, _number(detail), detail)
+    for fn in list(EVENT_LISTENERS):
+        try:
+            fn(name, kind, detail)
+        except Exception as e:
+            log(f"[{name}] event listener error: {e}")
 
-def _is_already_running(exe_full_path: str, workdir: str) -> bool:
+
+def _number(text: str) -> float | None:
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _ready_pattern(name: str) -> str:
+    return READY_PATTERNS.get(name, DEFAULT_READY_PATTERN)
+
+
+def _display_state(name: str) -> str:
+    """bot_state, except that a bot with no process is "stopped" (or waiting on the supervisor)."""
+    if not startup_detected.get(name):
+        if name in _restart_tasks:
+            return "restarting"
+        if SUPERVISOR.is_held(name):
+            return "held"
+        if bot_state.get(name) in ("restarting", "held"):
+            return bot_state[name]  # as reported by the bot's agent
+        return "stopped"
+    return bot_state.get(name, "ready")
+
+
+def _mark_launching(bot: lightbulb.BotApp, name: str) -> None:
+    """A fresh process was spawned: wait for its readiness pattern."""
+    seq = _launch_seq.get(name, 0) + 1
+    _launch_seq[name] = seq
+    bot_state[name] = "launching"
+    launch_started_at[name] = time.time()
+    _mark_dirty()
+    asyncio.create_task(_ready_deadline(bot, name, seq))
+
+
+def _mark_ready(name: str, *, attached: bool = False) -> None:
+    """Readiness seen (or we attached to a process that was already running)."""
+    was = bot_state.get(name)
+    bot_state[name] = "ready"
+    started = launch_started_at.pop(name, None)
+    if not attached and started is not None:
+        elapsed = time.time() - started
+        TIME_TO_READY.observe(elapsed, bot=name)
+        _emit_event(name, "ready", f"{elapsed:.3f}")
+        log(f"[{name}] READY after {elapsed:.1f}s" + (" (past the deadline)" if was == "unready" else ""))
+    WATCHDOG.watch(name, time.time())
+    recovered = SUPERVISOR.on_ready(name)
+    if recovered is not None:
+        RECOVERY_TIME.observe(recovered, bot=name)
+        log(f"[{name}] recovered {recovered:.1f}s after it went down")
+    _mark_dirty()
+
+
+def _mark_stopped(name: str) -> None:
+    bot_state[name] = "stopped"
+    launch_started_at.pop(name, None)
+
+
+def _expect_stop(name: str, *, restart: bool = False) -> None:
     """
-    Return True if a process with this exact exe path is already running.
-    Fallback: match by process name + cwd (for cases where exe path is unavailable).
+    Call before terminating `name` on purpose: its exit is then not a crash,
+    a pending supervisor restart is dropped, and (unless it is a restart)
+    an open downtime incident ends here.
     """
-    exe_full_path = os.path.abspath(exe_full_path).lower()
-    workdir = os.path.abspath(workdir).lower()
-    exe_name = os.path.basename(exe_full_path)
+    _stop_requested.add(name)
+    task = _restart_tasks.pop(name, None)
+    if task is not None:
+        task.cancel()
+    if not restart:
+        SUPERVISOR.on_manual_stop(name)
+
+
+def _launching_count() -> int:
+    return sum(
+        1
+        for n in BOT_EXECUTABLES
+        if n in _launch_pending or (bot_state.get(n) == "launching" and startup_detected.get(n))
+    )
 
-    for p in psutil.process_iter(["pid", "name", "exe", "cwd", "cmdline"]):
-        try:
-            # Skip ourselves
-            if p.pid == os.getpid():
-                continue
 
-            p_exe = (p.info.get("exe") or "").lower()
-            p_name = (p.info.get("name") or "").lower()
-            p_cwd  = (p.info.get("cwd") or "").lower()
+async def _ready_deadline(bot: lightbulb.BotApp, name: str, seq: int):
+    """Flag a launch that hasn't become ready within READY_TIMEOUT_SECONDS."""
+    await asyncio.sleep(READY_TIMEOUT_SECONDS)
+    if _launch_seq.get(name) != seq or _display_state(name) != "launching":
+        return  # relaunched, ready, or gone in the meantime
+    bot_state[name] = "unready"
+    READY_TIMEOUTS.inc(bot=name)
+    _mark_dirty()
+    detail = f"no match for `{_ready_pattern(name)}` within {READY_TIMEOUT_SECONDS}s"
+    log(f"[{name}] NOT READY: {detail}")
+    _emit_event(name, "unready", detail)
+    if HEADLESS:
+        return
+    _request_update(bot)
+    await _send_unready_alert(bot, name, detail)
 
-            # Strong match: exact exe path
-            if p_exe and os.path.abspath(p_exe).lower() == exe_full_path:
-                return True
 
-            # Fallback: match by name + cwd
-            if p_name == exe_name.lower() and p_cwd == workdir:
-                return True
+async def _send_unready_alert(bot: lightbulb.BotApp, name: str, detail: str):
+    try:
+        await bot.rest.create_message(
+            ALERT_CHANNEL_ID,
+            f"⏳ `{name}` is running but not ready: {detail}",
+        )
+    except Exception as e:
+        log(f"[{name}] ERROR sending not-ready alert: {e}")
 
-            # Extra fallback: if exe missing, check cmdline[0]
-            cmd0 = ""
-            try:
-                cl = p.info.get("cmdline") or []
-                if cl:
-                    cmd0 = os.path.abspath(cl[0]).lower()
-            except Exception:
-                pass
-            if cmd0 and cmd0 == exe_full_path:
-                return True
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-    return False
 
 def _persist_status_id(msg_id: int) -> None:
     """(2) Persist the status message id on disk."""
     try:
+        if STORE is not None:
+            STORE.set_state("status_message_id", int(msg_id))
+            log(f"[STATE] persisted status_message_id={msg_id}")
+            return
         with open(STATUS_STATE_FILE, "w", encoding="utf-8") as f:
             json.dump({"status_message_id": int(msg_id)}, f)
         log(f"[STATE] persisted status_message_id={msg_id}")
@@ -184,6 +763,10 @@ def _persist_status_id(msg_id: int) -> None:
 def _load_status_id() -> int | None:
     """(2) Load persisted status message id if present."""
     try:
+        mid = STORE.get_state("status_message_id") if STORE is not None else None
+        if mid is not None:
+            log(f"[STATE] loaded status_message_id={mid}")
+            return int(mid)
         if os.path.exists(STATUS_STATE_FILE):
             with open(STATUS_STATE_FILE, "r", encoding="utf-8") as f:
                 data = json.load(f)
@@ -201,7 +784,7 @@ def _tailer_running(name: str, label: str) -> bool:
     return t is not None and not t.done() and not t.cancelled()
 
 
-def _start_tailer(bot: lightbulb.BotApp, name: str, log_path: str, label: str):
+def _start_tailer(bot: lightbulb.BotApp, name: str, log_path: str, label: str, from_start: bool = False):
     """
     Start a single tailer per (bot, stream). `label` should be "out" or "err".
     Both streams append into LOG_BUFFERS[name].
@@ -211,7 +794,7 @@ def _start_tailer(bot: lightbulb.BotApp, name: str, log_path: str, label: str):
         log(f"[{name}] tailer already running for {label} -> {log_path}")
         return
     log(f"[{name}] starting tailer for {label} -> {log_path}")
-    TAIL_TASKS[key] = asyncio.create_task(_tail_log_and_parse(bot, name, log_path))
+    TAIL_TASKS[key] = asyncio.create_task(_tail_log_and_parse(bot, name, log_path, label, from_start))
 
 def _stop_tailer(name: str):
     """
@@ -231,14 +814,17 @@ async def _build_embed() -> hikari.Embed:
 
     header = (
         "Bot".ljust(20)
-        + "Started".ljust(10)
+        + "State".ljust(10)
         + "Depo".ljust(6)
         + "Instant".ljust(16)  # shows "current/max"
     )
+    stats = payout_stats() if PAYOUT_EMBED_COLUMN else None
+    if stats is not None:
+        header += "C/h".rjust(7)
     lines = [header, "-" * len(header)]
 
     for name in BOT_EXECUTABLES:
-        started = "✅" if startup_detected.get(name) else "❌"
+        started = STATE_ICONS[_display_state(name)]
         depo = str(trade_counts.get(name, 0))
         ic = instant_coins.get(name)
         mx = max_coins.get(name)
@@ -250,12 +836,16 @@ async def _build_embed() -> hikari.Embed:
         else:
             inst_str = "—"
 
-        lines.append(
+        row = (
             name.ljust(20)
             + started.ljust(10)
             + depo.ljust(6)
             + inst_str.ljust(16)
         )
+        if stats is not None:
+            rate = stats.rate[len(lines) - 2]  # rows follow BOT_EXECUTABLES order
+            row += ("—" if rate != rate else f"{rate:.1f}").rjust(7)
+        lines.append(row)
 
     return hikari.Embed(
         title="📊 v4 Bot Log Monitor",
@@ -265,9 +855,16 @@ async def _build_embed() -> hikari.Embed:
 
 
 
+def _mark_dirty() -> None:
+    """Note that state changed and the embed is now behind."""
+    global _dirty_since
+    if _dirty_since is None:
+        _dirty_since = time.time()
+
+
 async def _update_embed(bot: lightbulb.BotApp, *, force: bool = False):
     """Edit the status embed, respecting a minimum interval to avoid rate limits."""
-    global status_message_id, _last_edit_ts
+    global status_message_id, _last_edit_ts, _dirty_since
     if not status_message_id:
         log("[EMBED] no status_message_id; skipping update")
         return
@@ -278,32 +875,49 @@ async def _update_embed(bot: lightbulb.BotApp, *, force: bool = False):
         return
 
     async with _embed_lock:
+        # The embed built below covers every change made up to this point
+        dirty, _dirty_since = _dirty_since, None
         embed = await _build_embed()
         try:
-            await bot.rest.edit_message(ALERT_CHANNEL_ID, status_message_id, embed=embed)
+            with REST_LATENCY.time(op="edit_message"):
+                await bot.rest.edit_message(ALERT_CHANNEL_ID, status_message_id, embed=embed)
             _last_edit_ts = time.time()
+            EMBED_EDITS.inc(result="ok")
+            if dirty is not None:
+                EMBED_EVENT_LATENCY.observe(_last_edit_ts - dirty)
             log(f"[EMBED] edited message id={status_message_id}")
         except hikari.NotFoundError:
             # Message was deleted: recreate and persist
             log("[EMBED] status message not found; recreating")
-            msg = await bot.rest.create_message(ALERT_CHANNEL_ID, embed=embed)
+            with REST_LATENCY.time(op="create_message"):
+                msg = await bot.rest.create_message(ALERT_CHANNEL_ID, embed=embed)
             status_message_id = msg.id
             _persist_status_id(status_message_id)
             _last_edit_ts = time.time()
+            EMBED_EDITS.inc(result="recreated")
         except Exception as e:
+            EMBED_EDITS.inc(result="failed")
+            if dirty is not None and _dirty_since is None:
+                _dirty_since = dirty
             log(f"[EMBED] update failed: {e}")
 
 
 async def _schedule_update(bot: lightbulb.BotApp, *, debounce_seconds: float = 2.0, force: bool = False):
     """Coalesce multiple update requests and apply one edit after a debounce window."""
     global _update_scheduled, _pending_force
+    if HEADLESS:
+        return
     _pending_force = _pending_force or force  # any caller can request a force
 
     if _update_scheduled:
         return
     _update_scheduled = True
     try:
-        await asyncio.sleep(debounce_seconds)
+        # Wait out the debounce, and the edit throttle too; otherwise
+        # _update_embed would skip the edit and the change would sit unseen
+        # until the next periodic refresh
+        throttle = MIN_EDIT_INTERVAL - (time.time() - _last_edit_ts)
+        await asyncio.sleep(debounce_seconds if _pending_force else max(debounce_seconds, throttle))
         # Try a normal update; if it’s still within MIN_EDIT_INTERVAL and we have a force pending,
         # call with force to push it through (use sparingly).
         await _update_embed(bot, force=_pending_force)
@@ -312,95 +926,144 @@ async def _schedule_update(bot: lightbulb.BotApp, *, debounce_seconds: float = 2
         _update_scheduled = False
 
 
-async def _tail_log_and_parse(bot: lightbulb.BotApp, name: str, log_path: str):
+def _request_update(bot: lightbulb.BotApp) -> None:
+    """Schedule a debounced embed update without waiting for it."""
+    if not _update_scheduled and not HEADLESS:
+        asyncio.create_task(_schedule_update(bot))
+
+
+async def _parse(name: str, data: bytes, stream: str = "out"):
+    """Parse a chunk inline, or in this bot's worker process if PARSE_WORKERS is set."""
+    # Every line is needed when it is echoed, forwarded or fingerprinted (stderr);
+    # otherwise just the buffer's worth
+    keep = None if (ECHO_BOT_LINES or LINE_LISTENERS or stream == "err") else LOG_BUFFERS[name].maxlen
+    # Only look for readiness until it's been seen
+    ready = _ready_pattern(name) if bot_state.get(name) in ("launching", "unready") else None
+    if PARSE_WORKERS <= 0:
+        return parse_chunk(data, keep, ready)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(pool_for(name, PARSE_WORKERS), parse_chunk, data, keep, ready)
+
+
+async def _ingest(bot: lightbulb.BotApp, name: str, label: str, data: bytes):
+    """
+    Parse one read of whole lines from a bot's log and apply it: buffers,
+    stderr fingerprints, readiness, depositable items and the payout amounts,
+    with their journal entries and embed updates. The tailer calls this per
+    read; benchmarks/replay.py feeds recorded logs through it.
+    """
+    res = await _parse(name, data, label)
+
+    TAIL_LINES.inc(res.line_count, bot=name, stream=label)
+    TAIL_BYTES.inc(res.byte_count, bot=name, stream=label)
+    for text in res.lines:
+        if ECHO_BOT_LINES:
+            log(f"[{name}] {text}")  # echo to your console once per real line
+        for fn in LINE_LISTENERS:
+            fn(name, label, text)
+    if label == "err":
+        observe_stderr(bot, name, res.lines)
+    else:
+        LOG_BUFFERS[name].extend(res.lines)
+    if res.line_count:
+        last_seen[name] = time.time()
+        WATCHDOG.observe(name, res.line_count, last_seen[name])
+
+    if res.ready and bot_state.get(name) in ("launching", "unready"):
+        _mark_ready(name)
+        _request_update(bot)
+
+    # Depositable items
+    if res.depo is not None and trade_counts.get(name) != res.depo:
+        trade_counts[name] = res.depo
+        _journal(name, "depositable", res.depo)
+        _mark_dirty()
+        log(f"[{name}] UPDATED: Depositable items -> {res.depo}")
+        _request_update(bot)
+
+    # Instant payout amount : <coins> (<current>/<max>)  -> capture coins and max
+    changed = False
+    for value in res.instants:  # each change is a payout sample, not just the chunk's last
+        if instant_coins.get(name) != value:
+            instant_coins[name] = value
+            _record_instant(name, value)
+            changed = True
+    if changed:
+        log(f"[{name}] UPDATED: Instant -> {res.instant:.2f}")
+    if res.max is not None and max_coins.get(name) != res.max:
+        max_coins[name] = res.max
+        _journal(name, "max", res.max)
+        log(f"[{name}] UPDATED: Max -> {res.max:.0f}")
+        changed = True
+
+    if changed:
+        _mark_dirty()
+        _persist_coin_state()
+        _request_update(bot)
+    return res
+
+
+async def _tail_log_and_parse(
+    bot: lightbulb.BotApp, name: str, log_path: str, label: str = "out", from_start: bool = False
+):
     """Follow the log file and reuse your existing parsing + embed updates.
        Also parses 'Instant payout amount : <coins> (<current>/<max>)' to update Instant coins + Max,
-       and persists the latest values to disk when they change."""
+       and persists the latest values to disk when they change.
+       Reads in chunks of whole lines; see src/logparse.py for the parsing itself.
+       `from_start` reads a freshly spawned bot's log from the top so early
+       lines (the readiness line in particular) aren't missed."""
     try:
-        # Ensure regex + state exist (in case not defined elsewhere yet)
-        rx = globals().get("INSTANT_RX")
-        if rx is None:
-            globals()["INSTANT_RX"] = re.compile(
-                r"Instant\s+payout\s+amount\s*:\s*([0-9]+(?:\.[0-9]+)?)\s*\(\s*[0-9]+(?:\.[0-9]+)?\s*/\s*([0-9]+(?:\.[0-9]+)?)\s*\)",
-                re.IGNORECASE,
-            )
-            rx = globals()["INSTANT_RX"]
-
-        if "instant_coins" not in globals():
-            globals()["instant_coins"] = {bn: None for bn in BOT_EXECUTABLES}
-        if "max_coins" not in globals():
-            globals()["max_coins"] = {bn: None for bn in BOT_EXECUTABLES}
-
         # Wait until the file exists (handles the "already running" case too)
-        while not os.path.exists(log_path):
+        while not await offload.exists(log_path):
             await asyncio.sleep(0.5)
 
         log(f"[{name}] tailer attached -> {log_path}")
 
-        # Start at end; change to 0 if you want full replay
+        pending = b""  # partial last line from the previous read
+        # Start at end unless this is a fresh launch
         with open(log_path, "rb", buffering=0) as f:
-            f.seek(0, os.SEEK_END)
-            while True:
-                line = f.readline()
-                if not line:
-                    await asyncio.sleep(0.2)
-                    continue
-
-                text = line.decode("utf-8", errors="ignore").rstrip()
-                log(f"[{name}] {text}")  # echo to your console once per real line
-                LOG_BUFFERS[name].append(text)
-                # last_seen[name] = time.time()  # keep commented if you've removed 'stale'
-
-                # Depositable items
-                m = DEPOSITABLE_RE.search(text)
-                if m:
-                    new_val = int(m.group(1))
-                    if trade_counts.get(name) != new_val:
-                        trade_counts[name] = new_val
-                        log(f"[{name}] UPDATED: Depositable items -> {new_val}")
-                        try:
-                            await _schedule_update(bot)  # or _schedule_update(bot) if you prefer debounce
-                        except Exception as e:
-                            log(f"[{name}] ERROR updating embed on keyword: {e}")
-
-                # Instant payout amount : <coins> (<current>/<max>)  -> capture coins and max
-                p = rx.search(text)
-                if p:
-                    coins_val = None
-                    max_val = None
-                    try:
-                        coins_val = float(p.group(1))
-                    except ValueError:
-                        pass
-                    try:
-                        max_val = float(p.group(2))
-                    except ValueError:
-                        pass
-
-                    changed = False
-                    if coins_val is not None and globals()["instant_coins"].get(name) != coins_val:
-                        globals()["instant_coins"][name] = coins_val
-                        log(f"[{name}] UPDATED: Instant -> {coins_val:.2f}")
-                        changed = True
-                    if max_val is not None and globals()["max_coins"].get(name) != max_val:
-                        globals()["max_coins"][name] = max_val
-                        log(f"[{name}] UPDATED: Max -> {max_val:.0f}")
-                        changed = True
-
-                    if changed:
-                        # Persist to JSON if the helper is available
-                        try:
-                            persist_fn = globals().get("_persist_coin_state")
-                            if callable(persist_fn):
-                                persist_fn()
-                        except Exception as e:
-                            log(f"[{name}] coin persist error: {e}")
-
-                        # Refresh embed
-                        try:
-                            await _schedule_update(bot)  # or await _schedule_update(bot) if you prefer debounce
-                        except Exception as e:
-                            log(f"[{name}] ERROR updating embed on instant: {e}")
+            try:
+                if not from_start:
+                    # Still the file the capture was following? Then nothing is skipped
+                    resume = LOGCAPTURE.resume_offset(name, label, f) if LOGCAPTURE else None
+                    if resume is not None:
+                        f.seek(resume)
+                        log(f"[{name}] {label}: resuming capture at byte {resume}")
+                    else:
+                        f.seek(0, os.SEEK_END)
+                if LOGCAPTURE is not None:
+                    LOGCAPTURE.attach(name, label, f)
+                while True:
+                    chunk = f.read(TAIL_CHUNK_BYTES)
+                    if not chunk and os.fstat(f.fileno()).st_size < f.tell():
+                        # Truncated underneath us (bot relaunched into the same file)
+                        f.seek(0)
+                        pending = b""
+                        continue
+                    if chunk:
+                        data = pending + chunk
+                        cut = data.rfind(b"\n") + 1
+                        data, pending = data[:cut], data[cut:]
+                        if not data:
+                            continue
+                    elif pending:
+                        # Nothing more came; treat the partial line as a line (like readline did)
+                        data, pending = pending, b""
+                    else:
+                        await asyncio.sleep(0.2)
+                        continue
+
+                    if LOGCAPTURE is not None:
+                        LOGCAPTURE.append(name, label, data, f.tell() - len(pending))
+                    await _ingest(bot, name, label, data)
+
+                    if len(chunk) < TAIL_CHUNK_BYTES:
+                        # Caught up; don't spin on a file that grows a line at a time
+                        await asyncio.sleep(0.2)
+            finally:
+                # Close the segment while the live file is still open (its resume point is saved)
+                if LOGCAPTURE is not None:
+                    LOGCAPTURE.close(name, label)
 
     except asyncio.CancelledError:
         log(f"[{name}] tailer cancelled")
@@ -425,8 +1088,7 @@ async def _spawn_via_powershell(path: str, cwd: str, log_path: str, err_log_path
 
     # Clean any stale pid file first
     try:
-        if os.path.exists(pid_file):
-            os.remove(pid_file)
+        await offload.remove(pid_file)
     except Exception:
         pass
 
@@ -463,12 +1125,10 @@ async def _spawn_via_powershell(path: str, cwd: str, log_path: str, err_log_path
     pid = None
     for _ in range(50):  # up to ~5s
         try:
-            if os.path.exists(pid_file):
-                with open(pid_file, "r", encoding="ascii", errors="ignore") as f:
-                    txt = f.read().strip()
-                if txt.isdigit():
-                    pid = int(txt)
-                    break
+            txt = (await offload.read_text(pid_file) or "").strip()
+            if txt.isdigit():
+                pid = int(txt)
+                break
         except Exception:
             pass
         await asyncio.sleep(0.1)
@@ -481,41 +1141,659 @@ async def _spawn_via_powershell(path: str, cwd: str, log_path: str, err_log_path
 
 
 
+async def _spawn_direct(path: str, cwd: str, log_path: str, err_log_path: str) -> int:
+    """
+    Non-Windows launch (used by the fake fleet in benchmarks/): exec the file
+    directly with stdout/stderr redirected into the log files, in its own
+    session so it outlives the controller like the PowerShell path does.
+    """
+    log(f"[SPAWN] launching: {path} (cwd={cwd}) -> out={log_path} err={err_log_path}")
+    with open(log_path, "wb") as out, open(err_log_path, "wb") as err:
+        proc = await asyncio.create_subprocess_exec(
+            path,
+            cwd=cwd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=out,
+            stderr=err,
+            start_new_session=True,
+        )
+    _children[proc.pid] = proc
+    log(f"[SPAWN] child PID={proc.pid}")
+    return proc.pid
+
+
+async def _spawn_process(path: str, cwd: str, log_path: str, err_log_path: str) -> int:
+    """Launch a bot detached from the controller and return its PID."""
+    if os.name == "nt":
+        return await _spawn_via_powershell(path, cwd, log_path, err_log_path)
+    return await _spawn_direct(path, cwd, log_path, err_log_path)
+
+
 async def _watch_pid_and_alert(bot: lightbulb.BotApp, name: str, pid: int):
     """Poll the spawned process by PID; when it exits, update embed and alert."""
+    gen = _watch_gen[name] = _watch_gen.get(name, 0) + 1
+    bot_pids[name] = pid
+    if PLACEMENT_ENABLED:
+        await _place_bot(name, pid)
     try:
-        p = psutil.Process(pid)
+        p = await offload.run("watch_pid", psutil.Process, pid)
     except psutil.Error:
         p = None
 
     if p is not None:
         try:
-            while p.is_running():
+            while await offload.run("watch_pid", p.is_running):
                 await asyncio.sleep(2)
         except psutil.Error:
             pass
 
-    # Process is gone
+    if _watch_gen.get(name) != gen:
+        # Relaunched (e.g. /restartall) before we noticed; the new watcher owns the state now
+        if name in BOT_EXECUTABLES:
+            log(f"[{name}] old process exited (pid={pid}); already relaunched")
+        else:
+            log(f"[{name}] process exited (pid={pid}); removed from the fleet")
+        return
+
+    # Process is gone (read the stop marker before awaiting: a relaunch clears it)
+    intentional = name in _stop_requested
+    _stop_requested.discard(name)
     startup_detected[name] = False
+    bot_pids.pop(name, None)
+    MEMTREND.forget(name)
+    PLACER.forget(name)
+    _bot_procs.pop(name, None)
+    _mark_stopped(name)
     _stop_tailer(name)
+    code = await _exit_code(pid, p)
+    detail = f"pid={pid}" + ("" if code is None else f" exit={code}")
+    if name in _hung_killed:
+        _hung_killed.discard(name)
+        detail += " killed by the watchdog (hung)"
+
+    if intentional:
+        BOT_EXITS.inc(bot=name, kind="stopped")
+        log(f"[{name}] stopped on request ({detail})")
+        _emit_event(name, "stopped", detail)
+        if not HEADLESS:
+            _request_update(bot)
+        return
+
+    BOT_EXITS.inc(bot=name, kind="clean" if code == 0 else "crash")
+    decision = SUPERVISOR.on_exit(name, code)
+    log(f"[{name}] exited unexpectedly ({detail}); supervisor: {decision.action} ({decision.reason})")
+    note = ""
+    if decision.action == "restart":
+        note = f"restarting in {decision.delay:.0f}s, exit {decision.attempt}/{CRASH_LOOP_MAX_EXITS}"
+        _schedule_restart(bot, name, decision.delay)
+        _emit_event(name, "restarting", note)
+    else:
+        _emit_event(name, "offline", detail)
+    if decision.action == "crashloop":
+        CRASH_LOOPS.inc(bot=name)
+        _emit_event(name, "crashloop", decision.reason)
+    if HEADLESS:
+        return
+    await _send_offline_alert(bot, name, detail, note=note)
+    if decision.action == "crashloop":
+        await _send_crashloop_alert(bot, name, decision.reason)
+
+
+async def _exit_code(pid: int, p: psutil.Process | None) -> int | None:
+    """Exit code of a finished bot if we can still get it (our own child, or Windows), else None."""
+    child = _children.pop(pid, None)
+    if child is not None:
+        try:
+            return await asyncio.wait_for(child.wait(), 5)
+        except asyncio.TimeoutError:
+            return None
+    if p is not None:
+        try:
+            return p.wait(timeout=0)
+        except psutil.Error:
+            pass
+    return None
+
+
+def _schedule_restart(bot: lightbulb.BotApp, name: str, delay: float) -> None:
+    old = _restart_tasks.pop(name, None)
+    if old is not None:
+        old.cancel()
+    _restart_tasks[name] = asyncio.create_task(_restart_after(bot, name, delay))
+    _mark_dirty()
+
+
+async def _restart_after(bot: lightbulb.BotApp, name: str, delay: float):
+    """Supervisor restart after the backoff, unless someone started or stopped the bot meanwhile."""
+    await asyncio.sleep(delay)
+    if _restart_tasks.get(name) is not asyncio.current_task():
+        return
+    del _restart_tasks[name]
+    if startup_detected.get(name) or name in _launch_pending:
+        log(f"[{name}] supervisor restart skipped; already running")
+        return
+    SUPERVISOR.on_restart(name)
+    BOT_RESTARTS.inc(bot=name)
+    log(f"[{name}] supervisor restart")
+    # Through launch_bots so LAUNCH_CONCURRENCY also covers a fleet-wide crash
+    await launch_bots(bot, [name], stagger=0)
+
+
+async def _watchdog_loop(bot: lightbulb.BotApp):
+    """Every WATCHDOG_INTERVAL_SECONDS: update log rates and flag/unflag hung bots run here."""
+    while True:
+        try:
+            await asyncio.sleep(WATCHDOG_INTERVAL_SECONDS)
+            names = [
+                n
+                for n in BOT_EXECUTABLES
+                if _runs_here(n) and startup_detected.get(n) and bot_state.get(n) in ("ready", "hung")
+            ]
+            hung, resumed = WATCHDOG.tick(names, time.time())
+            for name in hung:
+                asyncio.create_task(_on_hung(bot, name))
+            for name in resumed:
+                bot_state[name] = "ready"
+                _mark_dirty()
+                log(f"[{name}] output resumed; no longer hung")
+                _emit_event(name, "resumed")
+                if not HEADLESS:
+                    _request_update(bot)
+        except asyncio.CancelledError:
+            log("[WATCHDOG] cancelled")
+            break
+        except Exception as e:
+            log(f"[WATCHDOG] check failed: {e}")
+
+
+async def _on_hung(bot: lightbulb.BotApp, name: str):
+    reason = WATCHDOG.bots[name].reason
+    bot_state[name] = "hung"
+    BOT_HANGS.inc(bot=name)
+    _mark_dirty()
+    # "restart" = kill it and let its restart policy (backoff, crash-loop hold) bring it back
+    restart = WATCHDOG_ACTION == "restart" and SUPERVISOR.policy(name) != "never"
+    log(f"[{name}] HUNG: {reason}" + ("; killing it for a restart" if restart else ""))
+    _emit_event(name, "hung", reason)
+    if restart:
+        asyncio.create_task(_kill_hung(name))
+    if HEADLESS:
+        return
+    _request_update(bot)
+    await _send_hung_alert(bot, name, reason, restarting=restart)
+
+
+async def _kill_hung(name: str):
+    matches = await offload.find_processes(BOT_EXECUTABLES[name], caller="watchdog")
+    if not matches:
+        log(f"[{name}] watchdog: no running process found; nothing killed")
+        return
+    # Marked before terminating: the PID watcher may see the exit before terminate() returns
+    _hung_killed.add(name)
+    outcomes = await asyncio.gather(*(offload.terminate(p) for p in matches))
+    for p, res in zip(matches, outcomes):
+        log(f"[{name}] watchdog: PID {p.pid} {res}")
+    if not any(res in ("terminated", "killed", "killed-timeout") for res in outcomes):
+        _hung_killed.discard(name)  # nothing was stopped; a later exit is not the watchdog's
+
+
+async def _send_hung_alert(bot: lightbulb.BotApp, name: str, reason: str, *, restarting: bool = False):
     try:
-        await _schedule_update(bot, debounce_seconds=0)
         await bot.rest.create_message(
             ALERT_CHANNEL_ID,
-            content=f"<@!{ALERT_USER_ID}> ⚠️ Bot **{name}** just went offline!",
+            content=(
+                f"<@!{ALERT_USER_ID}> 🥶 Bot **{name}** looks hung: {reason}"
+                + ("; restarting it." if restarting else ".")
+            ),
             user_mentions=True,
         )
-        log(f"[{name}] offline alert sent (pid={pid})")
+    except Exception as e:
+        log(f"[{name}] ERROR sending hung alert: {e}")
+
+
+def _rss_limit(name: str) -> float:
+    return MEMWATCH_LIMITS_MB.get(name, MEMWATCH_RSS_LIMIT_MB) * 1024 * 1024
+
+
+def _in_quiet_hours(now: datetime.datetime | None = None) -> bool:
+    if MEMWATCH_QUIET_HOURS is None:
+        return True
+    start, end = MEMWATCH_QUIET_HOURS
+    hour = (now or datetime.datetime.now()).hour
+    return start <= hour < end if start <= end else hour >= start or hour < end
+
+
+def _sample_rss(pids: dict[str, int]) -> dict[str, int]:
+    """RSS by bot for the given PIDs (runs in a thread; no process scan needed)."""
+    out: dict[str, int] = {}
+    for name, pid in pids.items():
+        try:
+            out[name] = psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            continue
+    return out
+
+
+async def _memwatch_loop(bot: lightbulb.BotApp):
+    """Every MEMWATCH_INTERVAL_SECONDS: sample RSS, update trends, warn, and recycle if enabled."""
+    while True:
+        try:
+            await asyncio.sleep(MEMWATCH_INTERVAL_SECONDS)
+            pids = {n: p for n, p in bot_pids.items() if _runs_here(n) and startup_detected.get(n)}
+            rss = await offload.run("rss_sample", _sample_rss, pids)
+            now = time.time()
+            at_risk: list[tuple[float, str]] = []
+            for name, value in rss.items():
+                MEMTREND.add(name, pids[name], value, now)
+                fit = MEMTREND.fit(name)
+                BOT_RSS_GROWTH.set(0.0 if fit is None else round(fit.slope, 1), bot=name)
+                eta = MEMTREND.eta(name, _rss_limit(name))
+                if eta is None:
+                    BOT_RSS_ETA.remove(bot=name)
+                    continue
+                BOT_RSS_ETA.set(round(eta), bot=name)
+                if eta <= MEMWATCH_WARN_HOURS * 3600:
+                    at_risk.append((eta, name))
+                    series = MEMTREND.series[name]
+                    if not series.warned:
+                        series.warned = True
+                        asyncio.create_task(_on_memory_risk(bot, name, value, fit, eta))
+
+            if MEMWATCH_RECYCLE and at_risk and _in_quiet_hours():
+                for eta, name in sorted(at_risk):
+                    if len(_recycling) >= MEMWATCH_MAX_RECYCLING:
+                        break
+                    if name not in _recycling and bot_state.get(name) == "ready":
+                        _recycling.add(name)
+                        asyncio.create_task(_recycle(bot, name, _rss_reason(rss[name], MEMTREND.fit(name), eta)))
+        except asyncio.CancelledError:
+            log("[MEMWATCH] cancelled")
+            break
+        except Exception as e:
+            log(f"[MEMWATCH] check failed: {e}")
+
+
+def _rss_reason(rss: int, fit, eta: float) -> str:
+    mb = rss / (1024 * 1024)
+    if eta <= 0:
+        return f"RSS {mb:.0f} MB is over its limit"
+    growth = f", growing {fit.slope * 3600 / (1024 * 1024):.0f} MB/h" if fit is not None else ""
+    when = f"{eta / 60:.0f} min" if eta < 3600 else f"{eta / 3600:.1f}h"
+    return f"RSS {mb:.0f} MB{growth}; limit in ~{when}"
+
+
+async def _on_memory_risk(bot: lightbulb.BotApp, name: str, rss: int, fit, eta: float):
+    reason = _rss_reason(rss, fit, eta)
+    MEMORY_WARNINGS.inc(bot=name)
+    plan = ""
+    if MEMWATCH_RECYCLE:
+        plan = "queued for a recycle" if _in_quiet_hours() else "will recycle it in the quiet hours"
+    log(f"[{name}] MEMORY: {reason}" + (f"; {plan}" if plan else ""))
+    _emit_event(name, "memory", reason + (f"; {plan}" if plan else ""))
+    if HEADLESS:
+        return
+    await _send_memory_alert(bot, name, reason + (f"; {plan}" if plan else ""))
+
+
+async def _send_memory_alert(bot: lightbulb.BotApp, name: str, detail: str):
+    try:
+        await bot.rest.create_message(ALERT_CHANNEL_ID, f"📈 `{name}`: {detail}")
+    except Exception as e:
+        log(f"[{name}] ERROR sending memory alert: {e}")
+
+
+async def _recycle(bot: lightbulb.BotApp, name: str, reason: str):
+    """Stop -> relaunch one bot; its slot is held until it is ready again (or its ready deadline passes)."""
+    try:
+        BOT_RECYCLES.inc(bot=name)
+        log(f"[{name}] recycling: {reason}")
+        _emit_event(name, "recycle", reason)
+        results = await stop_bot(name, restart=True)
+        log(f"[{name}] recycle stop: " + "; ".join(results))
+        await launch_bots(bot, [name], stagger=0)
+        deadline = time.time() + READY_TIMEOUT_SECONDS + 5
+        while time.time() < deadline and _display_state(name) in ("stopped", "launching"):
+            await asyncio.sleep(1.0)
+        log(f"[{name}] recycle done ({_display_state(name)})")
+        if not HEADLESS:
+            _request_update(bot)
+    except Exception as e:
+        log(f"[{name}] recycle failed: {e}")
+    finally:
+        _recycling.discard(name)
+
+
+def _apply_placement(name: str, pid: int, cores: list[int]) -> bool:
+    """Set affinity and priority of one bot process. Blocking: call it through offload.run."""
+    try:
+        p = psutil.Process(pid)
+        p.cpu_affinity(cores)
+        p.nice(nice_value(BOT_PRIORITY, psutil))
+    except AttributeError:
+        log("[PLACEMENT] cpu_affinity is not supported on this platform")
+        return False
+    except (psutil.Error, OSError, ValueError) as e:
+        log(f"[{name}] placement on cores {cores} failed: {e}")
+        return False
+    return True
+
+
+async def _place_bot(name: str, pid: int) -> None:
+    local = [n for n in BOT_EXECUTABLES if _runs_here(n)]
+    cores = PLACER.choose(name, local.index(name) if name in local else 0, bot_cpu)
+    if await offload.run("placement", _apply_placement, name, pid, cores):
+        log(f"[PLACEMENT] {name} pid={pid} -> cores {cores} ({BOT_PRIORITY})")
+
+
+def _pin_controller() -> None:
+    """Keep this process (and the parse workers it forks later) on the reserved cores."""
+    cores = PLACER.reserved or PLACER.cores
+    try:
+        psutil.Process().cpu_affinity(cores)
+        log(f"[PLACEMENT] controller pinned to cores {cores}; bots get {PLACER.cores} ({PLACEMENT_STRATEGY})")
+    except (AttributeError, psutil.Error, OSError, ValueError) as e:
+        log(f"[PLACEMENT] could not pin the controller: {e}")
+
+
+def _sample_cpu(pids: dict[str, int]) -> tuple[list[float], dict[str, float]]:
+    """Per-core and per-bot CPU since the previous call (runs in a thread)."""
+    global _core_times
+    cur = psutil.cpu_times(percpu=True)
+    loads = core_percents(_core_times, cur) if _core_times is not None else []
+    _core_times = cur
+    cpu: dict[str, float] = {}
+    for name, pid in pids.items():
+        try:
+            p = _bot_procs.get(name)
+            if p is None or p.pid != pid:
+                p = _bot_procs[name] = psutil.Process(pid)
+            cpu[name] = p.cpu_percent(interval=None)  # 0.0 the first time
+        except psutil.Error:
+            _bot_procs.pop(name, None)
+    return loads, cpu
+
+
+async def _measure() -> list[float]:
+    global core_load, bot_cpu
+    pids = {n: p for n, p in bot_pids.items() if n in PLACER.assigned}
+    loads, bot_cpu = await offload.run("cpu_sample", _sample_cpu, pids)
+    if loads:
+        core_load = loads
+        for core, pct in enumerate(loads):
+            CORE_LOAD.set(round(pct, 1), core=str(core))
+    return loads
+
+
+async def _move_bots(reason: str, moves: list[tuple[str, list[int], list[int]]], before: list[float]) -> dict:
+    done = []
+    for name, old, new in moves:
+        pid = bot_pids.get(name)
+        if pid and await offload.run("placement", _apply_placement, name, pid, new):
+            PLACEMENT_MOVES.inc(bot=name, reason=reason)
+            log(f"[PLACEMENT] {name} moved {old} -> {new} ({reason}, {bot_cpu.get(name, 0.0):.0f}% CPU)")
+            done.append((name, old, new))
+    entry = {"at": time.time(), "reason": reason, "moves": done, "before": before, "after": None}
+    placement_log.append(entry)
+    return entry
+
+
+async def _placement_loop(bot: lightbulb.BotApp):
+    """Every PLACEMENT_CHECK_SECONDS: measure CPU and move bots that stayed hot."""
+    waiting: dict | None = None  # last change, still missing its "after" load
+    while True:
+        try:
+            await asyncio.sleep(PLACEMENT_CHECK_SECONDS)
+            async with _placement_lock:
+                loads = await _measure()
+                if waiting is not None:
+                    waiting["after"] = loads
+                    waiting = None
+                moves = PLACER.hot_moves(bot_cpu, loads) if loads else []
+                if moves:
+                    waiting = await _move_bots("hot", moves, loads)
+        except asyncio.CancelledError:
+            log("[PLACEMENT] cancelled")
+            break
+        except Exception as e:
+            log(f"[PLACEMENT] check failed: {e}")
+
+
+async def rebalance(sample_seconds: float = 3.0) -> dict:
+    """Re-place every placed bot by measured CPU; returns the log entry with load before/after."""
+    async with _placement_lock:
+        await _measure()
+        await asyncio.sleep(sample_seconds)
+        before = await _measure()
+        old = dict(PLACER.assigned)
+        new = PLACER.replan(bot_cpu)
+        moves = [(n, old.get(n, []), c) for n, c in new.items() if sorted(c) != sorted(old.get(n, []))]
+        entry = await _move_bots("rebalance", moves, before)
+        await asyncio.sleep(sample_seconds)
+        entry["after"] = await _measure()
+    return entry
+
+
+async def _send_offline_alert(bot: lightbulb.BotApp, name: str, detail: str = "", *, note: str = ""):
+    """
+    Refresh the embed and ping ALERT_USER_ID (also used for bots reported by
+    agents). With a `note` (the supervisor is restarting it) nobody is pinged.
+    """
+    try:
+        await _schedule_update(bot, debounce_seconds=0)
+        with REST_LATENCY.time(op="create_message"):
+            if note:
+                await bot.rest.create_message(
+                    ALERT_CHANNEL_ID,
+                    content=f"⚠️ Bot **{name}** went offline; {note}.",
+                )
+            else:
+                await bot.rest.create_message(
+                    ALERT_CHANNEL_ID,
+                    content=f"<@!{ALERT_USER_ID}> ⚠️ Bot **{name}** just went offline!",
+                    user_mentions=True,
+                )
+        OFFLINE_ALERTS.inc(bot=name)
+        log(f"[{name}] offline alert sent ({detail})")
     except Exception as e:
         log(f"[{name}] ERROR sending offline alert: {e}")
-        
+
+
+async def _send_crashloop_alert(bot: lightbulb.BotApp, name: str, reason: str):
+    try:
+        await bot.rest.create_message(
+            ALERT_CHANNEL_ID,
+            content=(
+                f"<@!{ALERT_USER_ID}> 🛑 Bot **{name}** is crash-looping ({reason}); "
+                "automatic restarts are paused until it is started manually."
+            ),
+            user_mentions=True,
+        )
+    except Exception as e:
+        log(f"[{name}] ERROR sending crash-loop alert: {e}")
+
+
+async def _send_launch_failed(bot: lightbulb.BotApp, name: str, error: str):
+    try:
+        await bot.rest.create_message(
+            ALERT_CHANNEL_ID,
+            f"❌ Failed to start `{name}`: `{error}`",
+        )
+    except Exception:
+        pass
+
+
+async def _launch_one(bot: lightbulb.BotApp, name: str):
+    try:
+        path = BOT_EXECUTABLES.get(name)
+        if path is None:  # removed from the fleet while queued
+            return
+        await run_and_monitor_bot(bot, name, path)
+    finally:
+        _launch_pending.discard(name)
+
+
+async def launch_bots(
+    bot: lightbulb.BotApp,
+    names: list[str],
+    *,
+    stagger: float,
+    jitter: float = 0.0,
+    concurrency: int | None = None,
+) -> int:
+    """
+    Launch `names` in order, `stagger` (+ random `jitter`) seconds apart.
+    With a concurrency limit (default LAUNCH_CONCURRENCY; 0 = none), also
+    hold off while that many bots are still launching, i.e. started but
+    not ready and not yet past their ready deadline.
+    """
+    limit = LAUNCH_CONCURRENCY if concurrency is None else concurrency
+    count = 0
+    for name in names:
+        if limit > 0:
+            while _launching_count() >= limit:
+                await asyncio.sleep(0.2)
+        _launch_pending.add(name)
+        asyncio.create_task(_launch_one(bot, name))
+        count += 1
+        # smooth out log/pid writes and any service logins
+        if stagger or jitter:
+            await asyncio.sleep(stagger + (random.random() * jitter))
+    return count
+
+
+def _add_bot_state(name: str) -> None:
+    startup_detected.setdefault(name, False)
+    trade_counts.setdefault(name, 0)
+    last_seen.setdefault(name, 0.0)
+    bot_state.setdefault(name, "stopped")
+    instant_coins.setdefault(name, None)
+    max_coins.setdefault(name, None)
+
+
+def _drop_bot_state(name: str) -> None:
+    """Forget a bot that left the fleet (its process is already stopped)."""
+    for d in (startup_detected, trade_counts, last_seen, bot_state, instant_coins, max_coins,
+              launch_started_at, bot_pids, LOG_BUFFERS, ERR_BUFFERS, _bot_procs, WATCHDOG.bots):
+        d.pop(name, None)
+    _stop_requested.discard(name)
+    ERRORS.forget(name)
+    MEMTREND.forget(name)
+    PLACER.forget(name)
+    PAYOUTS.forget(name)
+    if SUPERVISOR.records.pop(name, None) is not None:
+        SUPERVISOR.save()
+
+
+async def apply_fleet(bot: lightbulb.BotApp, new: Fleet) -> FleetDiff:
+    """
+    Bring the running fleet in line with `new` without touching unaffected bots:
+    stop bots that left this host, stop + relaunch bots whose path changed,
+    launch bots that arrived, and resize the per-bot state to match. An agent
+    only takes the bots assigned to it.
+    """
+    if AGENT_ID is not None:
+        new = Fleet({n: p for n, p in new.bots.items() if new.agents.get(n) == AGENT_ID}, new.agents)
+    old = Fleet(dict(BOT_EXECUTABLES), dict(BOT_AGENTS))
+    diff = diff_fleet(old, new)
+    if not diff:
+        return diff
+    global _fleet_version
+    _fleet_version += 1
+    log(f"[FLEET] fleet.json changed: {diff.summary()}")
+
+    here_old = {n for n in old.bots if old.agents.get(n) == AGENT_ID}
+    here_new = {n for n in new.bots if new.agents.get(n) == AGENT_ID}
+    relaunch = [n for n in diff.changed if n in here_old and n in here_new]
+    leaving = [n for n in old.bots if n in here_old and n not in here_new]
+
+    # Stop while the old path is still what the process scan matches
+    for name in leaving + relaunch:
+        results = await stop_bot(name, restart=name in relaunch)
+        log(f"[{name}] " + ("stopped for its new path: " if name in relaunch else "left this host: ") + "; ".join(results))
+        # Retire its watcher so the exit isn't reported (or re-adds state) later
+        _watch_gen[name] = _watch_gen.get(name, 0) + 1
+        _stop_requested.discard(name)
+
+    # Same dict objects everywhere (commands, panel, fleetcontroller), so update in place
+    BOT_EXECUTABLES.clear()
+    BOT_EXECUTABLES.update(new.bots)
+    BOT_AGENTS.clear()
+    BOT_AGENTS.update(new.agents)
+    for name in diff.added:
+        _add_bot_state(name)
+    for name in diff.removed:
+        _drop_bot_state(name)
+    for name in diff.moved:
+        if name not in here_new:
+            startup_detected[name] = False  # its agent reports it from now on
+            _mark_stopped(name)
+    if diff.removed:
+        _persist_coin_state()
+
+    for fn in list(FLEET_LISTENERS):
+        try:
+            fn(diff)
+        except Exception as e:
+            log(f"[FLEET] listener error: {e}")
+
+    arriving = [n for n in BOT_EXECUTABLES if n in here_new and (n not in here_old or n in relaunch)]
+    held = [n for n in arriving if SUPERVISOR.is_held(n)]
+    if held:
+        log(f"[SUPERVISOR] not starting bots held after a crash loop: {', '.join(held)}")
+    await launch_bots(
+        bot,
+        [n for n in arriving if n not in held],
+        stagger=LAUNCH_STAGGER_SECONDS,
+        jitter=LAUNCH_JITTER_SECONDS,
+    )
+    if not HEADLESS:
+        _request_update(bot)
+    return diff
+
+
+def _fleet_stamp() -> tuple[int, int] | None:
+    try:
+        st = os.stat(FLEET_FILE)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+async def _fleet_reload_loop(bot: lightbulb.BotApp):
+    """Poll FLEET_FILE; apply each valid change, report invalid ones and keep the current fleet."""
+    stamp = await offload.run("fleet_stamp", _fleet_stamp)
+    while True:
+        try:
+            await asyncio.sleep(FLEET_RELOAD_SECONDS)
+            current = await offload.run("fleet_stamp", _fleet_stamp)
+            if current == stamp or current is None:
+                continue
+            stamp = current
+            try:
+                fleet = await offload.run("read_fleet", read_fleet, FLEET_FILE)
+            except (OSError, ValueError) as e:
+                FLEET_RELOADS.inc(result="invalid")
+                log(f"[FLEET] {FLEET_FILE} not applied: {e}")
+                if not HEADLESS:
+                    await bot.rest.create_message(ALERT_CHANNEL_ID, f"⚠️ `{FLEET_FILE}` not applied: `{e}`")
+                continue
+            if fleet is None:
+                continue
+            diff = await apply_fleet(bot, fleet)
+            FLEET_RELOADS.inc(result="applied" if diff else "unchanged")
+        except asyncio.CancelledError:
+            log("[FLEET] reload watcher cancelled")
+            break
+        except Exception as e:
+            log(f"[FLEET] reload failed: {e}")
+
 
 async def start_all_bots(bot: lightbulb.BotApp):
     """Create/reuse the status embed, launch all bots, and start periodic refresh."""
-    global status_message_id, _periodic_task
+    global status_message_id, _periodic_task, _watchdog_task, _memwatch_task, _placement_task, _fleet_task
 
     # Try to reuse existing status message; self-heal if missing
-    status_message_id = _load_status_id()
+    status_message_id = None if HEADLESS else _load_status_id()
     if status_message_id:
         try:
             await _schedule_update(bot)  # test-edit; also builds current embed
@@ -527,26 +1805,38 @@ async def start_all_bots(bot: lightbulb.BotApp):
             log(f"[DEBUG] failed to edit persisted status message: {e}")
             status_message_id = None
 
-    if not status_message_id:
+    if not status_message_id and not HEADLESS:
         initial = await _build_embed()
         msg = await bot.rest.create_message(ALERT_CHANNEL_ID, embed=initial)
         status_message_id = msg.id
         _persist_status_id(status_message_id)
         log(f"[DEBUG] Created log monitor message id={status_message_id}")
 
-    # --- launch all bots with a tiny stagger ---
-    LAUNCH_STAGGER_SECONDS = 0.75  # tune 0.3–1.5s
-    LAUNCH_JITTER_SECONDS = 0.25   # +/- random jitter
-
-    count = 0
-    for name, path in BOT_EXECUTABLES.items():
-        asyncio.create_task(run_and_monitor_bot(bot, name, path))
-        count += 1
-        # smooth out log/pid writes and any service logins
-        await asyncio.sleep(
-            LAUNCH_STAGGER_SECONDS + (random.random() * LAUNCH_JITTER_SECONDS)
-        )
-    log(f"[DEBUG] launching {count} bot(s) with stagger")
+    if PLACEMENT_ENABLED:
+        _pin_controller()
+
+    # --- launch all bots with a tiny stagger (bots on other hosts belong to their agent) ---
+    held = [name for name in BOT_EXECUTABLES if _runs_here(name) and SUPERVISOR.is_held(name)]
+    if held:
+        log(f"[SUPERVISOR] not starting bots held after a crash loop: {', '.join(held)}")
+    count = await launch_bots(
+        bot,
+        [name for name in BOT_EXECUTABLES if _runs_here(name) and name not in held],
+        stagger=LAUNCH_STAGGER_SECONDS,
+        jitter=LAUNCH_JITTER_SECONDS,
+    )
+    log(f"[DEBUG] launched {count} bot(s) with stagger")
+
+    if WATCHDOG_ENABLED and _watchdog_task is None:
+        _watchdog_task = asyncio.create_task(_watchdog_loop(bot))
+    if MEMWATCH_ENABLED and _memwatch_task is None:
+        _memwatch_task = asyncio.create_task(_memwatch_loop(bot))
+    if PLACEMENT_ENABLED and _placement_task is None:
+        _placement_task = asyncio.create_task(_placement_loop(bot))
+    if FLEET_FILE and _fleet_task is None:
+        _fleet_task = asyncio.create_task(_fleet_reload_loop(bot))
+    if HEADLESS:
+        return
 
     # Periodic refresh to keep <t:...:R> fresh and reflect counters
     async def _periodic():
@@ -570,31 +1860,48 @@ async def start_all_bots(bot: lightbulb.BotApp):
     _periodic_task = asyncio.create_task(_periodic())
 
 
-def _find_running_pid(exe_full_path: str, workdir: str) -> int | None:
-    """Return the PID of a running v4-bot that matches this exe/cwd, else None."""
-    exe_full_path = os.path.abspath(exe_full_path).lower()
-    workdir = os.path.abspath(workdir).lower()
-    exe_name = os.path.basename(exe_full_path)
+NOT_RUNNING = "no running process found"
 
-    for p in psutil.process_iter(["pid", "name", "exe", "cwd", "cmdline"]):
-        try:
-            if p.pid == os.getpid():
-                continue
-            p_exe = (p.info.get("exe") or "").lower()
-            p_name = (p.info.get("name") or "").lower()
-            p_cwd  = (p.info.get("cwd") or "").lower()
-            if p_exe and os.path.abspath(p_exe).lower() == exe_full_path:
-                return p.pid
-            if p_name == exe_name.lower() and p_cwd == workdir:
-                return p.pid
-            cl = p.info.get("cmdline") or []
-            if cl:
-                cmd0 = os.path.abspath(cl[0]).lower()
-                if cmd0 == exe_full_path:
-                    return p.pid
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-    return None
+
+async def stop_bot(name: str, *, wipe: bool = False, restart: bool = False, caller: str = "stop_bot") -> list[str]:
+    """
+    Stop a local bot (terminate, then kill), optionally delete its
+    session.json, and mark it stopped. Returns one status string per step
+    (NOT_RUNNING when no process matched).
+    Pass restart=True when it is started again right after.
+    Used by the panel, agent.py, recycling and fleet reloads; see stop_bots()
+    for several bots at once.
+    """
+    _expect_stop(name, restart=restart)
+    matches = await offload.find_processes(BOT_EXECUTABLES[name], caller=caller)
+    return await _stop_matched(name, matches, wipe)
+
+
+async def stop_bots(
+    names: list[str], *, wipe: bool = False, restart: bool = False, caller: str
+) -> dict[str, list[str]]:
+    """stop_bot() for several local bots, with one scan of the process table for all of them."""
+    for name in names:
+        _expect_stop(name, restart=restart)
+    procs = await offload.scan_fleet({n: BOT_EXECUTABLES[n] for n in names}, caller=caller)
+    results = await asyncio.gather(*(_stop_matched(n, procs[n], wipe) for n in names))
+    return dict(zip(names, results))
+
+
+async def _stop_matched(name: str, matches: list[psutil.Process], wipe: bool) -> list[str]:
+    exe_path = BOT_EXECUTABLES[name]
+    outcomes = await asyncio.gather(*(offload.terminate(p) for p in matches))
+    results = [f"PID {p.pid}: {res}" for p, res in zip(matches, outcomes)]
+    if not matches:
+        results.append(NOT_RUNNING)
+
+    if wipe:
+        results.append(await offload.delete_session(os.path.dirname(exe_path)))
+
+    _stop_tailer(name)
+    startup_detected[name] = False
+    _mark_stopped(name)
+    return results
 
 
 async def run_and_monitor_bot(bot: lightbulb.BotApp, name: str, path: str):
@@ -609,53 +1916,54 @@ async def run_and_monitor_bot(bot: lightbulb.BotApp, name: str, path: str):
 
     # Ensure no stale tailers remain
     _stop_tailer(name)
-
-    # --- already running? don't spawn a duplicate ---
-    if _is_already_running(path, cwd):
+    # Whatever the previous process's watcher sees from now on is stale (it may not
+    # have noticed the exit yet), so retire it before dropping its stop marker.
+    # A manual start also ends a crash-loop hold.
+    _watch_gen[name] = _watch_gen.get(name, 0) + 1
+    _stop_requested.discard(name)
+    if SUPERVISOR.release(name):
+        log(f"[{name}] crash-loop hold cleared by start")
+
+    # --- already running? don't spawn a duplicate (one scan gives the PID too) ---
+    pid = await offload.find_pid(path, caller="run_and_monitor")
+    if pid:
         log(f"[{name}] already running; not launching a duplicate.")
+        BOT_LAUNCHES.inc(bot=name, result="attached")
         startup_detected[name] = True
-        try:
-            await _schedule_update(bot)
-        except Exception as e:
-            log(f"[{name}] embed update failed on duplicate check: {e}")
+        # Been up since before we looked; there is no launch to time
+        _mark_ready(name, attached=True)
+        _request_update(bot)
 
         # Start tailers for both streams so we see all output
         _start_tailer(bot, name, log_path, "out")
         _start_tailer(bot, name, err_log_path, "err")
 
         # Attach a watcher to the existing PID so offline alert & state still work
-        pid = _find_running_pid(path, cwd)
-        if pid:
-            log(f"[{name}] attaching watcher to existing PID {pid}")
-            asyncio.create_task(_watch_pid_and_alert(bot, name, pid))
-        else:
-            log(f"[{name}] WARNING: could not find PID for already-running process")
+        log(f"[{name}] attaching watcher to existing PID {pid}")
+        asyncio.create_task(_watch_pid_and_alert(bot, name, pid))
         return
 
-    # --- spawn fresh via PowerShell (no PIPEs), then read PID from file ---
+    # --- spawn fresh (PowerShell on Windows, no PIPEs), then read PID ---
     try:
-        child_pid = await _spawn_via_powershell(path, cwd, log_path, err_log_path)
+        child_pid = await _spawn_process(path, cwd, log_path, err_log_path)
     except Exception as e:
+        BOT_LAUNCHES.inc(bot=name, result="failed")
+        _mark_stopped(name)
         log(f"[{name}] failed to start: {e}")
-        try:
-            await bot.rest.create_message(
-                ALERT_CHANNEL_ID,
-                f"❌ Failed to start `{name}`: `{e}`",
-            )
-        except Exception:
-            pass
+        _emit_event(name, "launch_failed", str(e))
+        if not HEADLESS:
+            await _send_launch_failed(bot, name, str(e))
         return
 
-    # Mark started + update embed
+    # Mark started (launching until the log says it's ready) + update embed
+    BOT_LAUNCHES.inc(bot=name, result="spawned")
     startup_detected[name] = True
-    try:
-        await _schedule_update(bot)
-    except Exception as e:
-        log(f"[{name}] ERROR updating embed on start: {e}")
+    _mark_launching(bot, name)
+    _request_update(bot)
 
-    # Tail both streams
-    _start_tailer(bot, name, log_path, "out")
-    _start_tailer(bot, name, err_log_path, "err")
+    # Tail both streams from the top: the new process just truncated them
+    _start_tailer(bot, name, log_path, "out", from_start=True)
+    _start_tailer(bot, name, err_log_path, "err", from_start=True)
 
     # Watch the PID and alert on exit; cancels both tailers on exit via _watch_pid_and_alert
     asyncio.create_task(_watch_pid_and_alert(bot, name, child_pid))
@@ -670,13 +1978,38 @@ async def on_started(_: hikari.StartedEvent):
 async def on_stopping(_: hikari.StoppingEvent):
     # Stop periodic task (4)
     log("[LIFECYCLE] Bot stopping; cancelling periodic task")
-    global _periodic_task
+    global _periodic_task, _watchdog_task, _memwatch_task, _placement_task, _fleet_task
     if _periodic_task:
         _periodic_task.cancel()
         _periodic_task = None
+    if _watchdog_task:
+        _watchdog_task.cancel()
+        _watchdog_task = None
+    if _memwatch_task:
+        _memwatch_task.cancel()
+        _memwatch_task = None
+    if _placement_task:
+        _placement_task.cancel()
+        _placement_task = None
+    if _fleet_task:
+        _fleet_task.cancel()
+        _fleet_task = None
+    shutdown_pools()
+    _persist_errors(force=True)
+    if STORE is not None:
+        STORE.close()  # commits whatever is still queued
+    if LOGCAPTURE is not None:
+        LOGCAPTURE.shutdown()
+
+
+@plugin.listener(hikari.StoppedEvent)
+async def on_stopped(_: hikari.StoppedEvent):
+    # Last: other plugins' StoppingEvent handlers (panel, /history, /exportlogs) may still use the pool
+    offload.shutdown()
 
 def load(bot):
     log("[EXT] loading Bot Log Monitor")
+    init_state()
     bot.add_plugin(plugin)
 
 def unload(bot):
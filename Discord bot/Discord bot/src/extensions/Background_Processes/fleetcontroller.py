@@ -0,0 +1,377 @@
+# src/extensions/Background_Processes/fleetcontroller.py
+"""
+Controller side of multi-host mode. Agents (agent.py, one per host) connect
+over TCP, send a full snapshot of their bots, then compact deltas, batched
+log lines and offline/launch-failure events. That state is merged into
+botlogs so the status embed, /tail and alerts work the same for remote
+bots. Start/stop/restart for a bot listed in BOT_AGENTS is routed to its
+agent with send_command().
+"""
+import asyncio
+import hmac
+import itertools
+import time
+from dataclasses import dataclass, field
+
+import hikari
+import lightbulb
+
+from src.config import (
+    BOT_AGENTS,
+    FLEET_LISTEN_HOST,
+    FLEET_LISTEN_PORT,
+    FLEET_TOKEN,
+    FLEET_IDLE_TIMEOUT_SECONDS,
+)
+from src.fleetproto import (
+    PROTOCOL_VERSION,
+    MAX_LINE_BYTES,
+    ProtocolError,
+    encode,
+    read_message,
+)
+from src.metrics import (
+    FLEET_AGENTS,
+    FLEET_MESSAGES,
+    FLEET_COMMAND_LATENCY,
+    TAIL_LINES,
+    TIME_TO_READY,
+    BOT_EXITS,
+    BOT_RESTARTS,
+    CRASH_LOOPS,
+    RECOVERY_TIME,
+    BOT_HANGS,
+    MEMORY_WARNINGS,
+    BOT_RECYCLES,
+)
+from src.extensions.Background_Processes import botlogs
+from src.extensions.Background_Processes.botlogs import (
+    BOT_EXECUTABLES,
+    ALERT_CHANNEL_ID,
+    LOG_BUFFERS,
+    SUPERVISOR,
+    log,
+)
+
+plugin = lightbulb.Plugin("Fleet Controller")
+
+COMMAND_TIMEOUT_SECONDS = 60.0  # stop can take ~8s per process, restart more
+
+
+@dataclass
+class AgentConn:
+    agent_id: str
+    peer: str
+    writer: asyncio.StreamWriter
+    bots: set[str] = field(default_factory=set)
+    connected_at: float = field(default_factory=time.time)
+    last_seen: float = field(default_factory=time.time)
+    resyncs: int = 0
+    pending: set[int] = field(default_factory=set)  # command ids waiting for a result on this connection
+
+    def send(self, msg_type: str, **fields) -> None:
+        FLEET_MESSAGES.inc(direction="out", type=msg_type)
+        self.writer.write(encode(msg_type, **fields))
+
+
+AGENTS: dict[str, AgentConn] = {}
+# Connection count per agent id (a reconnect is a resync)
+_sessions: dict[str, int] = {}
+_pending: dict[int, asyncio.Future] = {}
+_cmd_ids = itertools.count(1)
+_server: asyncio.AbstractServer | None = None
+
+
+def is_remote(name: str) -> bool:
+    """True if `name` is run by an agent rather than this process."""
+    return name in BOT_AGENTS
+
+
+def agent_for(name: str) -> str | None:
+    return BOT_AGENTS.get(name)
+
+
+async def send_command(name: str, op: str, *, wipe: bool = False) -> str:
+    """Route start/stop/restart for a remote bot to its agent; returns the agent's reply."""
+    agent_id = BOT_AGENTS[name]
+    conn = AGENTS.get(agent_id)
+    if conn is None:
+        return f"⚠️ agent `{agent_id}` for `{name}` is not connected"
+    if op == "stop":
+        # The agent's supervisor stands down on its side; end any downtime incident here
+        SUPERVISOR.on_manual_stop(name)
+
+    cmd_id = next(_cmd_ids)
+    fut = asyncio.get_running_loop().create_future()
+    _pending[cmd_id] = fut
+    conn.pending.add(cmd_id)
+    t0 = time.perf_counter()
+    try:
+        conn.send("cmd", id=cmd_id, op=op, bot=name, wipe=wipe)
+        await conn.writer.drain()
+        ok, msg = await asyncio.wait_for(fut, COMMAND_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        return f"⚠️ agent `{agent_id}` did not answer {op} for `{name}`"
+    except ConnectionError as e:
+        return f"⚠️ agent `{agent_id}` connection lost: {e}"
+    finally:
+        _pending.pop(cmd_id, None)
+        conn.pending.discard(cmd_id)
+    FLEET_COMMAND_LATENCY.observe(time.perf_counter() - t0, op=op)
+    return msg if ok else f"❌ {msg}"
+
+
+# -----------------------------
+# Applying agent state
+# -----------------------------
+def _apply_snapshot(name: str, fields: dict) -> bool:
+    """Merge snapshot fields for one bot into botlogs state; True if anything changed."""
+    changed = False
+    if "started" in fields and botlogs.startup_detected.get(name) != bool(fields["started"]):
+        botlogs.startup_detected[name] = bool(fields["started"])
+        changed = True
+    if "state" in fields and botlogs.bot_state.get(name) != fields["state"]:
+        botlogs.bot_state[name] = str(fields["state"])
+        changed = True
+    if "depo" in fields and botlogs.trade_counts.get(name) != fields["depo"]:
+        botlogs.trade_counts[name] = int(fields["depo"] or 0)
+        botlogs._journal(name, "depositable", botlogs.trade_counts[name])
+        changed = True
+    coins_changed = False
+    for key, target in (("instant", botlogs.instant_coins), ("max", botlogs.max_coins)):
+        if key in fields and target.get(name) != fields[key]:
+            target[name] = None if fields[key] is None else float(fields[key])
+            if key == "instant" and target[name] is not None:
+                botlogs._record_instant(name, target[name])
+            elif target[name] is not None:
+                botlogs._journal(name, key, target[name])
+            coins_changed = True
+    if coins_changed:
+        botlogs._persist_coin_state()
+    return changed or coins_changed
+
+
+def _accepts(conn: AgentConn, name: str) -> bool:
+    """Only take state for bots this agent is configured to run."""
+    return name in conn.bots
+
+
+def _assigned(agent_id: str) -> set[str]:
+    return {n for n, a in BOT_AGENTS.items() if a == agent_id and n in BOT_EXECUTABLES}
+
+
+def _on_fleet_change(_diff) -> None:
+    """fleet.json was reloaded: re-scope live agents and ask for bots they may already have sent."""
+    for conn in AGENTS.values():
+        bots = _assigned(conn.agent_id)
+        new = bots - conn.bots
+        conn.bots = bots
+        if new:
+            conn.send("resync", bots=sorted(new))
+
+
+def _refresh() -> None:
+    botlogs._mark_dirty()
+    asyncio.create_task(botlogs._schedule_update(plugin.bot))
+
+
+async def _handle_message(conn: AgentConn, msg: dict) -> None:
+    kind = msg["t"]
+    FLEET_MESSAGES.inc(direction="in", type=kind)
+    conn.last_seen = time.time()
+
+    if kind == "ping":
+        conn.send("pong")
+    elif kind == "delta":
+        name = msg.get("bot")
+        if _accepts(conn, name) and _apply_snapshot(name, msg.get("f") or {}):
+            _refresh()
+    elif kind == "lines":
+        name = msg.get("bot")
+        if _accepts(conn, name):
+            lines = msg.get("l") or []
+            stream = msg.get("s", "out")
+            if stream == "err":
+                botlogs.observe_stderr(plugin.bot, name, lines)
+            else:
+                LOG_BUFFERS[name].extend(lines)
+            for fn in botlogs.LINE_LISTENERS:
+                for text in lines:
+                    fn(name, stream, text)
+            TAIL_LINES.inc(len(lines), bot=name, stream=stream)
+    elif kind == "event":
+        name = msg.get("bot")
+        if not _accepts(conn, name):
+            return
+        log(f"[FLEET] {conn.agent_id}/{name}: {msg.get('kind')} {msg.get('detail', '')}")
+        detail = str(msg.get("detail", ""))
+        botlogs._journal(name, str(msg.get("kind")), botlogs._number(detail), detail)
+        # Restart decisions are the agent's; the controller keeps the fleet-wide stats
+        if msg.get("kind") in ("offline", "restarting"):
+            botlogs.startup_detected[name] = False
+            botlogs._mark_dirty()
+            BOT_EXITS.inc(bot=name, kind="crash")
+            SUPERVISOR.on_exit(name, None, decide=False)
+            note = ""
+            if msg.get("kind") == "restarting":
+                SUPERVISOR.on_restart(name)  # counted when scheduled; the agent counts launches
+                BOT_RESTARTS.inc(bot=name)
+                note = msg.get("detail", "")
+            asyncio.create_task(
+                botlogs._send_offline_alert(plugin.bot, name, f"agent={conn.agent_id}", note=note)
+            )
+        elif msg.get("kind") == "crashloop":
+            CRASH_LOOPS.inc(bot=name)
+            asyncio.create_task(botlogs._send_crashloop_alert(plugin.bot, name, msg.get("detail", "")))
+        elif msg.get("kind") == "launch_failed":
+            asyncio.create_task(botlogs._send_launch_failed(plugin.bot, name, msg.get("detail", "")))
+        elif msg.get("kind") == "ready":
+            try:
+                TIME_TO_READY.observe(float(msg.get("detail")), bot=name)
+            except (TypeError, ValueError):
+                pass
+            recovered = SUPERVISOR.on_ready(name)
+            if recovered is not None:
+                RECOVERY_TIME.observe(recovered, bot=name)
+        elif msg.get("kind") == "memory":
+            MEMORY_WARNINGS.inc(bot=name)
+            asyncio.create_task(botlogs._send_memory_alert(plugin.bot, name, msg.get("detail", "")))
+        elif msg.get("kind") == "recycle":
+            BOT_RECYCLES.inc(bot=name)
+        elif msg.get("kind") == "hung":
+            BOT_HANGS.inc(bot=name)
+            asyncio.create_task(botlogs._send_hung_alert(plugin.bot, name, msg.get("detail", "")))
+        elif msg.get("kind") == "unready":
+            asyncio.create_task(botlogs._send_unready_alert(plugin.bot, name, msg.get("detail", "")))
+    elif kind == "result":
+        fut = _pending.get(msg.get("id"))
+        if fut is not None and not fut.done():
+            fut.set_result((bool(msg.get("ok")), str(msg.get("msg", ""))))
+    else:
+        log(f"[FLEET] {conn.agent_id}: ignoring unknown message type {kind!r}")
+
+
+async def _handle_agent(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    peer = "%s:%s" % (writer.get_extra_info("peername") or ("?", "?"))[:2]
+    conn: AgentConn | None = None
+    try:
+        hello = await read_message(reader, timeout=10)
+        if not hello or hello["t"] != "hello":
+            raise ProtocolError("expected hello")
+        if not hmac.compare_digest(str(hello.get("token", "")), FLEET_TOKEN):
+            writer.write(encode("error", msg="bad token"))
+            log(f"[FLEET] rejected agent from {peer}: bad token")
+            return
+        if hello.get("v") != PROTOCOL_VERSION:
+            writer.write(encode("error", msg=f"protocol v{PROTOCOL_VERSION} required"))
+            log(f"[FLEET] rejected agent from {peer}: protocol {hello.get('v')}")
+            return
+
+        agent_id = str(hello.get("agent"))
+        conn = AgentConn(agent_id, peer, writer)
+        conn.bots = _assigned(agent_id)
+        unknown = set(hello.get("bots") or {}) - conn.bots
+        if unknown:
+            log(f"[FLEET] {agent_id}: ignoring bots not assigned to it: {', '.join(sorted(unknown))}")
+
+        # A reconnect replaces the old session; its socket may not have noticed yet
+        old = AGENTS.get(agent_id)
+        if old is not None:
+            old.writer.close()
+        _sessions[agent_id] = _sessions.get(agent_id, 0) + 1
+        conn.resyncs = _sessions[agent_id] - 1
+        AGENTS[agent_id] = conn
+        FLEET_AGENTS.set(len(AGENTS))
+
+        # Full resync: bots the agent didn't report are treated as stopped
+        for name in conn.bots:
+            snap = (hello.get("bots") or {}).get(name) or {"started": False}
+            _apply_snapshot(name, snap)
+        _refresh()
+        conn.send("welcome")
+        await writer.drain()
+        log(f"[FLEET] agent {agent_id} connected from {peer} ({len(conn.bots)} bot(s), resync #{conn.resyncs})")
+
+        while True:
+            msg = await read_message(reader, timeout=FLEET_IDLE_TIMEOUT_SECONDS)
+            if msg is None:
+                break
+            await _handle_message(conn, msg)
+            if writer.transport.get_write_buffer_size() > 64 * 1024:
+                await writer.drain()
+    except asyncio.TimeoutError:
+        log(f"[FLEET] agent {conn.agent_id if conn else peer} timed out")
+    except (ProtocolError, ConnectionError) as e:
+        log(f"[FLEET] agent {conn.agent_id if conn else peer} dropped: {e}")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        log(f"[FLEET] agent handler error: {e}")
+    finally:
+        writer.close()
+        if conn is not None:
+            # Commands sent on this connection get no result now (a reconnect starts a new one)
+            _fail_pending(conn)
+        if conn is not None and AGENTS.get(conn.agent_id) is conn:
+            del AGENTS[conn.agent_id]
+            FLEET_AGENTS.set(len(AGENTS))
+            await _agent_lost(conn)
+
+
+def _fail_pending(conn: AgentConn) -> None:
+    for cmd_id in list(conn.pending):
+        fut = _pending.get(cmd_id)
+        if fut is not None and not fut.done():
+            fut.set_exception(ConnectionError("agent disconnected before answering"))
+    conn.pending.clear()
+
+
+async def _agent_lost(conn: AgentConn) -> None:
+    """The agent's bots may well still be running, but we can't see them any more."""
+    log(f"[FLEET] agent {conn.agent_id} disconnected")
+    for name in conn.bots:
+        botlogs.startup_detected[name] = False
+    _refresh()
+    try:
+        await plugin.bot.rest.create_message(
+            ALERT_CHANNEL_ID,
+            f"⚠️ Agent `{conn.agent_id}` disconnected; its bots show as stopped until it reconnects: "
+            + ", ".join(f"`{n}`" for n in sorted(conn.bots)),
+        )
+    except Exception as e:
+        log(f"[FLEET] disconnect alert failed: {e}")
+
+
+@plugin.listener(hikari.StartedEvent)
+async def on_started(_: hikari.StartedEvent) -> None:
+    global _server
+    if not FLEET_LISTEN_PORT or _server is not None:
+        return
+    if FLEET_TOKEN in ("", "CHANGE_ME"):
+        log(f"[FLEET] not listening on {FLEET_LISTEN_HOST}:{FLEET_LISTEN_PORT}: set FLEET_TOKEN in config.py first")
+        return
+    _server = await asyncio.start_server(
+        _handle_agent, FLEET_LISTEN_HOST, FLEET_LISTEN_PORT, limit=MAX_LINE_BYTES
+    )
+    log(f"[FLEET] listening for agents on {FLEET_LISTEN_HOST}:{FLEET_LISTEN_PORT}")
+
+
+@plugin.listener(hikari.StoppingEvent)
+async def on_stopping(_: hikari.StoppingEvent) -> None:
+    global _server
+    if _server is not None:
+        _server.close()
+        for conn in list(AGENTS.values()):
+            conn.writer.close()
+        _server = None
+
+
+def load(bot):
+    botlogs.FLEET_LISTENERS.append(_on_fleet_change)
+    bot.add_plugin(plugin)
+
+
+def unload(bot):
+    if _on_fleet_change in botlogs.FLEET_LISTENERS:
+        botlogs.FLEET_LISTENERS.remove(_on_fleet_change)
+    bot.remove_plugin(plugin)
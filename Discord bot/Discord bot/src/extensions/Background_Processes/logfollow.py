@@ -0,0 +1,205 @@
+# src/extensions/Background_Processes/logfollow.py
+"""
+Live log follow: one message kept up to date with a bot's newest output until
+it times out or its Stop button is pressed (subscriptions: src/follow.py).
+
+start() is what `/tail follow:` and the panel's "Follow Log" button call. The
+tailers reach the hub through botlogs.LINE_LISTENERS (remote bots' lines
+through fleetcontroller), and the hook is only registered while something is
+followed: with a listener present the tailers keep every parsed line instead
+of just the buffer's worth.
+
+One loop edits the due viewers, each at most every FOLLOW_EDIT_SECONDS and
+only when its feed has new lines. hikari waits out 429s itself; a viewer whose
+edit is stuck behind one stays busy instead of queueing more edits, and one
+that hits RateLimitTooLongError backs off. A message that is gone (deleted,
+or an ephemeral one whose interaction token expired) ends its viewer.
+"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+import hikari
+import lightbulb
+
+from src.components import ROUTER, Job
+from src.config import FOLLOW_EDIT_SECONDS, FOLLOW_MAX_MINUTES, FOLLOW_MAX_VIEWERS
+from src.follow import FollowHub, Viewer
+from src.metrics import FOLLOW_EDITS, FOLLOW_VIEWERS
+from src.extensions.Background_Processes.botlogs import ERR_BUFFERS, LINE_LISTENERS, LOG_BUFFERS, log
+
+plugin = lightbulb.Plugin("Log Follow")
+
+# fn(content, components) edits the followed message
+EditTarget = Callable[[str, list], Awaitable[None]]
+
+HUB = FollowHub(keep=50, interval=FOLLOW_EDIT_SECONDS)
+TICK_SECONDS = 0.5
+EPHEMERAL_MAX_SECONDS = 14 * 60  # interaction tokens (and so ephemeral edits) last 15 minutes
+RATE_LIMIT_BACKOFF_SECONDS = 30.0
+MAX_FAILURES = 3
+STOP_PREFIX = "follow_stop:"
+
+_loop_task: Optional[asyncio.Task] = None
+
+
+def interaction_target(inter: hikari.PartialInteraction) -> EditTarget:
+    """Edit an interaction's initial response (ephemeral follows)."""
+    async def edit(content: str, components: list) -> None:
+        await inter.edit_initial_response(content=content, components=components)
+    return edit
+
+
+def message_target(rest: hikari.api.RESTClient, channel_id: int, message_id: int) -> EditTarget:
+    """Edit a channel message (public follows; no 15-minute limit)."""
+    async def edit(content: str, components: list) -> None:
+        await rest.edit_message(channel_id, message_id, content=content, components=components)
+    return edit
+
+
+def refusal(user_id: int, name: str, stream: str) -> Optional[str]:
+    """Why a new follow can't start right now, or None (replacing your own follow of the same stream always can)."""
+    running = sum(1 for v in HUB.viewers.values() if v.stop_reason is None)
+    if running >= FOLLOW_MAX_VIEWERS and HUB.find(user_id, name, stream) is None:
+        return f"❌ {FOLLOW_MAX_VIEWERS} live follows are already running (FOLLOW_MAX_VIEWERS); stop one first."
+    return None
+
+
+def start(user_id: int, name: str, stream: str, minutes: float, target: EditTarget, *, ephemeral: bool) -> Viewer:
+    """Follow `name`'s stream ("out"/"err") in the message `target` edits; replaces this user's follow of it."""
+    old = HUB.find(user_id, name, stream)
+    if old is not None:
+        HUB.stop(old.id, "replaced by a newer follow")
+    seconds = min(minutes, FOLLOW_MAX_MINUTES) * 60
+    if ephemeral:
+        seconds = min(seconds, EPHEMERAL_MAX_SECONDS)
+    buf = (ERR_BUFFERS if stream == "err" else LOG_BUFFERS).get(name)
+    v = HUB.subscribe(user_id, name, stream, time.time(), seconds, target, buf or ())
+    _ensure_running()
+    return v
+
+
+def _update_gauge() -> None:
+    FOLLOW_VIEWERS.set(len(HUB), kind="viewers")
+    FOLLOW_VIEWERS.set(len(HUB.feeds), kind="feeds")
+
+
+def _ensure_running() -> None:
+    global _loop_task
+    if HUB.on_line not in LINE_LISTENERS:
+        LINE_LISTENERS.append(HUB.on_line)
+    if _loop_task is None or _loop_task.done():
+        _loop_task = asyncio.create_task(_follow_loop())
+    _update_gauge()
+
+
+async def _follow_loop() -> None:
+    try:
+        while HUB.viewers:
+            now = time.time()
+            for v in HUB.due(now):
+                v.busy = True
+                asyncio.create_task(_edit(v))
+            await asyncio.sleep(TICK_SECONDS)
+    finally:
+        # Nobody is following; let the tailers go back to keeping only the buffer's worth
+        if HUB.on_line in LINE_LISTENERS:
+            LINE_LISTENERS.remove(HUB.on_line)
+        _update_gauge()
+
+
+def _age(seconds: float) -> str:
+    return f"{seconds:.0f}s" if seconds < 90 else f"{seconds / 60:.0f}m"
+
+
+def _render(v: Viewer, lines: list[str], total: int, now: float) -> str:
+    if v.stop_reason is None:
+        head = f"📡 `{v.bot}` {v.stream}: live, {total} new line(s), ends in {_age(max(0.0, v.deadline - now))}"
+    else:
+        head = f"⏹️ `{v.bot}` {v.stream}: follow {v.stop_reason}, {total} new line(s)"
+    # Newest lines that fit; drop from the top
+    shown: list[str] = []
+    size = len(head) + 10
+    for text in reversed(lines):
+        size += len(text) + 1
+        if size > 1900:
+            break
+        shown.append(text)
+    shown.reverse()
+    return head + "\n```\n" + ("\n".join(shown) or "(no output yet)") + "\n```"
+
+
+def _stop_row(v: Viewer) -> list:
+    row = plugin.bot.rest.build_message_action_row()
+    row.add_interactive_button(hikari.ButtonStyle.DANGER, f"{STOP_PREFIX}{v.id}", label="Stop")
+    return [row]
+
+
+async def _edit(v: Viewer) -> None:
+    closing = v.stop_reason is not None
+    lines, seq, total = HUB.view(v)
+    try:
+        await v.target(_render(v, lines, total, time.time()), [] if closing else _stop_row(v))
+    except (hikari.NotFoundError, hikari.UnauthorizedError, hikari.ForbiddenError):
+        # Message deleted, or the interaction token expired
+        FOLLOW_EDITS.inc(result="gone")
+        closing = True
+    except hikari.RateLimitTooLongError:
+        FOLLOW_EDITS.inc(result="rate_limited")
+        v.next_edit = time.time() + RATE_LIMIT_BACKOFF_SECONDS
+    except Exception as e:
+        FOLLOW_EDITS.inc(result="failed")
+        v.failures += 1
+        v.next_edit = time.time() + FOLLOW_EDIT_SECONDS
+        if v.failures >= MAX_FAILURES:
+            log(f"[FOLLOW] {v.bot} {v.stream}: giving up after {v.failures} failed edits: {e}")
+            closing = True
+    else:
+        FOLLOW_EDITS.inc(result="closed" if closing else "ok")
+        HUB.sent(v, seq, time.time())
+    finally:
+        v.busy = False
+    if closing:
+        HUB.unsubscribe(v.id)
+        _update_gauge()
+
+
+def _stop_check(inter: hikari.ComponentInteraction) -> Optional[str]:
+    v = HUB.viewers.get(_viewer_id(inter.custom_id))
+    if v is not None and v.user_id != inter.user.id:
+        return "❌ Only whoever started this follow can stop it."
+    return None
+
+
+def _viewer_id(custom_id: str) -> int:
+    try:
+        return int(custom_id[len(STOP_PREFIX):])
+    except ValueError:
+        return 0
+
+
+@ROUTER.route(STOP_PREFIX, ack="update", check=_stop_check, prefix=True)
+async def on_stop(job: Job) -> None:
+    if HUB.stop(_viewer_id(job.interaction.custom_id), "stopped") is None:
+        # Already over (e.g. the controller restarted); just drop the stale button
+        await job.interaction.edit_initial_response(components=[])
+
+
+@plugin.listener(hikari.StoppingEvent)
+async def on_stopping(_: hikari.StoppingEvent) -> None:
+    # Leave the messages saying the follow ended rather than looking live
+    for v in list(HUB.viewers.values()):
+        HUB.stop(v.id, "ended (controller stopping)")
+    deadline = time.monotonic() + 3.0
+    while HUB.viewers and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+
+
+def load(bot: lightbulb.BotApp) -> None:
+    bot.add_plugin(plugin)
+
+
+def unload(bot: lightbulb.BotApp) -> None:
+    if _loop_task is not None:
+        _loop_task.cancel()
+    bot.remove_plugin(plugin)
@@ -0,0 +1,210 @@
+# src/extensions/Background_Processes/loopmonitor.py
+"""
+Event-loop lag sampler + stall detector.
+
+A coroutine ticks every LOOP_LAG_SAMPLE_SECONDS and records how late it woke
+up (loop lag). A watchdog thread watches that wake-up deadline; once the
+sampler is more than LOOP_STALL_MS overdue it grabs the loop thread's stack and the
+task that was running, so we know *what* blocked the loop, not just that it
+was blocked. Stalls go into a bounded history for /looplag and can ping the
+alert channel when they get close to Discord's 3s interaction window.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+
+import hikari
+import lightbulb
+
+from src.config import (
+    ALERT_CHANNEL_ID,
+    LOOP_LAG_SAMPLE_SECONDS,
+    LOOP_STALL_MS,
+    LOOP_ALERT_MS,
+    LOOP_ALERT_COOLDOWN_SECONDS,
+    LOOP_STALL_HISTORY,
+)
+from src.metrics import REGISTRY, REST_LATENCY
+from src.extensions.Background_Processes.botlogs import log
+
+plugin = lightbulb.Plugin("Loop Monitor")
+
+LOOP_LAG = REGISTRY.histogram(
+    "v4_loop_lag_seconds", "How late the loop-lag sampler woke up."
+)
+LOOP_STALLS = REGISTRY.counter(
+    "v4_loop_stalls_total", "Event-loop stalls longer than LOOP_STALL_MS, by blocking function.", ("function",)
+)
+
+# Our own source tree; used to pick the most relevant frame from a stack
+_SRC_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+STACK_DEPTH = 12
+
+
+@dataclass
+class StallRecord:
+    started_at: float                 # wall-clock time the stall was detected
+    function: str                     # innermost frame in our code (or innermost overall)
+    task: str                         # task/coroutine running when the loop stalled
+    stack: list[str] = field(default_factory=list)
+    duration_ms: float | None = None  # filled in once the loop recovers
+
+
+# Bounded stall history (newest last) + recent lag samples
+STALLS: deque[StallRecord] = deque(maxlen=LOOP_STALL_HISTORY)
+LAG_SAMPLES: deque[float] = deque(maxlen=600)
+
+# Monotonic time the sampler expects to wake up next, and when it last did
+_deadline: float = 0.0
+_last_tick: float = 0.0
+_loop_thread_id: int | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+_sampler_task: asyncio.Task | None = None
+_watchdog: threading.Thread | None = None
+_stop_event = threading.Event()
+_last_alert_ts: float = 0.0
+
+
+def _describe_task(loop: asyncio.AbstractEventLoop) -> str:
+    """Best-effort name of the task running on `loop` (read from another thread)."""
+    try:
+        task = asyncio.tasks._current_tasks.get(loop)  # type: ignore[attr-defined]
+    except Exception:
+        task = None
+    if task is None:
+        return "(callback, no task)"
+    try:
+        coro = task.get_coro()
+        return f"{task.get_name()} {getattr(coro, '__qualname__', repr(coro))}"
+    except Exception:
+        return repr(task)
+
+
+def _sample_stack() -> tuple[str, list[str]]:
+    frame = sys._current_frames().get(_loop_thread_id) if _loop_thread_id else None
+    if frame is None:
+        return "(unknown)", []
+    summary = traceback.extract_stack(frame)[-STACK_DEPTH:]
+    stack = [f"{os.path.basename(fs.filename)}:{fs.lineno} {fs.name}" for fs in summary]
+
+    function = f"{summary[-1].name} ({os.path.basename(summary[-1].filename)}:{summary[-1].lineno})"
+    for fs in reversed(summary):
+        if os.path.abspath(fs.filename).startswith(_SRC_ROOT):
+            function = f"{fs.name} ({os.path.basename(fs.filename)}:{fs.lineno})"
+            break
+    return function, stack
+
+
+def _watchdog_main() -> None:
+    stall_ms = LOOP_STALL_MS / 1000.0
+    poll = min(0.05, stall_ms / 4)
+    current: StallRecord | None = None
+    stall_deadline = 0.0
+
+    while not _stop_event.wait(poll):
+        late = time.monotonic() - _deadline
+        if current is None and late > stall_ms:
+            function, stack = _sample_stack()
+            current = StallRecord(
+                started_at=time.time() - late,
+                function=function,
+                task=_describe_task(_loop) if _loop else "(unknown)",
+                stack=stack,
+            )
+            stall_deadline = _deadline
+            STALLS.append(current)
+        elif current is not None and _deadline != stall_deadline:
+            # Sampler woke up again: close the record
+            current.duration_ms = round((_last_tick - stall_deadline) * 1000.0, 1)
+            LOOP_STALLS.inc(function=current.function)
+            if _loop is not None and current.duration_ms >= LOOP_ALERT_MS:
+                try:
+                    _loop.call_soon_threadsafe(_schedule_alert, current)
+                except RuntimeError:
+                    pass
+            current = None
+
+
+def _schedule_alert(record: StallRecord) -> None:
+    asyncio.create_task(_send_alert(record))
+
+
+async def _send_alert(record: StallRecord) -> None:
+    global _last_alert_ts
+    log(f"[LOOP] stall {record.duration_ms:.0f}ms in {record.function} (task={record.task})")
+    now = time.time()
+    if now - _last_alert_ts < LOOP_ALERT_COOLDOWN_SECONDS:
+        return
+    _last_alert_ts = now
+    try:
+        with REST_LATENCY.time(op="create_message"):
+            await plugin.bot.rest.create_message(
+                ALERT_CHANNEL_ID,
+                f"🐢 Event loop blocked for **{record.duration_ms:.0f}ms** in `{record.function}`"
+                f" (task `{record.task}`). See `/looplag` for the stack.",
+            )
+    except Exception as e:
+        log(f"[LOOP] alert failed: {e}")
+
+
+async def _sampler() -> None:
+    global _deadline, _last_tick
+    interval = LOOP_LAG_SAMPLE_SECONDS
+    while True:
+        _deadline = time.monotonic() + interval
+        await asyncio.sleep(interval)
+        _last_tick = time.monotonic()
+        lag = max(0.0, _last_tick - _deadline)
+        LOOP_LAG.observe(lag)
+        LAG_SAMPLES.append(lag)
+
+
+def start_monitor() -> None:
+    """Start the sampler and watchdog thread on the running loop (idempotent)."""
+    global _sampler_task, _watchdog, _loop, _loop_thread_id, _deadline
+    if _sampler_task is not None and not _sampler_task.done():
+        return
+    _loop = asyncio.get_running_loop()
+    _loop_thread_id = threading.get_ident()
+    _deadline = time.monotonic() + LOOP_LAG_SAMPLE_SECONDS
+    _sampler_task = asyncio.create_task(_sampler())
+
+    if _watchdog is None or not _watchdog.is_alive():
+        _stop_event.clear()
+        _watchdog = threading.Thread(target=_watchdog_main, name="loop-watchdog", daemon=True)
+        _watchdog.start()
+    log(f"[LOOP] monitor started (stall>{LOOP_STALL_MS}ms, alert>{LOOP_ALERT_MS}ms)")
+
+
+def stop_monitor() -> None:
+    global _sampler_task, _watchdog
+    _stop_event.set()
+    _watchdog = None
+    if _sampler_task is not None:
+        _sampler_task.cancel()
+        _sampler_task = None
+
+
+@plugin.listener(hikari.StartedEvent)
+async def on_started(_: hikari.StartedEvent) -> None:
+    start_monitor()
+
+
+@plugin.listener(hikari.StoppingEvent)
+async def on_stopping(_: hikari.StoppingEvent) -> None:
+    stop_monitor()
+
+
+def load(bot: lightbulb.BotApp) -> None:
+    bot.add_plugin(plugin)
+
+
+def unload(bot: lightbulb.BotApp) -> None:
+    stop_monitor()
+    bot.remove_plugin(plugin)
@@ -0,0 +1,144 @@
+# src/extensions/Background_Processes/metricsserver.py
+import logging
+import time
+
+import hikari
+import lightbulb
+import psutil
+from aiohttp import web
+
+from src.config import METRICS_HOST, METRICS_PORT
+from src.metrics import (
+    REGISTRY,
+    REST_RATE_LIMITED,
+    OWNER_COMMANDS,
+    BOT_CPU,
+    BOT_RSS,
+    PROCESS_SCAN,
+)
+from src.extensions.Background_Processes.botlogs import BOT_EXECUTABLES, log
+from src import offload
+
+plugin = lightbulb.Plugin("Metrics Endpoint")
+
+_runner: web.AppRunner | None = None
+
+# Per-bot CPU/RAM needs a process scan; never do it more often than this
+COLLECT_MIN_INTERVAL = 5.0
+_last_collect: float = 0.0
+
+
+class _RateLimitCounter(logging.Handler):
+    """
+    Count 429s. hikari retries rate-limited requests internally, so they never
+    surface as exceptions; the only trace is a warning/error on "hikari.rest".
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        msg = str(record.msg)
+        if "rate limited" not in msg:
+            return
+        REST_RATE_LIMITED.inc(scope="global" if "global bucket" in msg else "route")
+
+
+_rate_limit_handler = _RateLimitCounter(level=logging.WARNING)
+
+
+def _collect_bot_resources() -> None:
+    """One psutil pass for the whole fleet -> per-bot CPU% and RSS gauges."""
+    global _last_collect
+    now = time.monotonic()
+    if now - _last_collect < COLLECT_MIN_INTERVAL:
+        return
+    _last_collect = now
+
+    cpu = {name: 0.0 for name in BOT_EXECUTABLES}
+    rss = {name: 0 for name in BOT_EXECUTABLES}
+
+    with PROCESS_SCAN.time(caller="metrics"):
+        found = offload.scan_fleet_sync(dict(BOT_EXECUTABLES))
+    for name, procs in found.items():
+        for p in procs:
+            try:
+                # process_iter hands back cached Process objects, so cpu_percent
+                # measures since the previous scrape
+                cpu[name] += p.cpu_percent(interval=None)
+                rss[name] += p.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+
+    BOT_CPU.clear()
+    BOT_RSS.clear()
+    for name in BOT_EXECUTABLES:
+        BOT_CPU.set(round(cpu[name], 1), bot=name)
+        BOT_RSS.set(rss[name], bot=name)
+
+
+def _render() -> str:
+    REGISTRY.collect()
+    return REGISTRY.render()
+
+
+async def render_metrics() -> str:
+    """Run collectors + render off the event loop."""
+    return await offload.run("metrics_render", _render)
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"  # Prometheus text exposition format
+
+
+async def _handle_metrics(_: web.Request) -> web.Response:
+    body = await render_metrics()
+    return web.Response(text=body, headers={"Content-Type": CONTENT_TYPE})
+
+
+async def _start_server() -> None:
+    global _runner
+    if not METRICS_PORT or _runner is not None:
+        return
+    app = web.Application()
+    app.router.add_get("/metrics", _handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, METRICS_HOST, METRICS_PORT).start()
+    except OSError as e:
+        log(f"[METRICS] could not bind {METRICS_HOST}:{METRICS_PORT}: {e}")
+        await runner.cleanup()
+        return
+    _runner = runner
+    log(f"[METRICS] serving http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+
+
+async def _stop_server() -> None:
+    global _runner
+    if _runner is not None:
+        await _runner.cleanup()
+        _runner = None
+
+
+@plugin.listener(hikari.StartedEvent)
+async def on_started(_: hikari.StartedEvent) -> None:
+    await _start_server()
+
+
+@plugin.listener(hikari.StoppingEvent)
+async def on_stopping(_: hikari.StoppingEvent) -> None:
+    await _stop_server()
+
+
+@plugin.listener(lightbulb.CommandInvocationEvent)
+async def on_command(event: lightbulb.CommandInvocationEvent) -> None:
+    OWNER_COMMANDS.inc(command=event.command.name)
+
+
+def load(bot: lightbulb.BotApp) -> None:
+    REGISTRY.add_collector(_collect_bot_resources)
+    logging.getLogger("hikari.rest").addHandler(_rate_limit_handler)
+    bot.add_plugin(plugin)
+
+
+def unload(bot: lightbulb.BotApp) -> None:
+    REGISTRY.remove_collector(_collect_bot_resources)
+    logging.getLogger("hikari.rest").removeHandler(_rate_limit_handler)
+    bot.remove_plugin(plugin)
@@ -0,0 +1,55 @@
+# src/extensions/Commands_Owner/agents.py
+import time
+
+import hikari
+import lightbulb
+
+from src.config import BOT_AGENTS, FLEET_LISTEN_PORT
+from src.extensions.Background_Processes import fleetcontroller
+from src.extensions.Background_Processes.botlogs import startup_detected
+
+plugin = lightbulb.Plugin("Agents Command")
+plugin.add_checks(lightbulb.owner_only)
+
+
+def _age(seconds: float) -> str:
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+@plugin.command
+@lightbulb.command("agents", "Show connected host agents and their bots (ephemeral)")
+@lightbulb.implements(lightbulb.SlashCommand)
+async def agents(ctx: lightbulb.Context) -> None:
+    if not FLEET_LISTEN_PORT:
+        await ctx.respond("Multi-host mode is off (FLEET_LISTEN_PORT = 0).", flags=hikari.MessageFlag.EPHEMERAL)
+        return
+
+    now = time.time()
+    expected = sorted(set(BOT_AGENTS.values()))
+    lines = [f"{'Agent':<14}{'Peer':<22}{'Up':>7}{'Seen':>7}{'Resync':>8}  Bots"]
+    for agent_id in sorted(set(expected) | set(fleetcontroller.AGENTS)):
+        conn = fleetcontroller.AGENTS.get(agent_id)
+        bots = sorted(n for n, a in BOT_AGENTS.items() if a == agent_id)
+        running = sum(1 for n in bots if startup_detected.get(n))
+        if conn is None:
+            lines.append(f"{agent_id:<14}{'(not connected)':<22}{'—':>7}{'—':>7}{'—':>8}  {running}/{len(bots)}")
+            continue
+        lines.append(
+            f"{agent_id:<14}{conn.peer:<22}{_age(now - conn.connected_at):>7}"
+            f"{_age(now - conn.last_seen):>7}{conn.resyncs:>8}  {running}/{len(bots)}"
+        )
+
+    content = "```\n" + "\n".join(lines) + "\n```"
+    await ctx.respond(content[:1990], flags=hikari.MessageFlag.EPHEMERAL)
+
+
+def load(bot):
+    bot.add_plugin(plugin)
+
+
+def unload(bot):
+    bot.remove_plugin(plugin)
@@ -0,0 +1,85 @@
+# src/extensions/Commands_Owner/discover.py
+import hikari
+import lightbulb
+
+from src.config import (
+    BOT_AGENTS,
+    FLEET_FILE,
+    DISCOVERY_ROOTS,
+    DISCOVERY_DEPTH,
+    DISCOVERY_EXE_NAMES,
+    DISCOVERY_MARKER,
+    DISCOVERY_CACHE_FILE,
+    DISCOVERY_WORKERS,
+)
+from src.discovery import Discovery, merge_fleet
+from src.fleetfile import Fleet, read_fleet, write_fleet, diff_fleet
+from src.extensions.Background_Processes.botlogs import BOT_EXECUTABLES, log
+from src import offload
+
+plugin = lightbulb.Plugin("Discover Command")
+plugin.add_checks(lightbulb.owner_only)
+
+
+def _scan():
+    return Discovery(
+        DISCOVERY_ROOTS,
+        depth=DISCOVERY_DEPTH,
+        exe_names=DISCOVERY_EXE_NAMES,
+        marker=DISCOVERY_MARKER,
+        cache_path=DISCOVERY_CACHE_FILE,
+        workers=DISCOVERY_WORKERS,
+    ).run()
+
+
+@plugin.command
+@lightbulb.option("apply", "Write the result to the fleet file (it is picked up within seconds)", type=bool, required=False, default=False)
+@lightbulb.command("discover", "Scan the discovery roots for bot folders and show/apply the fleet changes (ephemeral)")
+@lightbulb.implements(lightbulb.SlashCommand)
+async def discover(ctx: lightbulb.Context) -> None:
+    if not FLEET_FILE:
+        await ctx.respond("❌ `FLEET_FILE` is not set in config.", flags=hikari.MessageFlag.EPHEMERAL)
+        return
+    await ctx.respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE, flags=hikari.MessageFlag.EPHEMERAL)
+
+    result = await offload.run("discover", _scan)
+    exists = await offload.exists(FLEET_FILE)
+    try:
+        # No file yet: start from what is running now (config.py)
+        current = await offload.run("read_fleet", read_fleet, FLEET_FILE) or Fleet(dict(BOT_EXECUTABLES), dict(BOT_AGENTS))
+    except (OSError, ValueError) as e:
+        await ctx.edit_last_response(f"❌ `{FLEET_FILE}` is not valid, fix it first: `{e}`")
+        return
+    merged = merge_fleet(current, result.bots)
+    diff = diff_fleet(current, merged)
+
+    lines = [
+        f"{result.dirs} folder(s) in {result.seconds * 1000:.0f} ms "
+        f"({result.scanned} listed, {result.cached} from cache); {len(result.bots)} bot folder(s) found",
+    ]
+    for name in diff.added:
+        lines.append(f"+ {name}: {merged.bots[name]}")
+    for name in diff.removed:
+        lines.append(f"- {name}: {current.bots[name]} (exe is gone)")
+    if not diff and exists:
+        lines.append(f"{FLEET_FILE} is up to date ({len(merged.bots)} bot(s))")
+    elif ctx.options.apply:
+        await offload.run("write_fleet", write_fleet, FLEET_FILE, merged)
+        log(f"[FLEET] /discover wrote {FLEET_FILE}: {diff.summary()}")
+        lines.append(f"Written to {FLEET_FILE}; the fleet reloads on its next check")
+    else:
+        lines.append("Dry run; use apply: true to write it")
+    lines.extend(f"! {err}" for err in result.errors[:5])
+
+    content = "```\n" + "\n".join(lines) + "\n```"
+    if len(content) > 1990:
+        content = content[:1980] + "\n…```"
+    await ctx.edit_last_response(content)
+
+
+def load(bot: lightbulb.BotApp):
+    bot.add_plugin(plugin)
+
+
+def unload(bot: lightbulb.BotApp):
+    bot.remove_plugin(plugin)
@@ -0,0 +1,83 @@
+# src/extensions/Commands_Owner/errors.py
+import time
+
+import hikari
+import lightbulb
+
+from src.extensions.Background_Processes import botlogs
+
+plugin = lightbulb.Plugin("Errors Command")
+plugin.add_checks(lightbulb.owner_only)
+
+
+def _age(seconds: float) -> str:
+    if seconds < 90:
+        return f"{seconds:.0f}s"
+    if seconds < 5400:
+        return f"{seconds / 60:.0f}m"
+    if seconds < 172800:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
+
+
+@plugin.command
+@lightbulb.option("id", "Show one fingerprint in full (the id column)", required=False)
+@lightbulb.option("hours", "Only errors seen in the last N hours", type=float, required=False, min_value=0.1)
+@lightbulb.option("count", "How many fingerprints", type=int, required=False, default=10, min_value=1, max_value=25)
+@lightbulb.option("name", "Bot name (default: the whole fleet)", required=False, autocomplete=True)
+@lightbulb.command("errors", "Most frequent stderr errors, grouped by fingerprint (ephemeral)")
+@lightbulb.implements(lightbulb.SlashCommand)
+async def errors(ctx: lightbulb.Context) -> None:
+    now = time.time()
+    tracker = botlogs.ERRORS
+
+    if ctx.options.id:
+        found = tracker.find(ctx.options.id.strip().lower())
+        if not found:
+            await ctx.respond(f"❌ No error fingerprint `{ctx.options.id}`.", flags=hikari.MessageFlag.EPHEMERAL)
+            return
+        parts = []
+        for e in found:
+            parts.append(
+                f"**{e.bot}** `{e.id}` ×{e.count}, first {_age(now - e.first_seen)} ago, last {_age(now - e.last_seen)} ago\n"
+                f"```\n{e.key}\n```Sample:\n```\n{e.sample}\n```"
+            )
+        content = "\n".join(parts)
+        await ctx.respond(content[:1990], flags=hikari.MessageFlag.EPHEMERAL)
+        return
+
+    name = ctx.options.name
+    if name and name not in botlogs.BOT_EXECUTABLES:
+        await ctx.respond(f"❌ Bot `{name}` not found in configuration.", flags=hikari.MessageFlag.EPHEMERAL)
+        return
+    since = now - ctx.options.hours * 3600 if ctx.options.hours else None
+    top = tracker.top(name, ctx.options.count, since)
+    if not top:
+        await ctx.respond("No stderr errors recorded" + (f" for `{name}`." if name else "."), flags=hikari.MessageFlag.EPHEMERAL)
+        return
+
+    lines = [f"{'Id':<9}{'Count':>7}{'Last':>6}  {'Bot':<14}Error"]
+    for e in top:
+        lines.append(f"{e.id:<9}{e.count:>7}{_age(now - e.last_seen):>6}  {e.bot[:13]:<14}{e.key[:70]}")
+    total = sum(tracker.lines.get(b, 0) for b in ([name] if name else tracker.lines))
+    footer = f"{total} stderr line(s); {len(tracker.entries)} fingerprint(s) tracked fleet-wide. `/errors id:<id>` for a sample."
+    content = "```\n" + "\n".join(lines) + "\n```" + footer
+    while len(content) > 1990 and len(lines) > 2:
+        lines.pop()
+        content = "```\n" + "\n".join(lines) + "\n```" + footer
+    await ctx.respond(content, flags=hikari.MessageFlag.EPHEMERAL)
+
+
+@errors.autocomplete("name")
+async def name_autocomplete(
+    opt: hikari.AutocompleteInteractionOption, inter: hikari.AutocompleteInteraction
+):
+    return botlogs.name_choices(opt.value)
+
+
+def load(bot):
+    bot.add_plugin(plugin)
+
+
+def unload(bot):
+    bot.remove_plugin(plugin)
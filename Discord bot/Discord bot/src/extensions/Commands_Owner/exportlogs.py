@@ -0,0 +1,88 @@
+# src/extensions/Commands_Owner/exportlogs.py
+import os
+import tempfile
+import time
+
+import hikari
+import lightbulb
+
+from src import offload
+from src.config import EXPORT_DEFAULT_HOURS, EXPORT_MAX_MB
+from src.logstore import parse_time
+from src.extensions.Background_Processes import botlogs
+from src.extensions.Background_Processes.fleetcontroller import is_remote
+
+plugin = lightbulb.Plugin("Export Logs Command")
+plugin.add_checks(lightbulb.owner_only)
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1e6:.1f} MB"
+
+
+@plugin.command
+@lightbulb.option("since", f"From this time on: 15m, 2h, 1d, 09:55, 2024-05-01 09:55 (default {EXPORT_DEFAULT_HOURS:g}h)", required=False)
+@lightbulb.option("name", "Bot name", required=True, autocomplete=True)
+@lightbulb.command("exportlogs", "A bot's captured stdout/stderr, journal and state as a zip attachment (ephemeral)")
+@lightbulb.implements(lightbulb.SlashCommand)
+async def exportlogs(ctx: lightbulb.Context) -> None:
+    name = ctx.options.name
+    if name not in botlogs.BOT_EXECUTABLES:
+        await ctx.respond(f"❌ Bot `{name}` not found in configuration.", flags=hikari.MessageFlag.EPHEMERAL)
+        return
+    now = time.time()
+    try:
+        start = parse_time(ctx.options.since, now) if ctx.options.since else now - EXPORT_DEFAULT_HOURS * 3600
+    except ValueError as e:
+        await ctx.respond(f"❌ {e}", flags=hikari.MessageFlag.EPHEMERAL)
+        return
+
+    await ctx.respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE, flags=hikari.MessageFlag.EPHEMERAL)
+    # Snapshot the state here, on the loop; the zip is written on the offload pool
+    state = botlogs.export_state(name)
+    fd, path = tempfile.mkstemp(prefix=f"v4export-{name}-", suffix=".zip")
+    os.close(fd)
+    try:
+        bundle = await offload.run("export_logs", botlogs.write_export, path, name, start, now, state)
+        since = time.strftime("%m-%d %H:%M", time.localtime(start))
+        content = (
+            f"📦 `{name}` since {since}: {_mb(bundle.raw_bytes)} of output, "
+            f"{bundle.events} journal event(s), {_mb(bundle.size)} zipped in {bundle.seconds:.1f}s"
+        )
+        # trimmed: the plan moved the start later (oldest lines out); cut: the cap was hit while copying (newest out)
+        trimmed = [f"std{p.stream}" for p in bundle.parts if p.trimmed]
+        cut = [f"std{p.stream}" for p in bundle.parts if p.cut]
+        if trimmed:
+            content += f"\n⚠️ Over the {EXPORT_MAX_MB:g} MB cap; the oldest lines of {'/'.join(trimmed)} were left out."
+        if cut:
+            content += f"\n⚠️ The {EXPORT_MAX_MB:g} MB cap was reached while writing; the newest lines of {'/'.join(cut)} are missing."
+        if bundle.truncated:
+            content += " See manifest.json for the exported range."
+        if is_remote(name):
+            content += "\nℹ️ This bot runs on an agent; its full logs are captured on that host."
+        await ctx.respond(
+            content,
+            attachment=hikari.File(path, filename=f"{name}-{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}.zip"),
+        )
+    except Exception as e:
+        await ctx.respond(f"❌ Export failed: {type(e).__name__}: {e}"[:1900])
+    finally:
+        try:
+            await offload.remove(path)
+        except OSError:
+            pass
+
+
+@exportlogs.autocomplete("name")
+async def name_autocomplete(
+    opt: hikari.AutocompleteInteractionOption, inter: hikari.AutocompleteInteraction
+):
+    return botlogs.name_choices(opt.value)
+
+
+def load(bot):
+    bot.add_plugin(plugin)
+
+
+def unload(bot):
+    bot.remove_plugin(plugin)
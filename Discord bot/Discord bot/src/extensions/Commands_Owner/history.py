@@ -0,0 +1,72 @@
+# src/extensions/Commands_Owner/history.py
+import datetime
+
+import hikari
+import lightbulb
+
+from src.extensions.Background_Processes import botlogs
+from src import offload
+
+plugin = lightbulb.Plugin("History Command")
+plugin.add_checks(lightbulb.owner_only)
+
+
+def _value(value: float | None) -> str:
+    if value is None:
+        return ""
+    return f"{value:.0f}" if value == int(value) else f"{value:.2f}"
+
+
+def _history(name: str, count: int, kind: str | None) -> list[str]:
+    store = botlogs.STORE
+    events = store.last_events(name, count, kind)
+    totals = store.totals(name)
+    lines = [f"{'When':<15}{'Event':<13}{'Value':>10}  Detail"]
+    for ev in events:
+        when = datetime.datetime.fromtimestamp(ev.ts).strftime("%m-%d %H:%M:%S")
+        detail = "" if ev.value is not None else ev.detail
+        lines.append(f"{when:<15}{ev.type[:12]:<13}{_value(ev.value):>10}  {detail[:60]}")
+    if not events:
+        lines.append("(no events)")
+    if totals:
+        counts = ", ".join(f"{t} {tot.count}" for (_, t), tot in sorted(totals.items()))
+        lines.append(f"Lifetime: {counts}")
+    return lines
+
+
+@plugin.command
+@lightbulb.option("type", "Only this event type (e.g. restarting, offline, instant, depositable)", required=False)
+@lightbulb.option("count", "How many events (newest first)", type=int, required=False, default=15, min_value=1, max_value=50)
+@lightbulb.option("name", "Bot name", required=True, autocomplete=True)
+@lightbulb.command("history", "Recent journal events for a bot: restarts, exits, payouts, depositable items (ephemeral)")
+@lightbulb.implements(lightbulb.SlashCommand)
+async def history(ctx: lightbulb.Context) -> None:
+    if botlogs.STORE is None:
+        await ctx.respond("❌ The state store is off (`STATE_DB = None` in config).", flags=hikari.MessageFlag.EPHEMERAL)
+        return
+    name = ctx.options.name
+    if name not in botlogs.BOT_EXECUTABLES:
+        await ctx.respond(f"❌ Bot `{name}` not found in configuration.", flags=hikari.MessageFlag.EPHEMERAL)
+        return
+
+    # SQLite reads stay off the event loop
+    lines = await offload.run("history", _history, name, ctx.options.count, ctx.options.type)
+    content = f"**{name}**\n```\n" + "\n".join(lines) + "\n```"
+    if len(content) > 1990:
+        content = content[:1980] + "\n…```"
+    await ctx.respond(content, flags=hikari.MessageFlag.EPHEMERAL)
+
+
+@history.autocomplete("name")
+async def name_autocomplete(
+    opt: hikari.AutocompleteInteractionOption, inter: hikari.AutocompleteInteraction
+):
+    return botlogs.name_choices(opt.value)
+
+
+def load(bot):
+    bot.add_plugin(plugin)
+
+
+def unload(bot):
+    bot.remove_plugin(plugin)
@@ -0,0 +1,60 @@
+# src/extensions/Commands_Owner/looplag.py
+import datetime
+
+import hikari
+import lightbulb
+
+from src.extensions.Background_Processes import loopmonitor
+
+plugin = lightbulb.Plugin("Loop Lag Command")
+plugin.add_checks(lightbulb.owner_only)
+
+
+def _ms(seconds: float | None) -> str:
+    return "—" if seconds is None else f"{seconds * 1000:.0f}ms"
+
+
+@plugin.command
+@lightbulb.option("stack", "Include the stack sample of the worst stall", type=bool, required=False, default=False)
+@lightbulb.option("count", "Number of recent stalls to list (1-20)", type=int, required=False, default=5)
+@lightbulb.command("looplag", "Show event-loop lag and recent stalls (ephemeral)")
+@lightbulb.implements(lightbulb.SlashCommand)
+async def looplag(ctx: lightbulb.Context) -> None:
+    n = max(1, min(20, ctx.options.count))
+    lag = loopmonitor.LOOP_LAG
+    recent = list(loopmonitor.LAG_SAMPLES)
+
+    lines = [
+        f"Lag now   {_ms(recent[-1] if recent else None)}   max(recent) {_ms(max(recent) if recent else None)}",
+        f"Lag p50   {_ms(lag.quantile(0.5))}   p99 {_ms(lag.quantile(0.99))}   samples {lag.count()}",
+        f"Stalls    {len(loopmonitor.STALLS)} in history (>{loopmonitor.LOOP_STALL_MS}ms)",
+        "",
+    ]
+
+    stalls = list(loopmonitor.STALLS)[-n:]
+    for rec in reversed(stalls):
+        ts = datetime.datetime.fromtimestamp(rec.started_at).strftime("%H:%M:%S")
+        dur = "ongoing" if rec.duration_ms is None else f"{rec.duration_ms:.0f}ms"
+        lines.append(f"{ts} {dur:>8}  {rec.function}")
+        lines.append(f"         task: {rec.task}")
+
+    if ctx.options.stack and loopmonitor.STALLS:
+        worst = max(loopmonitor.STALLS, key=lambda r: r.duration_ms or 0.0)
+        lines.append("")
+        lines.append(f"Stack of worst stall ({worst.duration_ms or 0:.0f}ms):")
+        lines.extend(f"  {frame}" for frame in worst.stack)
+
+    content = "```\n" + "\n".join(lines) + "\n```"
+    while len(content) > 1900 and len(lines) > 4:
+        lines.pop()
+        content = "```\n" + "\n".join(lines) + "\n```"
+
+    await ctx.respond(content, flags=hikari.MessageFlag.EPHEMERAL)
+
+
+def load(bot: lightbulb.BotApp):
+    bot.add_plugin(plugin)
+
+
+def unload(bot: lightbulb.BotApp):
+    bot.remove_plugin(plugin)
@@ -0,0 +1,97 @@
+# src/extensions/Commands_Owner/metrics.py
+import time
+
+import hikari
+import lightbulb
+
+from src.metrics import (
+    REGISTRY,
+    TAIL_LINES,
+    EMBED_EDITS,
+    PANEL_EDITS,
+    REST_LATENCY,
+    REST_RATE_LIMITED,
+    PROCESS_SCAN,
+    INTERACTION_ACK,
+    INTERACTION_JOBS,
+    BOT_CPU,
+    BOT_RSS,
+    BOTS_STARTED,
+)
+from src.config import METRICS_HOST, METRICS_PORT
+from src import offload
+
+plugin = lightbulb.Plugin("Metrics Command")
+plugin.add_checks(lightbulb.owner_only)
+
+
+def _ms(seconds: float | None) -> str:
+    return "—" if seconds is None else f"{seconds * 1000:.0f}ms"
+
+
+def _uptime(seconds: float) -> str:
+    h, rem = divmod(int(seconds), 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}h{m:02d}m{s:02d}s"
+
+
+def _top(gauge, n: int, fmt) -> str:
+    items = sorted(gauge.items(), key=lambda kv: kv[1], reverse=True)[:n]
+    if not items:
+        return "—"
+    return ", ".join(f"{key[0]} {fmt(v)}" for key, v in items)
+
+
+def _summary() -> str:
+    uptime = time.time() - REGISTRY.started_at
+    lines_total = TAIL_LINES.total()
+
+    rest_ops = sorted({key[0] for key in REST_LATENCY.label_keys()})
+    rest_rows = [
+        f"  {op:<15} n={REST_LATENCY.count(op=op):<6} "
+        f"p50={_ms(REST_LATENCY.quantile(0.5, op=op)):<7} p99={_ms(REST_LATENCY.quantile(0.99, op=op))}"
+        for op in rest_ops
+    ] or ["  (no calls yet)"]
+
+    out = [
+        f"Uptime          {_uptime(uptime)}",
+        f"Bots started    {int(BOTS_STARTED.value())}",
+        f"Tail lines      {int(lines_total)} ({lines_total / max(uptime, 1):.1f}/s avg)",
+        f"Embed edits     ok={int(EMBED_EDITS.value(result='ok'))} "
+        f"recreated={int(EMBED_EDITS.value(result='recreated'))} failed={int(EMBED_EDITS.value(result='failed'))}",
+        f"Panel edits     ok={int(PANEL_EDITS.value(result='ok'))} failed={int(PANEL_EDITS.value(result='failed'))}",
+        f"429s            {int(REST_RATE_LIMITED.total())}",
+        f"Process scans   n={PROCESS_SCAN.count()} p50={_ms(PROCESS_SCAN.quantile(0.5))} "
+        f"p95={_ms(PROCESS_SCAN.quantile(0.95))}",
+        f"Panel acks      n={INTERACTION_ACK.count()} p50={_ms(INTERACTION_ACK.quantile(0.5))} "
+        f"p99={_ms(INTERACTION_ACK.quantile(0.99))} jobs running={int(INTERACTION_JOBS.value())}",
+        "REST latency",
+        *rest_rows,
+        f"Top CPU         {_top(BOT_CPU, 5, lambda v: f'{v:.0f}%')}",
+        f"Top RAM         {_top(BOT_RSS, 5, lambda v: f'{v / (1024 * 1024):.0f}MB')}",
+    ]
+    return "\n".join(out)
+
+
+@plugin.command
+@lightbulb.command("metrics", "Show controller metrics (ephemeral)")
+@lightbulb.implements(lightbulb.SlashCommand)
+async def metrics(ctx: lightbulb.Context) -> None:
+    # Per-bot CPU/RAM come from a process scan; keep it off the event loop
+    await offload.run("metrics_collect", REGISTRY.collect)
+
+    content = "```\n" + _summary() + "\n```"
+    if METRICS_PORT:
+        content += f"\nScrape: `http://{METRICS_HOST}:{METRICS_PORT}/metrics`"
+    if len(content) > 1900:
+        content = content[:1890] + "\n…```"
+
+    await ctx.respond(content, flags=hikari.MessageFlag.EPHEMERAL)
+
+
+def load(bot: lightbulb.BotApp):
+    bot.add_plugin(plugin)
+
+
+def unload(bot: lightbulb.BotApp):
+    bot.remove_plugin(plugin)
@@ -0,0 +1,81 @@
+# src/extensions/Commands_Owner/payouts.py
+import math
+
+import hikari
+import lightbulb
+
+from src.config import PAYOUT_WINDOW_HOURS
+from src.extensions.Background_Processes.botlogs import payout_stats
+
+plugin = lightbulb.Plugin("Payouts Command")
+plugin.add_checks(lightbulb.owner_only)
+
+SORTS = {
+    "rate": "fastest first",
+    "slowest": "slowest first",
+    "eta": "closest to max first",
+    "name": "by name",
+}
+
+
+def _num(value: float, fmt: str = ".1f") -> str:
+    return "—" if math.isnan(value) else format(value, fmt)
+
+
+def _eta(hours: float) -> str:
+    if math.isnan(hours):
+        return "—"
+    if hours == 0:
+        return "at max"
+    if hours < 1:
+        return f"{hours * 60:.0f}m"
+    if hours < 48:
+        return f"{hours:.1f}h"
+    return f"{hours / 24:.1f}d"
+
+
+@plugin.command
+@lightbulb.option("hours", "Window to measure over", type=float, required=False, default=PAYOUT_WINDOW_HOURS, min_value=0.25)
+@lightbulb.option("sort", "Order of the rows", required=False, default="rate", choices=list(SORTS))
+@lightbulb.command("payouts", "Coins/hour per bot, time to max and fleet totals (ephemeral)")
+@lightbulb.implements(lightbulb.SlashCommand)
+async def payouts(ctx: lightbulb.Context) -> None:
+    stats = payout_stats(ctx.options.hours)
+    order = list(range(len(stats.names)))
+    if ctx.options.sort == "name":
+        order.sort(key=lambda i: stats.names[i])
+    else:
+        # Bots without a value go last whichever way the rest is sorted
+        key = stats.eta_hours if ctx.options.sort == "eta" else stats.rate
+        sign = -1 if ctx.options.sort == "rate" else 1
+        order.sort(key=lambda i: (math.isnan(key[i]), sign * key[i] if not math.isnan(key[i]) else 0))
+
+    lines = [f"{'Bot':<16}{'C/h':>8}{'Now':>9}{'Max':>7}{'To max':>8}{'N':>5}"]
+    for i in order:
+        lines.append(
+            f"{stats.names[i][:15]:<16}{_num(stats.rate[i]):>8}{_num(stats.current[i], '.2f'):>9}"
+            f"{_num(stats.max[i], '.0f'):>7}{_eta(stats.eta_hours[i]):>8}{int(stats.samples[i]):>5}"
+        )
+    pct = stats.percentiles()
+    footer = [
+        f"Fleet: {stats.fleet_rate:.1f} coins/h from {stats.earning}/{len(stats.names)} bot(s), "
+        f"{stats.fleet_current:.2f} coins waiting",
+    ]
+    if pct:
+        footer.append("Rate percentiles: " + ", ".join(f"p{p} {v:.1f}" for p, v in pct.items()))
+    footer.append(f"Window {stats.window_hours:g}h, {SORTS[ctx.options.sort]}; computed in {stats.seconds * 1000:.1f} ms")
+
+    # Keep the fleet summary when the table is cut
+    body = "\n".join(lines)
+    room = 1990 - len("\n".join(footer)) - 20
+    if len(body) > room:
+        body = body[:room].rsplit("\n", 1)[0] + "\n…"
+    await ctx.respond("```\n" + body + "\n\n" + "\n".join(footer) + "\n```", flags=hikari.MessageFlag.EPHEMERAL)
+
+
+def load(bot):
+    bot.add_plugin(plugin)
+
+
+def unload(bot):
+    bot.remove_plugin(plugin)
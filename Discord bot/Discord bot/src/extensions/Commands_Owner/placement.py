@@ -0,0 +1,94 @@
+# src/extensions/Commands_Owner/placement.py
+import datetime
+
+import hikari
+import lightbulb
+
+from src.config import PLACEMENT_ENABLED, PLACEMENT_STRATEGY, BOT_PRIORITY
+from src.extensions.Background_Processes import botlogs
+
+plugin = lightbulb.Plugin("Placement Command")
+plugin.add_checks(lightbulb.owner_only)
+
+
+def _bar(pct: float, width: int = 20) -> str:
+    filled = int(round(width * max(0.0, min(100.0, pct)) / 100))
+    return "█" * filled + "·" * (width - filled)
+
+
+def _core_lines(title: str, loads: list[float] | None) -> list[str]:
+    if not loads:
+        return [f"{title}: no sample yet"]
+    reserved = set(botlogs.PLACER.reserved)
+    lines = [f"{title}:"]
+    for core, pct in enumerate(loads):
+        tag = " ctl" if core in reserved else ""
+        lines.append(f"  cpu{core:<3}{_bar(pct)} {pct:5.1f}%{tag}")
+    return lines
+
+
+def _change_lines(entry: dict) -> list[str]:
+    ts = datetime.datetime.fromtimestamp(entry["at"]).strftime("%H:%M:%S")
+    lines = [f"{ts} {entry['reason']}: {len(entry['moves'])} bot(s) moved"]
+    for name, old, new in entry["moves"]:
+        lines.append(f"  {name}: {old} -> {new}")
+    before, after = entry["before"], entry["after"]
+    if before and after:
+        lines.append(
+            f"  load avg {sum(before) / len(before):.1f}% -> {sum(after) / len(after):.1f}%, "
+            f"hottest {max(before):.1f}% -> {max(after):.1f}%, "
+            f"spread {max(before) - min(before):.1f} -> {max(after) - min(after):.1f} pts"
+        )
+    return lines
+
+
+@plugin.command
+@lightbulb.option("rebalance", "Re-place all bots by measured CPU now (takes ~6s)", type=bool, required=False, default=False)
+@lightbulb.command("placement", "CPU placement on this host: cores per bot and per-core load before/after (ephemeral)")
+@lightbulb.implements(lightbulb.SlashCommand)
+async def placement(ctx: lightbulb.Context) -> None:
+    if not PLACEMENT_ENABLED:
+        await ctx.respond("CPU placement is off (`PLACEMENT_ENABLED` in config).", flags=hikari.MessageFlag.EPHEMERAL)
+        return
+
+    entry = None
+    if ctx.options.rebalance:
+        await ctx.respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE, flags=hikari.MessageFlag.EPHEMERAL)
+        entry = await botlogs.rebalance()
+
+    placer = botlogs.PLACER
+    lines = [
+        f"Strategy {PLACEMENT_STRATEGY}, priority {BOT_PRIORITY}, controller on {placer.reserved or 'all'}, "
+        f"bots on {placer.cores}",
+        "",
+    ]
+    for name in sorted(placer.assigned):
+        cpu = botlogs.bot_cpu.get(name)
+        lines.append(f"{name[:15]:<16}{str(placer.assigned[name]):<12}{'—' if cpu is None else f'{cpu:.0f}%':>6}")
+    if not placer.assigned:
+        lines.append("No bots placed yet")
+    lines.append("")
+
+    last = entry or (botlogs.placement_log[-1] if botlogs.placement_log else None)
+    if last is None:
+        lines.extend(_core_lines("Per-core load now", botlogs.core_load))
+    else:
+        lines.extend(_change_lines(last))
+        lines.extend(_core_lines("Before", last["before"]))
+        lines.extend(_core_lines("After", last["after"] or None))
+
+    content = "```\n" + "\n".join(lines) + "\n```"
+    if len(content) > 1990:
+        content = content[:1980] + "\n…```"
+    if entry is not None:
+        await ctx.edit_last_response(content)
+    else:
+        await ctx.respond(content, flags=hikari.MessageFlag.EPHEMERAL)
+
+
+def load(bot: lightbulb.BotApp):
+    bot.add_plugin(plugin)
+
+
+def unload(bot: lightbulb.BotApp):
+    bot.remove_plugin(plugin)
@@ -0,0 +1,55 @@
+# src/extensions/Commands_Owner/recovery.py
+import time
+
+import hikari
+import lightbulb
+
+from src.extensions.Background_Processes.botlogs import BOT_EXECUTABLES, SUPERVISOR, _display_state
+
+plugin = lightbulb.Plugin("Recovery Command")
+plugin.add_checks(lightbulb.owner_only)
+
+
+def _dur(seconds: float | None) -> str:
+    if seconds is None:
+        return "—"
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+@plugin.command
+@lightbulb.command("recovery", "Crash recovery stats: exits, restarts, downtime and MTTR per bot (ephemeral)")
+@lightbulb.implements(lightbulb.SlashCommand)
+async def recovery(ctx: lightbulb.Context) -> None:
+    now = time.time()
+    lines = [f"{'Bot':<16}{'Policy':<11}{'Exits':>6}{'Rst':>5}{'Loop':>5}{'Down':>8}{'MTTR':>7}  State"]
+    total_rec = total_sec = 0.0
+    for name in sorted(BOT_EXECUTABLES):
+        rec = SUPERVISOR.records.get(name)
+        if rec is None:
+            lines.append(f"{name[:15]:<16}{SUPERVISOR.policy(name):<11}{0:>6}{0:>5}{0:>5}{'—':>8}{'—':>7}  {_display_state(name)}")
+            continue
+        total_rec += rec.recoveries
+        total_sec += rec.recovery_seconds
+        lines.append(
+            f"{name[:15]:<16}{SUPERVISOR.policy(name):<11}{rec.exits:>6}{rec.restarts:>5}{rec.crash_loops:>5}"
+            f"{_dur(rec.downtime(now)):>8}{_dur(rec.mttr()):>7}  {_display_state(name)}"
+        )
+    fleet_mttr = _dur(total_sec / total_rec) if total_rec else "—"
+    lines.append(f"Fleet MTTR {fleet_mttr} over {total_rec:.0f} recovered incident(s)")
+
+    content = "```\n" + "\n".join(lines) + "\n```"
+    if len(content) > 1990:
+        content = content[:1980] + "\n…```"
+    await ctx.respond(content, flags=hikari.MessageFlag.EPHEMERAL)
+
+
+def load(bot):
+    bot.add_plugin(plugin)
+
+
+def unload(bot):
+    bot.remove_plugin(plugin)
@@ -4,9 +4,15 @@ import lightbulb
 
 from src.extensions.Background_Processes.botlogs import (
     BOT_EXECUTABLES,
+    LAUNCH_STAGGER_SECONDS,
+    LAUNCH_JITTER_SECONDS,
+    launch_bots,
+    name_index,
+    name_choices,
     startup_detected,
     run_and_monitor_bot,
 )
+from src.extensions.Background_Processes.fleetcontroller import is_remote, send_command
 
 plugin = lightbulb.Plugin("Start Bot Command")
 plugin.add_checks(lightbulb.owner_only)
@@ -15,18 +21,40 @@ plugin.add_checks(lightbulb.owner_only)
 @plugin.command
 @lightbulb.option(
     "name",
-    "The bot to start (or reattach to if already running).",
-    choices=list(BOT_EXECUTABLES.keys()),
+    "The bot(s) to start (or reattach to): names and/or tag:<group>, comma-separated.",
     required=True,
+    autocomplete=True,
 )
-@lightbulb.command("startbot", "Start (or reattach to) a monitored bot by name")
+@lightbulb.command("startbot", "Start (or reattach to) monitored bots by name or tag")
 @lightbulb.implements(lightbulb.SlashCommand)
 async def startbot(ctx: lightbulb.Context) -> None:
-    botname = ctx.options.name
-    path = BOT_EXECUTABLES.get(botname)
+    botnames, invalid = name_index().resolve(ctx.options.name)
 
-    if not path:
-        await ctx.respond(f"❌ Bot `{botname}` not found in configuration.", flags=hikari.MessageFlag.EPHEMERAL)
+    if invalid or not botnames:
+        await ctx.respond(
+            f"❌ Bot(s) not found in configuration: {', '.join(invalid) or ctx.options.name}",
+            flags=hikari.MessageFlag.EPHEMERAL,
+        )
+        return
+
+    if len(botnames) > 1:
+        await ctx.respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE, flags=hikari.MessageFlag.EPHEMERAL)
+        lines = [await send_command(b, "start") for b in botnames if is_remote(b)]
+        local = [b for b in botnames if not is_remote(b)]
+        attached = sum(1 for b in local if startup_detected.get(b))
+        if local:
+            # Staggered like the startup launch; already-running ones are re-attached
+            asyncio.create_task(
+                launch_bots(ctx.app, local, stagger=LAUNCH_STAGGER_SECONDS, jitter=LAUNCH_JITTER_SECONDS)
+            )
+            lines.append(f"🚀 Starting {len(local) - attached} bot(s), re-attaching to {attached}…")
+        await ctx.edit_last_response("\n".join(lines)[:1990])
+        return
+
+    botname = botnames[0]
+    path = BOT_EXECUTABLES[botname]
+    if is_remote(botname):
+        await ctx.respond(await send_command(botname, "start"), flags=hikari.MessageFlag.EPHEMERAL)
         return
 
     if startup_detected.get(botname):
@@ -38,6 +66,14 @@ async def startbot(ctx: lightbulb.Context) -> None:
     asyncio.create_task(run_and_monitor_bot(ctx.app, botname, path))
 
 
+# Autocomplete rather than fixed choices: the fleet can change while running (fleet.json)
+@startbot.autocomplete("name")
+async def name_autocomplete(
+    opt: hikari.AutocompleteInteractionOption, inter: hikari.AutocompleteInteraction
+):
+    return name_choices(opt.value, multi=True)
+
+
 def load(bot: lightbulb.BotApp):
     bot.add_plugin(plugin)
 
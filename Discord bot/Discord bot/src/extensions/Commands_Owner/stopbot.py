@@ -1,68 +1,23 @@
-import asyncio
-import os
-import psutil
 import hikari
 import lightbulb
 
 from src.extensions.Background_Processes.botlogs import (
-    BOT_EXECUTABLES,
-    startup_detected,
-    _stop_tailer,
+    NOT_RUNNING,
+    name_index,
+    name_choices,
+    stop_bots,
     _schedule_update,  # If you don't have this, import _update_embed as _schedule_update
 )
+from src.extensions.Background_Processes.fleetcontroller import is_remote, send_command
 
 plugin = lightbulb.Plugin("Stop Bot Command")
 plugin.add_checks(lightbulb.owner_only)
 
 
-def _match_proc_for_exe(proc: psutil.Process, exe_full_path: str, workdir: str) -> bool:
-    exe_full_path = os.path.abspath(exe_full_path).lower()
-    workdir = os.path.abspath(workdir).lower()
-    exe_name = os.path.basename(exe_full_path)
-
-    try:
-        p_exe = (proc.info.get("exe") or "").lower()
-        p_name = (proc.info.get("name") or "").lower()
-        p_cwd  = (proc.info.get("cwd") or "").lower()
-        p_cmd  = proc.info.get("cmdline") or []
-    except (psutil.NoSuchProcess, psutil.AccessDenied):
-        return False
-
-    if p_exe and os.path.abspath(p_exe).lower() == exe_full_path:
-        return True
-    if p_name == exe_name.lower() and p_cwd == workdir:
-        return True
-    try:
-        if p_cmd:
-            cmd0 = os.path.abspath(p_cmd[0]).lower()
-            if cmd0 == exe_full_path:
-                return True
-    except Exception:
-        pass
-    return False
-
-
-async def _terminate_process(proc: psutil.Process) -> str:
-    try:
-        proc.terminate()
-    except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-        return f"terminate error: {e}"
-
-    for _ in range(10):  # up to ~5s
-        if not proc.is_running() or proc.status() == psutil.STATUS_ZOMBIE:
-            return "terminated"
-        await asyncio.sleep(0.5)
-
-    try:
-        proc.kill()
-        for _ in range(6):  # up to ~3s
-            if not proc.is_running():
-                return "killed"
-            await asyncio.sleep(0.5)
-    except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-        return f"kill error: {e}"
-
-    return "killed-timeout"
+def _stop_line(botname: str, results: list[str]) -> str:
+    if results[0] == NOT_RUNNING:
+        return f"⚠️ No running process found for `{botname}`." + "".join(f" {r}." for r in results[1:])
+    return f"🛑 Stopped `{botname}` → " + "; ".join(results)
 
 
 @plugin.command
@@ -75,58 +30,35 @@ async def _terminate_process(proc: psutil.Process) -> str:
 )
 @lightbulb.option(
     "name",
-    "The bot to stop",
-    choices=list(BOT_EXECUTABLES.keys()),
+    "The bot(s) to stop: names and/or tag:<group>, comma-separated",
     required=True,
+    autocomplete=True,
 )
-@lightbulb.command("stopbot", "Stop a monitored bot by name, optionally wiping session.json.")
+@lightbulb.command("stopbot", "Stop monitored bots by name or tag, optionally wiping session.json.")
 @lightbulb.implements(lightbulb.SlashCommand)
 async def stopbot(ctx: lightbulb.Context) -> None:
-    botname = ctx.options.name
-    exe_path = BOT_EXECUTABLES.get(botname)
+    botnames, invalid = name_index().resolve(ctx.options.name)
     wipe = ctx.options.wipe
 
-    if not exe_path:
-        await ctx.respond(f"❌ Bot `{botname}` not found in configuration.", flags=hikari.MessageFlag.EPHEMERAL)
-        return
-
-    matches: list[psutil.Process] = []
-    for proc in psutil.process_iter(["pid", "name", "exe", "cwd", "cmdline", "status"]):
-        try:
-            if _match_proc_for_exe(proc, exe_path, os.path.dirname(exe_path)):
-                matches.append(proc)
-        except (psutil.NoSuchProcess, psutil.AccessDenied):
-            continue
-
-    if not matches:
-        await ctx.respond(f"⚠️ No running process found for `{botname}`.", flags=hikari.MessageFlag.EPHEMERAL)
-        _stop_tailer(botname)
-        startup_detected[botname] = False
-        try:
-            await _schedule_update(ctx.app)
-        except Exception:
-            pass
+    if invalid or not botnames:
+        await ctx.respond(
+            f"❌ Bot(s) not found in configuration: {', '.join(invalid) or ctx.options.name}",
+            flags=hikari.MessageFlag.EPHEMERAL,
+        )
         return
+    await ctx.respond(hikari.ResponseType.DEFERRED_MESSAGE_CREATE, flags=hikari.MessageFlag.EPHEMERAL)
 
     results = []
-    for p in matches:
-        res = await _terminate_process(p)
-        results.append(f"PID {p.pid}: {res}")
-
-    # Optionally wipe session.json before marking as stopped
-    if wipe:
-        session_path = os.path.join(os.path.dirname(exe_path), "session.json")
-        try:
-            if os.path.exists(session_path):
-                os.remove(session_path)
-                results.append("session.json deleted")
-            else:
-                results.append("no session.json found")
-        except Exception as e:
-            results.append(f"wipe failed: {e}")
+    local = []
+    for botname in botnames:
+        if is_remote(botname):
+            results.append(await send_command(botname, "stop", wipe=wipe))
+        else:
+            local.append(botname)
 
-    _stop_tailer(botname)
-    startup_detected[botname] = False
+    # Intentional: no crash alert, no supervisor restart
+    stopped = await stop_bots(local, wipe=wipe, caller="stopbot")
+    results.extend(_stop_line(b, res) for b, res in stopped.items())
 
     # Refresh embed with the live BotApp instance
     try:
@@ -139,10 +71,18 @@ async def stopbot(ctx: lightbulb.Context) -> None:
     except Exception:
         pass
 
-    await ctx.respond(
-        f"🛑 Stopped `{botname}` → " + "; ".join(results),
-        flags=hikari.MessageFlag.EPHEMERAL,
-    )
+    content = "\n".join(results)
+    if len(content) > 1900:
+        content = content[:1900].rsplit("\n", 1)[0] + f"\n… ({len(results)} bots in total)"
+    await ctx.edit_last_response(content)
+
+
+# Autocomplete rather than fixed choices: the fleet can change while running (fleet.json)
+@stopbot.autocomplete("name")
+async def name_autocomplete(
+    opt: hikari.AutocompleteInteractionOption, inter: hikari.AutocompleteInteraction
+):
+    return name_choices(opt.value, multi=True)
 
 
 def load(bot: lightbulb.BotApp):
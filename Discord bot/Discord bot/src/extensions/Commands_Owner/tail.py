@@ -1,7 +1,13 @@
 # src/extensions/Commands_Owner/tail.py
+import time
+
 import lightbulb
 import hikari
 
+from src.logstore import parse_time
+from src import offload
+from src.extensions.Background_Processes import logfollow
+
 # Try common background module names
 try:
     from ..Background_Processes import bot_log_monitor as botlogs
@@ -20,18 +26,48 @@ plugin.add_checks(lightbulb.owner_only)
 @plugin.command
 @lightbulb.option("name", "Bot name", required=True, autocomplete=True)
 @lightbulb.option("lines", "Number of lines (1-50)", type=int, required=False, default=15)
+@lightbulb.option(
+    "stream",
+    "live: recent lines seen by the tailer; out/err: the captured history (survives restarts)",
+    required=False,
+    default="live",
+    choices=["live", "out", "err"],
+)
+@lightbulb.option("since", "Captured lines from this time on: 15m, 2h, 09:55, 2024-05-01 09:55", required=False)
+@lightbulb.option("until", "With since: up to this time (same formats; default now)", required=False)
+@lightbulb.option(
+    "follow", "Keep the message updated with new lines for N minutes (Stop button to end early)",
+    type=int, required=False, min_value=1, max_value=60,
+)
+@lightbulb.option(
+    "public", "With follow: post in this channel instead (ephemeral follows end after 14 min)",
+    type=bool, required=False, default=False,
+)
 @lightbulb.command("tail", "Show the last N log lines from a bot (ephemeral)")
 @lightbulb.implements(lightbulb.SlashCommand)
 async def tail(ctx: lightbulb.Context):
     name = ctx.options.name
     n = max(1, min(50, ctx.options.lines))
 
-    buf = botlogs.LOG_BUFFERS.get(name)
-    if not buf:
-        await ctx.respond(f"Unknown bot `{name}` or no logs yet.", flags=hikari.MessageFlag.EPHEMERAL)
+    if ctx.options.since:
+        await _tail_range(ctx, name, n)
+        return
+    if ctx.options.follow:
+        await _follow(ctx, name)
         return
 
-    lines = list(buf)[-n:]
+    if ctx.options.stream != "live" and botlogs.LOGCAPTURE is not None:
+        # Reads (and maybe decompresses) segments; keep it off the event loop
+        lines = await offload.run("log_tail", botlogs.LOGCAPTURE.tail, name, ctx.options.stream, n)
+        if not lines:
+            await ctx.respond(f"No captured {ctx.options.stream} output for `{name}`.", flags=hikari.MessageFlag.EPHEMERAL)
+            return
+    else:
+        buf = botlogs.LOG_BUFFERS.get(name)
+        if not buf:
+            await ctx.respond(f"Unknown bot `{name}` or no logs yet.", flags=hikari.MessageFlag.EPHEMERAL)
+            return
+        lines = list(buf)[-n:]
     content = "```\n" + "\n".join(lines) + "\n```"
     if len(content) > 1900:
         while len(content) > 1900 and lines:
@@ -42,15 +78,60 @@ async def tail(ctx: lightbulb.Context):
 
     await ctx.respond(content, flags=hikari.MessageFlag.EPHEMERAL)
 
+async def _follow(ctx: lightbulb.Context, name: str):
+    """Live view: one message edited with the newest lines (see logfollow)."""
+    if name not in botlogs.BOT_EXECUTABLES:
+        await ctx.respond(f"❌ Bot `{name}` not found in configuration.", flags=hikari.MessageFlag.EPHEMERAL)
+        return
+    stream = "err" if ctx.options.stream == "err" else "out"
+    refusal = logfollow.refusal(ctx.author.id, name, stream)
+    if refusal:
+        await ctx.respond(refusal, flags=hikari.MessageFlag.EPHEMERAL)
+        return
+
+    if ctx.options.public:
+        msg = await ctx.app.rest.create_message(ctx.channel_id, f"📡 Following `{name}` {stream}…")
+        target = logfollow.message_target(ctx.app.rest, ctx.channel_id, msg.id)
+        await ctx.respond(f"📡 Following `{name}` in this channel.", flags=hikari.MessageFlag.EPHEMERAL)
+    else:
+        await ctx.respond(f"📡 Following `{name}` {stream}…", flags=hikari.MessageFlag.EPHEMERAL)
+        target = logfollow.interaction_target(ctx.interaction)
+    logfollow.start(ctx.author.id, name, stream, ctx.options.follow, target, ephemeral=not ctx.options.public)
+
+async def _tail_range(ctx: lightbulb.Context, name: str, n: int):
+    """The first n captured lines in [since, until], read through the segment index."""
+    if botlogs.LOGCAPTURE is None:
+        await ctx.respond("❌ Log capture is off (`LOG_SEGMENT_MB = 0` in config).", flags=hikari.MessageFlag.EPHEMERAL)
+        return
+    try:
+        start = parse_time(ctx.options.since)
+        end = parse_time(ctx.options.until) if ctx.options.until else None
+    except ValueError as e:
+        await ctx.respond(f"❌ {e}", flags=hikari.MessageFlag.EPHEMERAL)
+        return
+    stream = "out" if ctx.options.stream == "live" else ctx.options.stream
+
+    rows, more = await offload.run("log_range", botlogs.log_range, name, stream, start, end, n)
+    window = time.strftime("%m-%d %H:%M:%S", time.localtime(start)) + " → " + (
+        time.strftime("%m-%d %H:%M:%S", time.localtime(end)) if end else "now"
+    )
+    if not rows:
+        await ctx.respond(f"No captured {stream} output for `{name}` in {window}.", flags=hikari.MessageFlag.EPHEMERAL)
+        return
+    lines = [time.strftime("%H:%M:%S ", time.localtime(ts)) + text for ts, text in rows]
+    head = f"`{name}` {stream}, {window}"
+    # Keep the start of the window; drop from the end to fit
+    while lines and len(head) + sum(len(x) + 1 for x in lines) > 1850:
+        lines.pop()
+        more = True
+    content = head + "\n```\n" + "\n".join(lines) + "\n```" + ("\n_(more lines in range; narrow it or raise lines)_" if more else "")
+    await ctx.respond(content, flags=hikari.MessageFlag.EPHEMERAL)
+
 # ⬇️ no type hint here; keep it version-agnostic
 @tail.autocomplete("name")
 async def ac_name(option, interaction):
-    # Offer names we’ve seen buffers for; fallback to configured bots
-    names = list(botlogs.LOG_BUFFERS.keys()) or list(botlogs.BOT_EXECUTABLES.keys())
-    names = names[:25]  # Discord limit
-
-    # Return a list of choices (name=value)
-    return [hikari.CommandChoice(name=n, value=n) for n in names]
+    # Best matches for what's typed so far (at most 25, Discord's limit)
+    return botlogs.name_choices(getattr(option, "value", None))
 
 def load(bot):
     bot.add_plugin(plugin)
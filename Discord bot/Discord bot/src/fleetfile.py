@@ -0,0 +1,115 @@
+# src/fleetfile.py
+"""
+The fleet definition as a data file, so bots can be added/removed/moved
+without restarting the controller. When FLEET_FILE exists it replaces
+BOT_EXECUTABLES / BOT_AGENTS from config.py (the dicts are updated in place,
+so every module that imported them sees the change); botlogs polls it and
+applies the difference to the running fleet.
+
+    {
+      "bots":   {"examplebot": "C:\\\\Users\\\\You\\\\Desktop\\\\examplebot\\\\v4-bot.exe"},
+      "agents": {"examplebot": "host2"}
+    }
+
+"agents" is optional. Pure parsing/diffing like src/fleetproto.py; acting on
+a diff (launch, stop, reattach) stays in botlogs.
+"""
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Fleet:
+    bots: dict[str, str]
+    agents: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class FleetDiff:
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)  # same name, new exe path
+    moved: list[str] = field(default_factory=list)    # same name, other agent (or to/from this host)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed or self.moved)
+
+    def summary(self) -> str:
+        parts = [
+            f"{label} {', '.join(names)}"
+            for label, names in (("+", self.added), ("-", self.removed), ("path", self.changed), ("agent", self.moved))
+            if names
+        ]
+        return "; ".join(parts) or "no changes"
+
+
+def parse_fleet(data) -> Fleet:
+    """Validate decoded JSON; raises ValueError with a readable reason."""
+    if not isinstance(data, dict) or not isinstance(data.get("bots"), dict):
+        raise ValueError('expected an object with a "bots" object')
+    bots = data["bots"]
+    agents = data.get("agents") or {}
+    if not isinstance(agents, dict):
+        raise ValueError('"agents" must be an object')
+    for name, path in bots.items():
+        if not name or not isinstance(path, str) or not path:
+            raise ValueError(f"bot {name!r}: path must be a non-empty string")
+    for name, agent in agents.items():
+        if name not in bots:
+            raise ValueError(f"agent entry for unknown bot {name!r}")
+        if not isinstance(agent, str) or not agent:
+            raise ValueError(f"bot {name!r}: agent must be a non-empty string")
+    return Fleet(dict(bots), dict(agents))
+
+
+def read_fleet(path: str | None) -> Fleet | None:
+    """The fleet in `path`, or None if there is no such file. Bad JSON raises ValueError."""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON: {e}") from None
+    return parse_fleet(data)
+
+
+def write_fleet(path: str, fleet: Fleet) -> None:
+    """Atomic write (the reload loop never sees a half-written file)."""
+    data: dict = {"bots": fleet.bots}
+    if fleet.agents:
+        data["agents"] = fleet.agents
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def load_into(path: str | None, bots: dict[str, str], agents: dict[str, str]) -> bool:
+    """Startup: replace the config dicts' contents with the file's; False if there is no file."""
+    fleet = read_fleet(path)
+    if fleet is None:
+        return False
+    bots.clear()
+    bots.update(fleet.bots)
+    agents.clear()
+    agents.update(fleet.agents)
+    return True
+
+
+def diff_fleet(old: Fleet, new: Fleet) -> FleetDiff:
+    d = FleetDiff()
+    for name in new.bots:
+        if name not in old.bots:
+            d.added.append(name)
+            continue
+        if new.bots[name] != old.bots[name]:
+            d.changed.append(name)
+        if new.agents.get(name) != old.agents.get(name):
+            d.moved.append(name)
+    d.removed = [name for name in old.bots if name not in new.bots]
+    return d
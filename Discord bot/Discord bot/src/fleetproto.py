@@ -0,0 +1,71 @@
+# src/fleetproto.py
+"""
+Wire format between agent.py (one per host) and the controller's
+fleetcontroller extension: one JSON object per line over plain TCP.
+
+agent -> controller
+    hello   {"agent", "token", "v", "bots": {name: snapshot}}   full resync, first message
+    delta   {"bot", "f": {field: value}}                         changed snapshot fields only
+    lines   {"bot", "s": "out"|"err", "l": [text, ...]}          batched log lines
+    event   {"bot", "kind", "detail"}
+    result  {"id", "ok", "msg"}                                   answer to a cmd
+    ping    {}
+
+controller -> agent
+    welcome {}
+    cmd     {"id", "op": "start"|"stop"|"restart", "bot", "wipe"}
+    resync  {"bots": [name, ...]}                                 send these bots' full snapshots again
+    pong    {}
+    error   {"msg"}                                               then the socket closes
+
+A snapshot is {"started": bool, "state": "stopped"|"launching"|"ready"|"unready"|
+"hung"|"restarting"|"held", "depo": int, "instant": float|None, "max": float|None}.
+Event kinds: "offline" (unexpected exit, not restarted), "restarting" (unexpected
+exit, the agent's supervisor restarts it; detail = when), "crashloop", "stopped"
+(intentional), "launch_failed", "ready" (detail = seconds to ready), "unready",
+"hung" (detail = why), "resumed", "memory" (RSS trend warning), "recycle".
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+
+PROTOCOL_VERSION = 1
+
+# Longest accepted line; a full hello for a few hundred bots is well under this
+MAX_LINE_BYTES = 4 * 1024 * 1024
+
+SNAPSHOT_FIELDS = ("started", "state", "depo", "instant", "max")
+
+
+class ProtocolError(Exception):
+    """The peer sent something that isn't a protocol message."""
+
+
+def encode(msg_type: str, **fields) -> bytes:
+    fields["t"] = msg_type
+    return json.dumps(fields, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+async def read_message(reader: asyncio.StreamReader, timeout: float | None = None) -> dict | None:
+    """Read one message; None on a clean EOF. Raises ProtocolError or asyncio.TimeoutError."""
+    try:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+    except ValueError as e:  # line longer than the reader limit
+        raise ProtocolError(str(e)) from e
+    if not line:
+        return None
+    try:
+        msg = json.loads(line)
+    except ValueError as e:
+        raise ProtocolError(f"bad json: {e}") from e
+    if not isinstance(msg, dict) or not isinstance(msg.get("t"), str):
+        raise ProtocolError("message without a type")
+    return msg
+
+
+def diff_snapshot(old: dict | None, new: dict) -> dict:
+    """Fields of `new` that differ from `old` (all of them if there is no `old`)."""
+    if old is None:
+        return dict(new)
+    return {k: v for k, v in new.items() if old.get(k) != v}
@@ -0,0 +1,131 @@
+# src/follow.py
+"""
+Live-follow subscriptions: viewers watching a bot's output as one message
+that is edited with the newest lines, instead of clicking "tail" again.
+
+  Feed     one per (bot, stream) that anyone follows: the newest `keep` lines
+           and a sequence number bumped per line. Every viewer of that bot
+           and stream reads the same feed, so the tailer hands each line over
+           once however many people are watching
+  Viewer   one followed message: its feed, when it ends, the feed sequence it
+           last showed and when it may be edited next
+  FollowHub.on_line()  the tailer-side hook; a dict lookup for bots nobody
+                       follows
+
+due() is what the edit loop asks for: viewers that are not mid-edit, whose
+edit interval has passed and whose feed has moved on since their last edit,
+or that are ending (time is up, or stop() was called). Lines arriving between
+two edits are batched into the next one, so a log storm costs one edit per
+interval per viewer. Ending goes through the same loop, so the closing edit
+never races an edit still in flight.
+
+No hikari imports; the Discord side is in
+src/extensions/Background_Processes/logfollow.py.
+"""
+from __future__ import annotations
+
+import itertools
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class Feed:
+    lines: deque
+    seq: int = 0
+    viewers: set[int] = field(default_factory=set)
+
+
+@dataclass
+class Viewer:
+    id: int
+    user_id: int
+    bot: str
+    stream: str
+    deadline: float
+    target: Any           # how to edit the message (opaque here)
+    started_seq: int = 0
+    sent_seq: int = -1    # -1: not shown yet
+    next_edit: float = 0.0
+    busy: bool = False
+    failures: int = 0
+    stop_reason: str | None = None
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return (self.bot, self.stream)
+
+
+class FollowHub:
+    def __init__(self, *, keep: int = 50, interval: float = 3.0):
+        self.keep = keep
+        self.interval = interval
+        self.feeds: dict[tuple[str, str], Feed] = {}
+        self.viewers: dict[int, Viewer] = {}
+        self._ids = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self.viewers)
+
+    def on_line(self, bot: str, stream: str, text: str) -> None:
+        feed = self.feeds.get((bot, stream))
+        if feed is not None:
+            feed.lines.append(text)
+            feed.seq += 1
+
+    def find(self, user_id: int, bot: str, stream: str) -> Viewer | None:
+        for v in self.viewers.values():
+            if v.user_id == user_id and v.key == (bot, stream) and v.stop_reason is None:
+                return v
+        return None
+
+    def subscribe(self, user_id: int, bot: str, stream: str, now: float, seconds: float, target: Any, seed=()) -> Viewer:
+        """A new viewer; the feed is seeded with `seed` if nobody followed it yet."""
+        feed = self.feeds.get((bot, stream))
+        if feed is None:
+            feed = self.feeds[(bot, stream)] = Feed(deque(seed, maxlen=self.keep))
+        v = Viewer(next(self._ids), user_id, bot, stream, now + seconds, target, started_seq=feed.seq)
+        feed.viewers.add(v.id)
+        self.viewers[v.id] = v
+        return v
+
+    def stop(self, viewer_id: int, reason: str) -> Viewer | None:
+        """Have the next due() hand this viewer over for its closing edit."""
+        v = self.viewers.get(viewer_id)
+        if v is not None and v.stop_reason is None:
+            v.stop_reason = reason
+        return v
+
+    def unsubscribe(self, viewer_id: int) -> Viewer | None:
+        """Drop a viewer (and its feed once nobody else reads it)."""
+        v = self.viewers.pop(viewer_id, None)
+        if v is None:
+            return None
+        feed = self.feeds.get(v.key)
+        if feed is not None:
+            feed.viewers.discard(v.id)
+            if not feed.viewers:
+                del self.feeds[v.key]
+        return v
+
+    def due(self, now: float) -> list[Viewer]:
+        found = []
+        for v in self.viewers.values():
+            if v.busy:
+                continue
+            if v.stop_reason is None and now >= v.deadline:
+                v.stop_reason = "timed out"
+            if v.stop_reason is not None or (now >= v.next_edit and self.feeds[v.key].seq != v.sent_seq):
+                found.append(v)
+        return found
+
+    def view(self, v: Viewer) -> tuple[list[str], int, int]:
+        """(newest lines, feed sequence, lines since the viewer started) for one edit."""
+        feed = self.feeds[v.key]
+        return list(feed.lines), feed.seq, feed.seq - v.started_seq
+
+    def sent(self, v: Viewer, seq: int, now: float) -> None:
+        v.sent_seq = seq
+        v.failures = 0
+        v.next_edit = now + self.interval
@@ -0,0 +1,60 @@
+# src/httpsettings.py
+"""
+HTTP settings for the Discord REST/gateway clients.
+
+Builds one certifi-backed SSL context per process and hands it to hikari via
+HTTPSettings, instead of patching aiohttp.TCPConnector for every client.
+"""
+from __future__ import annotations
+
+import ssl
+from functools import lru_cache
+
+import certifi
+import hikari
+
+from src.config import (
+    HTTP_KEEPALIVE,
+    HTTP_CONNECT_TIMEOUT_SECONDS,
+    HTTP_TOTAL_TIMEOUT_SECONDS,
+    HTTP_PROXY_URL,
+    HTTP_TRUST_ENV,
+)
+
+
+@lru_cache(maxsize=None)
+def get_ssl_context() -> ssl.SSLContext:
+    """Return the shared SSL context (CA bundle is parsed once per process)."""
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+def build_http_settings() -> hikari.impl.HTTPSettings:
+    """
+    HTTP settings tuned for our traffic: short bursts of embed edits and
+    interaction replies, then long idle gaps.
+
+    - keep-alive on (hikari force-closes every connection by default), so a
+      burst reuses warm TLS connections instead of handshaking per request
+    - cleanup of closed transports, so sockets dropped by Discord during the
+      idle gaps don't linger in the pool
+    - a bounded wait for a pooled connection, so a stuck burst fails fast
+      instead of hanging an interaction past its 3s window
+
+    The pool size itself is hikari's (100 connections per client), which is
+    far above what the per-route rate limits let us use anyway.
+    """
+    return hikari.impl.HTTPSettings(
+        ssl=get_ssl_context(),
+        force_close_transports=not HTTP_KEEPALIVE,
+        enable_cleanup_closed=HTTP_KEEPALIVE,
+        timeouts=hikari.impl.HTTPTimeoutSettings(
+            acquire_and_connect=HTTP_CONNECT_TIMEOUT_SECONDS,
+            request_socket_connect=HTTP_CONNECT_TIMEOUT_SECONDS,
+            total=HTTP_TOTAL_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+def build_proxy_settings() -> hikari.impl.ProxySettings:
+    """Proxy settings from config (no proxy unless one is configured)."""
+    return hikari.impl.ProxySettings(url=HTTP_PROXY_URL, trust_env=HTTP_TRUST_ENV)
@@ -0,0 +1,187 @@
+# src/logexport.py
+"""
+Diagnostics bundles for /exportlogs: one bot's captured output over a time
+range plus what the controller knows about it, as a zip built on a worker
+thread:
+
+  <bot>/state.json     status, coins, supervisor/watchdog records, top errors
+                       (built by the caller on the event loop)
+  <bot>/events.jsonl   the bot's journal from the state store
+  <bot>/err.log        stderr captured in the range
+  <bot>/out.log        stdout, same range
+  manifest.json        the range actually exported per stream and what was left out
+
+Memory stays flat however much history there is: log ranges are copied in
+1 MB blocks from the segments (LogCapture.iter_range_blocks) into the deflate
+stream, and the archive goes to a file that is uploaded from disk.
+
+The archive is capped at max_bytes (Discord's upload limit). The range is
+planned newest-first from the segment sizes before anything is written:
+stderr first (small, and usually the point), then stdout with what is left,
+so when a range doesn't fit the oldest lines are left out rather than the
+newest (the stream's start moves to a later index entry). The estimate uses
+the gzipped segments' own compression ratio; if it was off, writing still
+stops at the cap, which loses the newest lines of that stream instead
+(StreamPart.cut), and the manifest says where.
+
+Without capture (LOG_SEGMENT_MB = 0) the ends of the live LOG_DIR files are
+exported instead, sized by compressing a sample of their last megabyte.
+
+No hikari imports.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+import zipfile
+import zlib
+from dataclasses import asdict, dataclass
+
+from src.logstore import LogCapture, raw_size
+
+BLOCK = 1 << 20
+LEVEL = 6
+DEFAULT_RATIO = 0.15  # compressed/raw when there is nothing to measure
+HEADROOM = 0.9        # share of the cap the plan fills; the rest absorbs estimate error
+RESERVE = 256 * 1024  # at most this much kept free while copying, for deflate's buffered output and the manifest
+STREAMS = ("err", "out")
+
+
+@dataclass
+class StreamPart:
+    stream: str
+    start: float           # where the export of this stream actually starts
+    raw_bytes: int = 0     # uncompressed bytes written
+    trimmed: bool = False  # start moved later to fit the cap
+    cut: bool = False      # copying stopped at the cap (newest lines missing)
+
+
+@dataclass
+class Bundle:
+    path: str
+    size: int
+    parts: list[StreamPart]
+    events: int
+    seconds: float
+
+    @property
+    def raw_bytes(self) -> int:
+        return sum(p.raw_bytes for p in self.parts)
+
+    @property
+    def truncated(self) -> bool:
+        return any(p.trimmed or p.cut for p in self.parts)
+
+
+def _ratio(segs) -> float:
+    packed = [s for s in segs if s.compressed]
+    raw = sum(raw_size(s) for s in packed)
+    return sum(s.size for s in packed) / raw if raw else DEFAULT_RATIO
+
+
+def plan_start(capture: LogCapture, bot: str, stream: str, start: float, end: float, budget: float) -> tuple[float, bool]:
+    """
+    Start of the newest part of [start, end] whose compressed size fits in
+    `budget` bytes, and whether that is later than `start`.
+    """
+    spans = list(capture.spans(bot, stream, start, end))
+    ratio = _ratio(seg for seg, _, _ in spans)
+    used = 0.0
+    for seg, entries, i in reversed(spans):
+        first = entries[i][1]
+        stop = next((off for ts, off in entries[i + 1:] if ts > end), raw_size(seg))
+        cost = max(0, stop - first) * ratio
+        if used + cost <= budget:
+            used += cost
+            continue
+        # Only the newest part of this segment fits: start at the first index entry past the cut
+        cut = stop - max(0.0, budget - used) / ratio
+        later = [ts for ts, off in entries[i:] if off >= cut]
+        return (later[0] if later else entries[-1][0]), True
+    return start, False
+
+
+def _file_tail(path: str | None, budget: float):
+    """Blocks from the end of a live log file, as much as fits `budget` compressed bytes."""
+    try:
+        size = os.path.getsize(path) if path else 0
+        with open(path, "rb") as f:
+            f.seek(max(0, size - BLOCK))
+            sample = f.read(BLOCK)
+        ratio = len(zlib.compress(sample, LEVEL)) / len(sample) if sample else DEFAULT_RATIO
+    except (OSError, TypeError):
+        size, ratio = 0, DEFAULT_RATIO
+    offset = max(0, size - int(budget / ratio))
+
+    def blocks():
+        if not size:
+            return
+        with open(path, "rb") as f:
+            f.seek(offset)
+            if offset:
+                f.readline()  # start at a whole line
+            left = size - f.tell()  # the file keeps growing; stop where it was
+            while left > 0:
+                data = f.read(min(BLOCK, left))
+                if not data:
+                    break
+                left -= len(data)
+                yield data
+
+    return blocks(), offset > 0
+
+
+def _copy(zf: zipfile.ZipFile, raw, name: str, blocks, part: StreamPart, limit: int) -> None:
+    try:
+        with zf.open(name, "w", force_zip64=True) as out:
+            for data in blocks:
+                if raw.tell() >= limit:
+                    part.cut = True
+                    break
+                out.write(data)
+                part.raw_bytes += len(data)
+    finally:
+        blocks.close()  # closes the segment the generator has open
+
+
+def write_bundle(
+    path: str,
+    bot: str,
+    start: float,
+    end: float,
+    *,
+    capture: LogCapture | None,
+    live_files: dict[str, str],
+    state: dict,
+    events: list,
+    max_bytes: int,
+) -> Bundle:
+    """Write the bundle to `path`. Blocking (decompresses and compresses); run it off the event loop."""
+    t0 = time.perf_counter()
+    parts: list[StreamPart] = []
+    limit = max_bytes - min(RESERVE, max_bytes // 8)
+    with open(path, "wb") as raw, zipfile.ZipFile(raw, "w", zipfile.ZIP_DEFLATED, compresslevel=LEVEL) as zf:
+        # Small entries first, so the cap never costs them
+        zf.writestr(f"{bot}/state.json", json.dumps(state, indent=2, default=str))
+        zf.writestr(f"{bot}/events.jsonl", "".join(json.dumps(asdict(e)) + "\n" for e in events))
+        for stream in STREAMS:
+            part = StreamPart(stream, start)
+            budget = limit * HEADROOM - raw.tell()
+            if capture is not None:
+                part.start, part.trimmed = plan_start(capture, bot, stream, start, end, budget)
+                blocks = capture.iter_range_blocks(bot, stream, part.start, end, BLOCK)
+            else:
+                blocks, part.trimmed = _file_tail(live_files.get(stream), budget)
+            _copy(zf, raw, f"{bot}/{stream}.log", blocks, part, limit)
+            parts.append(part)
+        zf.writestr("manifest.json", json.dumps({
+            "bot": bot,
+            "since": start,
+            "until": end,
+            "source": "segments" if capture is not None else "live files",
+            "streams": [asdict(p) for p in parts],
+            "events": len(events),
+            "max_bytes": max_bytes,
+        }, indent=2))
+    return Bundle(path, os.path.getsize(path), parts, len(events), time.perf_counter() - t0)
@@ -0,0 +1,117 @@
+# src/logparse.py
+"""
+Log parsing for the tailers: decode a chunk of complete lines and pull out
+the values the status embed cares about.
+
+parse_chunk() is a plain function on bytes so it can run inline on the
+event loop or in a worker process. With PARSE_WORKERS > 0 each bot is
+pinned to one single-process pool (a shard), so its chunks are parsed in
+order while different bots parse in parallel. Only compact results come
+back: the last depositable/instant values (and every instant amount, for
+the payout rate), whether a readiness pattern matched, and the lines to keep.
+
+Keep this module free of hikari/lightbulb/botlogs imports; worker
+processes import it on their own.
+"""
+from __future__ import annotations
+
+import re
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+# Parse: "Instant payout amount : 201.59 (201.59/2000)"
+INSTANT_RX = re.compile(
+    r"Instant\s+payout\s+amount\s*:\s*([0-9]+(?:\.[0-9]+)?)\s*\(\s*[0-9]+(?:\.[0-9]+)?\s*/\s*([0-9]+(?:\.[0-9]+)?)\s*\)",
+    re.IGNORECASE,
+)
+
+# Strict pattern: match number immediately before "Depositable items"
+DEPOSITABLE_RE = re.compile(r"\b(\d+)\s+depositable\s+items\b", re.IGNORECASE)
+
+# Cheap pre-filters so most lines skip the regexes entirely
+_DEPO_HINT = b"epositable"
+_INSTANT_HINT = b"nstant"
+
+
+@dataclass
+class ParseResult:
+    line_count: int = 0
+    byte_count: int = 0
+    # Last `keep` lines of the chunk (all of them when keep is None)
+    lines: list[str] = field(default_factory=list)
+    # Last value seen in the chunk, None if the chunk had none
+    depo: int | None = None
+    instant: float | None = None
+    max: float | None = None
+    # Every instant amount in the chunk, in order: a catch-up read can hold
+    # several, and a cash-out between them must not hide the gain before it
+    instants: list[float] = field(default_factory=list)
+    # The readiness pattern matched somewhere in the chunk
+    ready: bool = False
+
+
+@lru_cache(maxsize=256)
+def _compile_ready(pattern: str) -> re.Pattern:
+    return re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+
+
+def parse_chunk(data: bytes, keep: int | None = None, ready_pattern: str | None = None) -> ParseResult:
+    """
+    Parse complete lines (the chunk should end at a newline; a trailing
+    partial line is treated as a line). Lines are decoded as UTF-8 with
+    errors ignored and right-stripped, like the old per-line tailer.
+    `ready_pattern` is only passed while the bot is still launching.
+    """
+    res = ParseResult(byte_count=len(data))
+    if ready_pattern:
+        res.ready = _compile_ready(ready_pattern).search(data.decode("utf-8", errors="ignore")) is not None
+    raw = data.split(b"\n")
+    if raw and not raw[-1]:
+        raw.pop()
+    res.line_count = len(raw)
+
+    # Only lines that can match need a full decode + regex
+    lower = data.lower()
+    if _DEPO_HINT in lower or _INSTANT_HINT in lower:
+        for line in raw:
+            low = line.lower()
+            if _DEPO_HINT in low:
+                m = DEPOSITABLE_RE.search(line.decode("utf-8", errors="ignore"))
+                if m:
+                    res.depo = int(m.group(1))
+            if _INSTANT_HINT in low:
+                p = INSTANT_RX.search(line.decode("utf-8", errors="ignore"))
+                if p:
+                    try:
+                        res.instant = float(p.group(1))
+                        res.instants.append(res.instant)
+                    except ValueError:
+                        pass
+                    try:
+                        res.max = float(p.group(2))
+                    except ValueError:
+                        pass
+
+    tail = raw if keep is None else raw[-keep:] if keep else []
+    res.lines = [line.decode("utf-8", errors="ignore").rstrip() for line in tail]
+    return res
+
+
+# -----------------------------
+# Sharded worker pools
+# -----------------------------
+_pools: list[ProcessPoolExecutor] = []
+
+
+def pool_for(name: str, workers: int) -> ProcessPoolExecutor:
+    """The single-process pool that parses `name` (stable across calls)."""
+    while len(_pools) < workers:
+        _pools.append(ProcessPoolExecutor(max_workers=1))
+    return _pools[zlib.crc32(name.encode("utf-8")) % workers]
+
+
+def shutdown_pools() -> None:
+    while _pools:
+        _pools.pop().shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,525 @@
+# src/logstore.py
+"""
+Segmented capture of bot output.
+
+The bots write stdout/stderr into LOG_DIR/<name>.log(.err), which a relaunch
+overwrites. The tailers already read every byte of those files; they also
+hand the bytes to LogCapture.append(), which keeps them as history:
+
+    LOG_DIR/segments/<bot>/out-000001.log.gz
+                           out-000002.log.gz
+                           out-000003.log      <- open, being appended to
+                           out-000003.idx      <- sparse time -> offset index
+                           out.pos             <- resume point in the live file
+
+  - a segment is closed at a line boundary once it reaches segment_bytes, or
+    when the tailer stops; closed segments are gzipped by a background thread
+  - sequence numbers only grow (a restarted controller opens a new segment),
+    so the order of the files is the order of the output
+  - retention runs on the same thread: closed segments older than max_age
+    days are deleted, then the oldest ones across all bots until the total
+    is under max_bytes
+  - the .pos file records how far into the live file has been captured, so
+    a controller that restarts while a bot keeps running picks up where it
+    stopped instead of skipping to the end
+
+Each segment has an index: (wall-clock time, byte offset) written when an
+append starts more than index_bytes or index_seconds after the previous entry.
+Lines from an entry's offset on were captured at or after its time, so a time
+range query (iter_range) skips the segments outside the range, seeks to the
+entry at or before the start and stops at the first entry past the end;
+the edges are as precise as the index interval. Offsets are in the
+uncompressed text (a gzipped segment is decompressed up to the offset, not
+split into lines). Segments keep their last write time as mtime.
+
+Readers (tail, iter_lines, iter_range, iter_range_blocks) go over the
+segments in order, plain or gzipped, and work while the capture goes on; run
+them off the event loop.
+
+No hikari imports; botlogs owns the instance and feeds it from the tailers.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import queue
+import re
+import shutil
+import struct
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+
+SEGMENT_DIR = "segments"
+STREAMS = ("out", "err")
+_SEGMENT_RX = re.compile(r"^(out|err)-(\d{6,})\.log(\.gz)?$")
+_HEAD_BYTES = 4096  # the live file's first bytes identify it across a controller restart
+_INDEX_ENTRY = struct.Struct("<dQ")  # (unix time, offset in the segment)
+_RELATIVE_RX = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhd])$")
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_STOP = object()
+
+
+@dataclass(frozen=True)
+class Segment:
+    path: str
+    bot: str
+    stream: str
+    seq: int
+    compressed: bool
+    size: int
+    mtime: float
+
+    @property
+    def index_path(self) -> str:
+        return index_path(self.path)
+
+
+class _Writer:
+    """The open segment of one (bot, stream); only touched by the tailer's thread."""
+
+    def __init__(self, path: str, seq: int):
+        self.path = path
+        self.seq = seq
+        self.file = open(path, "ab")
+        self.size = self.file.tell()
+        self.index = open(index_path(path), "ab")
+        self.indexed_at = -1      # segment offset of the last index entry
+        self.indexed_ts = 0.0
+        self.live_offset: int | None = None
+        self.live_file = None  # the tailer's handle on the live file, for its identity
+
+    def close(self) -> None:
+        self.file.close()
+        self.index.close()
+
+
+def index_path(segment_path: str) -> str:
+    """The .idx next to a segment (plain or gzipped)."""
+    base = segment_path[:-3] if segment_path.endswith(".gz") else segment_path
+    return base[:-4] + ".idx"
+
+
+def read_index(seg: Segment) -> list[tuple[float, int]]:
+    """A segment's (time, offset) entries; empty for a segment without an index."""
+    try:
+        with open(seg.index_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return []
+    data = data[: len(data) - len(data) % _INDEX_ENTRY.size]  # an entry being written
+    return list(_INDEX_ENTRY.iter_unpack(data))
+
+
+def parse_time(text: str, now: float | None = None) -> float:
+    """
+    Unix time for "15m" / "2h" / "1d" (ago), "HH:MM[:SS]" (local, the latest
+    one not in the future) or "YYYY-MM-DD HH:MM[:SS]". ValueError otherwise.
+    """
+    now = time.time() if now is None else now
+    text = text.strip().lower()
+    m = _RELATIVE_RX.match(text)
+    if m:
+        return now - float(m.group(1)) * _UNIT_SECONDS[m.group(2)]
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M"):
+        try:
+            return time.mktime(time.strptime(text, fmt))
+        except ValueError:
+            pass
+    for fmt in ("%H:%M:%S", "%H:%M"):
+        try:
+            clock = time.strptime(text, fmt)
+        except ValueError:
+            continue
+        today = time.localtime(now)
+        ts = time.mktime(today[:3] + clock[3:6] + (0, 0, -1))
+        return ts - 86400 if ts > now else ts
+    raise ValueError(f"not a time: {text!r} (try 15m, 2h, 09:55 or 2024-05-01 09:55)")
+
+
+def raw_size(seg: Segment) -> int:
+    """Uncompressed length of a segment (a gzip member's trailer holds it mod 2**32)."""
+    if not seg.compressed:
+        return seg.size
+    try:
+        with open(seg.path, "rb") as f:
+            f.seek(-4, os.SEEK_END)
+            return struct.unpack("<I", f.read(4))[0]
+    except OSError:
+        return 0
+
+
+def open_segment(seg: Segment):
+    """Binary file object for a segment; follows a segment that was compressed meanwhile."""
+    if not seg.compressed:
+        try:
+            return open(seg.path, "rb")
+        except FileNotFoundError:
+            return gzip.open(seg.path + ".gz", "rb")
+    return gzip.open(seg.path, "rb")
+
+
+def _last_lines(f, n: int, block: int = 64 * 1024) -> list[bytes]:
+    """Last n lines of a seekable plain file, reading backwards in blocks."""
+    f.seek(0, os.SEEK_END)
+    end = f.tell()
+    data = b""
+    while end > 0 and data.count(b"\n") <= n:
+        start = max(0, end - block)
+        f.seek(start)
+        data = f.read(end - start) + data
+        end = start
+    return data.splitlines()[-n:]
+
+
+class LogCapture:
+    def __init__(
+        self,
+        root: str,
+        *,
+        segment_bytes: int = 8 * 1024 * 1024,
+        max_bytes: int = 2 * 1024 ** 3,
+        max_age_days: float = 14.0,
+        check_seconds: float = 300.0,
+        compress_level: int = 6,
+        index_bytes: int = 64 * 1024,
+        index_seconds: float = 5.0,
+    ):
+        self.root = os.path.join(root, SEGMENT_DIR)
+        self.segment_bytes = segment_bytes
+        self.index_bytes = index_bytes
+        self.index_seconds = index_seconds
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self.check_seconds = check_seconds
+        self.compress_level = compress_level
+        os.makedirs(self.root, exist_ok=True)
+        self._writers: dict[tuple[str, str], _Writer] = {}
+        self._open_paths: set[str] = set()
+        self._lock = threading.Lock()
+        # Stats (background thread); see botlogs._collect_logcapture
+        self.compressed = 0
+        self.raw_bytes = 0          # sizes before compression, of segments compressed since start
+        self.gz_bytes = 0
+        self.deleted = 0
+        self.last_retention: dict | None = None
+        self.error: str | None = None
+        self._jobs: queue.SimpleQueue = queue.SimpleQueue()
+        # Segments left uncompressed by a previous run (closed by the restart)
+        for seg in self.all_segments():
+            if not seg.compressed:
+                self._jobs.put(seg.path)
+        self._thread = threading.Thread(target=self._run, name="log-capture", daemon=True)
+        self._thread.start()
+
+    # ---- layout ----
+    def _bot_dir(self, bot: str) -> str:
+        return os.path.join(self.root, bot)
+
+    def segments(self, bot: str, stream: str = "out") -> list[Segment]:
+        """One bot's segments for a stream, oldest first (the open one last)."""
+        folder = self._bot_dir(bot)
+        found: dict[int, Segment] = {}
+        try:
+            entries = list(os.scandir(folder))
+        except FileNotFoundError:
+            return []
+        for entry in entries:
+            m = _SEGMENT_RX.match(entry.name)
+            if not m or m.group(1) != stream:
+                continue
+            try:
+                st = entry.stat()
+            except FileNotFoundError:
+                continue  # compressed or deleted while listing
+            seq = int(m.group(2))
+            seg = Segment(entry.path, bot, stream, seq, bool(m.group(3)), st.st_size, st.st_mtime)
+            # Mid-compression both files exist; the plain one is complete
+            if seq not in found or not seg.compressed:
+                found[seq] = seg
+        return [found[k] for k in sorted(found)]
+
+    def all_segments(self) -> list[Segment]:
+        out = []
+        try:
+            bots = [e.name for e in os.scandir(self.root) if e.is_dir()]
+        except FileNotFoundError:
+            return out
+        for bot in bots:
+            for stream in STREAMS:
+                out.extend(self.segments(bot, stream))
+        return out
+
+    # ---- capture (tailer side) ----
+    def append(self, bot: str, stream: str, data: bytes, live_offset: int | None = None) -> None:
+        """
+        Add output for (bot, stream). `data` should end at a line boundary;
+        `live_offset` is the position in the live file right after it.
+        """
+        w = self._writers.get((bot, stream)) or self._open(bot, stream)
+        now = time.time()
+        while data:
+            if w.indexed_at < 0 or w.size - w.indexed_at >= self.index_bytes or now - w.indexed_ts >= self.index_seconds:
+                w.index.write(_INDEX_ENTRY.pack(now, w.size))
+                w.indexed_at, w.indexed_ts = w.size, now
+            room = self.segment_bytes - w.size
+            if len(data) > room > 0:
+                # Close at the last line break that fits; a longer line goes in whole
+                cut = data.rfind(b"\n", 0, room) + 1 or data.find(b"\n", room) + 1 or len(data)
+            else:
+                cut = len(data)
+            w.file.write(data[:cut])
+            w.size += cut
+            data = data[cut:]
+            if w.size >= self.segment_bytes:
+                w.live_offset = None if data else live_offset
+                live = w.live_file
+                self._roll(bot, stream)
+                w = self._open(bot, stream)
+                w.live_file = live
+        w.file.flush()
+        w.index.flush()
+        w.live_offset = live_offset
+
+    def attach(self, bot: str, stream: str, f) -> None:
+        """The live file the offsets passed to append() refer to (kept open by the tailer)."""
+        w = self._writers.get((bot, stream)) or self._open(bot, stream)
+        w.live_file = f
+
+    def resume_offset(self, bot: str, stream: str, f) -> int | None:
+        """Where the last capture of this same live file stopped, or None."""
+        try:
+            with open(os.path.join(self._bot_dir(bot), f"{stream}.pos"), "r", encoding="utf-8") as pf:
+                saved = json.load(pf)
+            offset, length = int(saved["offset"]), int(saved["length"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if offset > os.fstat(f.fileno()).st_size or saved.get("id") != _live_id(f, length):
+            return None
+        return offset
+
+    def close(self, bot: str, stream: str | None = None) -> None:
+        """The tailer stopped: close (and queue for compression) the open segment(s)."""
+        for s in STREAMS if stream is None else (stream,):
+            if (bot, s) in self._writers:
+                self._roll(bot, s)
+
+    def close_all(self) -> None:
+        for bot, stream in list(self._writers):
+            self._roll(bot, stream)
+
+    def shutdown(self, timeout: float = 30.0) -> None:
+        self.close_all()
+        self._jobs.put(_STOP)
+        self._thread.join(timeout)
+
+    def _open(self, bot: str, stream: str) -> _Writer:
+        folder = self._bot_dir(bot)
+        os.makedirs(folder, exist_ok=True)
+        existing = self.segments(bot, stream)
+        seq = (existing[-1].seq + 1) if existing else 1
+        w = _Writer(os.path.join(folder, f"{stream}-{seq:06d}.log"), seq)
+        with self._lock:
+            self._open_paths.add(w.path)
+        self._writers[(bot, stream)] = w
+        return w
+
+    def _roll(self, bot: str, stream: str) -> None:
+        w = self._writers.pop((bot, stream))
+        w.close()
+        with self._lock:
+            self._open_paths.discard(w.path)
+        if w.live_offset is not None and w.live_file is not None and not w.live_file.closed:
+            self._save_pos(bot, stream, w.live_offset, w.live_file)
+        if w.size:
+            self._jobs.put(w.path)
+        else:
+            for path in (w.path, index_path(w.path)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _save_pos(self, bot: str, stream: str, offset: int, live) -> None:
+        path = os.path.join(self._bot_dir(bot), f"{stream}.pos")
+        length = min(offset, _HEAD_BYTES)
+        try:
+            data = {"offset": offset, "length": length, "id": _live_id(live, length)}
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            self.error = f"pos not saved: {e}"
+
+    # ---- readers (any thread) ----
+    def tail(self, bot: str, stream: str, n: int) -> list[str]:
+        """Last n lines across segments, oldest first."""
+        out: list[bytes] = []
+        for seg in reversed(self.segments(bot, stream)):
+            try:
+                with open_segment(seg) as f:
+                    lines = _last_lines(f, n - len(out)) if not seg.compressed else f.read().splitlines()[-(n - len(out)):]
+            except OSError:
+                continue
+            out[:0] = lines
+            if len(out) >= n:
+                break
+        return [line.decode("utf-8", errors="replace").rstrip("\r") for line in out[-n:]]
+
+    def iter_lines(self, bot: str, stream: str, start_seq: int = 0):
+        """(segment seq, line bytes) from the oldest segment on (or from start_seq)."""
+        for seg in self.segments(bot, stream):
+            if seg.seq < start_seq:
+                continue
+            try:
+                with open_segment(seg) as f:
+                    for line in f:
+                        yield seg.seq, line.rstrip(b"\r\n")
+            except OSError:
+                continue
+
+    def iter_range(self, bot: str, stream: str, start: float, end: float | None = None):
+        """
+        (time, line bytes) for the lines captured between start and end (unix
+        times; end None = up to now), oldest first. The time is that of the
+        index entry at or before the line; segments without an index count as
+        written at their mtime.
+        """
+        end = float("inf") if end is None else end
+        for seg, entries, i in self.spans(bot, stream, start, end):
+            try:
+                with open_segment(seg) as f:
+                    pos = entries[i][1]
+                    f.seek(pos)
+                    ts = entries[i][0]
+                    i += 1
+                    for line in f:
+                        while i < len(entries) and pos >= entries[i][1]:
+                            ts = entries[i][0]
+                            i += 1
+                        if ts > end:
+                            return
+                        pos += len(line)
+                        yield ts, line.rstrip(b"\r\n")
+            except OSError:
+                continue
+
+    def iter_range_blocks(self, bot: str, stream: str, start: float, end: float | None = None, block: int = 1 << 20):
+        """
+        The bytes of the lines iter_range() yields, in blocks of at most `block`
+        bytes (not split at lines), for copying a range without a Python-level
+        loop per line.
+        """
+        end = float("inf") if end is None else end
+        for seg, entries, i in self.spans(bot, stream, start, end):
+            stop = next((off for ts, off in entries[i + 1:] if ts > end), None)
+            try:
+                with open_segment(seg) as f:
+                    pos = entries[i][1]
+                    f.seek(pos)
+                    while stop is None or pos < stop:
+                        data = f.read(block if stop is None else min(block, stop - pos))
+                        if not data:
+                            break
+                        pos += len(data)
+                        yield data
+            except OSError:
+                continue
+            if stop is not None:
+                return
+
+    def spans(self, bot: str, stream: str, start: float, end: float):
+        """(segment, index entries, entry to start from) for the segments a range touches."""
+        for seg in self.segments(bot, stream):
+            if seg.mtime < start:
+                continue  # last written before the range began
+            entries = read_index(seg) or [(seg.mtime, 0)]
+            if entries[0][0] > end:
+                return  # this and every later segment begin after the range
+            times = [ts for ts, _ in entries]
+            yield seg, entries, max(0, bisect_right(times, start) - 1)
+
+    # ---- background thread ----
+    def _run(self) -> None:
+        next_check = time.monotonic()
+        while True:
+            try:
+                job = self._jobs.get(timeout=max(0.0, next_check - time.monotonic()))
+            except queue.Empty:
+                job = None
+            if job is _STOP:
+                return
+            if job is not None:
+                self._compress(job)
+            if time.monotonic() >= next_check:
+                self.enforce_retention()
+                next_check = time.monotonic() + self.check_seconds
+
+    def _compress(self, path: str) -> None:
+        gz = path + ".gz"
+        try:
+            st = os.stat(path)
+            size = st.st_size
+            with open(path, "rb") as src, gzip.open(gz + ".tmp", "wb", compresslevel=self.compress_level) as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            # Keep the last write time: range queries and retention go by it
+            os.utime(gz + ".tmp", ns=(st.st_atime_ns, st.st_mtime_ns))
+            os.replace(gz + ".tmp", gz)
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            # e.g. a reader still has it open on Windows; it is retried on the next start
+            self.error = f"compress {os.path.basename(path)}: {e}"
+            return
+        self.compressed += 1
+        self.raw_bytes += size
+        self.gz_bytes += os.path.getsize(gz)
+
+    def enforce_retention(self) -> dict:
+        """Delete closed segments past max_age_days, then the oldest until under max_bytes."""
+        t0 = time.perf_counter()
+        with self._lock:
+            open_paths = set(self._open_paths)
+        segs = sorted(self.all_segments(), key=lambda s: s.mtime)
+        total = sum(s.size for s in segs)
+        cutoff = time.time() - self.max_age_days * 86400
+        removed = 0
+        for seg in segs:
+            if seg.path in open_paths:
+                continue
+            if seg.mtime >= cutoff and total <= self.max_bytes:
+                break  # sorted by age: nothing older is left and the total fits
+            try:
+                os.remove(seg.path)
+            except OSError:
+                continue
+            try:
+                os.remove(seg.index_path)
+            except OSError:
+                pass
+            total -= seg.size
+            removed += 1
+        self.deleted += removed
+        self.last_retention = {
+            "at": time.time(),
+            "segments": len(segs) - removed,
+            "bytes": total,
+            "removed": removed,
+            "seconds": time.perf_counter() - t0,
+        }
+        return self.last_retention
+
+
+def _live_id(f, length: int) -> dict:
+    """Identity of a live log file: inode plus a hash of its first `length` bytes."""
+    pos = f.tell()
+    try:
+        f.seek(0)
+        head = f.read(length)
+    finally:
+        f.seek(pos)
+    return {"ino": os.fstat(f.fileno()).st_ino, "head": hashlib.sha1(head).hexdigest()}
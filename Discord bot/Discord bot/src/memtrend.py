@@ -0,0 +1,92 @@
+# src/memtrend.py
+"""
+RSS trend per bot: a sliding window of (time, rss) samples and a least-squares
+line through them. The slope says how fast a process grows; extending the
+line says when it will cross its limit. A new PID starts a new window.
+
+Pure bookkeeping like src/supervisor.py; botlogs samples and acts.
+"""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+
+
+@dataclass
+class Fit:
+    slope: float     # bytes/s
+    current: float   # fitted RSS at the newest sample, bytes
+    r2: float        # how well a straight line explains the samples (0..1)
+    samples: int
+    span: float      # seconds covered by the samples
+
+
+@dataclass
+class Series:
+    pid: int
+    samples: deque = field(default_factory=deque)  # (t, rss)
+    warned: bool = False                           # one early warning per process
+
+
+def fit_line(samples) -> Fit | None:
+    """Least squares over (t, rss) pairs; None with fewer than 3 points or no time spread."""
+    n = len(samples)
+    if n < 3:
+        return None
+    # Centered sums: RSS values are ~1e9, so raw sums of squares would lose precision
+    mx = sum(t for t, _ in samples) / n
+    my = sum(y for _, y in samples) / n
+    sxx = sxy = syy = 0.0
+    for t, y in samples:
+        dx, dy = t - mx, y - my
+        sxx += dx * dx
+        sxy += dx * dy
+        syy += dy * dy
+    if sxx <= 0:
+        return None
+    slope = sxy / sxx
+    r2 = 1.0 if syy <= 0 else min(1.0, sxy * sxy / (sxx * syy))
+    last_t = samples[-1][0]
+    return Fit(slope, my + slope * (last_t - mx), r2, n, last_t - samples[0][0])
+
+
+class MemTrend:
+    def __init__(self, *, window: float, min_samples: int, min_r2: float):
+        self.window = window
+        self.min_samples = min_samples
+        self.min_r2 = min_r2
+        self.series: dict[str, Series] = {}
+
+    def add(self, name: str, pid: int, rss: int, now: float) -> None:
+        s = self.series.get(name)
+        if s is None or s.pid != pid:
+            s = self.series[name] = Series(pid)
+        s.samples.append((now, rss))
+        while s.samples and now - s.samples[0][0] > self.window:
+            s.samples.popleft()
+
+    def forget(self, name: str) -> None:
+        self.series.pop(name, None)
+
+    def fit(self, name: str) -> Fit | None:
+        s = self.series.get(name)
+        if s is None or len(s.samples) < self.min_samples:
+            return None
+        return fit_line(s.samples)
+
+    def latest(self, name: str) -> int | None:
+        s = self.series.get(name)
+        return s.samples[-1][1] if s and s.samples else None
+
+    def eta(self, name: str, limit: float) -> float | None:
+        """
+        Seconds until the RSS reaches `limit`: 0 if it already has, None if
+        there is no steady growth (too few samples, flat/shrinking, or noisy).
+        """
+        last = self.latest(name)
+        if last is not None and last >= limit:
+            return 0.0
+        f = self.fit(name)
+        if f is None or f.slope <= 0 or f.r2 < self.min_r2:
+            return None
+        return max(0.0, (limit - f.current) / f.slope)
@@ -0,0 +1,441 @@
+# src/metrics.py
+"""
+Tiny in-process metrics registry (counters, gauges, fixed-bucket histograms)
+rendered in Prometheus text format.
+
+Recording is a dict update, so instrumenting hot paths is cheap. Anything
+expensive (process scans for per-bot CPU/RAM) goes into a collector that only
+runs when somebody scrapes /metrics or asks for the summary.
+"""
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+LabelKey = tuple[str, ...]
+
+# Default latency buckets (seconds): 1ms .. 30s
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(names: tuple[str, ...], values: LabelKey, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    if float(v).is_integer():
+        return str(int(v))
+    return repr(float(v))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+
+    def _key(self, labels: dict[str, str]) -> LabelKey:
+        if not self.labelnames:
+            return ()
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def total(self) -> float:
+        return sum(self._values.values())
+
+    def items(self) -> list[tuple[LabelKey, float]]:
+        return list(self._values.items())
+
+    def render(self) -> list[str]:
+        out = super().render()
+        for key, v in list(self._values.items()):
+            out.append(f"{self.name}{_fmt_labels(self.labelnames, key)} {_fmt_value(v)}")
+        return out
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[LabelKey, float] = {}
+        self._fn: Callable[[], float] | None = None
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def remove(self, **labels: str) -> None:
+        self._values.pop(self._key(labels), None)
+
+    def clear(self) -> None:
+        self._values.clear()
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Compute the (unlabelled) value lazily at render time."""
+        self._fn = fn
+
+    def value(self, **labels: str) -> float:
+        if self._fn is not None and not self.labelnames:
+            return float(self._fn())
+        return self._values.get(self._key(labels), 0.0)
+
+    def items(self) -> list[tuple[LabelKey, float]]:
+        return list(self._values.items())
+
+    def render(self) -> list[str]:
+        out = super().render()
+        if self._fn is not None and not self.labelnames:
+            try:
+                out.append(f"{self.name} {_fmt_value(float(self._fn()))}")
+            except Exception:
+                pass
+            return out
+        for key, v in list(self._values.items()):
+            out.append(f"{self.name}{_fmt_labels(self.labelnames, key)} {_fmt_value(v)}")
+        return out
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # per label key: [bucket counts..., +Inf count], sum
+        self._counts: dict[LabelKey, list[int]] = {}
+        self._sums: dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, **labels)
+
+    def _merged(self, **labels: str) -> tuple[list[int], float]:
+        """Bucket counts and sum for one label set, or all of them if no labels given."""
+        if labels or not self.labelnames:
+            key = self._key(labels)
+            return list(self._counts.get(key, [0] * (len(self.buckets) + 1))), self._sums.get(key, 0.0)
+        merged = [0] * (len(self.buckets) + 1)
+        for counts in list(self._counts.values()):
+            for i, c in enumerate(counts):
+                merged[i] += c
+        return merged, sum(self._sums.values())
+
+    def count(self, **labels: str) -> int:
+        return sum(self._merged(**labels)[0])
+
+    def mean(self, **labels: str) -> float | None:
+        counts, total = self._merged(**labels)
+        n = sum(counts)
+        return (total / n) if n else None
+
+    def quantile(self, q: float, **labels: str) -> float | None:
+        """Estimate a quantile by linear interpolation inside the matching bucket."""
+        counts, _ = self._merged(**labels)
+        n = sum(counts)
+        if not n:
+            return None
+        rank = q * n
+        seen = 0
+        for i, c in enumerate(counts):
+            if seen + c >= rank and c:
+                lo = self.buckets[i - 1] if i > 0 else 0.0
+                hi = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lo + (hi - lo) * ((rank - seen) / c)
+            seen += c
+        return self.buckets[-1]
+
+    def label_keys(self) -> list[LabelKey]:
+        return list(self._counts.keys())
+
+    def render(self) -> list[str]:
+        out = super().render()
+        for key, counts in list(self._counts.items()):
+            cumulative = 0
+            for bound, c in zip(self.buckets, counts):
+                cumulative += c
+                le = 'le="' + _fmt_value(bound) + '"'
+                out.append(f"{self.name}_bucket{_fmt_labels(self.labelnames, key, le)} {cumulative}")
+            cumulative += counts[-1]
+            le = 'le="+Inf"'
+            out.append(f"{self.name}_bucket{_fmt_labels(self.labelnames, key, le)} {cumulative}")
+            out.append(f"{self.name}_sum{_fmt_labels(self.labelnames, key)} {_fmt_value(self._sums[key])}")
+            out.append(f"{self.name}_count{_fmt_labels(self.labelnames, key)} {cumulative}")
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self._collect_lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            # Extensions can be reloaded; hand back the live metric
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))  # type: ignore[return-value]
+
+    def add_collector(self, fn: Callable[[], None]) -> None:
+        """Register a callback run before rendering (for values that are costly to keep live)."""
+        if fn not in self._collectors:
+            self._collectors.append(fn)
+
+    def remove_collector(self, fn: Callable[[], None]) -> None:
+        if fn in self._collectors:
+            self._collectors.remove(fn)
+
+    def collect(self) -> None:
+        """Run collectors. Blocking; call from a worker thread, not the event loop."""
+        with self._collect_lock:
+            for fn in list(self._collectors):
+                try:
+                    fn()
+                except Exception:
+                    pass
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# =========================
+#  Controller metrics
+# =========================
+
+TAIL_LINES = REGISTRY.counter(
+    "v4_tail_lines_total", "Log lines ingested by the tailers.", ("bot", "stream")
+)
+TAIL_BYTES = REGISTRY.counter(
+    "v4_tail_bytes_total", "Log bytes ingested by the tailers.", ("bot", "stream")
+)
+EMBED_EDITS = REGISTRY.counter(
+    "v4_embed_edits_total", "Status embed edit attempts by result.", ("result",)
+)
+EMBED_EVENT_LATENCY = REGISTRY.histogram(
+    "v4_embed_event_latency_seconds",
+    "Time from a parsed state change to the status embed edit that shows it.",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0, 120.0),
+)
+PANEL_EDITS = REGISTRY.counter(
+    "v4_panel_edits_total", "Control panel message edits by result.", ("result",)
+)
+REST_LATENCY = REGISTRY.histogram(
+    "v4_rest_request_seconds", "Discord REST call latency as seen by the controller.", ("op",)
+)
+REST_RATE_LIMITED = REGISTRY.counter(
+    "v4_rest_rate_limited_total", "429 responses reported by the Discord REST client.", ("scope",)
+)
+PROCESS_SCAN = REGISTRY.histogram(
+    "v4_process_scan_seconds", "Duration of psutil process scans.", ("caller",)
+)
+OFFLOAD_CALL = REGISTRY.histogram(
+    "v4_offload_call_seconds", "Blocking calls run on the offload pool: time in the call, by op.", ("op",)
+)
+OFFLOAD_WAIT = REGISTRY.histogram(
+    "v4_offload_wait_seconds", "Blocking calls run on the offload pool: time queued for a thread, by op.", ("op",)
+)
+OFFLINE_ALERTS = REGISTRY.counter(
+    "v4_offline_alerts_total", "Offline alerts sent for exited bots.", ("bot",)
+)
+BOT_LAUNCHES = REGISTRY.counter(
+    "v4_bot_launches_total", "Bot launch attempts by result.", ("bot", "result")
+)
+PANEL_INTERACTIONS = REGISTRY.counter(
+    "v4_panel_interactions_total", "Control panel interactions by action.", ("action",)
+)
+INTERACTION_ACK = REGISTRY.histogram(
+    "v4_interaction_ack_seconds",
+    "Time from a component interaction arriving to its acknowledgement being sent, by route.",
+    ("route", "result"),
+)
+INTERACTION_JOBS = REGISTRY.gauge(
+    "v4_interaction_jobs", "Background jobs started from component interactions that are still running."
+)
+INTERACTION_JOB_SECONDS = REGISTRY.histogram(
+    "v4_interaction_job_seconds", "Duration of interaction background jobs, by route and result.", ("route", "result")
+)
+FOLLOW_VIEWERS = REGISTRY.gauge(
+    "v4_follow_viewers", "Live-follow log messages being edited, and the bot streams they follow.", ("kind",)
+)
+FOLLOW_EDITS = REGISTRY.counter(
+    "v4_follow_edits_total", "Live-follow message edits by result.", ("result",)
+)
+OWNER_COMMANDS = REGISTRY.counter(
+    "v4_owner_commands_total", "Slash command invocations.", ("command",)
+)
+BOT_CPU = REGISTRY.gauge(
+    "v4_bot_cpu_percent", "Per-bot CPU usage (sampled at scrape time).", ("bot",)
+)
+BOT_RSS = REGISTRY.gauge(
+    "v4_bot_rss_bytes", "Per-bot resident memory (sampled at scrape time).", ("bot",)
+)
+TIME_TO_READY = REGISTRY.histogram(
+    "v4_bot_time_to_ready_seconds",
+    "Launch to first readiness-pattern match, per launch.",
+    ("bot",),
+    buckets=(1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0, 180.0, 300.0, 600.0),
+)
+READY_TIMEOUTS = REGISTRY.counter(
+    "v4_bot_ready_timeouts_total", "Launches that did not become ready within READY_TIMEOUT_SECONDS.", ("bot",)
+)
+BOTS_READY = REGISTRY.gauge(
+    "v4_bots_ready", "Bots currently ready (readiness pattern seen since launch)."
+)
+BOT_EXITS = REGISTRY.counter(
+    "v4_bot_exits_total", "Bot process exits by kind (crash, clean, stopped).", ("bot", "kind")
+)
+BOT_RESTARTS = REGISTRY.counter(
+    "v4_bot_auto_restarts_total", "Restarts launched by the crash recovery supervisor.", ("bot",)
+)
+CRASH_LOOPS = REGISTRY.counter(
+    "v4_bot_crash_loops_total", "Times a bot hit the crash-loop limit and was held.", ("bot",)
+)
+RECOVERY_TIME = REGISTRY.histogram(
+    "v4_bot_recovery_seconds",
+    "Unexpected exit to ready again, per incident (the mean is the MTTR).",
+    ("bot",),
+    buckets=(5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0, 14400.0),
+)
+BOT_DOWNTIME = REGISTRY.gauge(
+    "v4_bot_downtime_seconds", "Accumulated unplanned downtime (persisted across restarts).", ("bot",)
+)
+BOT_HANGS = REGISTRY.counter(
+    "v4_bot_hangs_total", "Times the watchdog flagged a running bot as hung.", ("bot",)
+)
+BOT_LOG_RATE = REGISTRY.gauge(
+    "v4_bot_log_lines_per_second", "Recent log rate per bot (watchdog EWMA) and its baseline.", ("bot", "window")
+)
+BOT_RSS_GROWTH = REGISTRY.gauge(
+    "v4_bot_rss_growth_bytes_per_second", "Slope of the per-bot RSS trend (memory watch).", ("bot",)
+)
+BOT_RSS_ETA = REGISTRY.gauge(
+    "v4_bot_rss_limit_eta_seconds", "Projected time until a bot's RSS reaches its limit (growing bots only).", ("bot",)
+)
+MEMORY_WARNINGS = REGISTRY.counter(
+    "v4_bot_memory_warnings_total", "Memory watch warnings (projected or actual limit crossing).", ("bot",)
+)
+BOT_RECYCLES = REGISTRY.counter(
+    "v4_bot_recycles_total", "Proactive stop -> relaunch of bots at risk of hitting their memory limit.", ("bot",)
+)
+STATE_STORE = REGISTRY.gauge(
+    "v4_state_store",
+    "State store: queued, written and dropped journal events, last commit seconds, file bytes.",
+    ("stat",),
+)
+BOT_STDERR_LINES = REGISTRY.counter(
+    "v4_bot_stderr_lines_total", "Lines a bot wrote to stderr.", ("bot",)
+)
+ERROR_FINGERPRINTS = REGISTRY.counter(
+    "v4_bot_error_fingerprints_total", "Stderr error fingerprints seen for the first time.", ("bot",)
+)
+LOG_CAPTURE = REGISTRY.gauge(
+    "v4_log_capture",
+    "Captured bot output: segments and bytes on disk, segments compressed/deleted since start, compression ratio.",
+    ("stat",),
+)
+FLEET_RELOADS = REGISTRY.counter(
+    "v4_fleet_reloads_total", "fleet.json reloads by result (applied, unchanged, invalid).", ("result",)
+)
+PLACEMENT_MOVES = REGISTRY.counter(
+    "v4_bot_placement_moves_total", "Bots moved to other cores (hot bot or a full rebalance).", ("bot", "reason")
+)
+CORE_LOAD = REGISTRY.gauge(
+    "v4_cpu_core_load_percent", "Per-core CPU load on this host over the last placement check.", ("core",)
+)
+BOTS_STARTED = REGISTRY.gauge(
+    "v4_bots_started", "Bots currently marked as started."
+)
+FLEET_AGENTS = REGISTRY.gauge(
+    "v4_fleet_agents_connected", "Remote agents currently connected."
+)
+FLEET_MESSAGES = REGISTRY.counter(
+    "v4_fleet_messages_total", "Agent protocol messages by direction and type.", ("direction", "type")
+)
+FLEET_COMMAND_LATENCY = REGISTRY.histogram(
+    "v4_fleet_command_seconds", "Round trip of a start/stop/restart routed to an agent.", ("op",)
+)
+UPTIME = REGISTRY.gauge("v4_controller_uptime_seconds", "Controller uptime.")
+UPTIME.set_function(lambda: time.time() - REGISTRY.started_at)
@@ -0,0 +1,150 @@
+# src/nameindex.py
+"""
+Bot-name lookup for autocomplete and bulk selectors.
+
+  - a prefix trie answers "names starting with q" in O(len(q)); when that
+    alone fills the 25 autocomplete slots nothing else is scanned
+  - otherwise names are matched fuzzily (q's letters in order) and ranked:
+    exact, prefix, word start (after - _ . space or a letter/digit change),
+    substring, then scattered letters by how tight they are
+  - fuzzy matches are cached per query; typing one more letter only filters
+    the previous query's matches instead of the whole fleet
+  - tags (config BOT_TAGS) are groups of bots; members may use * wildcards,
+    and a selector like "bot1, tag:eu" resolves to the listed bots
+
+Rebuilt by botlogs.name_index() whenever the fleet changes.
+"""
+from __future__ import annotations
+
+import fnmatch
+import re
+from collections import OrderedDict
+
+TAG_PREFIX = "tag:"
+CACHE_SIZE = 512
+_WORD_START = re.compile(r"(?:^|[-_. ])(.)|(?<=[a-z])([0-9])|(?<=[0-9])([a-z])")
+
+
+def _word_starts(lower: str) -> set[int]:
+    return {m.start(m.lastindex) for m in _WORD_START.finditer(lower)}
+
+
+def _fuzzy_span(q: str, s: str) -> int | None:
+    """Length of the window in which q's letters appear in order in s, or None."""
+    pos = first = -1
+    for ch in q:
+        pos = s.find(ch, pos + 1)
+        if pos < 0:
+            return None
+        if first < 0:
+            first = pos
+    return pos - first + 1
+
+
+class NameIndex:
+    def __init__(self, names, tags: dict[str, list[str]] | None = None):
+        self.names = list(names)
+        self._lower = {n: n.lower() for n in self.names}
+        self._by_lower = {low: n for n, low in self._lower.items()}
+        self._trie: dict = {}
+        for name in self.names:
+            node = self._trie
+            for ch in self._lower[name]:
+                node = node.setdefault(ch, {})
+                node.setdefault("", []).append(name)  # every name below this prefix
+        self.tags: dict[str, list[str]] = {}
+        for tag, members in (tags or {}).items():
+            picked: list[str] = []
+            seen: set[str] = set()
+            for pattern in members:
+                if any(c in pattern for c in "*?["):
+                    hits = fnmatch.filter(self.names, pattern)
+                else:
+                    exact = self._by_lower.get(pattern.lower())
+                    hits = [exact] if exact else []
+                for h in hits:
+                    if h not in seen:
+                        seen.add(h)
+                        picked.append(h)
+            self.tags[tag.lower()] = picked
+        self._matches: OrderedDict[str, list[str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def prefix(self, q: str) -> list[str]:
+        node = self._trie
+        for ch in q.lower():
+            node = node.get(ch)
+            if node is None:
+                return []
+        return node.get("", self.names if not q else [])
+
+    def _fuzzy(self, q: str) -> list[str]:
+        hit = self._matches.get(q)
+        if hit is not None:
+            self._matches.move_to_end(q)
+            return hit
+        pool = self.names
+        for k in range(len(q) - 1, 0, -1):
+            shorter = self._matches.get(q[:k])
+            if shorter is not None:
+                pool = shorter  # anything matching q also matched its prefix
+                break
+        hit = [n for n in pool if _fuzzy_span(q, self._lower[n]) is not None]
+        self._matches[q] = hit
+        if len(self._matches) > CACHE_SIZE:
+            self._matches.popitem(last=False)
+        return hit
+
+    def _rank(self, q: str, name: str) -> tuple:
+        low = self._lower[name]
+        if low == q:
+            tier = 0
+        elif low.startswith(q):
+            tier = 1
+        else:
+            at = low.find(q)
+            if at >= 0:
+                tier = 2 if at in _word_starts(low) else 3
+            else:
+                return (4, _fuzzy_span(q, low), len(low), low)
+        return (tier, 0, len(low), low)
+
+    def search(self, query: str, limit: int = 25) -> list[str]:
+        q = query.strip().lower()
+        if not q:
+            return self.names[:limit]
+        by_prefix = self.prefix(q)
+        if len(by_prefix) >= limit:
+            return sorted(by_prefix, key=lambda n: (len(n), self._lower[n]))[:limit]
+        return sorted(self._fuzzy(q), key=lambda n: self._rank(q, n))[:limit]
+
+    def search_tags(self, query: str, limit: int = 25) -> list[str]:
+        q = query.strip().lower()
+        return sorted(t for t in self.tags if q in t)[:limit]
+
+    def resolve(self, selector: str) -> tuple[list[str], list[str]]:
+        """'bot1, tag:eu bot7' -> (bots in order, without repeats; tokens that matched nothing)."""
+        bots: list[str] = []
+        seen: set[str] = set()
+        unknown: list[str] = []
+        for token in re.split(r"[,\s]+", selector.strip()):
+            if not token:
+                continue
+            if token.lower().startswith(TAG_PREFIX):
+                members = self.tags.get(token[len(TAG_PREFIX):].lower())
+                if not members:
+                    unknown.append(token)
+                    continue
+            else:
+                name = self._by_lower.get(token.lower())
+                if name is None:
+                    unknown.append(token)
+                    continue
+                members = [name]
+            for m in members:
+                if m not in seen:
+                    seen.add(m)
+                    bots.append(m)
+        return bots, unknown
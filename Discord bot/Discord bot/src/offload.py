@@ -0,0 +1,209 @@
+# src/offload.py
+"""
+Blocking work off the event loop: one bounded thread pool for psutil scans
+and file operations, async wrappers for the calls the extensions make, and
+the process-matching rules that used to be copied into each of them.
+
+  run(op, fn, *args)       fn on the pool; time spent queued and in the call
+                           go to v4_offload_wait_seconds / v4_offload_call_seconds
+                           by op
+  find_processes()         the processes of one bot / several bots (one pass
+  scan_fleet()             over the process table however many bots), or just
+  find_pid()               the first PID; scans also feed v4_process_scan_seconds
+  exists() / remove() / read_text() / delete_session()
+  terminate(proc)          terminate, wait, then kill; the psutil calls are
+                           single syscalls, the waits are asyncio.sleep
+
+A process belongs to a bot when its exe is the bot's exe path, or its name and
+cwd match the exe's name and folder, or its cmdline[0] is the exe path (the
+controller itself never matches).
+
+The pool has OFFLOAD_WORKERS threads. A scan is the longest call, and a burst
+of panel clicks or a fleet restart queues scans instead of running dozens at
+once; the wait histogram shows when that queue gets long.
+
+No hikari imports.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+import psutil
+
+from src.config import OFFLOAD_WORKERS
+from src.metrics import OFFLOAD_CALL, OFFLOAD_WAIT, PROCESS_SCAN
+
+T = TypeVar("T")
+_SCAN_ATTRS = ["pid", "name", "exe", "cwd", "cmdline"]
+
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=max(1, OFFLOAD_WORKERS), thread_name_prefix="offload")
+        return _pool
+
+
+def shutdown() -> None:
+    """Stop the pool (queued calls are dropped); the next run() starts a new one."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def run(op: str, fn: Callable[..., T], *args) -> T:
+    """Call fn(*args) on the offload pool and await the result."""
+    queued = time.perf_counter()
+
+    def _call():
+        t0 = time.perf_counter()
+        OFFLOAD_WAIT.observe(t0 - queued, op=op)
+        try:
+            return fn(*args)
+        finally:
+            OFFLOAD_CALL.observe(time.perf_counter() - t0, op=op)
+
+    return await asyncio.get_running_loop().run_in_executor(_executor(), _call)
+
+
+# ---- process inspection ----
+def _norm(path: str) -> str:
+    return os.path.abspath(path).lower()
+
+
+def scan_fleet_sync(targets: dict[str, str], *, first_only: bool = False) -> dict[str, list[psutil.Process]]:
+    """
+    Matching processes per bot ({name: exe path}) from one pass over the
+    process table. Blocking; use scan_fleet() from the event loop.
+    """
+    by_exe: dict[str, list[str]] = {}
+    by_name_cwd: dict[tuple[str, str], list[str]] = {}
+    for name, exe_path in targets.items():
+        exe = _norm(exe_path)
+        by_exe.setdefault(exe, []).append(name)
+        by_name_cwd.setdefault((os.path.basename(exe), _norm(os.path.dirname(exe_path))), []).append(name)
+    found: dict[str, list[psutil.Process]] = {name: [] for name in targets}
+    me = os.getpid()
+
+    for p in psutil.process_iter(_SCAN_ATTRS):
+        try:
+            if p.pid == me:
+                continue
+            info = p.info
+            p_exe = info.get("exe") or ""
+            names = by_exe.get(_norm(p_exe)) if p_exe else None
+            if not names:
+                names = by_name_cwd.get(((info.get("name") or "").lower(), (info.get("cwd") or "").lower()))
+            if not names:
+                cl = info.get("cmdline") or []
+                names = by_exe.get(_norm(cl[0])) if cl and cl[0] else None
+        except (psutil.NoSuchProcess, psutil.AccessDenied, ValueError):
+            continue
+        for name in names or ():
+            if not (first_only and found[name]):
+                found[name].append(p)
+    return found
+
+
+def _timed_scan(caller: str, targets: dict[str, str], first_only: bool) -> dict[str, list[psutil.Process]]:
+    with PROCESS_SCAN.time(caller=caller):
+        return scan_fleet_sync(targets, first_only=first_only)
+
+
+async def scan_fleet(targets: dict[str, str], *, caller: str) -> dict[str, list[psutil.Process]]:
+    return await run("process_scan", _timed_scan, caller, dict(targets), False)
+
+
+async def find_processes(exe_path: str, *, caller: str) -> list[psutil.Process]:
+    return (await run("process_scan", _timed_scan, caller, {"": exe_path}, False))[""]
+
+
+async def find_pid(exe_path: str, *, caller: str) -> int | None:
+    """PID of a running process of this exe (the first match), else None."""
+    procs = (await run("process_scan", _timed_scan, caller, {"": exe_path}, True))[""]
+    return procs[0].pid if procs else None
+
+
+async def terminate(proc: psutil.Process) -> str:
+    """Try terminate() then kill() with short waits; return an action string."""
+    try:
+        if not proc.is_running():
+            return "not running"
+        proc.terminate()
+    except psutil.Error as e:
+        return f"terminate error: {e}"
+
+    try:
+        for _ in range(10):  # ~5s
+            if not proc.is_running() or proc.status() == psutil.STATUS_ZOMBIE:
+                return "terminated"
+            await asyncio.sleep(0.5)
+    except psutil.NoSuchProcess:
+        return "terminated"
+    except psutil.Error as e:
+        return f"wait error: {e}"
+
+    try:
+        proc.kill()
+        for _ in range(6):  # ~3s
+            if not proc.is_running():
+                return "killed"
+            await asyncio.sleep(0.5)
+    except psutil.Error as e:
+        return f"kill error: {e}"
+
+    return "killed-timeout"
+
+
+# ---- files ----
+def _remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _read_text(path: str) -> str | None:
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _delete_session(cwd: str) -> str:
+    try:
+        return "session.json deleted" if _remove(os.path.join(cwd, "session.json")) else "no session.json found"
+    except OSError as e:
+        return f"wipe failed: {e}"
+
+
+async def exists(path: str) -> bool:
+    return await run("exists", os.path.exists, path)
+
+
+async def remove(path: str) -> bool:
+    """Delete a file; False if it wasn't there. Other OSErrors are raised."""
+    return await run("remove", _remove, path)
+
+
+async def read_text(path: str) -> str | None:
+    """A file's text (UTF-8, errors replaced), or None if it doesn't exist."""
+    return await run("read", _read_text, path)
+
+
+async def delete_session(cwd: str) -> str:
+    """Delete <cwd>/session.json; a short status string either way."""
+    return await run("delete_session", _delete_session, cwd)
@@ -0,0 +1,163 @@
+# src/payouts.py
+"""
+Payout-rate analytics from the "Instant payout amount : X (cur/max)" values.
+
+Each bot keeps its last `samples` (time, amount) pairs in one row of a
+fleet-wide NumPy ring buffer, so a recompute is a handful of array
+operations over all bots at once instead of a Python loop per bot:
+
+  - coins/hour  the increases of the amount inside the window, divided by
+                the time they span (drops are cash-outs or restarts and are
+                skipped, not counted as negative earnings)
+  - to max      (max - current) / rate, in hours
+  - fleet       total coins/hour and amount, and rate percentiles over the
+                bots that have a rate
+
+A bot needs two samples at least `min_span` seconds apart to get a rate.
+
+No hikari imports; botlogs feeds it from the tailers (and agent snapshots),
+seeds it from the state store's journal, and /payouts and the status embed
+read it.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+PERCENTILES = (10, 50, 90)
+
+
+@dataclass
+class PayoutStats:
+    names: list[str]
+    rate: np.ndarray          # coins/hour (nan = not enough samples)
+    current: np.ndarray       # latest amount (nan = none yet)
+    max: np.ndarray           # per-bot max (nan = unknown)
+    eta_hours: np.ndarray     # hours until current reaches max (nan = no rate, 0 = at max)
+    samples: np.ndarray       # samples inside the window
+    window_hours: float
+    seconds: float            # compute time
+
+    def index(self, name: str) -> int | None:
+        try:
+            return self.names.index(name)
+        except ValueError:
+            return None
+
+    @property
+    def fleet_rate(self) -> float:
+        return float(np.nansum(self.rate))
+
+    @property
+    def fleet_current(self) -> float:
+        return float(np.nansum(self.current))
+
+    @property
+    def earning(self) -> int:
+        return int(np.count_nonzero(~np.isnan(self.rate)))
+
+    def percentiles(self) -> dict[int, float]:
+        rates = self.rate[~np.isnan(self.rate)]
+        if not rates.size:
+            return {}
+        return dict(zip(PERCENTILES, (float(v) for v in np.percentile(rates, PERCENTILES))))
+
+
+class PayoutSeries:
+    def __init__(self, samples: int = 512, min_span: float = 300.0):
+        self.size = max(2, samples)
+        self.min_span = min_span
+        self.rows: dict[str, int] = {}
+        self._ts = np.zeros((16, self.size))
+        self._val = np.zeros((16, self.size))
+        self._count = np.zeros(16, dtype=np.int64)   # samples stored (<= size)
+        self._head = np.zeros(16, dtype=np.int64)    # next write position
+
+    def _row(self, name: str) -> int:
+        row = self.rows.get(name)
+        if row is None:
+            row = self.rows[name] = len(self.rows)
+            if row >= len(self._count):
+                grow = len(self._count)  # amortized: double the rows
+                self._ts = np.vstack([self._ts, np.zeros((grow, self.size))])
+                self._val = np.vstack([self._val, np.zeros((grow, self.size))])
+                self._count = np.concatenate([self._count, np.zeros(grow, dtype=np.int64)])
+                self._head = np.concatenate([self._head, np.zeros(grow, dtype=np.int64)])
+        return row
+
+    def add(self, name: str, value: float, ts: float | None = None) -> None:
+        row = self._row(name)
+        head = int(self._head[row])
+        self._ts[row, head] = time.time() if ts is None else ts
+        self._val[row, head] = value
+        self._head[row] = (head + 1) % self.size
+        self._count[row] = min(self._count[row] + 1, self.size)
+
+    def forget(self, name: str) -> None:
+        row = self.rows.get(name)
+        if row is not None:
+            # The row stays allocated (the bot may come back) but starts over
+            # from position 0, as compute() expects of a row that hasn't wrapped
+            self._count[row] = 0
+            self._head[row] = 0
+            self._ts[row] = np.nan
+            self._val[row] = 0.0
+
+    def compute(
+        self,
+        names: list[str],
+        maxes: dict[str, float | None],
+        *,
+        window_hours: float,
+        now: float | None = None,
+    ) -> PayoutStats:
+        t0 = time.perf_counter()
+        now = time.time() if now is None else now
+        # Work on every used row in place (slices, no copies), then pick the rows asked for
+        used = len(self.rows)
+        ts, val = self._ts[:used], self._val[:used]
+        head, count = self._head[:used], self._count[:used]
+        pos = np.arange(self.size)
+        # Rows are rings, not reordered: a row fills from position 0, so before
+        # it wraps the samples are positions < count (and head == count)
+        valid = (pos < count[:, None]) & (ts >= now - window_hours * 3600)
+
+        # Ring neighbours (p, p+1) and the wrap-around (size-1, 0) are consecutive
+        # samples, except the pair that ends at `head` (newest -> oldest)
+        steps = np.diff(val, axis=1)
+        np.clip(steps, 0, None, out=steps)
+        steps *= valid[:, 1:] & valid[:, :-1] & (pos[1:] != head[:, None])
+        wrap = np.clip(val[:, 0] - val[:, -1], 0, None) * (valid[:, 0] & valid[:, -1] & (head != 0))
+        gained = steps.sum(axis=1) + wrap
+        newest = (head - 1) % self.size
+        last_ts = np.where(valid[np.arange(used), newest], ts[np.arange(used), newest], -np.inf)
+        first_ts = np.where(valid, ts, np.inf).min(axis=1, initial=np.inf)
+        span = last_ts - first_ts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            row_rate = np.where(span >= self.min_span, gained / span * 3600, np.nan)
+        # Latest amount per bot: the newest sample, window or not
+        row_current = np.where(count > 0, val[np.arange(used), newest], np.nan)
+
+        rows = np.array([self.rows.get(name, -1) for name in names], dtype=np.int64)
+        known = rows >= 0
+        rows = np.where(known, rows, 0)
+        rate = np.where(known, row_rate[rows] if used else np.nan, np.nan)
+        current = np.where(known, row_current[rows] if used else np.nan, np.nan)
+        samples = np.where(known, valid.sum(axis=1)[rows] if used else 0, 0)
+        mx = np.array([np.nan if maxes.get(name) is None else maxes[name] for name in names], dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            eta = np.where(rate > 0, np.clip(mx - current, 0, None) / rate, np.nan)
+        eta = np.where(current >= mx, 0.0, eta)
+
+        return PayoutStats(
+            names=list(names),
+            rate=rate,
+            current=current,
+            max=mx,
+            eta_hours=eta,
+            samples=samples,
+            window_hours=window_hours,
+            seconds=time.perf_counter() - t0,
+        )
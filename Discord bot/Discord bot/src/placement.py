@@ -0,0 +1,152 @@
+# src/placement.py
+"""
+CPU placement for the fleet: which cores each bot may run on. The
+controller keeps its reserved cores; bots are spread over the rest either
+round-robin (by launch order) or by measured load (least-loaded cores
+first). A bot that keeps its cores saturated for several checks in a row
+is moved to the least-loaded cores, if those are clearly less busy.
+
+Pure bookkeeping like src/supervisor.py; botlogs applies the result with
+psutil (cpu_affinity + nice) and records the before/after per-core load.
+"""
+from __future__ import annotations
+
+import os
+
+# name -> (POSIX nice value, psutil Windows priority-class constant)
+PRIORITIES = {
+    "normal": (0, "NORMAL_PRIORITY_CLASS"),
+    "below_normal": (10, "BELOW_NORMAL_PRIORITY_CLASS"),
+    "idle": (19, "IDLE_PRIORITY_CLASS"),
+}
+
+# Only move a hot bot if the target cores are at least this much (percent points) less busy
+MOVE_MARGIN_PCT = 20.0
+
+
+def nice_value(priority: str, psutil_module):
+    """Argument for psutil.Process.nice() on this platform."""
+    posix, win_const = PRIORITIES.get(priority, PRIORITIES["normal"])
+    if os.name == "nt":
+        return getattr(psutil_module, win_const)
+    return posix
+
+
+def core_percents(prev, cur) -> list[float]:
+    """Per-core busy % between two psutil.cpu_times(percpu=True) snapshots."""
+    out = []
+    for a, b in zip(prev, cur):
+        total = sum(b) - sum(a)
+        idle = (b.idle - a.idle) + (getattr(b, "iowait", 0.0) - getattr(a, "iowait", 0.0))
+        out.append(0.0 if total <= 0 else max(0.0, min(100.0, 100.0 * (total - idle) / total)))
+    return out
+
+
+class Placer:
+    def __init__(
+        self,
+        *,
+        cpu_count: int,
+        reserved: list[int],
+        per_bot: int,
+        strategy: str,
+        hot_pct: float,
+        hot_checks: int,
+    ):
+        self.reserved = [c for c in reserved if 0 <= c < cpu_count]
+        # Everything left for bots (all cores if the reservation would leave none)
+        self.cores = [c for c in range(cpu_count) if c not in self.reserved] or list(range(cpu_count))
+        self.per_bot = max(1, min(per_bot, len(self.cores)))
+        self.strategy = strategy
+        self.hot_pct = hot_pct
+        self.hot_checks = hot_checks
+        self.assigned: dict[str, list[int]] = {}
+        self._hot: dict[str, int] = {}
+
+    def _slot(self, index: int) -> list[int]:
+        """The index-th group of per_bot consecutive bot cores (wrapping)."""
+        n = len(self.cores)
+        return [self.cores[(index * self.per_bot + k) % n] for k in range(self.per_bot)]
+
+    def _slots(self) -> list[list[int]]:
+        n = len(self.cores)
+        count = max(1, n // self.per_bot)
+        return [self._slot(i) for i in range(count)]
+
+    def assigned_load(self, bot_cpu: dict[str, float], *, skip: str | None = None) -> dict[int, float]:
+        """Per-core load implied by the bots placed on it (each bot's CPU split over its cores)."""
+        load = {c: 0.0 for c in self.cores}
+        for name, cores in self.assigned.items():
+            if name == skip or not cores:
+                continue
+            share = bot_cpu.get(name, 0.0) / len(cores)
+            for c in cores:
+                if c in load:
+                    load[c] += share
+        return load
+
+    def _least_loaded_slot(self, load: dict[int, float], counts: dict[int, int]) -> list[int]:
+        return min(
+            self._slots(),
+            key=lambda slot: (sum(load.get(c, 0.0) for c in slot), sum(counts.get(c, 0) for c in slot)),
+        )
+
+    def choose(self, name: str, index: int, bot_cpu: dict[str, float]) -> list[int]:
+        """Cores for a bot that was just launched (or attached to); `index` is its position in the fleet."""
+        if self.strategy == "load":
+            counts: dict[int, int] = {}
+            for other, cores in self.assigned.items():
+                if other != name:
+                    for c in cores:
+                        counts[c] = counts.get(c, 0) + 1
+            cores = self._least_loaded_slot(self.assigned_load(bot_cpu, skip=name), counts)
+        else:
+            cores = self._slot(index)
+        self.assigned[name] = cores
+        self._hot.pop(name, None)
+        return cores
+
+    def forget(self, name: str) -> None:
+        self.assigned.pop(name, None)
+        self._hot.pop(name, None)
+
+    def replan(self, bot_cpu: dict[str, float]) -> dict[str, list[int]]:
+        """Full greedy placement of the placed bots by measured CPU, busiest first."""
+        names = sorted(self.assigned, key=lambda n: bot_cpu.get(n, 0.0), reverse=True)
+        self.assigned = {}
+        load = {c: 0.0 for c in self.cores}
+        counts: dict[int, int] = {}
+        for name in names:
+            slot = self._least_loaded_slot(load, counts)
+            self.assigned[name] = slot
+            for c in slot:
+                load[c] += bot_cpu.get(name, 0.0) / len(slot)
+                counts[c] = counts.get(c, 0) + 1
+        self._hot.clear()
+        return dict(self.assigned)
+
+    def hot_moves(self, bot_cpu: dict[str, float], core_load: list[float]) -> list[tuple[str, list[int], list[int]]]:
+        """
+        Bots that were hot for hot_checks checks in a row, with the cores to move
+        them to. `bot_cpu` is psutil percent (100 = one core), `core_load` is
+        per-core busy % from core_percents() (cpu_times deltas between checks).
+        Applies the moves to `assigned`.
+        """
+        moves = []
+        for name, cores in list(self.assigned.items()):
+            if bot_cpu.get(name, 0.0) >= self.hot_pct * len(cores):
+                self._hot[name] = self._hot.get(name, 0) + 1
+            else:
+                self._hot.pop(name, None)
+                continue
+            if self._hot[name] < self.hot_checks:
+                continue
+            self._hot.pop(name, None)
+            load = {c: (core_load[c] if c < len(core_load) else 0.0) for c in self.cores}
+            target = min(self._slots(), key=lambda slot: sum(load[c] for c in slot))
+            here = sum(load.get(c, 0.0) for c in cores) / len(cores)
+            there = sum(load[c] for c in target) / len(target)
+            if sorted(target) != sorted(cores) and there + MOVE_MARGIN_PCT <= here:
+                self.assigned[name] = target
+                moves.append((name, cores, target))
+        return moves
@@ -0,0 +1,352 @@
+# src/store.py
+"""
+Embedded state store: one SQLite file (WAL mode) holding
+
+  - state    current values by key (coin snapshot, status message id,
+             supervisor records), JSON-encoded
+  - events   an append-only journal: (ts, bot, type, value, detail) for
+             lifecycle events (ready, restarting, offline, ...) and parsed
+             values (instant payouts, depositable items)
+  - totals   per bot and type, the count / value sum / time span of events
+             that compaction has already removed, so lifetime figures
+             survive retention
+
+Writes never block the caller: event() and set_state() put the row on a
+queue and a single writer thread inserts whatever has piled up in one
+transaction (executemany), so a burst of thousands of events costs one
+commit. set_state() also updates an in-memory copy that get_state() reads,
+so state reads don't wait for the writer either; values are JSON-encoded on
+the writer thread, newest per key only.
+
+Reads (last_events, events_between, totals) run on the calling thread with
+its own connection; WAL lets them run while the writer commits. Call them
+via asyncio.to_thread from the event loop.
+
+Every compact_seconds the writer folds events older than retention_days, and
+beyond the newest max_events, into totals, deletes them, checkpoints the WAL
+and returns freed pages, so the file stays bounded.
+
+No hikari imports; botlogs opens the store and feeds it.
+"""
+from __future__ import annotations
+
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id     INTEGER PRIMARY KEY,
+    ts     REAL NOT NULL,
+    bot    TEXT NOT NULL,
+    type   TEXT NOT NULL,
+    value  REAL,
+    detail TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS events_bot_ts ON events (bot, ts);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE TABLE IF NOT EXISTS state (
+    key     TEXT PRIMARY KEY,
+    value   TEXT NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totals (
+    bot       TEXT NOT NULL,
+    type      TEXT NOT NULL,
+    count     INTEGER NOT NULL,
+    value_sum REAL NOT NULL,
+    first_ts  REAL NOT NULL,
+    last_ts   REAL NOT NULL,
+    PRIMARY KEY (bot, type)
+);
+"""
+
+# Statements are kept as constants so sqlite3's statement cache reuses them
+INSERT_EVENT = "INSERT INTO events (ts, bot, type, value, detail) VALUES (?, ?, ?, ?, ?)"
+UPSERT_STATE = (
+    "INSERT INTO state (key, value, updated) VALUES (?, ?, ?) "
+    "ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated = excluded.updated"
+)
+LAST_EVENTS = "SELECT ts, bot, type, value, detail FROM events WHERE bot = ? ORDER BY ts DESC, id DESC LIMIT ?"
+LAST_EVENTS_OF_TYPE = (
+    "SELECT ts, bot, type, value, detail FROM events WHERE bot = ? AND type = ? "
+    "ORDER BY ts DESC, id DESC LIMIT ?"
+)
+# {filters}: "", "bot = ? AND ", "type = ? AND " or both; four fixed strings, so still cached
+EVENTS_BETWEEN = (
+    "SELECT ts, bot, type, value, detail FROM events WHERE {filters}ts >= ? AND ts < ? ORDER BY ts, id LIMIT ?"
+)
+FOLD_OLD = """
+INSERT INTO totals (bot, type, count, value_sum, first_ts, last_ts)
+SELECT bot, type, COUNT(*), COALESCE(SUM(value), 0), MIN(ts), MAX(ts) FROM events WHERE {where} GROUP BY bot, type
+ON CONFLICT(bot, type) DO UPDATE SET
+    count = count + excluded.count,
+    value_sum = value_sum + excluded.value_sum,
+    first_ts = MIN(first_ts, excluded.first_ts),
+    last_ts = MAX(last_ts, excluded.last_ts)
+"""
+LIVE_TOTALS = (
+    "SELECT bot, type, COUNT(*), COALESCE(SUM(value), 0), MIN(ts), MAX(ts) FROM events {where} GROUP BY bot, type"
+)
+
+# Queue items: events are 5-tuples, state writes 3-tuples, markers (kind, threading.Event)
+_FLUSH = "flush"
+_COMPACT = "compact"
+_CLOSE = object()
+
+
+@dataclass(frozen=True)
+class Event:
+    ts: float
+    bot: str
+    type: str
+    value: float | None
+    detail: str
+
+
+@dataclass
+class Total:
+    count: int = 0
+    value_sum: float = 0.0
+    first_ts: float | None = None
+    last_ts: float | None = None
+
+
+class Store:
+    def __init__(
+        self,
+        path: str,
+        *,
+        retention_days: float = 30.0,
+        max_events: int = 1_000_000,
+        compact_seconds: float = 3600.0,
+        max_pending: int = 100_000,
+        batch_size: int = 5000,
+    ):
+        self.path = path
+        self.retention_days = retention_days
+        self.max_events = max_events
+        self.compact_seconds = compact_seconds
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        # Stats (written by the writer thread, read by metrics)
+        self.written = 0
+        self.dropped = 0
+        self.last_flush_seconds = 0.0
+        self.last_compaction: dict | None = None
+        self.error: str | None = None
+
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._state: dict[str, object] = {}
+        self._local = threading.local()
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        # Schema and the state snapshot are set up before the writer starts
+        db = self._connect()
+        # Freed pages go back to the file system on compaction (only takes effect on a new file)
+        db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        db.executescript(SCHEMA)
+        for key, value in db.execute("SELECT key, value FROM state"):
+            self._state[key] = json.loads(value)
+        db.close()
+        self._writer = threading.Thread(target=self._run, name="state-store", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        db.execute("PRAGMA journal_mode = WAL")
+        # WAL + NORMAL: commits don't fsync; a power cut can lose the last moments, never corrupt
+        db.execute("PRAGMA synchronous = NORMAL")
+        return db
+
+    def _reader(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = self._connect()
+            db.execute("PRAGMA query_only = ON")
+        return db
+
+    # ---- writes (any thread, never block) ----
+    def event(self, bot: str, type: str, value: float | None = None, detail: str = "", ts: float | None = None) -> None:
+        if self._queue.qsize() >= self.max_pending:
+            self.dropped += 1  # writer can't keep up (disk stalled); don't grow without bound
+            return
+        self._queue.put((ts or time.time(), bot, type, value, detail))
+
+    def set_state(self, key: str, value) -> None:
+        """
+        Store a JSON-serializable value; get_state sees it at once, the file
+        shortly after. The writer serializes it (only the newest value per key
+        in a batch), so don't mutate `value` afterwards; pass a fresh object.
+        A value JSON can't encode is not written; `error` says which key.
+        """
+        self._state[key] = value
+        self._queue.put((key, value, time.time()))
+
+    def get_state(self, key: str, default=None):
+        return self._state.get(key, default)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until everything queued so far is committed."""
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def compact(self, timeout: float | None = None) -> dict | None:
+        """Run a compaction now (on the writer thread) and return its summary."""
+        done = threading.Event()
+        self._queue.put((_COMPACT, done))
+        done.wait(timeout)
+        return self.last_compaction
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def close(self, timeout: float = 10.0) -> None:
+        if self._writer.is_alive():
+            self._queue.put(_CLOSE)
+            self._writer.join(timeout)
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    # ---- reads (calling thread) ----
+    def last_events(self, bot: str, n: int = 20, type: str | None = None) -> list[Event]:
+        """Newest first."""
+        if type is None:
+            rows = self._reader().execute(LAST_EVENTS, (bot, n))
+        else:
+            rows = self._reader().execute(LAST_EVENTS_OF_TYPE, (bot, type, n))
+        return [Event(*r) for r in rows]
+
+    def events_between(
+        self,
+        start: float,
+        end: float,
+        bot: str | None = None,
+        type: str | None = None,
+        limit: int = 10_000,
+    ) -> list[Event]:
+        """Oldest first, start <= ts < end."""
+        filters, args = "", []
+        if bot is not None:
+            filters, args = "bot = ? AND ", [bot]
+        if type is not None:
+            filters += "type = ? AND "
+            args.append(type)
+        rows = self._reader().execute(EVENTS_BETWEEN.format(filters=filters), (*args, start, end, limit))
+        return [Event(*r) for r in rows]
+
+    def totals(self, bot: str | None = None) -> dict[tuple[str, str], Total]:
+        """Lifetime count / value sum per (bot, type): compacted totals plus the events still kept."""
+        db = self._reader()
+        args = () if bot is None else (bot,)
+        where = "" if bot is None else "WHERE bot = ?"
+        out: dict[tuple[str, str], Total] = {}
+        for query in (f"SELECT * FROM totals {where}", LIVE_TOTALS.format(where=where)):
+            for b, t, count, value_sum, first_ts, last_ts in db.execute(query, args):
+                tot = out.setdefault((b, t), Total())
+                tot.count += count
+                tot.value_sum += value_sum
+                tot.first_ts = first_ts if tot.first_ts is None else min(tot.first_ts, first_ts)
+                tot.last_ts = last_ts if tot.last_ts is None else max(tot.last_ts, last_ts)
+        return out
+
+    # ---- writer thread ----
+    def _run(self) -> None:
+        db = self._connect()
+        next_compact = time.monotonic() + self.compact_seconds
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=max(0.0, next_compact - time.monotonic()))
+                except queue.Empty:
+                    item = (_COMPACT, threading.Event())
+                events, states, markers = [], {}, []
+                closing = False
+                # Everything that piled up while the last commit ran goes into this one
+                while True:
+                    if item is _CLOSE:
+                        closing = True
+                    elif len(item) == 2:
+                        markers.append(item)
+                    elif len(item) == 5:
+                        events.append(item)
+                    else:
+                        states[item[0]] = item  # only the newest value per key is written
+                    if closing or len(events) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                self._write(db, events, list(states.values()))
+                if any(kind == _COMPACT for kind, _ in markers) or time.monotonic() >= next_compact:
+                    self._compact(db)
+                    next_compact = time.monotonic() + self.compact_seconds
+                for _, done in markers:
+                    done.set()
+                if closing:
+                    return
+        finally:
+            db.close()
+
+    def _write(self, db: sqlite3.Connection, events: list[tuple], states: list[tuple]) -> None:
+        if not events and not states:
+            return
+        t0 = time.perf_counter()
+        rows, bad = [], None
+        for k, v, t in states:
+            try:
+                rows.append((k, json.dumps(v, separators=(",", ":")), t))
+            except (TypeError, ValueError) as e:
+                bad = f"state {k!r} not saved: {e}"  # the writer thread has to keep running
+        try:
+            db.execute("BEGIN")
+            if events:
+                db.executemany(INSERT_EVENT, events)
+            if rows:
+                db.executemany(UPSERT_STATE, rows)
+            db.execute("COMMIT")
+        except sqlite3.Error as e:
+            self.error = str(e)
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            self.dropped += len(events)
+            return
+        self.error = bad
+        self.written += len(events)
+        self.last_flush_seconds = time.perf_counter() - t0
+
+    def _compact(self, db: sqlite3.Connection) -> None:
+        t0 = time.perf_counter()
+        cutoff = time.time() - self.retention_days * 86400
+        try:
+            db.execute("BEGIN")
+            # Rows to drop: older than the retention, or beyond the newest max_events
+            row = db.execute("SELECT id FROM events ORDER BY id DESC LIMIT 1 OFFSET ?", (self.max_events,)).fetchone()
+            where, args = "ts < ?", [cutoff]
+            if row is not None:
+                where, args = "(ts < ? OR id <= ?)", [cutoff, row[0]]
+            db.execute(FOLD_OLD.format(where=where), args)
+            removed = db.execute(f"DELETE FROM events WHERE {where}", args).rowcount
+            db.execute("COMMIT")
+            db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            db.execute("PRAGMA incremental_vacuum")
+        except sqlite3.Error as e:
+            self.error = str(e)
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            return
+        self.last_compaction = {
+            "at": time.time(),
+            "removed": removed,
+            "seconds": time.perf_counter() - t0,
+            "bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        }
@@ -0,0 +1,206 @@
+# src/supervisor.py
+"""
+Crash recovery bookkeeping for the PID watchers in botlogs: per-bot restart
+policy, exponential backoff with jitter, crash-loop detection, and restart /
+downtime / recovery stats persisted across controller restarts.
+
+This module only decides; launching and alerting stay in botlogs. An
+incident runs from an unexpected exit until the bot is ready again, no
+matter who restarted it; its length is the recovery time (MTTR = mean).
+
+Records are kept in the state store when one is set (src/store.py), else
+in a JSON file.
+
+Policies:
+    "always"      restart after any unexpected exit
+    "on-failure"  restart unless the exit code is 0 (an unknown code counts as a failure)
+    "never"       alert only (the old behaviour)
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, field, asdict, fields
+
+POLICIES = ("always", "on-failure", "never")
+
+
+@dataclass
+class BotRecord:
+    exits: int = 0                     # unexpected exits (intentional stops are not counted)
+    restarts: int = 0                  # automatic restarts launched
+    crash_loops: int = 0
+    recoveries: int = 0
+    recovery_seconds: float = 0.0      # sum over recovered incidents
+    downtime_seconds: float = 0.0      # closed incidents, including ones ended by a manual stop
+    down_since: float | None = None    # open incident
+    held: bool = False                 # crash loop: no automatic restarts until a manual start
+    last_exit_at: float | None = None
+    last_exit_code: int | None = None
+    recent_exits: list[float] = field(default_factory=list)
+
+    def mttr(self) -> float | None:
+        return self.recovery_seconds / self.recoveries if self.recoveries else None
+
+    def downtime(self, now: float | None = None) -> float:
+        if self.down_since is None:
+            return self.downtime_seconds
+        return self.downtime_seconds + max(0.0, (now or time.time()) - self.down_since)
+
+
+@dataclass
+class Decision:
+    action: str          # "restart", "crashloop" or "none"
+    delay: float = 0.0   # seconds before the restart
+    attempt: int = 0     # exits inside the crash-loop window, this one included
+    reason: str = ""
+
+
+class Supervisor:
+    def __init__(
+        self,
+        path: str,
+        *,
+        policies: dict[str, str],
+        default_policy: str,
+        backoff_base: float,
+        backoff_max: float,
+        loop_max_exits: int,
+        loop_window: float,
+    ):
+        self.path = path
+        self.policies = policies
+        self.default_policy = default_policy
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.loop_max_exits = loop_max_exits
+        self.loop_window = loop_window
+        self.records: dict[str, BotRecord] = {}
+        self.save_error: str | None = None
+        # A src.store.Store to keep the records in instead of `path` (set by botlogs)
+        self.store = None
+
+    def policy(self, name: str) -> str:
+        p = self.policies.get(name, self.default_policy)
+        return p if p in POLICIES else "never"
+
+    def record(self, name: str) -> BotRecord:
+        rec = self.records.get(name)
+        if rec is None:
+            rec = self.records[name] = BotRecord()
+        return rec
+
+    def backoff(self, attempt: int) -> float:
+        """base * 2^(attempt-1), capped, then +/-20% so a fleet-wide crash doesn't relaunch in lockstep."""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** max(0, attempt - 1)))
+        return delay * (0.8 + 0.4 * random.random())
+
+    # ---- transitions ----
+    def on_exit(self, name: str, code: int | None, *, decide: bool = True, now: float | None = None) -> Decision:
+        """An unexpected exit. With decide=False (bots run by an agent) only the stats are kept."""
+        now = now or time.time()
+        rec = self.record(name)
+        rec.exits += 1
+        rec.last_exit_at = now
+        rec.last_exit_code = code
+        if rec.down_since is None:
+            rec.down_since = now
+        rec.recent_exits = [t for t in rec.recent_exits if now - t < self.loop_window] + [now]
+        attempt = len(rec.recent_exits)
+
+        policy = self.policy(name)
+        if not decide:
+            decision = Decision("none", attempt=attempt, reason="managed by its agent")
+        elif policy == "never":
+            decision = Decision("none", attempt=attempt, reason="policy never")
+        elif policy == "on-failure" and code == 0:
+            decision = Decision("none", attempt=attempt, reason="clean exit (code 0)")
+        elif rec.held:
+            decision = Decision("none", attempt=attempt, reason="held after a crash loop")
+        elif attempt >= self.loop_max_exits:
+            rec.held = True
+            rec.crash_loops += 1
+            decision = Decision(
+                "crashloop",
+                attempt=attempt,
+                reason=f"{attempt} exits in {self.loop_window / 60:.0f} min",
+            )
+        else:
+            decision = Decision("restart", delay=self.backoff(attempt), attempt=attempt, reason=f"policy {policy}")
+        self.save()
+        return decision
+
+    def on_restart(self, name: str) -> None:
+        self.record(name).restarts += 1
+        self.save()
+
+    def on_ready(self, name: str, *, now: float | None = None) -> float | None:
+        """Close the open incident; returns its recovery time, or None if there was none."""
+        rec = self.records.get(name)
+        if rec is None or rec.down_since is None:
+            return None
+        elapsed = max(0.0, (now or time.time()) - rec.down_since)
+        rec.down_since = None
+        rec.recoveries += 1
+        rec.recovery_seconds += elapsed
+        rec.downtime_seconds += elapsed
+        self.save()
+        return elapsed
+
+    def on_manual_stop(self, name: str, *, now: float | None = None) -> None:
+        """Stopped on purpose: an open incident ends here without counting as a recovery."""
+        rec = self.records.get(name)
+        if rec is None or rec.down_since is None:
+            return
+        rec.downtime_seconds += max(0.0, (now or time.time()) - rec.down_since)
+        rec.down_since = None
+        self.save()
+
+    def release(self, name: str) -> bool:
+        """Manual start: clear a crash-loop hold. True if the bot was held."""
+        rec = self.records.get(name)
+        if rec is None or not rec.held:
+            return False
+        rec.held = False
+        rec.recent_exits = []
+        self.save()
+        return True
+
+    def is_held(self, name: str) -> bool:
+        rec = self.records.get(name)
+        return bool(rec and rec.held)
+
+    # ---- persistence ----
+    def save(self) -> None:
+        """Write all records; a failure is kept in save_error rather than raised into the watcher."""
+        data = {name: asdict(rec) for name, rec in self.records.items()}
+        if self.store is not None:
+            self.store.set_state("supervisor", data)  # queued; the store's writer thread commits it
+            return
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            self.save_error = str(e)
+        else:
+            self.save_error = None
+
+    def load(self, names) -> None:
+        """Load stats for `names` (unknown bots in the file are dropped); a missing file is fine."""
+        data = self.store.get_state("supervisor") if self.store is not None else None
+        if data is None:
+            # No store, or its first start: the JSON file (if any) still has the stats
+            if not os.path.exists(self.path):
+                return
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f) or {}
+        known = {f.name for f in fields(BotRecord)}
+        self.records = {
+            name: BotRecord(**{k: v for k, v in data[name].items() if k in known})
+            for name in names
+            if isinstance(data.get(name), dict)
+        }
@@ -0,0 +1,129 @@
+# src/watchdog.py
+"""
+Hang detection from log activity. The tailers count lines per bot; every
+tick the watchdog turns the count into a rate and keeps two EWMAs of it:
+a fast one (recent activity) and a slow one (the bot's own baseline, frozen
+while it is flagged). A ready bot is flagged hung when
+
+  - it has been silent for max(min_silence, gap_factor / baseline) seconds,
+    i.e. for many of its usual gaps between lines, or
+  - its recent rate fell below drop_ratio * baseline,
+
+and it is un-flagged once it is back above that ratio with a fresh line.
+Bots quieter than min_baseline lines/s are not judged at all.
+
+Pure bookkeeping like src/supervisor.py; botlogs does the alerting/restarts.
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+
+@dataclass
+class Activity:
+    pending: int = 0                # lines since the last tick
+    last_line: float = 0.0
+    fast: float | None = None       # lines/s, short half-life
+    slow: float | None = None       # lines/s, the baseline
+    watched_since: float = 0.0      # ready (again) at; judging starts after the warmup
+    hung_since: float | None = None
+    reason: str = ""
+
+
+class Watchdog:
+    def __init__(
+        self,
+        *,
+        fast_half_life: float,
+        slow_half_life: float,
+        warmup: float,
+        min_silence: float,
+        gap_factor: float,
+        drop_ratio: float,
+        min_baseline: float,
+    ):
+        self.fast_half_life = fast_half_life
+        self.slow_half_life = slow_half_life
+        self.warmup = warmup
+        self.min_silence = min_silence
+        self.gap_factor = gap_factor
+        self.drop_ratio = drop_ratio
+        self.min_baseline = min_baseline
+        self.bots: dict[str, Activity] = {}
+        self._last_tick: float | None = None
+
+    def _get(self, name: str) -> Activity:
+        act = self.bots.get(name)
+        if act is None:
+            act = self.bots[name] = Activity()
+        return act
+
+    def observe(self, name: str, lines: int, now: float) -> None:
+        """Called by the tailer for every parsed chunk."""
+        if lines:
+            act = self._get(name)
+            act.pending += lines
+            act.last_line = now
+
+    def watch(self, name: str, now: float) -> None:
+        """The bot became ready: restart the warmup. The baseline is kept across relaunches."""
+        act = self._get(name)
+        act.pending = 0
+        act.last_line = now
+        act.fast = None
+        act.watched_since = now
+        act.hung_since = None
+        act.reason = ""
+
+    def is_hung(self, name: str) -> bool:
+        act = self.bots.get(name)
+        return bool(act and act.hung_since is not None)
+
+    @staticmethod
+    def _ewma(old: float | None, value: float, dt: float, half_life: float) -> float:
+        if old is None:
+            return value
+        alpha = 1.0 - math.exp(-math.log(2) * dt / half_life)
+        return old + alpha * (value - old)
+
+    def tick(self, names, now: float) -> tuple[list[str], list[str]]:
+        """
+        Update the rates of `names` (the bots that should be active) and
+        return (newly hung, resumed). Other bots are left alone.
+        """
+        dt = now - self._last_tick if self._last_tick is not None else 0.0
+        self._last_tick = now
+        hung: list[str] = []
+        resumed: list[str] = []
+        if dt <= 0:
+            return hung, resumed
+
+        for name in names:
+            act = self._get(name)
+            rate = act.pending / dt
+            act.pending = 0
+            act.fast = self._ewma(act.fast, rate, dt, self.fast_half_life)
+            if act.hung_since is None:
+                act.slow = self._ewma(act.slow, rate, dt, self.slow_half_life)
+
+            base = act.slow or 0.0
+            if base < self.min_baseline or now - act.watched_since < self.warmup:
+                continue
+            silence = now - act.last_line
+
+            if act.hung_since is None:
+                limit = max(self.min_silence, self.gap_factor / base)
+                if silence >= limit:
+                    act.reason = f"no output for {silence:.0f}s (usually {base:.2f} lines/s)"
+                elif act.fast < self.drop_ratio * base:
+                    act.reason = f"{act.fast:.2f} lines/s vs a usual {base:.2f}"
+                else:
+                    continue
+                act.hung_since = now
+                hung.append(name)
+            elif act.fast >= self.drop_ratio * base and silence < self.min_silence:
+                act.hung_since = None
+                act.reason = ""
+                resumed.append(name)
+        return hung, resumed
@@ -1,67 +1,71 @@
+"""
+Find bot folders and write them to the fleet file (src/fleet.json).
+
+Uses the same discovery as the /discover command: DISCOVERY_ROOTS,
+DISCOVERY_DEPTH etc. from src/config.py unless overridden here. Bots
+already in the fleet file keep their names; a running controller picks
+the new file up on its own.
+
+    python pathgenerator.py
+    python pathgenerator.py --root D:\\bots --root ~/Desktop --depth 2
+    python pathgenerator.py --print
+"""
+import argparse
 import os
-import textwrap
+import sys
 
+BOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Discord bot", "Discord bot")
+sys.path.insert(0, BOT_DIR)
 
-def find_bots_on_desktop() -> dict[str, str]:
-    bots: dict[str, str] = {}
+import src.config as config  # noqa: E402
+from src.discovery import Discovery, merge_fleet  # noqa: E402
+from src.fleetfile import Fleet, read_fleet, write_fleet, diff_fleet  # noqa: E402
 
-    # Resolve Desktop path for the current user
-    desktop = os.path.join(os.path.expanduser("~"), "Desktop")
 
-    if not os.path.isdir(desktop):
-        print(f"Desktop folder not found: {desktop}")
-        return bots
-
-    print(f"Scanning desktop: {desktop}\n")
-
-    for entry in os.listdir(desktop):
-        folder = os.path.join(desktop, entry)
-        if not os.path.isdir(folder):
-            continue
-
-        exe = os.path.join(folder, "v4-bot.exe")
-        cmd = os.path.join(folder, "run.cmd")
-
-        if os.path.isfile(exe) and os.path.isfile(cmd):
-            # Use folder name as bot name
-            botname = entry
-            # Use forward slashes to avoid escaping issues
-            exe_path = exe.replace("\\", "/")
-            bots[botname] = exe_path
-            print(f"  [+] Found bot folder: {botname} -> {exe_path}")
-
-    if not bots:
-        print("No bot folders found (need folders on Desktop with v4-bot.exe and run.cmd).")
-
-    return bots
-
-
-def print_config_snippet(bots: dict[str, str]) -> None:
-    if not bots:
-        return
-
-    print("\n\n=== Generated BOT_EXECUTABLES snippet ===\n")
-
-    # Build a nice, readable Python dict snippet
-    lines = ["BOT_EXECUTABLES = {"]
-
-    # Sort by name for stable order
-    for name in sorted(bots.keys(), key=str.lower):
-        path = bots[name]
-        # repr() will properly escape the string for Python
-        lines.append(f'    "{name}": r"{path}",')
-
-    lines.append("}")
-    snippet = "\n".join(lines)
-
-    print(snippet)
-    print("\nCopy the above block into src/config.py\n")
+def _in_bot_dir(path: str | None) -> str | None:
+    # Config paths are relative to the bot folder (where main.py runs)
+    return None if path is None else os.path.join(BOT_DIR, os.path.expanduser(path))
 
 
 def main() -> None:
-    bots = find_bots_on_desktop()
-    print_config_snippet(bots)
-    input("\nPress Enter to exit...")
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", action="append", help="folder to scan (repeatable); default DISCOVERY_ROOTS")
+    parser.add_argument("--depth", type=int, default=config.DISCOVERY_DEPTH)
+    parser.add_argument("--out", default=_in_bot_dir(config.FLEET_FILE or "src/fleet.json"))
+    parser.add_argument("--print", dest="dry_run", action="store_true", help="show the result, don't write it")
+    parser.add_argument("--no-wait", action="store_true", help="don't wait for Enter at the end")
+    args = parser.parse_args()
+
+    roots = args.root or config.DISCOVERY_ROOTS
+    print(f"Scanning {', '.join(roots)} (depth {args.depth})")
+    result = Discovery(
+        roots,
+        depth=args.depth,
+        exe_names=config.DISCOVERY_EXE_NAMES,
+        marker=config.DISCOVERY_MARKER,
+        cache_path=_in_bot_dir(config.DISCOVERY_CACHE_FILE),
+        workers=config.DISCOVERY_WORKERS,
+    ).run()
+    for err in result.errors:
+        print(f"  [!] {err}")
+    for name, path in result.bots.items():
+        print(f"  [+] {name} -> {path}")
+    print(
+        f"{len(result.bots)} bot folder(s) in {result.dirs} folder(s), {result.seconds * 1000:.0f} ms "
+        f"({result.scanned} listed, {result.cached} from cache)"
+    )
+
+    exists = os.path.exists(args.out)
+    current = read_fleet(args.out) or Fleet(dict(config.BOT_EXECUTABLES), dict(config.BOT_AGENTS))
+    merged = merge_fleet(current, result.bots)
+    diff = diff_fleet(current, merged)
+    print(f"\n{args.out}: {diff.summary() if exists else 'new file'}")
+    if (diff or not exists) and not args.dry_run:
+        write_fleet(args.out, merged)
+        print(f"Written ({len(merged.bots)} bot(s)).")
+
+    if not args.no_wait and sys.stdin.isatty():
+        input("\nPress Enter to exit...")
 
 
 if __name__ == "__main__":